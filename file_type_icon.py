@@ -29,10 +29,13 @@ from .src.zukan_icon_theme.core.zukan_pref_settings import ZukanIconFiles
 from .src.zukan_icon_theme.helpers.cache_theme_info import delete_cached_theme_info
 from .src.zukan_icon_theme.helpers.clean_comments import CleanCommentsCommand  # noqa F401
 from .src.zukan_icon_theme.helpers.search_themes import get_sidebar_bgcolor
+from .src.zukan_icon_theme.helpers.load_save_settings import get_system_theme_ttl
 from .src.zukan_icon_theme.helpers.load_save_settings import get_theme_name
+from .src.zukan_icon_theme.helpers.load_save_settings import is_system_theme_watch
 from .src.zukan_icon_theme.helpers.load_save_settings import is_zukan_listener_enabled
 from .src.zukan_icon_theme.helpers.logger import logging
 from .src.zukan_icon_theme.helpers.move_folders import MoveFolder
+from .src.zukan_icon_theme.helpers.system_theme import system_appearance
 from .src.zukan_icon_theme.helpers.zukan_reporter import ZukanReporterCommand  # noqa F401
 from .src.zukan_icon_theme.utils.zukan_paths import (
     ZUKAN_ICONS_DATA_FILE,
@@ -58,6 +61,9 @@ if not os.path.exists(ZUKAN_ICONS_DATA_FILE):
 
 
 def plugin_loaded():
+    # `system_theme_ttl` and `system_theme_watch` settings.
+    system_appearance.configure(get_system_theme_ttl(), is_system_theme_watch())
+
     # IndexError when testing in ST4 Python 3.3, using sublime-package file.
     # get_sidebar_bgcolor use sublime find_resources
     theme_name = get_theme_name()
@@ -93,6 +99,9 @@ def plugin_loaded():
 def plugin_unloaded():
     MoveFolder().remove_created_folder(ZUKAN_PKG_PATH)
 
+    # Stop 'busctl monitor' watcher, if running.
+    system_appearance.stop_watch()
+
     if zukan_listener_enabled:
         # Clear `add_on_change`
         SettingsEvent.zukan_preferences_clear()
@@ -1,5 +1,4 @@
 import logging
-import os
 import sublime
 import sublime_plugin
 
@@ -8,9 +7,7 @@ from ..helpers.load_save_settings import (
     is_zukan_listener_enabled,
     set_save_settings,
 )
-from ..utils.file_extensions import (
-    PNG_EXTENSION,
-)
+from ..helpers.png_catalog import png_catalog
 from ..utils.file_settings import (
     ZUKAN_SETTINGS,
 )
@@ -54,9 +51,7 @@ class ChangeResetIcon:
         # primary_file_list = [j for i in PRIMARY_ICONS for j in i[2]]
 
         if (
-            not os.path.exists(
-                os.path.join(self.icon_path, change_icon_file + PNG_EXTENSION)
-            )
+            not png_catalog.exists(change_icon_file, (self.icon_path,))
             # Primary icons list excluded because 'file_type_image-1' does not
             # exist in 'icons' folder. It is been renamed to 'file_type_image'
             and change_icon_file not in primary_file_list
@@ -1,5 +1,4 @@
 import logging
-import os
 import sublime
 import sublime_plugin
 
@@ -8,10 +7,8 @@ from ..helpers.load_save_settings import (
     is_zukan_listener_enabled,
     set_save_settings,
 )
+from ..helpers.png_catalog import png_catalog
 from ..helpers.remove_empty_dict import remove_empty_dict
-from ..utils.file_extensions import (
-    PNG_EXTENSION,
-)
 from ..utils.file_settings import (
     ZUKAN_SETTINGS,
 )
@@ -146,11 +143,7 @@ class CreateDeleteCustomIcon:
         # Check if PNG exist
         primary_file_list = [file_name for name, file_name, *_ in PRIMARY_ICONS]
         if (
-            not os.path.exists(
-                os.path.join(
-                    self.zukan_pkg_icons_path, custom_icon_file + PNG_EXTENSION
-                )
-            )
+            not png_catalog.exists(custom_icon_file, (self.zukan_pkg_icons_path,))
             # Primary icons list excluded because 'file_type_image-1' does not
             # exist in 'icons' folder. It is been renamed to 'file_type_image'
             and custom_icon_file not in primary_file_list
@@ -1,12 +1,12 @@
 import logging
 import sublime_plugin
 
+from ..helpers.icons_data_cache import read_zukan_icons_data
 from ..helpers.load_save_settings import (
     get_ignored_icon_settings,
     is_zukan_listener_enabled,
     set_save_settings,
 )
-from ..helpers.read_write_data import read_pickle_data
 from ..lib.icons_syntaxes import ZukanSyntax
 from ..utils.file_settings import (
     ZUKAN_SETTINGS,
@@ -29,7 +29,7 @@ class DisableEnableIcon:
         self.zukan_listener_enabled = is_zukan_listener_enabled()
 
     def zukan_icons_data(self) -> list:
-        return read_pickle_data(ZUKAN_ICONS_DATA_FILE)
+        return read_zukan_icons_data(ZUKAN_ICONS_DATA_FILE)
 
     def ignored_icon_setting(self) -> list:
         return get_ignored_icon_settings()
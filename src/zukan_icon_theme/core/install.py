@@ -1,9 +1,10 @@
 import logging
-import threading
 
+from ..lib.build_plan import build_changed_icons_files, build_icons_files
 from ..lib.icons_preferences import ZukanPreference
 from ..lib.icons_syntaxes import ZukanSyntax
 from ..lib.icons_themes import ZukanTheme
+from ..helpers.build_jobs import SCOPE_ALL, SCOPE_ICONS_FILES, BuildJob, build_jobs
 from ..helpers.delete_unused import delete_unused_icons
 from ..helpers.load_save_settings import (
     get_theme_settings,
@@ -11,6 +12,7 @@ from ..helpers.load_save_settings import (
     is_zukan_restart_message,
 )
 from ..helpers.move_folders import MoveFolder
+from ..helpers.settings_diff import SettingsDiff
 from ..helpers.thread_progress import ThreadProgress
 from ..utils.zukan_paths import (
     ZUKAN_PKG_ICONS_DATA_PRIMARY_PATH,
@@ -52,8 +54,7 @@ class InstallEvent:
         if auto_install_theme is False:
             self.zukan_theme.create_icons_themes()
 
-        self.zukan_syntax.build_icons_syntaxes()
-        self.zukan_preference.build_icons_preferences()
+        build_icons_files(self.zukan_syntax, self.zukan_preference)
 
         logger.info('Zukan icons v%s has been built.', self.pkg_version_setting())
 
@@ -65,8 +66,8 @@ class InstallEvent:
         # Change build order: syntax then preferences. Notice error Bad XML,
         # when ignoring icon through Command, duplicating create preferences
         # after change from 'add_on_change' to  ViewListener.
-        self.zukan_syntax.build_icons_syntaxes()
-        self.zukan_preference.build_icons_preferences()
+        # Icons data, settings and theme are read once for both.
+        build_icons_files(self.zukan_syntax, self.zukan_preference)
 
     def install_upgrade_thread(self):
         """
@@ -92,9 +93,8 @@ class InstallEvent:
                     'current theme.'
                 )
 
-            t = threading.Thread(target=self.install_syntaxes_preferences)
-            t.start()
-            ThreadProgress(t, 'Upgrading zukan files', 'Upgrade done', dialog_message)
+            job = build_jobs.submit(self._install_syntaxes_preferences_job())
+            ThreadProgress(job, 'Upgrading zukan files', 'Upgrade done', dialog_message)
 
             logger.info('upgrading Zukan icons to v%s.', pkg_version)
             logger.info('Changelog in Sublime Text > Settings > Package Settings menu.')
@@ -107,10 +107,34 @@ class InstallEvent:
         """
         Using Thread to build syntax and preferences files, to avoid ST freezing.
         """
+        job = build_jobs.submit(self._install_syntaxes_preferences_job())
+        ThreadProgress(job, 'Building zukan files', 'Build done')
+
+    def _install_syntaxes_preferences_job(self) -> BuildJob:
+        return BuildJob(
+            ('install_syntaxes_preferences',),
+            self.install_syntaxes_preferences,
+            scope=SCOPE_ICONS_FILES,
+            full=True,
+        )
 
-        t = threading.Thread(target=self.install_syntaxes_preferences)
-        t.start()
-        ThreadProgress(t, 'Building zukan files', 'Build done')
+    def rebuild_changed_icons_thread(self, settings_diff: SettingsDiff):
+        """
+        Using Thread to build only syntax and preferences files of changed icons,
+        to avoid ST freezing.
+
+        Parameters:
+        settings_diff (SettingsDiff) -- icons settings changes.
+        """
+        # Each diff is from settings saved after previous one, none is a duplicate.
+        job = build_jobs.submit(
+            BuildJob(
+                ('build_changed_icons_files', id(settings_diff)),
+                build_changed_icons_files,
+                (self.zukan_syntax, self.zukan_preference, settings_diff),
+            )
+        )
+        ThreadProgress(job, 'Building zukan files', 'Build done')
 
     def new_install(self):
         """
@@ -136,6 +160,7 @@ class InstallEvent:
             else None
         )
 
-        t = threading.Thread(target=self.install_batch)
-        t.start()
-        ThreadProgress(t, 'Building zukan files', 'Build done', dialog_message)
+        job = build_jobs.submit(
+            BuildJob(('install_batch',), self.install_batch, scope=SCOPE_ALL, full=True)
+        )
+        ThreadProgress(job, 'Building zukan files', 'Build done', dialog_message)
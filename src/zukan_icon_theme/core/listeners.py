@@ -3,10 +3,17 @@ import os
 import sublime
 import sublime_plugin
 import threading
+import time
 
 from ..lib.icons_preferences import ZukanPreference
 from ..lib.icons_syntaxes import ZukanSyntax
 from ..lib.icons_themes import ZukanTheme
+from ..helpers.build_jobs import (
+    SCOPE_PREFERENCES,
+    SCOPE_SYNTAXES,
+    BuildJob,
+    build_jobs,
+)
 from ..helpers.load_save_settings import (
     get_prefer_icon_settings,
     get_settings,
@@ -15,10 +22,12 @@ from ..helpers.load_save_settings import (
     is_zukan_restart_message,
     save_current_ui_settings,
 )
+from ..helpers.output_state import output_state
 from ..helpers.read_write_data import read_pickle_data
 from ..helpers.search_themes import (
     get_sidebar_bgcolor,
     package_theme_exists,
+    theme_graph,
 )
 from ..helpers.system_theme import system_theme
 from ..helpers.color_dark_light import hex_dark_light
@@ -40,6 +49,109 @@ from ..utils.zukan_paths import (
 
 logger = logging.getLogger(__name__)
 
+# Activations closer than this, to last UI update, are grouped in one update.
+ACTIVATION_DEBOUNCE_MS = 250
+
+# user_ui_settings keys, same order as current_ui tuple.
+UI_SETTINGS_KEYS = (
+    'background',
+    'color_scheme',
+    'dark_theme',
+    'light_theme',
+    'system_theme',
+    'theme',
+)
+
+
+def current_ui(view) -> tuple:
+    """
+    Current theme and color scheme, read from view without file access.
+
+    Parameters:
+    view (sublime.View) -- activated view.
+
+    Returns:
+    (tuple) -- color scheme background, color scheme, dark theme, light theme,
+    system theme and theme.
+    """
+    view_settings = view.settings()
+
+    return (
+        view.style()['background'],
+        view_settings.get('color_scheme'),
+        view_settings.get('dark_theme'),
+        view_settings.get('light_theme'),
+        system_theme(),
+        view_settings.get('theme'),
+    )
+
+
+class ActivationGate:
+    """
+    Skip view activations when theme and color scheme did not change since last
+    UI update, and group bursts of activations in one update.
+
+    Parameters:
+    debounce_ms (int) -- minimum time between UI updates, in milliseconds.
+    """
+
+    def __init__(self, debounce_ms: int = ACTIVATION_DEBOUNCE_MS):
+        self.debounce_ms = debounce_ms
+        self._fingerprint = None
+        self._last_update = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """
+        Next activation updates UI, e.g. after zukan settings change.
+        """
+        with self._lock:
+            self._fingerprint = None
+            self._last_update = None
+
+    def is_current(self, fingerprint: tuple) -> bool:
+        with self._lock:
+            return fingerprint == self._fingerprint
+
+    def delay(self) -> int:
+        """
+        Returns:
+        (int) -- milliseconds to wait before updating UI, 0 to update now.
+        """
+        with self._lock:
+            if self._last_update is None:
+                return 0
+
+            elapsed = (time.perf_counter() - self._last_update) * 1000
+            return max(0, int(self.debounce_ms - elapsed))
+
+    def schedule(self) -> int:
+        """
+        Returns:
+        (int) -- token for a delayed update, only latest one runs.
+        """
+        with self._lock:
+            self._generation += 1
+            return self._generation
+
+    def is_latest(self, token: int) -> bool:
+        with self._lock:
+            return token == self._generation
+
+    def start(self):
+        with self._lock:
+            # Cancel delayed updates, this one is newer.
+            self._generation += 1
+            self._last_update = time.perf_counter()
+
+    def done(self, fingerprint: tuple):
+        with self._lock:
+            self._fingerprint = fingerprint
+
+
+activation_gate = ActivationGate()
+
 
 class SchemeTheme:
     """
@@ -85,14 +197,12 @@ class SchemeTheme:
             # Delete preferences to avoid error unable to decode 'icon_file_type'
             # Example of extensions that this errors show: HAML, LICENSE, README,
             # Makefile
-            if any(
-                syntax.endswith(SUBLIME_SYNTAX_EXTENSION)
-                for syntax in os.listdir(ZUKAN_PKG_ICONS_SYNTAXES_PATH)
+            if output_state.has_files(
+                ZUKAN_PKG_ICONS_SYNTAXES_PATH, SUBLIME_SYNTAX_EXTENSION
             ):
                 self.zukan_syntax.delete_icons_syntaxes()
-            if any(
-                preferences.endswith(TMPREFERENCES_EXTENSION)
-                for preferences in os.listdir(ZUKAN_PKG_ICONS_PREFERENCES_PATH)
+            if output_state.has_files(
+                ZUKAN_PKG_ICONS_PREFERENCES_PATH, TMPREFERENCES_EXTENSION
             ):
                 self.zukan_preference.delete_icons_preferences()
 
@@ -121,20 +231,24 @@ class SchemeTheme:
             theme_name in self.zukan_theme.list_created_icons_themes()
             and theme_name not in self.ignored_theme
         ):
-            if not any(
-                syntax.endswith(SUBLIME_SYNTAX_EXTENSION)
-                for syntax in os.listdir(ZUKAN_PKG_ICONS_SYNTAXES_PATH)
+            if not output_state.has_files(
+                ZUKAN_PKG_ICONS_SYNTAXES_PATH, SUBLIME_SYNTAX_EXTENSION
             ):
-                ts = threading.Thread(target=self.zukan_syntax.build_icons_syntaxes)
-                ts.start()
-                ThreadProgress(ts, 'Building zukan files', 'Build done')
+                job = build_jobs.submit(
+                    BuildJob(
+                        ('build_icons_syntaxes',),
+                        self.zukan_syntax.build_icons_syntaxes,
+                        scope=SCOPE_SYNTAXES,
+                        full=True,
+                    )
+                )
+                ThreadProgress(job, 'Building zukan files', 'Build done')
 
             # Build preferences if icons_preferences empty or if theme
             # in 'prefer_icon' option
             if (
-                not any(
-                    preferences.endswith(TMPREFERENCES_EXTENSION)
-                    for preferences in os.listdir(ZUKAN_PKG_ICONS_PREFERENCES_PATH)
+                not output_state.has_files(
+                    ZUKAN_PKG_ICONS_PREFERENCES_PATH, TMPREFERENCES_EXTENSION
                 )
                 or (
                     theme_name in self.prefer_icon
@@ -153,9 +267,14 @@ class SchemeTheme:
                     )
                 )
             ):
-                threading.Thread(
-                    target=self.zukan_preference.build_icons_preferences
-                ).start()
+                build_jobs.submit(
+                    BuildJob(
+                        ('build_icons_preferences',),
+                        self.zukan_preference.build_icons_preferences,
+                        scope=SCOPE_PREFERENCES,
+                        full=True,
+                    )
+                )
                 # self.zukan_preference.build_icons_preferences()
 
         # Deleting ignored theme in case it already exists before ignoring.
@@ -181,22 +300,60 @@ class SchemeThemeListener(sublime_plugin.ViewEventListener):
         # activate. Use 'enter' to select works. Seems happen with other functions.
         # With async seems not occur.
 
+        # Tab switching, same theme and color scheme, ends here.
+        ui = current_ui(self.view)
+        if activation_gate.is_current(ui):
+            return
+
+        delay = activation_gate.delay()
+        if delay:
+            token = activation_gate.schedule()
+            sublime.set_timeout_async(lambda: self.on_debounced(token), delay)
+            return
+
+        self.update_ui(ui)
+
+    def on_debounced(self, token: int):
+        if not activation_gate.is_latest(token) or not self.view.is_valid():
+            return
+
+        ui = current_ui(self.view)
+        if not activation_gate.is_current(ui):
+            self.update_ui(ui)
+
+    def update_ui(self, ui: tuple):
+        """
+        Create/delete zukan files or change icons if theme or color scheme
+        changed.
+
+        Parameters:
+        ui (tuple) -- current_ui result.
+        """
+        activation_gate.start()
+
+        # Themes are parsed once per UI change, and again on next one.
+        with theme_graph.operation():
+            self._update_ui(ui)
+
+    def _update_ui(self, ui: tuple):
         ignored_theme, auto_install_theme = get_theme_settings()
 
-        color_scheme_background = self.view.style()['background']
-        current_color_scheme = self.view.settings().get('color_scheme')
-        current_dark_theme = self.view.settings().get('dark_theme')
-        current_light_theme = self.view.settings().get('light_theme')
-        current_system_theme = system_theme()
-        current_theme = self.view.settings().get('theme')
+        (
+            color_scheme_background,
+            current_color_scheme,
+            current_dark_theme,
+            current_light_theme,
+            current_system_theme,
+            current_theme,
+        ) = ui
         icon_theme_file = os.path.join(ZUKAN_PKG_ICONS_PATH, current_theme)
 
         theme_name = current_theme
 
-        if theme_name == 'auto' and not system_theme():
+        if theme_name == 'auto' and not current_system_theme:
             theme_name = current_light_theme
 
-        if theme_name == 'auto' and system_theme():
+        if theme_name == 'auto' and current_system_theme:
             theme_name = current_dark_theme
 
         # create setting file with current UI if does not exist
@@ -275,26 +432,33 @@ class SchemeThemeListener(sublime_plugin.ViewEventListener):
                 or theme_name in ignored_theme
                 or (auto_install_theme is True and not os.path.exists(icon_theme_file))
                 # Move from ignored theme, need to create files.
-                or not any(
-                    preferences.endswith(TMPREFERENCES_EXTENSION)
-                    for preferences in os.listdir(ZUKAN_PKG_ICONS_PREFERENCES_PATH)
+                or not output_state.has_files(
+                    ZUKAN_PKG_ICONS_PREFERENCES_PATH, TMPREFERENCES_EXTENSION
                 )
-                or not any(
-                    syntax.endswith(SUBLIME_SYNTAX_EXTENSION)
-                    for syntax in os.listdir(ZUKAN_PKG_ICONS_SYNTAXES_PATH)
+                or not output_state.has_files(
+                    ZUKAN_PKG_ICONS_SYNTAXES_PATH, SUBLIME_SYNTAX_EXTENSION
                 )
             ):
                 SchemeTheme().get_user_theme()
 
                 logger.debug('SchemeTheme ViewListener on_activated_async')
 
-            # update current UI
-            save_current_ui_settings(
-                color_scheme_background,
-                current_color_scheme,
-                current_dark_theme,
-                current_light_theme,
-                current_system_theme,
-                current_theme,
-                sidebar_bgcolor,
-            )
+            # update current UI, only if it changed
+            if (ui, sidebar_bgcolor) not in [
+                (
+                    tuple(d.get(k) for k in UI_SETTINGS_KEYS),
+                    d.get('sidebar_bgcolor'),
+                )
+                for d in user_ui_settings
+            ]:
+                save_current_ui_settings(
+                    color_scheme_background,
+                    current_color_scheme,
+                    current_dark_theme,
+                    current_light_theme,
+                    current_system_theme,
+                    current_theme,
+                    sidebar_bgcolor,
+                )
+
+        activation_gate.done(ui)
@@ -65,14 +65,12 @@ class Preferences(ZukanPreference):
     def install_icon_preference(self, preference_name: str):
         file_name, _ = os.path.splitext(preference_name)
 
-        list_all_icons_preferences = self.get_list_icons_preferences()
+        icons_index = self.get_icons_index()
 
-        for p in list_all_icons_preferences:
-            if (
-                p['preferences']['settings']['icon'] == file_name
-                or p['preferences']['settings']['icon'][:-5] == file_name
-                or p['preferences']['settings']['icon'][:-6] == file_name
-            ):
+        # Default icon
+        # Need to add '-dark' or 'light' that was removed to mount list
+        for icon_name in (file_name, file_name + '-dark', file_name + '-light'):
+            for p in icons_index.records_by_icon(icon_name):
                 if p['name'] in self.ignored_icon_setting():
                     dialog_message = (
                         '{i} icon is disabled. Need to enable first.'.format(
@@ -83,16 +81,9 @@ class Preferences(ZukanPreference):
                     sublime.error_message(dialog_message)
 
                 else:
-                    # Default icon
-                    # Need to add '-dark' or 'light' that was removed to mount list
-                    if p['preferences']['settings']['icon'][:-5] == file_name:
-                        file_name = p['preferences']['settings']['icon']
-
-                    if p['preferences']['settings']['icon'][:-6] == file_name:
-                        file_name = p['preferences']['settings']['icon']
-
-                    # print(file_name)
-                    self.build_icon_preference(file_name)
+                    # All variants write same tmPreferences file.
+                    self.build_icon_preference(icon_name)
+                    return
 
     def install_all_icons_preferences(self):
         self.build_icons_preferences()
@@ -3,12 +3,12 @@ import os
 import sublime
 import sublime_plugin
 
-from ..helpers.edit_file_extension import edit_file_extension
+from ..helpers.edit_file_extension import extension_ownership
+from ..helpers.icons_data_cache import read_zukan_icons_data
 from ..helpers.load_save_settings import (
     get_change_icon_settings,
     get_ignored_icon_settings,
 )
-from ..helpers.read_write_data import read_pickle_data
 from ..lib.icons_syntaxes import ZukanSyntax
 from ..utils.file_extensions import (
     SUBLIME_SYNTAX_EXTENSION,
@@ -31,7 +31,7 @@ class Syntaxes(ZukanSyntax):
         self.syntaxes_path = syntaxes_path
 
     def zukan_icons_data(self):
-        return read_pickle_data(ZUKAN_ICONS_DATA_FILE)
+        return read_zukan_icons_data(ZUKAN_ICONS_DATA_FILE)
 
     def change_icon_file_extension_setting(self) -> list:
         _, change_icon_file_extension = get_change_icon_settings()
@@ -56,7 +56,7 @@ class Syntaxes(ZukanSyntax):
         list_syntaxes_not_installed = []
         zukan_icons = self.zukan_icons_data()
         compare_scopes_set = self.get_compare_scopes(zukan_icons)
-        change_icon_file_extension = self.change_icon_file_extension_setting()
+        ownership = extension_ownership(self.change_icon_file_extension_setting())
 
         list_all_icons_syntaxes = self.get_list_icons_syntaxes(zukan_icons)
 
@@ -66,11 +66,11 @@ class Syntaxes(ZukanSyntax):
                     scope = k.get('scope')
                     if scope and scope not in compare_scopes_set:
                         # 'change_file_extension' setting
-                        k['file_extensions'] = edit_file_extension(
-                            k['file_extensions'], scope, change_icon_file_extension
+                        file_extensions = ownership.filter_file_extensions(
+                            k['file_extensions'], scope
                         )
                         # file_extensions list can be empty
-                        if k['file_extensions']:
+                        if file_extensions:
                             list_syntaxes_not_installed.append(
                                 k['name'] + SUBLIME_SYNTAX_EXTENSION
                             )
@@ -87,23 +87,18 @@ class Syntaxes(ZukanSyntax):
         file_name, _ = os.path.splitext(syntax_name)
         zukan_icons = self.zukan_icons_data()
 
-        list_all_icons_syntaxes = self.get_list_icons_syntaxes(zukan_icons)
+        icons_index = self.get_icons_index(zukan_icons)
 
-        for d in list_all_icons_syntaxes:
-            if 'syntax' in d:
-                for s in d['syntax']:
-                    if s['name'] == file_name:
-                        if d['name'] in self.ignored_icon_setting():
-                            dialog_message = (
-                                '{i} icon is disabled. Need to enable first.'.format(
-                                    i=d['name']
-                                )
-                            )
-                            # sublime.message_dialog(dialog_message)
-                            sublime.error_message(dialog_message)
+        for d, _ in icons_index.syntaxes_by_name(file_name):
+            if d['name'] in self.ignored_icon_setting():
+                dialog_message = '{i} icon is disabled. Need to enable first.'.format(
+                    i=d['name']
+                )
+                # sublime.message_dialog(dialog_message)
+                sublime.error_message(dialog_message)
 
-                        else:
-                            self.install_syntax(file_name, syntax_name)
+            else:
+                self.install_syntax(file_name, syntax_name)
 
     def install_all_icons_syntaxes(self):
         self.install_syntaxes()
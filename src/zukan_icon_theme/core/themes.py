@@ -7,7 +7,7 @@ from ..helpers.load_save_settings import (
     get_theme_settings,
     is_zukan_restart_message,
 )
-from ..helpers.search_themes import search_resources_sublime_themes
+from ..helpers.search_themes import search_resources_sublime_themes, theme_graph
 from ..lib.icons_themes import ZukanTheme
 from ..utils.zukan_paths import (
     ZUKAN_PKG_ICONS_PATH,
@@ -66,10 +66,12 @@ class Themes(ZukanTheme):
             sublime.error_message(dialog_message)
 
         else:
-            self.create_icon_theme(theme_st_path)
+            with theme_graph.operation():
+                self.create_icon_theme(theme_st_path)
 
     def install_all_icons_themes(self):
-        self.create_icons_themes()
+        with theme_graph.operation():
+            self.create_icons_themes()
 
     def confirm_delete(self, message: str):
         return sublime.ok_cancel_dialog(message)
@@ -3,6 +3,7 @@ import os
 
 from collections.abc import Callable
 from .install import InstallEvent
+from .listeners import activation_gate
 from ..lib.icons_preferences import ZukanPreference
 from ..lib.icons_syntaxes import ZukanSyntax
 from ..helpers.clean_comments import CleanComments
@@ -12,7 +13,9 @@ from ..helpers.load_save_settings import (
     get_ignored_icon_settings,
     get_prefer_icon_settings,
     get_settings,
+    get_system_theme_ttl,
     get_upgraded_version_settings,
+    is_system_theme_watch,
     save_current_settings,
     read_current_settings,
 )
@@ -22,6 +25,8 @@ from ..helpers.package_size import (
     get_file_size,
 )
 from ..helpers.read_write_data import read_pickle_data
+from ..helpers.settings_diff import SettingsDiff
+from ..helpers.system_theme import system_appearance
 from ..utils.file_settings import (
     USER_SETTINGS,
     USER_SETTINGS_OPTIONS,
@@ -100,9 +105,11 @@ class ZukanIconFiles:
         # Tracks rebuild functions
         self.rebuild_functions = {
             'rebuild_icon_files_thread': False,
+            'rebuild_changed_icons': False,
             'build_icons_preferences': False,
             'install_syntaxes': False,
         }
+        self.settings_diff = None
 
     def on_upgrade_started(self):
         self.is_upgrading = True
@@ -139,10 +146,21 @@ class ZukanIconFiles:
 
                         save_current_settings()
 
+                    # 'ignored_icon', 'change_icon' and 'create_custom_icon'
+                    # changes rebuild only affected icons files.
+                    self.settings_diff = SettingsDiff(
+                        d,
+                        {
+                            'ignored_icon': self.ignored_icon,
+                            'change_icon': self.change_icon,
+                            'create_custom_icon': self.create_custom_icon,
+                        },
+                    )
+
                     # Check if ignored_icon changed
                     if sorted(d['ignored_icon']) != sorted(self.ignored_icon):
                         logger.info('"ignored_icon" changed, rebuilding files...')
-                        self.rebuild_functions['rebuild_icon_files_thread'] = True
+                        self.rebuild_functions['rebuild_changed_icons'] = True
 
                     # Check if change_icon changed
                     if sorted(d['change_icon']) != sorted(self.change_icon) or any(
@@ -152,7 +170,7 @@ class ZukanIconFiles:
                         ]
                     ):
                         logger.info('"change_icon" changed, rebuilding files...')
-                        self.rebuild_functions['build_icons_preferences'] = True
+                        self.rebuild_functions['rebuild_changed_icons'] = True
 
                     # Check if change_icon_file_extension changed
                     if any(
@@ -177,7 +195,7 @@ class ZukanIconFiles:
                         )
                     ) or len(d['create_custom_icon']) != len(self.create_custom_icon):
                         logger.info('"create_custom_icon" changed, rebuilding files...')
-                        self.rebuild_functions['rebuild_icon_files_thread'] = True
+                        self.rebuild_functions['rebuild_changed_icons'] = True
 
                     # Check if prefer_icon changed
                     if sorted(d['prefer_icon']) != sorted(self.prefer_icon) or any(
@@ -207,6 +225,28 @@ class ZukanIconFiles:
         """
         Rebuild functions that have been changed.
         """
+        # Rebuild icons preferences and syntaxes of changed icons
+        if self.rebuild_functions['rebuild_changed_icons']:
+            self.rebuild_functions['rebuild_changed_icons'] = False
+
+            # All preferences or syntaxes also change, build all files once.
+            if (
+                self.rebuild_functions['build_icons_preferences']
+                or self.rebuild_functions['install_syntaxes']
+            ):
+                self.rebuild_functions['rebuild_icon_files_thread'] = True
+
+            elif (
+                not self.rebuild_functions['rebuild_icon_files_thread']
+                and self.settings_diff is not None
+                and self.settings_diff.has_changes()
+            ):
+                self.install_event.rebuild_changed_icons_thread(self.settings_diff)
+
+                # Same as 'rebuild_icon_files_thread', 'reset_icon' and
+                # 'delete_custom_icon' leave commented entries.
+                self.clean_comments.clean_comments()
+
         # Rebuild icons preferences
         if (
             self.rebuild_functions['build_icons_preferences']
@@ -324,6 +364,12 @@ class SettingsEvent:
 
         event_bus = EventBus()
 
+        # Settings, e.g. 'ignored_theme', change icons on next view activation.
+        activation_gate.invalidate()
+
+        # 'system_theme_ttl' and 'system_theme_watch' settings
+        system_appearance.configure(get_system_theme_ttl(), is_system_theme_watch())
+
         # auto_upgraded setting
         upgrade_zukan = UpgradePlugin(event_bus)
         upgrade_zukan.start_upgrade()
@@ -0,0 +1,244 @@
+import logging
+import threading
+import time
+
+from collections.abc import Callable
+from ..helpers.build_progress import build_progress
+from ..helpers.search_themes import theme_graph
+
+logger = logging.getLogger(__name__)
+
+# Output folders a job builds.
+SCOPE_SYNTAXES = frozenset(['syntaxes'])
+SCOPE_PREFERENCES = frozenset(['preferences'])
+SCOPE_ICONS_FILES = SCOPE_SYNTAXES | SCOPE_PREFERENCES
+SCOPE_ALL = SCOPE_ICONS_FILES | frozenset(['themes'])
+
+
+class BuildJob:
+    """
+    A build function run by BuildJobScheduler. It can be tracked by
+    ThreadProgress, same as a thread.
+
+    Parameters:
+    key (tuple) -- job identity, pending jobs with same key run once.
+    target (Callable) -- build function.
+    args (tuple) -- build function arguments, default to ().
+    scope (frozenset) -- output folders built, default to SCOPE_ICONS_FILES.
+    full (bool) -- job rebuilds all files in scope, and replaces pending jobs
+    inside its scope. Default to False.
+    """
+
+    def __init__(
+        self,
+        key: tuple,
+        target: Callable,
+        args: tuple = (),
+        scope: frozenset = SCOPE_ICONS_FILES,
+        full: bool = False,
+    ):
+        self.key = key
+        self.target = target
+        self.args = args
+        self.scope = scope
+        self.full = full
+
+        # Job that runs this job work, if deduplicated or absorbed.
+        self.absorbed_by = None
+        # Jobs this job runs work for, they finish with it.
+        self._absorbed = []
+        self.cancelled = False
+        self.result = None
+        self.duration = None
+        self.summary = ''
+        self.scheduler = None
+        self._done = threading.Event()
+
+    def covers(self, job: 'BuildJob') -> bool:
+        """
+        Parameters:
+        job (BuildJob) -- another job.
+
+        Returns:
+        (bool) -- True if this job also builds everything job builds.
+        """
+        return job.key == self.key or (self.full and job.scope <= self.scope)
+
+    def cancel(self):
+        """
+        Cancel job, if it is still pending.
+        """
+        if self.scheduler is not None:
+            self.scheduler.cancel(self)
+        else:
+            self._finish(False)
+
+    def is_alive(self) -> bool:
+        if self.absorbed_by is not None:
+            return self.absorbed_by.is_alive()
+        return not self._done.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Parameters:
+        timeout (Optional[float]) -- seconds to wait, default to None.
+
+        Returns:
+        (bool) -- True if job finished.
+        """
+        if self.absorbed_by is not None:
+            return self.absorbed_by.wait(timeout)
+        return self._done.wait(timeout)
+
+    def queue_depth(self) -> int:
+        """
+        Returns:
+        (int) -- jobs waiting in scheduler.
+        """
+        return self.scheduler.depth() if self.scheduler is not None else 0
+
+    def is_running(self) -> bool:
+        return self.scheduler is not None and self.scheduler.running() is self
+
+    def status(self) -> str:
+        """
+        Returns:
+        (str) -- running phase status, '' if job is not running.
+        """
+        return build_progress.status() if self.is_running() else ''
+
+    def run(self):
+        build_progress.reset()
+        start = time.perf_counter()
+        try:
+            # Themes read again for each job.
+            with theme_graph.operation():
+                self.target(*self.args)
+            result = True
+        except Exception:
+            logger.exception('%s failed.', self.key[0])
+            result = False
+        self.duration = time.perf_counter() - start
+
+        self.summary = build_progress.summary()
+        if self.summary:
+            logger.info(
+                '%s done in %.3fs: %s.', self.key[0], self.duration, self.summary
+            )
+        self._finish(result)
+
+    def _finish(self, result: bool):
+        # Absorbed jobs end with this job result, e.g. for ThreadProgress. Set
+        # before this job is done, waiting on them follows absorbed_by.
+        for job in self._absorbed:
+            job.duration = self.duration
+            job.summary = self.summary
+            job._finish(result)
+
+        self.result = result
+        self._done.set()
+
+    def __repr__(self) -> str:
+        return 'BuildJob({k!r})'.format(k=self.key)
+
+
+class BuildJobScheduler:
+    """
+    Run build jobs one at a time, in a single worker thread, so rebuilds do not
+    overlap on same folders.
+
+    A job already pending with same key is not queued again. A full job replaces
+    pending jobs inside its scope, and a job is not queued if a pending full job
+    covers it. Replaced jobs finish when the job doing their work finishes.
+
+    Worker thread stops when queue is empty, and starts again on next submit.
+    """
+
+    def __init__(self):
+        self._pending = []
+        self._running = None
+        self._worker = None
+        # Last duration by job name, e.g. build_icons_syntaxes
+        self.durations = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job: BuildJob) -> BuildJob:
+        """
+        Parameters:
+        job (BuildJob) -- job to run.
+
+        Returns:
+        (BuildJob) -- job, to track with ThreadProgress.
+        """
+        with self._lock:
+            job.scheduler = self
+
+            for p in self._pending:
+                if p.covers(job):
+                    logger.debug('%r already pending in %r.', job, p)
+                    job.absorbed_by = p
+                    p._absorbed.append(job)
+                    return job
+
+            if job.full:
+                for p in [p for p in self._pending if job.covers(p)]:
+                    logger.debug('%r replaces pending %r.', job, p)
+                    self._pending.remove(p)
+                    p.absorbed_by = job
+                    job._absorbed.append(p)
+
+            self._pending.append(job)
+
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+
+        return job
+
+    def cancel(self, job: BuildJob) -> bool:
+        """
+        Remove a pending job. A running job is not interrupted.
+
+        Parameters:
+        job (BuildJob) -- job to cancel.
+
+        Returns:
+        (bool) -- True if job was pending.
+        """
+        with self._lock:
+            if job not in self._pending:
+                return False
+            self._pending.remove(job)
+
+        logger.debug('%r cancelled.', job)
+        job.cancelled = True
+        job._finish(False)
+        return True
+
+    def depth(self) -> int:
+        """
+        Returns:
+        (int) -- pending jobs, not including running one.
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def running(self) -> BuildJob:
+        with self._lock:
+            return self._running
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._running = None
+                    self._worker = None
+                    return
+                job = self._running = self._pending.pop(0)
+
+            job.run()
+            self.durations[job.key[0]] = job.duration
+            logger.debug('%r done in %.3fs.', job, job.duration)
+
+
+build_jobs = BuildJobScheduler()
@@ -0,0 +1,331 @@
+import errno
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from ..helpers.output_state import output_state
+from ..helpers.staged_output import unshare_file
+from ..utils.zukan_paths import (
+    ZUKAN_BUILD_MANIFEST_FILE,
+    ZUKAN_PKG_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+BUILD_MANIFEST_VERSION = 1
+
+
+def content_hash(content: str, context: str = '') -> str:
+    """
+    Hash generated file content.
+
+    Parameters:
+    content (str) -- file content.
+    context (str) -- extra state that changes the file but is not part of content,
+    default to ''.
+
+    Returns:
+    (str) -- sha1 hex digest.
+    """
+    h = hashlib.sha1(content.encode('utf-8'))
+    if context:
+        h.update(b'\0')
+        h.update(context.encode('utf-8'))
+    return h.hexdigest()
+
+
+def _file_stat(file_path: str) -> list:
+    st = os.stat(file_path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+class BuildManifest:
+    """
+    Content hash for each generated file, saved in `zukan_build_manifest.json`.
+
+    Each entry has the hash of generated content, and size and modified time of
+    file on disk. A file is unchanged if hash is the same and file was not
+    edited or deleted since last build.
+
+    Parameters:
+    manifest_file (str) -- path to manifest json file.
+    root (str) -- directory that entries paths are relative to.
+    """
+
+    def __init__(self, manifest_file: str, root: str):
+        self.manifest_file = manifest_file
+        self.root = root
+        self._entries = None
+        self._lock = threading.RLock()
+
+    def _key(self, file_path: str) -> str:
+        return os.path.relpath(file_path, self.root).replace(os.sep, '/')
+
+    def _load(self):
+        if self._entries is not None:
+            return
+
+        self._entries = {}
+        try:
+            with open(self.manifest_file, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == BUILD_MANIFEST_VERSION:
+                self._entries = manifest.get('files', {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError):
+            logger.warning('%s invalid, rebuilding all files.', self.manifest_file)
+
+    def is_current(self, file_path: str, file_hash: str) -> bool:
+        """
+        Check if file on disk was generated from same content.
+
+        Parameters:
+        file_path (str) -- path to generated file.
+        file_hash (str) -- hash of content to write.
+
+        Returns:
+        (bool) -- True if file does not need to be written.
+        """
+        with self._lock:
+            self._load()
+            entry = self._entries.get(self._key(file_path))
+
+        if entry is None or entry.get('hash') != file_hash:
+            return False
+
+        try:
+            return _file_stat(file_path) == entry.get('stat')
+        except OSError:
+            return False
+
+    def record(self, file_path: str, file_hash: str):
+        """
+        Save hash and current size and modified time of a file.
+
+        Parameters:
+        file_path (str) -- path to generated file.
+        file_hash (str) -- hash of generated content.
+        """
+        try:
+            stat = _file_stat(file_path)
+        except OSError:
+            self.remove(file_path)
+            return
+
+        with self._lock:
+            self._load()
+            self._entries[self._key(file_path)] = {'hash': file_hash, 'stat': stat}
+
+    def remove(self, file_path: str):
+        with self._lock:
+            self._load()
+            self._entries.pop(self._key(file_path), None)
+
+    def save(self):
+        """
+        Write manifest json, replacing old file only after new one is complete.
+        """
+        with self._lock:
+            self._load()
+            manifest = {'version': BUILD_MANIFEST_VERSION, 'files': self._entries}
+            tmp_file = self.manifest_file + '.tmp'
+
+            try:
+                if not os.path.exists(os.path.dirname(self.manifest_file)):
+                    os.makedirs(os.path.dirname(self.manifest_file))
+                with open(tmp_file, 'w') as f:
+                    json.dump(manifest, f, indent=0, sort_keys=True)
+                os.replace(tmp_file, self.manifest_file)
+            except OSError:
+                logger.error(
+                    '[Errno %d] %s: %r',
+                    errno.EACCES,
+                    os.strerror(errno.EACCES),
+                    self.manifest_file,
+                )
+
+    def session(self, directory: str, extension: str, context: str = ''):
+        """
+        Start a build of files in a directory.
+
+        Parameters:
+        directory (str) -- output directory.
+        extension (str) -- output files extension.
+        context (str) -- extra state added to content hash, default to ''.
+
+        Returns:
+        (BuildSession) -- build session.
+        """
+        return BuildSession(self, directory, extension, context)
+
+
+class BuildSession:
+    """
+    Write files through manifest, skipping unchanged ones, and count written,
+    skipped and deleted files.
+
+    Parameters:
+    manifest (BuildManifest) -- build manifest.
+    directory (str) -- output directory.
+    extension (str) -- output files extension.
+    context (str) -- extra state added to content hash.
+    """
+
+    def __init__(
+        self, manifest: BuildManifest, directory: str, extension: str, context: str
+    ):
+        self.manifest = manifest
+        self.directory = directory
+        self.extension = extension
+        self.context = context
+        self.written = 0
+        self.skipped = 0
+        self.deleted = 0
+        self._emitted = {}
+        self._lock = threading.Lock()
+
+    def write(self, file_path: str, content: str) -> bool:
+        """
+        Write file if content changed since last build.
+
+        Parameters:
+        file_path (str) -- path to file.
+        content (str) -- file content.
+
+        Returns:
+        (bool) -- True if file was written, False if skipped.
+        """
+        file_hash = content_hash(content, self.context)
+
+        with self._lock:
+            emitted = self._emitted.get(file_path)
+
+        # Files already emitted in this session are not checked against manifest,
+        # it records the previous build.
+        if emitted == file_hash or (
+            emitted is None and self.manifest.is_current(file_path, file_hash)
+        ):
+            with self._lock:
+                self._emitted[file_path] = file_hash
+                self.skipped += 1
+            return False
+
+        unshare_file(file_path)
+        with open(file_path, 'w') as f:
+            f.write(content)
+        output_state.added(file_path)
+
+        with self._lock:
+            self._emitted[file_path] = file_hash
+            self.written += 1
+        return True
+
+    def emit(self, file_path: str, content: str) -> bool:
+        """
+        Check a file written outside session, e.g. in a staging directory, and
+        record it in manifest with finish.
+
+        Parameters:
+        file_path (str) -- path to file, in output directory.
+        content (str) -- file content.
+
+        Returns:
+        (bool) -- True if file needs to be written, False if skipped.
+        """
+        file_hash = content_hash(content, self.context)
+        current = self.manifest.is_current(file_path, file_hash)
+
+        with self._lock:
+            self._emitted[file_path] = file_hash
+            if current:
+                self.skipped += 1
+            else:
+                self.written += 1
+        return not current
+
+    def forget(self, file_path: str):
+        """
+        Count a file deleted outside session and remove it from manifest.
+
+        Parameters:
+        file_path (str) -- path to file.
+        """
+        self.manifest.remove(file_path)
+        with self._lock:
+            self.deleted += 1
+
+    def delete(self, file_path: str):
+        """
+        Delete a stale file and remove it from manifest.
+
+        Parameters:
+        file_path (str) -- path to file.
+        """
+        try:
+            os.remove(file_path)
+            output_state.removed(file_path)
+            self.manifest.remove(file_path)
+            with self._lock:
+                self.deleted += 1
+        except FileNotFoundError:
+            logger.error(
+                '[Errno %d] %s: %r',
+                errno.ENOENT,
+                os.strerror(errno.ENOENT),
+                file_path,
+            )
+        except OSError:
+            logger.error(
+                '[Errno %d] %s: %r',
+                errno.EACCES,
+                os.strerror(errno.EACCES),
+                file_path,
+            )
+
+    def delete_stale(self):
+        """
+        Delete files with session extension, in session directory, that were not
+        written or skipped in this session.
+        """
+        if not os.path.exists(self.directory):
+            return
+
+        for file_name in output_state.files(self.directory, self.extension):
+            file_path = os.path.join(self.directory, file_name)
+
+            if file_path not in self._emitted:
+                self.delete(file_path)
+
+    def finish(self) -> dict:
+        """
+        Record emitted files, after any later edit to them, and save manifest.
+
+        Returns:
+        (dict) -- written, skipped and deleted counts.
+        """
+        for file_path, file_hash in self._emitted.items():
+            self.manifest.record(file_path, file_hash)
+        self.manifest.save()
+
+        report = self.report()
+        logger.info(
+            '%s: %d written, %d skipped, %d deleted.',
+            self.extension,
+            report['written'],
+            report['skipped'],
+            report['deleted'],
+        )
+        return report
+
+    def report(self) -> dict:
+        return {
+            'written': self.written,
+            'skipped': self.skipped,
+            'deleted': self.deleted,
+        }
+
+
+build_manifest = BuildManifest(ZUKAN_BUILD_MANIFEST_FILE, ZUKAN_PKG_PATH)
@@ -0,0 +1,160 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressPhase:
+    """
+    Progress of a build phase, e.g. syntaxes, with items done and time spent.
+
+    A phase can run more than once in a build, e.g. primary icons copied by
+    syntaxes and by preferences install, items and time are added.
+
+    Parameters:
+    name (str) -- phase name.
+    lock (threading.Lock) -- build progress lock, phases are advanced from
+    writer threads.
+    """
+
+    def __init__(self, name: str, lock):
+        self.name = name
+        self.total = 0
+        self.done = 0
+        self.elapsed = 0.0
+        self._start = None
+        self._lock = lock
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.finish()
+
+    def start(self, total: int = 0):
+        with self._lock:
+            self.total += total
+            self._start = time.perf_counter()
+
+    def advance(self, n: int = 1):
+        with self._lock:
+            self.done += n
+
+    def finish(self):
+        with self._lock:
+            if self._start is not None:
+                self.elapsed += time.perf_counter() - self._start
+                self._start = None
+
+    def is_running(self) -> bool:
+        return self._start is not None
+
+    def elapsed_now(self) -> float:
+        with self._lock:
+            if self._start is None:
+                return self.elapsed
+            return self.elapsed + time.perf_counter() - self._start
+
+    def rate(self) -> float:
+        """
+        Returns:
+        (float) -- items per second.
+        """
+        elapsed = self.elapsed_now()
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def status(self) -> str:
+        """
+        Returns:
+        (str) -- e.g. 'syntaxes 120/480, 923 files/s, 0.1s'
+        """
+        elapsed = self.elapsed_now()
+        if self.total:
+            return '{n} {d}/{t}, {r:.0f} files/s, {e:.1f}s'.format(
+                n=self.name, d=self.done, t=self.total, r=self.rate(), e=elapsed
+            )
+        return '{n}, {e:.1f}s'.format(n=self.name, e=elapsed)
+
+
+class BuildProgress:
+    """
+    Progress events published by builders: phase, items done and total, items
+    per second and elapsed time.
+
+    Builds run one at a time, in build jobs worker, and reset progress before
+    each job. ThreadProgress shows status of the running job.
+    """
+
+    def __init__(self):
+        self._phases = []
+        self._current = None
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._phases = []
+            self._current = None
+
+    def phase(self, name: str, total: int = 0) -> ProgressPhase:
+        """
+        Start a phase, or continue it if it already ran in this build.
+
+        Use with 'with', phase finishes when block exits.
+
+        Parameters:
+        name (str) -- phase name, e.g. select syntaxes, syntaxes, preferences,
+        primary icons or themes.
+        total (int) -- items to process in this run, default to 0.
+
+        Returns:
+        (ProgressPhase) -- phase.
+        """
+        with self._lock:
+            for p in self._phases:
+                if p.name == name:
+                    phase = p
+                    break
+            else:
+                phase = ProgressPhase(name, self._lock)
+                self._phases.append(phase)
+            self._current = phase
+
+        phase.start(total)
+        return phase
+
+    def phases(self) -> list:
+        with self._lock:
+            return list(self._phases)
+
+    def status(self) -> str:
+        """
+        Returns:
+        (str) -- running phase status, '' if no phase is running.
+        """
+        with self._lock:
+            current = self._current
+        if current is None or not current.is_running():
+            return ''
+        return current.status()
+
+    def summary(self) -> str:
+        """
+        Returns:
+        (str) -- time per phase, e.g. 'syntaxes 480 in 0.52s (923/s), themes
+        0.10s'
+        """
+        parts = []
+        for p in self.phases():
+            if p.done:
+                parts.append(
+                    '{n} {d} in {e:.2f}s ({r:.0f}/s)'.format(
+                        n=p.name, d=p.done, e=p.elapsed, r=p.rate()
+                    )
+                )
+            else:
+                parts.append('{n} {e:.2f}s'.format(n=p.name, e=p.elapsed))
+        return ', '.join(parts)
+
+
+build_progress = BuildProgress()
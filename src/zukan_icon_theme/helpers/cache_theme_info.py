@@ -1,6 +1,10 @@
+import contextlib
+import errno
 import json
+import logging
 import os
 import sublime
+import threading
 
 from datetime import datetime, timedelta, timezone
 from ..helpers.load_save_settings import get_cached_theme_info_lifespan
@@ -11,10 +15,13 @@ from ..utils.st_default_themes import (
     ST_DEFAULT_THEMES,
 )
 from ..utils.zukan_paths import (
+    filepath,
     INSTALLED_PACKAGES_PATH,
     THEME_INFO_FILE,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def get_modified_time(file_path: str) -> int:
     """
@@ -75,6 +82,244 @@ def get_file_path(file_path: str) -> str:
         )
 
 
+def get_resource_modified_time(resource_path: str):
+    """
+    Get theme resource source last modified time, without reading it.
+
+    Parameters:
+    resource_path (str) -- resource path, e.g.
+    Packages/Theme - Treble/Treble.hidden-theme
+
+    Returns:
+    (Optional[int|str]) -- source lastest modified timestamp, ST version for
+    ST default themes, or None if source not found.
+    """
+    theme_path = get_file_path(filepath(os.path.join('../../../../..', resource_path)))
+
+    if theme_path is None:
+        return None
+    # ST default themes change with ST version.
+    if theme_path == 'Theme - Default':
+        return sublime.version()
+    return get_modified_time(theme_path)
+
+
+class ThemeInfoStore:
+    """
+    `theme_info.json` loaded once, themes indexed by name and source, and by
+    name and ST version for ST default themes. It is read again if file
+    changed on disk, e.g. written by another ST instance.
+
+    Saves are written at once, or once at the end of a batch. File keeps its
+    creation time, replacing it on save resets file ctime on Windows.
+
+    Parameters:
+    theme_info_file (str) -- path to theme info json file.
+    """
+
+    def __init__(self, theme_info_file: str):
+        self.theme_info_file = theme_info_file
+        self._cache = None
+        self._stat = None
+        self._by_source = {}
+        self._by_st_version = {}
+        self._batch = 0
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def _index(self, t: dict):
+        self._by_source[(t['name'], t.get('source'))] = t
+        if t['name'] in ST_DEFAULT_THEMES:
+            self._by_st_version[(t['name'], t['st_version'])] = t
+
+    def _file_stat(self):
+        try:
+            st = os.stat(self.theme_info_file)
+        except OSError:
+            return None
+        return (st.st_mtime, st.st_size)
+
+    def _load(self):
+        stat = self._file_stat()
+        # Saves not written yet are kept.
+        if self._cache is not None and (self._dirty or stat == self._stat):
+            return
+
+        self._cache = {'themes': []}
+        self._stat = stat
+        self._by_source = {}
+        self._by_st_version = {}
+
+        if os.path.exists(self.theme_info_file):
+            with open(self.theme_info_file, 'r') as f:
+                self._cache = json.load(f)
+
+        if 'created' not in self._cache:
+            self._cache['created'] = self._file_created()
+
+        for t in self._cache['themes']:
+            self._index(t)
+
+    def _file_created(self) -> float:
+        # Files saved before creation time was kept.
+        try:
+            return os.path.getctime(self.theme_info_file)
+        except OSError:
+            return datetime.now(tz=timezone.utc).timestamp()
+
+    def invalidate(self):
+        """
+        Drop loaded themes, e.g. after `theme_info.json` is deleted.
+        """
+        with self._lock:
+            self._cache = None
+            self._stat = None
+            self._dirty = False
+
+    def created(self) -> float:
+        """
+        Returns:
+        (float) -- `theme_info.json` creation timestamp.
+        """
+        with self._lock:
+            self._load()
+            return self._cache['created']
+
+    def find(self, theme_name: str, theme_path: str, st_version: str):
+        """
+        Parameters:
+        theme_name (str) -- theme file name.
+        theme_path (str) -- theme source, get_file_path.
+        st_version (str) -- ST version.
+
+        Returns:
+        (Optional[dict]) -- theme entry.
+        """
+        with self._lock:
+            self._load()
+
+            if theme_name in ST_DEFAULT_THEMES:
+                t = self._by_st_version.get((theme_name, st_version))
+                if t is not None:
+                    return t
+            return self._by_source.get((theme_name, theme_path))
+
+    def get(self, file_path: str, key: str):
+        """
+        Get a cached theme info, if theme did not change since saved.
+
+        Parameters:
+        file_path (str) -- theme file path.
+        key (str) -- theme info, 'opacity' or 'sidebar_bgcolor'.
+
+        Returns:
+        (Optional[dict]) -- theme info, or None if not cached or outdated.
+        """
+        with self._lock:
+            self._load()
+            if not self._cache['themes']:
+                return None
+
+        theme_path = get_file_path(file_path)
+        source_date = get_modified_time(theme_path)
+        theme_name = os.path.basename(file_path)
+        st_version = sublime.version()
+
+        t = self.find(theme_name, theme_path, st_version)
+        if t is None or key not in t:
+            return None
+
+        # ST default themes change with ST version.
+        if theme_name in ST_DEFAULT_THEMES and st_version == t['st_version']:
+            return t[key]
+        if source_date == t[key]['last_updated']:
+            return t[key]
+        return None
+
+    def save(self, file_path: str, key: str, info: dict):
+        """
+        Save a theme info, with theme last modified time.
+
+        Parameters:
+        file_path (str) -- theme file path.
+        key (str) -- theme info, 'opacity' or 'sidebar_bgcolor'.
+        info (dict) -- theme info values.
+        """
+        theme_path = get_file_path(file_path)
+        # print(theme_path)
+        info['last_updated'] = get_modified_time(theme_path)
+        theme_name = os.path.basename(file_path)
+        st_version = sublime.version()
+
+        with self._lock:
+            t = self.find(theme_name, theme_path, st_version)
+
+            if t is not None:
+                if t.get(key) == info:
+                    return
+                t[key] = info
+            else:
+                t = {
+                    'name': theme_name,
+                    'source': theme_path,
+                    'st_version': st_version,
+                    key: info,
+                }
+                self._cache['themes'].append(t)
+                self._index(t)
+
+            self._dirty = True
+            if not self._batch:
+                self.flush()
+
+    def flush(self):
+        """
+        Write `theme_info.json` if changed, replacing old file only after new one
+        is complete.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+
+            tmp_file = self.theme_info_file + '.tmp'
+            try:
+                with open(tmp_file, 'w') as f:
+                    json.dump(self._cache, f, indent=4)
+                os.replace(tmp_file, self.theme_info_file)
+                self._stat = self._file_stat()
+                self._dirty = False
+            except OSError:
+                logger.error(
+                    '[Errno %d] %s: %r',
+                    errno.EACCES,
+                    os.strerror(errno.EACCES),
+                    self.theme_info_file,
+                )
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Buffer saves, `theme_info.json` is written once when batch ends.
+
+        Example:
+        with theme_info_store.batch():
+            for theme in themes:
+                theme_with_opacity(theme)
+        """
+        with self._lock:
+            self._batch += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch -= 1
+                if not self._batch:
+                    self.flush()
+
+
+theme_info_store = ThemeInfoStore(THEME_INFO_FILE)
+
+
 def is_theme_info_valid(file_path: str) -> bool:
     """
 
@@ -86,34 +331,9 @@ def is_theme_info_valid(file_path: str) -> bool:
     (Optional[bool) -- returns True or False for theme opacity value, or None
     if path does not exist.
     """
-    if os.path.exists(THEME_INFO_FILE):
-        theme_path = get_file_path(file_path)
-        source_date = get_modified_time(theme_path)
-        theme_name = os.path.basename(file_path)
-        st_version = sublime.version()
+    opacity = theme_info_store.get(file_path, 'opacity')
 
-        with open(THEME_INFO_FILE, 'r') as f:
-            cache = json.load(f)
-
-            for t in cache['themes']:
-                # print(t)
-                if (
-                    theme_name == t['name']
-                    and theme_name in ST_DEFAULT_THEMES
-                    and st_version == t['st_version']
-                ):
-                    # print('ST Theme')
-                    return t['opacity']['value']
-                    break
-                elif (
-                    theme_name == t['name']
-                    and theme_path == t['source']
-                    and source_date == t['opacity']['last_updated']
-                ):
-                    # print('is true')
-                    return t['opacity']['value']
-                    break
-    return None
+    return None if opacity is None else opacity['value']
 
 
 def save_theme_info(file_path: str, opacity: bool):
@@ -124,60 +344,100 @@ def save_theme_info(file_path: str, opacity: bool):
     file_path (str) -- file path.
     opacity (bool) -- True or False for theme opacity value.
     """
-    theme_path = get_file_path(file_path)
-    # print(theme_path)
-    last_updated = get_modified_time(theme_path)
-    theme_name = os.path.basename(file_path)
-    st_version = sublime.version()
+    theme_info_store.save(file_path, 'opacity', {'value': opacity})
 
-    if not os.path.exists(THEME_INFO_FILE):
-        cache = {'themes': []}
-    else:
-        with open(THEME_INFO_FILE, 'r') as f:
-            cache = json.load(f)
-
-    theme_found = False
-
-    for t in cache['themes']:
-        if (
-            theme_name == t['name']
-            and theme_name in ST_DEFAULT_THEMES
-            and st_version == t['st_version']
-        ):
-            if last_updated == t['opacity']['last_updated']:
-                theme_found = True
-                return
-            else:
-                t['opacity']['value'] = opacity
-                t['opacity']['last_updated'] = last_updated
-                theme_found = True
-                break
-
-        elif theme_name == t['name'] and theme_path == t['source']:
-            if last_updated == t['opacity']['last_updated']:
-                theme_found = True
-                return
-            else:
-                t['opacity']['value'] = opacity
-                t['opacity']['last_updated'] = last_updated
-                theme_found = True
-                break
-
-    if not theme_found:
-        cache['themes'].append(
-            {
-                'name': theme_name,
-                'source': theme_path,
-                'st_version': st_version,
-                'opacity': {
-                    'value': opacity,
-                    'last_updated': last_updated,
-                },
-            }
-        )
 
-    with open(THEME_INFO_FILE, 'w') as f:
-        json.dump(cache, f, indent=4)
+def is_parents_changed(parents: list, hidden_themes=None) -> bool:
+    """
+    Check if themes a theme extends changed since saved, comparing their
+    sources modified time. Parent themes are not parsed.
+
+    Parameters:
+    parents (list) -- saved 'extends' values and their hidden themes, with
+    modified time.
+    hidden_themes (Optional[callable]) -- current hidden themes for an 'extends'
+    value, ThemeGraph hidden_themes. Default to None.
+
+    Returns:
+    (bool) -- True if a parent theme changed, was added or removed.
+    """
+    if not isinstance(parents, list):
+        return True
+
+    for extends, resources in parents:
+        # 'extends' resolves to other files.
+        if hidden_themes is not None and hidden_themes(extends) != [
+            r[0] for r in resources
+        ]:
+            return True
+        for resource_path, last_updated in resources:
+            if get_resource_modified_time(resource_path) != last_updated:
+                return True
+    return False
+
+
+def get_cached_sidebar_bgcolor(file_path: str, background: str, hidden_themes=None):
+    """
+    Get cached sidebar background, 'dark' or 'light'.
+
+    Parameters:
+    file_path (str) -- theme file path.
+    background (str) -- color scheme background, used if sidebar background
+    is var(--background).
+    hidden_themes (Optional[callable]) -- current hidden themes for an 'extends'
+    value, ThemeGraph hidden_themes. Default to None.
+
+    Returns:
+    (Optional[str]) -- 'dark' or 'light', or None if not cached or outdated.
+    """
+    sidebar_bgcolor = theme_info_store.get(file_path, 'sidebar_bgcolor')
+
+    if sidebar_bgcolor is None:
+        return None
+    # Adaptive themes depend on color scheme background.
+    if sidebar_bgcolor['background'] not in (None, background):
+        return None
+    # A parent theme changed.
+    if is_parents_changed(sidebar_bgcolor.get('parents'), hidden_themes):
+        return None
+    return sidebar_bgcolor['value']
+
+
+def save_sidebar_bgcolor(
+    file_path: str,
+    bgcolor: str,
+    trace: list,
+    background: str = None,
+    parents: list = None,
+):
+    """
+    Save sidebar background in theme info JSON file.
+
+    Parameters:
+    file_path (str) -- theme file path.
+    bgcolor (str) -- 'dark' or 'light'.
+    trace (list) -- variables resolved to find sidebar background.
+    background (Optional[str]) -- color scheme background, if sidebar
+    background is var(--background). Default to None.
+    parents (Optional[list]) -- 'extends' values and their hidden themes,
+    ThemeGraph parents. Default to None.
+    """
+    theme_info_store.save(
+        file_path,
+        'sidebar_bgcolor',
+        {
+            'value': bgcolor,
+            'trace': trace,
+            'background': background,
+            'parents': [
+                [
+                    extends,
+                    [[r, get_resource_modified_time(r)] for r in resources],
+                ]
+                for extends, resources in parents or []
+            ],
+        },
+    )
 
 
 def cache_theme_info_lifespan() -> bool:
@@ -191,7 +451,7 @@ def cache_theme_info_lifespan() -> bool:
         return False
 
     cache_theme_info_lifespan = get_cached_theme_info_lifespan()
-    cache_created_time = datetime.fromtimestamp(os.path.getctime(THEME_INFO_FILE))
+    cache_created_time = datetime.fromtimestamp(theme_info_store.created())
     expiration_time = cache_created_time + timedelta(days=cache_theme_info_lifespan)
 
     # print(expiration_time)
@@ -204,3 +464,4 @@ def delete_cached_theme_info():
     """
     if cache_theme_info_lifespan():
         os.remove(THEME_INFO_FILE)
+        theme_info_store.invalidate()
@@ -1,13 +1,39 @@
+import functools
 import logging
 import math
 import re
 
+from ..helpers.color_mod import ColorMod
 from ..utils.st_color_palette import (
-    ST_COLOR_PALETTE,
+    ST_COLOR_PALETTE_DICT,
 )
 
 logger = logging.getLogger(__name__)
 
+# Theme colors, HSL and HSLA
+REGEX_HSL = re.compile(
+    # r'hsla?\((\d{1,3}),\s*(\d+)(?:%)?\s*,\s*(\d+)(?:%)?\s*(?:,'
+    # '\s*([01]?\d(\.\d+)?|1(\.0+)?))?\)'
+    r'hsla?\((\d+),\s*(-?\d*\.?\d+)%?,\s*(-?\d*\.?\d+)%?(?:,\s*(\d+(\.\d+)?))?\)'
+)
+# Theme colors, RGB and RGBA
+REGEX_RGB = re.compile(
+    r'rgba?\((\d{1,3}),\s*(\d{1,3}),\s*(\d{1,3})(?:,'
+    r'\s*([01]?\d(\.\d+)?|1(\.0+)?))?\)'
+)
+# Theme colors, Hex and Hexa
+REGEX_HEX = re.compile(r'#(?:[0-9a-fA-F]{6}|[0-9a-fA-F]{8})')
+# RGB numbers
+REGEX_RGB_NUMBERS = re.compile(
+    r'rgba?\((\d+),\s*(\d+),\s*(\d+)(?:,\s*(\d+(\.\d+)?))?\)'
+)
+# Color mod, e.g. color(var(--background) blend(#fff 50%))
+REGEX_COLOR_MOD = re.compile(
+    r'^color\(\s*(?P<base>(?:[^()\s]+|\([^)]*\))+)\s*(?:[a-zA-Z]+\(|\))'
+)
+# Variable name, e.g. var(--background)
+REGEX_VAR_NAME = re.compile(r'var\(([^)]+)\)')
+
 
 def convert_to_rgb(bgcolor: str) -> list:
     """
@@ -83,9 +109,7 @@ def convert_to_rgb(bgcolor: str) -> list:
 
 
 def st_colors_to_hex(var_name: str) -> str:
-    for k, v in ST_COLOR_PALETTE:
-        if var_name == k:
-            return v
+    return ST_COLOR_PALETTE_DICT.get(var_name)
 
 
 def extract_numbers_from_hsl(color_hsl: str) -> tuple:
@@ -100,11 +124,7 @@ def extract_numbers_from_hsl(color_hsl: str) -> tuple:
     Returns:
     (tuple) -- HSL or HSLA numbers.
     """
-    # Regex for HSL and HSLA
-    pattern = (
-        r'hsla?\((\d+),\s*(-?\d*\.?\d+)%?,\s*(-?\d*\.?\d+)%?(?:,\s*(\d+(\.\d+)?))?\)'
-    )
-    result = re.search(pattern, color_hsl)
+    result = REGEX_HSL.search(color_hsl)
 
     if result:
         hue = int(result.group(1))
@@ -134,8 +154,7 @@ def extract_numbers_from_rgb(color_rgb: str) -> list:
     Returns:
     (list) - list with RGB numbers.
     """
-    pattern = r'rgba?\((\d+),\s*(\d+),\s*(\d+)(?:,\s*(\d+(\.\d+)?))?\)'
-    result = re.search(pattern, color_rgb)
+    result = REGEX_RGB_NUMBERS.search(color_rgb)
 
     if result:
         r = int(result.group(1))
@@ -154,16 +173,12 @@ def extract_numbers_from_rgb(color_rgb: str) -> list:
 
 
 def extract_base_color(value: str) -> str:
-    regex_color_mod = re.compile(
-        r'^color\(\s*(?P<base>(?:[^()\s]+|\([^)]*\))+)\s*(?:[a-zA-Z]+\(|\))'
-    )
-
     value = value.strip()
 
     if not value.startswith('color('):
         return value
 
-    m = regex_color_mod.match(value)
+    m = REGEX_COLOR_MOD.match(value)
     if not m:
         return
 
@@ -205,6 +220,72 @@ def rgb_dark_light(rgb_color: list) -> str:
         return 'light'
 
 
+@functools.lru_cache(maxsize=512)
+def classify(color: str) -> str:
+    """
+    Return 'dark' or 'light' for a theme color, HSL, RGB, Hex, ST color palette
+    name or color mod of them.
+
+    Parameters:
+    color (str) -- theme color.
+
+    Returns:
+    (Optional[str]) -- 'dark' or 'light', or None if not a color, e.g.
+    var(--background).
+    """
+    # Color mod adjusters, e.g. blend, are applied. Variables are not known
+    # here, so a color mod using them is classified by its base color.
+    if color.strip().startswith('color('):
+        rgba, _ = ColorMod().resolve(color)
+
+        if rgba is not None:
+            return rgb_dark_light(list(rgba[:3]))
+
+    color = extract_base_color(color)
+
+    if color is None:
+        return None
+
+    # HSL and HSLA
+    if REGEX_HSL.match(color):
+        for r in REGEX_HSL.findall(color):
+            hue, sat, lum, alpha = r[0], r[1], r[2], r[3]
+
+            hsl_color = 'hsl({h}, {s}%, {l}%)'.format(h=hue, s=sat, l=lum)
+
+            if alpha:
+                hsl_color = 'hsla({h}, {s}%, {l}%, {a})'.format(
+                    h=hue, s=sat, l=lum, a=alpha
+                )
+
+        return rgb_dark_light(convert_to_rgb(hsl_color))
+
+    # RGB and RGBA
+    if REGEX_RGB.match(color):
+        for r in REGEX_RGB.findall(color):
+            red, green, blue, alpha = r[0], r[1], r[2], r[3]
+
+            rgb_color = 'rgb({r}, {g}, {b})'.format(r=red, g=green, b=blue)
+
+            if alpha:
+                rgb_color = 'rgba({r}, {g}, {b}, {a})'.format(
+                    r=red, g=green, b=blue, a=alpha
+                )
+
+        return rgb_dark_light(convert_to_rgb(rgb_color))
+
+    # Hex and Hexa
+    if REGEX_HEX.match(color):
+        return rgb_dark_light(convert_to_rgb(REGEX_HEX.findall(color)[0]))
+
+    # ST color palette
+    # E.g. aliceblue
+    if color in ST_COLOR_PALETTE_DICT:
+        return rgb_dark_light(convert_to_rgb(st_colors_to_hex(color)))
+
+    return None
+
+
 def get_icon_dark_light(bgcolor: str) -> str:
     """
     Get icon dark if bgcolor is light. And vice-versa.
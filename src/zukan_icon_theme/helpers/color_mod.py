@@ -0,0 +1,405 @@
+import logging
+import re
+
+from ..utils.st_color_palette import (
+    ST_COLOR_PALETTE_DICT,
+)
+
+logger = logging.getLogger(__name__)
+
+# rgb(59, 39, 61), rgba(38, 40, 51, 0.8), rgb(100% 0% 0% / 50%)
+REGEX_RGB_FUNCTION = re.compile(r'^rgba?\((?P<args>[^()]*)\)$')
+# hsl(255, 8.0%, 9.8%), hsla(3, 100%, 95%, 0.9)
+REGEX_HSL_FUNCTION = re.compile(r'^hsla?\((?P<args>[^()]*)\)$')
+REGEX_HEX_COLOR = re.compile(r'^#(?:[0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})$')
+REGEX_VAR_FUNCTION = re.compile(r'^var\(\s*(?P<name>[^()\s]+)\s*\)$')
+# blend(#fff 50%), l(+ 5%), min-contrast(var(bg) 4.5)
+REGEX_ADJUSTER = re.compile(r'^(?P<name>[a-z-]+)\((?P<args>.*)\)$', re.S)
+
+# Color scheme background, it is not a theme variable.
+BACKGROUND_VARIABLE = '--background'
+
+
+def _split_args(value: str, separators: str = ' \t\n,/') -> list:
+    """
+    Split arguments, outside parentheses.
+
+    Parameters:
+    value (str) -- function arguments, e.g. var(a) blend(#fff 50%)
+    separators (str) -- characters splitting arguments.
+
+    Returns:
+    (list) -- arguments.
+    """
+    args = []
+    depth = 0
+    current = []
+
+    for c in value:
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+
+        if depth == 0 and c in separators:
+            if current:
+                args.append(''.join(current))
+                current = []
+        else:
+            current.append(c)
+
+    if current:
+        args.append(''.join(current))
+    return args
+
+
+def _number(value: str, scale: float = 1.0) -> float:
+    # Percentage is relative to scale, e.g. 50% of 255.
+    if value.endswith('%'):
+        return float(value[:-1]) * scale / 100
+    return float(value)
+
+
+def _clamp(value: float, low: float = 0.0, high: float = 1.0) -> float:
+    return max(low, min(high, value))
+
+
+def hsl_to_rgb(hue: float, sat: float, lum: float) -> list:
+    """
+    Convert HSL to RGB, wikipedia formula.
+    https://en.wikipedia.org/wiki/HSL_and_HSV#To_RGB
+
+    Parameters:
+    hue (float) -- hue, 0 to 360.
+    sat (float) -- saturation, 0 to 100.
+    lum (float) -- lightness, 0 to 100.
+
+    Returns:
+    (list) -- RGB numbers, 0 to 255.
+    """
+    hue = (hue % 360) / 60
+    c = (1 - abs(2 * lum / 100 - 1)) * sat / 100
+    x = c * (1 - abs((hue % 2) - 1))
+    m = lum / 100 - c / 2
+
+    if 0 <= hue < 1:
+        r, g, b = c, x, 0
+    elif 1 <= hue < 2:
+        r, g, b = x, c, 0
+    elif 2 <= hue < 3:
+        r, g, b = 0, c, x
+    elif 3 <= hue < 4:
+        r, g, b = 0, x, c
+    elif 4 <= hue < 5:
+        r, g, b = x, 0, c
+    else:
+        r, g, b = c, 0, x
+
+    return [(r + m) * 255, (g + m) * 255, (b + m) * 255]
+
+
+def rgb_to_hsl(r: float, g: float, b: float) -> list:
+    """
+    Convert RGB to HSL.
+
+    Parameters:
+    r, g, b (float) -- RGB numbers, 0 to 255.
+
+    Returns:
+    (list) -- hue 0 to 360, saturation and lightness 0 to 100.
+    """
+    r, g, b = r / 255, g / 255, b / 255
+    high = max(r, g, b)
+    low = min(r, g, b)
+    lum = (high + low) / 2
+
+    if high == low:
+        return [0.0, 0.0, lum * 100]
+
+    d = high - low
+    sat = d / (1 - abs(2 * lum - 1))
+
+    if high == r:
+        hue = ((g - b) / d) % 6
+    elif high == g:
+        hue = (b - r) / d + 2
+    else:
+        hue = (r - g) / d + 4
+
+    return [hue * 60, sat * 100, lum * 100]
+
+
+def relative_luminance(rgba: tuple) -> float:
+    """
+    WCAG relative luminance.
+
+    Parameters:
+    rgba (tuple) -- RGB numbers 0 to 255, and alpha.
+
+    Returns:
+    (float) -- luminance, 0 to 1.
+    """
+    channels = []
+    for c in rgba[:3]:
+        c = c / 255
+        channels.append(c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4)
+    return 0.2126 * channels[0] + 0.7152 * channels[1] + 0.0722 * channels[2]
+
+
+def contrast_ratio(rgba1: tuple, rgba2: tuple) -> float:
+    """
+    WCAG contrast ratio between two colors.
+
+    Returns:
+    (float) -- contrast ratio, 1 to 21.
+    """
+    l1 = relative_luminance(rgba1)
+    l2 = relative_luminance(rgba2)
+    return (max(l1, l2) + 0.05) / (min(l1, l2) + 0.05)
+
+
+class ColorMod:
+    """
+    Evaluate ST colors, including color() mod adjusters: alpha (a), blend,
+    blenda, lightness (l), saturation (s) and min-contrast.
+
+    Each theme variable is evaluated once and kept, colors are tuples with RGB
+    numbers, 0 to 255, and alpha, 0 to 1.
+
+    Parameters:
+    variables (dict) -- theme variables.
+    background (Optional[str or callable]) -- color scheme background, or
+    function returning it, used for var(--background). Default to None.
+    """
+
+    def __init__(self, variables: dict = None, background=None):
+        self.variables = variables or {}
+        self.background = background
+        self._evaluated = {}
+        self._resolving = set()
+        self._uses_background = False
+
+    def resolve(self, value: str) -> tuple:
+        """
+        Parameters:
+        value (str) -- color, e.g. color(var(sidebar_bg) l(+ 5%)).
+
+        Returns:
+        color (Optional[tuple]) -- color tuple, or None if value is not a color.
+        uses_background (bool) -- True if value depends on var(--background).
+        """
+        self._uses_background = False
+        color = self.evaluate(value)
+        return color, self._uses_background
+
+    def variable(self, name: str):
+        """
+        Parameters:
+        name (str) -- variable name, e.g. --background or sidebar_bg.
+
+        Returns:
+        (Optional[tuple]) -- color tuple.
+        """
+        if name == BACKGROUND_VARIABLE:
+            self._uses_background = True
+            if callable(self.background):
+                self.background = self.background()
+            if self.background is None:
+                return None
+            return self.evaluate(self.background)
+
+        if name in self._evaluated:
+            color, uses_background = self._evaluated[name]
+            self._uses_background = self._uses_background or uses_background
+            return color
+
+        # Variables referring to each other.
+        if name in self._resolving or name not in self.variables:
+            return None
+
+        outer = self._uses_background
+        self._uses_background = False
+        self._resolving.add(name)
+
+        value = self.variables[name]
+        color = self.evaluate(value) if isinstance(value, str) else None
+
+        self._resolving.discard(name)
+        self._evaluated[name] = (color, self._uses_background)
+        self._uses_background = outer or self._uses_background
+        return color
+
+    def evaluate_all(self) -> dict:
+        """
+        Evaluate all theme variables, colors or not.
+
+        Returns:
+        (dict) -- variable name and color tuple, or None if not a color.
+        """
+        for name in self.variables:
+            self.variable(name)
+        return dict((k, v[0]) for k, v in self._evaluated.items())
+
+    def evaluate(self, value: str):
+        """
+        Parameters:
+        value (str) -- color, e.g. #fff, rgb(), hsl(), var(), palette name
+        or color() mod.
+
+        Returns:
+        (Optional[tuple]) -- color tuple, or None if value is not a color.
+        """
+        value = value.strip()
+
+        try:
+            if value.startswith('color('):
+                return self._color_mod(value)
+
+            m = REGEX_VAR_FUNCTION.match(value)
+            if m:
+                return self.variable(m.group('name'))
+
+            return self._literal(value)
+        except (ValueError, IndexError, ZeroDivisionError):
+            logger.debug('could not evaluate color %s', value)
+            return None
+
+    def _literal(self, value: str):
+        value = value.lower()
+
+        if value in ST_COLOR_PALETTE_DICT:
+            value = ST_COLOR_PALETTE_DICT[value]
+
+        if REGEX_HEX_COLOR.match(value):
+            hex_color = value[1:]
+            if len(hex_color) in (3, 4):
+                hex_color = ''.join(c * 2 for c in hex_color)
+            alpha = int(hex_color[6:8], 16) / 255 if len(hex_color) == 8 else 1.0
+            return (
+                int(hex_color[0:2], 16),
+                int(hex_color[2:4], 16),
+                int(hex_color[4:6], 16),
+                alpha,
+            )
+
+        m = REGEX_RGB_FUNCTION.match(value)
+        if m:
+            args = _split_args(m.group('args'))
+            rgb = [_clamp(_number(a, 255), 0, 255) for a in args[:3]]
+            alpha = _clamp(_number(args[3])) if len(args) > 3 else 1.0
+            return (rgb[0], rgb[1], rgb[2], alpha)
+
+        m = REGEX_HSL_FUNCTION.match(value)
+        if m:
+            args = _split_args(m.group('args'))
+            hue = float(args[0].replace('deg', ''))
+            sat = _clamp(float(args[1].rstrip('%')), 0, 100)
+            lum = _clamp(float(args[2].rstrip('%')), 0, 100)
+            alpha = _clamp(_number(args[3])) if len(args) > 3 else 1.0
+            return tuple(hsl_to_rgb(hue, sat, lum)) + (alpha,)
+
+        return None
+
+    def _color_mod(self, value: str):
+        # color(<base> <adjuster>*)
+        if not value.endswith(')'):
+            raise ValueError(value)
+
+        args = _split_args(value[len('color(') : -1])
+        color = self.evaluate(args[0])
+
+        for adjuster in args[1:]:
+            if color is None:
+                return None
+            color = self._adjust(color, adjuster)
+
+        return color
+
+    def _adjust(self, color: tuple, adjuster: str):
+        m = REGEX_ADJUSTER.match(adjuster.strip())
+        if not m:
+            raise ValueError(adjuster)
+
+        name = m.group('name')
+        args = _split_args(m.group('args'))
+
+        if name in ('alpha', 'a'):
+            alpha = _relative(color[3], args, 1.0)
+            return color[:3] + (_clamp(alpha),)
+
+        if name in ('lightness', 'l', 'saturation', 's'):
+            hsl = rgb_to_hsl(*color[:3])
+            i = 2 if name in ('lightness', 'l') else 1
+            hsl[i] = _clamp(_relative(hsl[i], args, 100.0), 0, 100)
+            return tuple(hsl_to_rgb(*hsl)) + (color[3],)
+
+        if name in ('blend', 'blenda'):
+            other = self.evaluate(args[0])
+            if other is None:
+                return None
+            # Percentage is the amount of base color.
+            p = _number(args[1], 1.0) if len(args) > 1 else 0.5
+            space = args[2] if len(args) > 2 else 'rgb'
+            return _blend(color, other, _clamp(p), space, name == 'blenda')
+
+        if name == 'min-contrast':
+            other = self.evaluate(args[0])
+            if other is None:
+                return None
+            return _min_contrast(color, other, float(args[1]))
+
+        raise ValueError(adjuster)
+
+
+def _relative(current: float, args: list, scale: float) -> float:
+    # l(50%), l(+ 10%), l(- 10%), l(* 1.5)
+    if len(args) > 1 and args[0] in ('+', '-', '*'):
+        amount = _number(args[1], scale)
+        if args[0] == '+':
+            return current + amount
+        if args[0] == '-':
+            return current - amount
+        return (
+            current * float(args[1].rstrip('%')) / (100 if args[1].endswith('%') else 1)
+        )
+    return _number(args[0], scale)
+
+
+def _blend(color: tuple, other: tuple, p: float, space: str, alpha: bool) -> tuple:
+    if space == 'hsl':
+        h1, s1, l1 = rgb_to_hsl(*color[:3])
+        h2, s2, l2 = rgb_to_hsl(*other[:3])
+        # Shortest way around hue circle.
+        if abs(h2 - h1) > 180:
+            h2 += 360 if h2 < h1 else -360
+        rgb = hsl_to_rgb(
+            h1 * p + h2 * (1 - p), s1 * p + s2 * (1 - p), l1 * p + l2 * (1 - p)
+        )
+    else:
+        rgb = [c1 * p + c2 * (1 - p) for c1, c2 in zip(color[:3], other[:3])]
+
+    a = color[3] * p + other[3] * (1 - p) if alpha else color[3]
+    return (rgb[0], rgb[1], rgb[2], a)
+
+
+def _min_contrast(color: tuple, other: tuple, ratio: float) -> tuple:
+    if contrast_ratio(color, other) >= ratio:
+        return color
+
+    hue, sat, lum = rgb_to_hsl(*color[:3])
+    # Away from the other color lightness.
+    target = 0.0 if relative_luminance(other) > 0.5 else 100.0
+    low, high = lum, target
+
+    if contrast_ratio(tuple(hsl_to_rgb(hue, sat, target)) + (1.0,), other) < ratio:
+        return tuple(hsl_to_rgb(hue, sat, target)) + (color[3],)
+
+    # Smallest lightness change meeting ratio.
+    for _ in range(20):
+        mid = (low + high) / 2
+        if contrast_ratio(tuple(hsl_to_rgb(hue, sat, mid)) + (1.0,), other) >= ratio:
+            high = mid
+        else:
+            low = mid
+
+    return tuple(hsl_to_rgb(hue, sat, high)) + (color[3],)
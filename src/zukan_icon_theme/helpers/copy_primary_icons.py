@@ -1,25 +1,27 @@
+import filecmp
 import logging
 import os
 import shutil
 
+from ..helpers.build_progress import build_progress
 from ..helpers.load_save_settings import (
     get_change_icon_settings,
     get_ignored_icon_settings,
     get_prefer_icon_settings,
     get_theme_name,
+    is_link_primary_icons,
 )
 from ..helpers.search_themes import get_sidebar_bgcolor
 from ..helpers.color_dark_light import get_icon_dark_light
+from ..helpers.ignore_filter import IgnoreFilter
 from ..utils.file_extensions import (
     PNG_EXTENSION,
-    SVG_EXTENSION,
 )
 from ..utils.icons_suffix import (
     ICONS_SUFFIX,
 )
 from ..utils.primary_icons import (
     PRIMARY_ICONS,
-    TAG_PRIMARY,
 )
 from ..utils.zukan_paths import (
     ZUKAN_PKG_ICONS_PATH,
@@ -29,7 +31,7 @@ from ..utils.zukan_paths import (
 logger = logging.getLogger(__name__)
 
 
-def copy_primary_icons(bgcolor: str = None, theme_name: str = None):
+def copy_primary_icons(bgcolor: str = None, theme_name: str = None) -> dict:
     """
     'primary' icons need to delete PNGs to work in 'ignore_icon' setting. They do
     not need preference file to show.
@@ -42,26 +44,132 @@ def copy_primary_icons(bgcolor: str = None, theme_name: str = None):
     Parameters:
     bgcolor (str) -- theme background color.
     theme_name (str) -- theme name.
+
+    Returns:
+    (dict) -- copied, linked, skipped and removed PNGs counts.
     """
     auto_prefer_icon, prefer_icon = get_prefer_icon_settings()
     change_icon, _ = get_change_icon_settings()
-    ignored_icon = get_ignored_icon_settings()
+    ignore_filter = IgnoreFilter(get_ignored_icon_settings())
 
     if not theme_name:
         theme_name = get_theme_name()
     if not bgcolor:
         bgcolor = get_sidebar_bgcolor(theme_name)
+
+    primary_icons_actions = plan_primary_icons(
+        bgcolor, theme_name, auto_prefer_icon, prefer_icon, change_icon, ignore_filter
+    )
+    return apply_primary_icons(primary_icons_actions, is_link_primary_icons())
+
+
+def is_identical_png(src: str, dst: str) -> bool:
+    """
+    Compare size first, PNGs only read if sizes are equal. filecmp caches
+    results by files stat, until one of them changes.
+
+    Parameters:
+    src (str) -- source PNG path.
+    dst (str) -- destination PNG path.
+
+    Returns:
+    (bool) -- True if destination exists and has same bytes as source.
+    """
+    try:
+        src_stat = os.stat(src)
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return False
+
+    # Hardlinked, same file.
+    if os.path.samestat(src_stat, dst_stat):
+        return True
+
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+
+    return filecmp.cmp(src, dst, shallow=False)
+
+
+def _link_png(src: str, dst: str) -> bool:
+    try:
+        os.link(src, dst)
+        return True
+    except (AttributeError, OSError) as error:
+        # Filesystem without hardlinks, or folders in different devices.
+        logger.debug('hardlink %s failed, copying: %s', dst, error)
+        return False
+
+
+def apply_primary_icons(primary_icons_actions: list, link: bool = False) -> dict:
+    """
+    Remove and copy primary icons PNGs.
+
+    PNGs already identical in destination are not copied again. A different
+    destination is removed before copy, it may be a hardlink to another
+    source PNG.
+
+    Parameters:
+    primary_icons_actions (list) -- tuples ('remove', path) or ('copy', source
+    path, destination path).
+    link (bool) -- hardlink PNGs instead of copying, copy if filesystem does
+    not support it. Default to False.
+
+    Returns:
+    (dict) -- copied, linked, skipped and removed PNGs counts.
+    """
+    summary = {'copied': 0, 'linked': 0, 'skipped': 0, 'removed': 0}
+
+    with build_progress.phase('primary icons', len(primary_icons_actions)) as progress:
+        for a in primary_icons_actions:
+            if a[0] == 'remove':
+                os.remove(a[1])
+                summary['removed'] += 1
+            elif is_identical_png(a[1], a[2]):
+                summary['skipped'] += 1
+            else:
+                if os.path.lexists(a[2]):
+                    os.remove(a[2])
+                if link and _link_png(a[1], a[2]):
+                    summary['linked'] += 1
+                else:
+                    shutil.copy2(a[1], a[2])
+                    summary['copied'] += 1
+            progress.advance()
+
+    return summary
+
+
+def plan_primary_icons(
+    bgcolor: str,
+    theme_name: str,
+    auto_prefer_icon: bool,
+    prefer_icon: dict,
+    change_icon: dict,
+    ignore_filter: IgnoreFilter,
+) -> list:
+    """
+    List PNGs to remove or copy for primary icons, from zukan settings.
+
+    Parameters:
+    bgcolor (str) -- theme background color.
+    theme_name (str) -- theme name.
+    auto_prefer_icon (bool) -- 'auto_prefer_icon' setting.
+    prefer_icon (dict) -- 'prefer_icon' setting.
+    change_icon (dict) -- 'change_icon' setting.
+    ignore_filter (IgnoreFilter) -- 'ignored_icon' setting.
+
+    Returns:
+    primary_icons_actions (list) -- tuples ('remove', path) or ('copy', source
+    path, destination path).
+    """
+    primary_icons_actions = []
     icon_dark_light = get_icon_dark_light(bgcolor)
 
     for p in PRIMARY_ICONS:
         for s in ICONS_SUFFIX:
             for i in p[2]:
-                if (
-                    TAG_PRIMARY in ignored_icon
-                    or p[0] in ignored_icon
-                    or i in ignored_icon
-                    or (i + SVG_EXTENSION) in ignored_icon
-                ):
+                if ignore_filter.is_primary_ignored(p[0], i):
                     if (p[0], i) in change_icon.items() and os.path.exists(
                         os.path.join(ZUKAN_PKG_ICONS_PATH, p[1] + s + PNG_EXTENSION)
                     ):
@@ -71,8 +179,13 @@ def copy_primary_icons(bgcolor: str = None, theme_name: str = None):
                             p[1],
                             s,
                         )
-                        os.remove(
-                            os.path.join(ZUKAN_PKG_ICONS_PATH, p[1] + s + PNG_EXTENSION)
+                        primary_icons_actions.append(
+                            (
+                                'remove',
+                                os.path.join(
+                                    ZUKAN_PKG_ICONS_PATH, p[1] + s + PNG_EXTENSION
+                                ),
+                            )
                         )
                     elif p[0] not in change_icon.keys() and os.path.exists(
                         os.path.join(ZUKAN_PKG_ICONS_PATH, p[1] + s + PNG_EXTENSION)
@@ -80,15 +193,15 @@ def copy_primary_icons(bgcolor: str = None, theme_name: str = None):
                         logger.debug(
                             '%s not in change_icon, removing %s%s', p[0], p[1], s
                         )
-                        os.remove(
-                            os.path.join(ZUKAN_PKG_ICONS_PATH, p[1] + s + PNG_EXTENSION)
+                        primary_icons_actions.append(
+                            (
+                                'remove',
+                                os.path.join(
+                                    ZUKAN_PKG_ICONS_PATH, p[1] + s + PNG_EXTENSION
+                                ),
+                            )
                         )
-                elif (
-                    TAG_PRIMARY not in ignored_icon
-                    or p[0] not in ignored_icon
-                    or i not in ignored_icon
-                    or (i + SVG_EXTENSION) not in ignored_icon
-                ):
+                else:
                     # Not checking if path exists, because change icon path will exist
                     # and will not replace icon unless delete icon first.
                     if (p[0], i) in change_icon.items():
@@ -105,26 +218,32 @@ def copy_primary_icons(bgcolor: str = None, theme_name: str = None):
                             else:
                                 icon_name = i.rsplit('-', 1)[0] + '-dark'
 
-                            shutil.copy2(
-                                os.path.join(
-                                    ZUKAN_PKG_ICONS_DATA_PRIMARY_PATH,
-                                    icon_name + s + PNG_EXTENSION,
-                                ),
-                                os.path.join(
-                                    ZUKAN_PKG_ICONS_PATH, p[1] + s + PNG_EXTENSION
-                                ),
+                            primary_icons_actions.append(
+                                (
+                                    'copy',
+                                    os.path.join(
+                                        ZUKAN_PKG_ICONS_DATA_PRIMARY_PATH,
+                                        icon_name + s + PNG_EXTENSION,
+                                    ),
+                                    os.path.join(
+                                        ZUKAN_PKG_ICONS_PATH, p[1] + s + PNG_EXTENSION
+                                    ),
+                                )
                             )
                         # Icon does not have icon dark/light option
                         # E.g. file_type_image-1
                         else:
-                            shutil.copy2(
-                                os.path.join(
-                                    ZUKAN_PKG_ICONS_DATA_PRIMARY_PATH,
-                                    i + s + PNG_EXTENSION,
-                                ),
-                                os.path.join(
-                                    ZUKAN_PKG_ICONS_PATH, p[1] + s + PNG_EXTENSION
-                                ),
+                            primary_icons_actions.append(
+                                (
+                                    'copy',
+                                    os.path.join(
+                                        ZUKAN_PKG_ICONS_DATA_PRIMARY_PATH,
+                                        i + s + PNG_EXTENSION,
+                                    ),
+                                    os.path.join(
+                                        ZUKAN_PKG_ICONS_PATH, p[1] + s + PNG_EXTENSION
+                                    ),
+                                )
                             )
 
                     elif p[0] not in change_icon.keys():
@@ -150,14 +269,17 @@ def copy_primary_icons(bgcolor: str = None, theme_name: str = None):
                                 s,
                             )
 
-                            shutil.copy2(
-                                os.path.join(
-                                    ZUKAN_PKG_ICONS_DATA_PRIMARY_PATH,
-                                    icon_name + s + PNG_EXTENSION,
-                                ),
-                                os.path.join(
-                                    ZUKAN_PKG_ICONS_PATH, p[1] + s + PNG_EXTENSION
-                                ),
+                            primary_icons_actions.append(
+                                (
+                                    'copy',
+                                    os.path.join(
+                                        ZUKAN_PKG_ICONS_DATA_PRIMARY_PATH,
+                                        icon_name + s + PNG_EXTENSION,
+                                    ),
+                                    os.path.join(
+                                        ZUKAN_PKG_ICONS_PATH, p[1] + s + PNG_EXTENSION
+                                    ),
+                                )
                             )
 
                         elif (
@@ -169,13 +291,18 @@ def copy_primary_icons(bgcolor: str = None, theme_name: str = None):
                                 p[2][0],
                                 s,
                             )
-                            shutil.copy2(
-                                # Copy default icon, dark.
-                                os.path.join(
-                                    ZUKAN_PKG_ICONS_DATA_PRIMARY_PATH,
-                                    p[2][0] + s + PNG_EXTENSION,
-                                ),
-                                os.path.join(
-                                    ZUKAN_PKG_ICONS_PATH, p[1] + s + PNG_EXTENSION
-                                ),
+                            primary_icons_actions.append(
+                                (
+                                    'copy',
+                                    # Copy default icon, dark.
+                                    os.path.join(
+                                        ZUKAN_PKG_ICONS_DATA_PRIMARY_PATH,
+                                        p[2][0] + s + PNG_EXTENSION,
+                                    ),
+                                    os.path.join(
+                                        ZUKAN_PKG_ICONS_PATH, p[1] + s + PNG_EXTENSION
+                                    ),
+                                )
                             )
+
+    return primary_icons_actions
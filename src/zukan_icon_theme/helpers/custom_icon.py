@@ -116,11 +116,13 @@ def generate_custom_icon(zukan_icons: list) -> list:
     dict_list = []
 
     if create_custom_icon:
+        data_names = set(list_data_names(zukan_icons))
+
         for c in create_custom_icon:
             if 'name' not in c:
                 logger.warning('%s do not have key "name", it is required', c)
                 continue
-            if c['name'] in list_data_names(zukan_icons):
+            if c['name'] in data_names:
                 logger.warning(
                     '%s key "name" already exists, it should be unique. Excluding from build.',
                     c['name'],
@@ -2,22 +2,33 @@ import errno
 import logging
 import os
 
+from ..helpers.staged_output import unshare_file
+
 logger = logging.getLogger(__name__)
 
+# Indentation by depth
+_INDENTS = {}
+
 
-def save_tm_preferences(data: dict, file_path):
+def save_tm_preferences(data: dict, file_path, session=None):
     """
     Write tmPreferences file.
 
     Parameters:
     data (dict) -- tmPreferences ordered dict.
     file_path (str) -- path to directory where tmPreferences will be saved.
+    session (Optional[BuildSession]) -- build session, skip writing if file did
+    not change. Default to None.
     """
     content = build_preference(data)
 
     try:
-        with open(file_path, 'w') as f:
-            f.write(content)
+        if session is not None:
+            session.write(file_path, content)
+        else:
+            unshare_file(file_path)
+            with open(file_path, 'w') as f:
+                f.write(content)
     except FileNotFoundError:
         logger.error(
             '[Errno %d] %s: %r', errno.ENOENT, os.strerror(errno.ENOENT), file_path
@@ -36,44 +47,75 @@ def build_preference(data: dict) -> str:
     data (dict) -- tmPreferences ordered dict.
 
     Returns:
-    content_with_plist_version (str) -- tmPreferences string with plist version.
+    (str) -- tmPreferences string with plist version.
     """
-    content = dict_to_preference(data)
-
     # Add plist version
-    content_with_plist_version = (
-        '<?xml version="1.0" encoding="UTF-8"?>\n<plist version="1.0">\n\t<dict>\n'
-        + content
-        + '\t</dict>\n</plist>\n'
-    )
+    out = ['<?xml version="1.0" encoding="UTF-8"?>\n<plist version="1.0">\n\t<dict>\n']
+    render_preference(out, data)
+    out.append('\t</dict>\n</plist>\n')
 
-    return content_with_plist_version
+    return ''.join(out)
 
 
-def dict_to_preference(preference_dict: dict, multiplier: int = 2) -> str:
+def _indent(depth: int) -> str:
     """
-    Convert tmPreferences ordered dict to string.
+    Indentation for a depth, cached.
 
     Parameters:
-    preference_dict (dict) -- tmPreferences dict.
-    multiplier (int) -- indentation multiplier.
+    depth (int) -- indentation multiplier.
 
     Returns:
-    data (str) -- tmPreferences string.
+    (str) -- indentation tabs.
     """
-    indent = '\t' * multiplier
-    data = ''
+    try:
+        return _INDENTS[depth]
+    except KeyError:
+        return _INDENTS.setdefault(depth, '\t' * depth)
+
 
-    # print(preference_dict)
+def render_preference(out: list, preference_dict: dict, multiplier: int = 2):
+    """
+    Append tmPreferences ordered dict fragments to a list, joined once by
+    caller.
+
+    Parameters:
+    out (list) -- fragments list.
+    preference_dict (dict) -- tmPreferences dict.
+    multiplier (int) -- indentation multiplier.
+    """
+    indent = _indent(multiplier)
+    append = out.append
 
     for k, v in preference_dict.items():
+        append(indent)
+        append('<key>')
+        append(str(k))
+        append('</key>\n')
+        append(indent)
+
         if isinstance(v, dict):
-            data += '{i}<key>{k}</key>\n'.format(i=indent, k=k)
-            data += '{i}<dict>\n'.format(i=indent)
-            data += dict_to_preference(v, multiplier + 1)
-            data += '{i}</dict>\n'.format(i=indent)
+            append('<dict>\n')
+            render_preference(out, v, multiplier + 1)
+            append(indent)
+            append('</dict>\n')
         else:
-            data += '{i}<key>{k}</key>\n'.format(i=indent, k=k)
-            data += '{i}<string>{v}</string>\n'.format(i=indent, v=v)
+            append('<string>')
+            append(str(v))
+            append('</string>\n')
+
+
+def dict_to_preference(preference_dict: dict, multiplier: int = 2) -> str:
+    """
+    Convert tmPreferences ordered dict to string.
+
+    Parameters:
+    preference_dict (dict) -- tmPreferences dict.
+    multiplier (int) -- indentation multiplier.
+
+    Returns:
+    (str) -- tmPreferences string.
+    """
+    out = []
+    render_preference(out, preference_dict, multiplier)
 
-    return data
+    return ''.join(out)
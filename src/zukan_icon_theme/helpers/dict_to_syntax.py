@@ -1,23 +1,43 @@
 import errno
 import logging
 import os
+import re
+
+from ..helpers.staged_output import unshare_file
 
 logger = logging.getLogger(__name__)
 
+# Indentation by depth
+_INDENTS = {}
+
+REGEX_CONTEXTS_MAIN = (
+    r'contexts:\n\s*main:\n\s*- include: .*?\n\s*  apply_prototype: .*?\n'
+)
+
 
-def save_sublime_syntax(data: dict, file_path: str):
+def save_sublime_syntax(
+    data: dict, file_path: str, session=None, contexts_main: str = None
+):
     """
     Write sublime-syntax file.
 
     Parameters:
     data (dict) -- sublime-syntax ordered dict.
     file_path (str) -- path to directory where sublime-syntax will be saved.
+    session (Optional[BuildSession]) -- build session, skip writing if file did
+    not change. Default to None.
+    contexts_main (Optional[str]) -- contexts main replacing the one in data,
+    default to None.
     """
-    content = build_syntax(data)
+    content = build_syntax(data, contexts_main)
 
     try:
-        with open(file_path, 'w') as f:
-            f.write(content)
+        if session is not None:
+            session.write(file_path, content)
+        else:
+            unshare_file(file_path)
+            with open(file_path, 'w') as f:
+                f.write(content)
     except FileNotFoundError:
         logger.error(
             '[Errno %d] %s: %r', errno.ENOENT, os.strerror(errno.ENOENT), file_path
@@ -30,23 +50,52 @@ def save_sublime_syntax(data: dict, file_path: str):
     # return content
 
 
-def build_syntax(data: dict) -> str:
+def build_syntax(data: dict, contexts_main: str = None) -> str:
     """
     Build sublime-syntax string with YAML directive.
 
     Parameters:
     data (dict) -- sublime-syntax ordered dict.
+    contexts_main (Optional[str]) -- contexts main replacing the one in data,
+    default to None.
 
     Returns:
     content (str) -- sublime-syntax string with YAML directive.
     """
-    content = ''
-    content += add_directive()
-    content += dict_to_syntax(data)
+    out = [add_directive()]
+    render_syntax(out, data)
+    content = ''.join(out)
+
+    if contexts_main is not None:
+        content = re.sub(REGEX_CONTEXTS_MAIN, contexts_main, content)
 
     return content
 
 
+def build_contexts_main(scope: str = None) -> str:
+    """
+    Contexts main for empty list if scope None. If scope exists, it is in a
+    format compat to ST version < 4075.
+
+    Parameters:
+    scope (Optional[str]) -- scope name, default to None.
+
+    Returns:
+    (str) -- sublime-syntax contexts main.
+    """
+    if scope is None:
+        return 'contexts:\n  main: []\n'
+
+    # Could not find other references, got this contexts main format, for
+    # ST versions lower than 4075, from A File Icon package.
+    include_scope_prop = 'scope:{s}#prototype'.format(s=scope)
+    include_scope = 'scope:{s}'.format(s=scope)
+
+    return 'contexts:\n  main:\n    - include: {p}\n      include: {s}\n'.format(
+        p=include_scope_prop, s=include_scope
+    )
+
+
 def add_directive() -> str:
     """
     Add YAML directive.
@@ -64,70 +113,105 @@ def add_directive() -> str:
     return directive
 
 
-def dict_to_syntax(syntax_dict: dict, multiplier: int = 0) -> str:
+def _indent(depth: int) -> str:
     """
-    Convert sublime-syntax ordered dict to string.
+    Indentation for a depth, cached.
 
     Parameters:
-    syntax_dict (dict) -- sublime-syntax ordered dict.
-    multiplier (int) -- indentation multiplier.
+    depth (int) -- indentation multiplier.
 
     Returns:
-    data (str) -- sublime-syntax string.
+    (str) -- indentation spaces.
     """
-    data = ''
-    indent = '  ' * multiplier
-    new_line = '\n'
+    try:
+        return _INDENTS[depth]
+    except KeyError:
+        return _INDENTS.setdefault(depth, '  ' * depth)
 
-    # print(syntax_dict)
+
+def _yaml_value(v) -> str:
+    # Change to yaml bool
+    if v is True:
+        return 'true'
+    if v is False:
+        return 'false'
+    return str(v)
+
+
+def render_syntax(out: list, syntax_dict: dict, multiplier: int = 0):
+    """
+    Append sublime-syntax ordered dict fragments to a list, joined once by
+    caller.
+
+    Parameters:
+    out (list) -- fragments list.
+    syntax_dict (dict) -- sublime-syntax ordered dict.
+    multiplier (int) -- indentation multiplier.
+    """
+    indent = _indent(multiplier)
+    append = out.append
 
     # sublime-syntax
     for k, v in syntax_dict.items():
-        data += '{i}{k}:'.format(i=indent, k=k)
+        append(indent)
+        append(str(k))
+        append(':')
 
         # Dict
         if isinstance(v, dict):
-            # print(v)
-            data += new_line
-            data += dict_to_syntax(v, multiplier + 1)
+            append('\n')
+            render_syntax(out, v, multiplier + 1)
 
         # List
         elif isinstance(v, list):
             # List empty, main: []
             if not v:
-                data += ' []\n'
+                append(' []\n')
 
             # List str
-            if v and all(isinstance(i, str) for i in v):
-                # print(v)
-                data += new_line
+            elif all(isinstance(i, str) for i in v):
+                append('\n')
 
                 for list_item in v:
-                    data += '{i}  - {l}\n'.format(i=indent, l=list_item)
+                    append(indent)
+                    append('  - ')
+                    append(list_item)
+                    append('\n')
 
             # Tuple list
-            if v and all(isinstance(i, dict) for i in v):
-                # print('include')
-                # print(v)
-                data += new_line
+            elif all(isinstance(i, dict) for i in v):
+                append('\n')
 
                 for tuple_list in v:
-                    for i, (x, y) in enumerate(tuple_list.items()):
-                        # Change to yaml bool
-                        if isinstance(y, bool):
-                            y = 'true' if y is True else 'false'
-
-                        if i == 0:
-                            data += '{i}  - {k}: {v}\n'.format(i=indent, k=x, v=y)
-                        else:
-                            data += '{i}    {k}: {v}\n'.format(i=indent, k=x, v=y)
+                    prefix = '  - '
+                    for x, y in tuple_list.items():
+                        append(indent)
+                        append(prefix)
+                        append(str(x))
+                        append(': ')
+                        append(_yaml_value(y))
+                        append('\n')
+                        prefix = '    '
 
         # String or boolean
         else:
-            # Change to yaml bool
-            if isinstance(v, bool):
-                v = 'true' if v is True else 'false'
+            append(' ')
+            append(_yaml_value(v))
+            append('\n')
+
 
-            data += ' {v}\n'.format(v=v)
+def dict_to_syntax(syntax_dict: dict, multiplier: int = 0) -> str:
+    """
+    Convert sublime-syntax ordered dict to string.
+
+    Parameters:
+    syntax_dict (dict) -- sublime-syntax ordered dict.
+    multiplier (int) -- indentation multiplier.
+
+    Returns:
+    (str) -- sublime-syntax string.
+    """
+    out = []
+    render_syntax(out, syntax_dict, multiplier)
 
-    return data
+    return ''.join(out)
@@ -1,4 +1,6 @@
+import copy
 import logging
+import threading
 
 from ..utils.scopes_file_extensions import (
     SCOPES_FILE_EXTENSIONS,
@@ -7,6 +9,93 @@ from ..utils.scopes_file_extensions import (
 logger = logging.getLogger(__name__)
 
 
+class ExtensionOwnership:
+    """
+    Different packages can use same file extension. It could result in an icon
+    pointing to a not desired file extension. This table has the scope that owns
+    a file extension.
+
+    The table comes from 2 different origins. One is default: SCOPES_FILE_EXTENSIONS.
+    And the other is from user 'change_icon_file_extension' setting, that takes
+    precedence over default.
+
+    Parameters:
+    change_icon_file_extension (list) -- 'change_icon_file_extension' setting.
+    """
+
+    def __init__(self, change_icon_file_extension: list):
+        self.owners = {}
+        for d in SCOPES_FILE_EXTENSIONS:
+            for e in d['file_extensions']:
+                if e not in self.owners:
+                    self.owners[e] = d['scope']
+
+        user_owners = {}
+        for d in change_icon_file_extension:
+            for e in d['file_extensions']:
+                if e not in user_owners:
+                    user_owners[e] = d['scope']
+
+        self.owners.update(user_owners)
+
+        # print(self.owners)
+
+    def owner(self, file_extension: str) -> str:
+        """
+        Parameters:
+        file_extension (str) -- file extension.
+
+        Returns:
+        (Optional[str]) -- scope that owns file extension, None if any scope can
+        use it.
+        """
+        return self.owners.get(file_extension)
+
+    def filter_file_extensions(
+        self, syntax_file_extensions: list, syntax_scope: str
+    ) -> list:
+        """
+        Remove file extensions, in existing icon syntax, owned by a different scope.
+
+        Parameters:
+        syntax_file_extensions (list) -- list of file extensions in a syntax data.
+        syntax_scope (str) --  syntax scope.
+
+        Returns:
+        (list) -- file extensions not owned by other scopes.
+        """
+        return [
+            i
+            for i in syntax_file_extensions
+            if self.owners.get(i, syntax_scope) == syntax_scope
+        ]
+
+
+_ownership_lock = threading.Lock()
+_ownership_cache = []
+
+
+def extension_ownership(change_icon_file_extension: list) -> ExtensionOwnership:
+    """
+    ExtensionOwnership for 'change_icon_file_extension' setting, built again only
+    when setting changes.
+
+    Parameters:
+    change_icon_file_extension (list) -- 'change_icon_file_extension' setting.
+
+    Returns:
+    (ExtensionOwnership) -- file extensions owners table.
+    """
+    with _ownership_lock:
+        if _ownership_cache and _ownership_cache[0] == change_icon_file_extension:
+            return _ownership_cache[1]
+
+        ownership = ExtensionOwnership(change_icon_file_extension)
+        _ownership_cache[:] = [copy.deepcopy(change_icon_file_extension), ownership]
+
+        return ownership
+
+
 def edit_file_extension(
     syntax_file_extensions: list, syntax_scope: str, change_icon_file_extension: list
 ) -> list:
@@ -26,42 +115,6 @@ def edit_file_extension(
     syntax_file_extensions (list) -- list of file extensions based on two lists:
     SCOPES_FILE_EXTENSIONS and 'change_icon_file_extension' setting.
     """
-
-    change_icon_file_extension_dict = {}
-    for d in change_icon_file_extension:
-        for e in d['file_extensions']:
-            if e not in change_icon_file_extension_dict:
-                change_icon_file_extension_dict[e] = d['scope']
-
-    scope_file_extensions_dict = {}
-    for d in SCOPES_FILE_EXTENSIONS:
-        for e in d['file_extensions']:
-            if e not in scope_file_extensions_dict:
-                scope_file_extensions_dict[e] = d['scope']
-
-    # Remove items from scope_file_extensions_dict if file extension is
-    # in change_icon_file_extension_dict
-    for d in change_icon_file_extension_dict:
-        if d in scope_file_extensions_dict:
-            del scope_file_extensions_dict[d]
-
-    # file_extensions_dict = {
-    #     **scope_file_extensions_dict,
-    #     **change_icon_file_extension_dict,
-    # }
-    # Python 3.3
-    file_extensions_dict = dict(
-        scope_file_extensions_dict, **change_icon_file_extension_dict
+    return extension_ownership(change_icon_file_extension).filter_file_extensions(
+        syntax_file_extensions, syntax_scope
     )
-
-    # print(file_extensions_dict)
-
-    syntax_file_extensions = [
-        i
-        for i in syntax_file_extensions
-        if i not in file_extensions_dict or file_extensions_dict[i] == syntax_scope
-    ]
-
-    # print(syntax_file_extensions)
-
-    return syntax_file_extensions
@@ -0,0 +1,200 @@
+import logging
+import os
+import threading
+
+from ..helpers.read_write_data import read_pickle_data
+from ..utils.zukan_paths import (
+    ZUKAN_ICONS_DATA_FILE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(
+        '{c} is read-only, copy it before editing.'.format(c=type(self).__name__)
+    )
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict used for cached icons data. It is still a dict, so
+    `isinstance(v, dict)` checks in sublime-syntax and tmPreferences writers work.
+
+    `dict(d)` or `thaw(d)` return editable copies.
+    """
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (dict, (thaw(self),))
+
+
+class FrozenList(list):
+    """
+    Read-only list used for cached icons data. `list(l)` or `thaw(l)` return
+    editable copies.
+    """
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __iadd__ = _read_only
+    __imul__ = _read_only
+    append = _read_only
+    clear = _read_only
+    extend = _read_only
+    insert = _read_only
+    pop = _read_only
+    remove = _read_only
+    reverse = _read_only
+    sort = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (list, (thaw(self),))
+
+
+def freeze(data):
+    """
+    Recursively convert dicts and lists to read-only FrozenDict and FrozenList.
+
+    Parameters:
+    data -- pickle data, dicts, lists and scalars.
+
+    Returns:
+    read-only data.
+    """
+    if isinstance(data, FrozenDict) or isinstance(data, FrozenList):
+        return data
+    if isinstance(data, dict):
+        return FrozenDict((k, freeze(v)) for k, v in data.items())
+    if isinstance(data, list):
+        return FrozenList(freeze(v) for v in data)
+    return data
+
+
+def thaw(data):
+    """
+    Recursively copy dicts and lists to editable dict and list.
+
+    Parameters:
+    data -- read-only or editable data.
+
+    Returns:
+    editable copy of data.
+    """
+    if isinstance(data, dict):
+        return {k: thaw(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [thaw(v) for v in data]
+    return data
+
+
+class IconsDataCache:
+    """
+    Process-wide pickle data cache.
+
+    Pickle file is loaded once, and kept while path, modified time and size do
+    not change. Results are read-only, shared by all callers.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _file_key(self, pickle_file: str) -> tuple:
+        st = os.stat(pickle_file)
+        return (st.st_mtime_ns, st.st_size)
+
+    def read(self, pickle_file: str) -> list:
+        """
+        Read pickle file, from cache if file did not change.
+
+        Parameters:
+        pickle_file (str) -- path to pickle file.
+
+        Returns:
+        (FrozenList) -- read-only pickle contents.
+        """
+        try:
+            file_key = self._file_key(pickle_file)
+        except OSError:
+            self.invalidate(pickle_file)
+            # Log and raise same errors as read_pickle_data.
+            return freeze(read_pickle_data(pickle_file))
+
+        with self._lock:
+            entry = self._entries.get(pickle_file)
+            if entry is not None and entry[0] == file_key:
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+            data = freeze(read_pickle_data(pickle_file))
+            self._entries[pickle_file] = (file_key, data)
+            logger.debug(
+                '%s loaded to cache, %d records.',
+                os.path.basename(pickle_file),
+                len(data),
+            )
+            return data
+
+    def invalidate(self, pickle_file: str = None):
+        """
+        Remove a pickle file, or all files if None, from cache.
+
+        Parameters:
+        pickle_file (Optional[str]) -- path to pickle file, default to None.
+        """
+        with self._lock:
+            if pickle_file is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(pickle_file, None)
+
+    def stats(self) -> dict:
+        """
+        Returns:
+        (dict) -- cache hits, misses and number of files cached.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'files': len(self._entries),
+            }
+
+
+icons_data_cache = IconsDataCache()
+
+
+def read_zukan_icons_data(pickle_file: str = ZUKAN_ICONS_DATA_FILE) -> list:
+    """
+    Read zukan icons data from process-wide cache.
+
+    Parameters:
+    pickle_file (str) -- path to pickle file, default to ZUKAN_ICONS_DATA_FILE.
+
+    Returns:
+    (FrozenList) -- read-only zukan icons data.
+    """
+    return icons_data_cache.read(pickle_file)
@@ -0,0 +1,123 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ZukanIconIndex:
+    """
+    Lookup maps for zukan icons data, built in one pass over icons records.
+
+    Maps icon name, preference icon, syntax name, scope, tag and file extension
+    to records. Syntax lookups return tuples (record, syntax).
+
+    Parameters:
+    zukan_icons (list) -- zukan icons data records.
+    parent (Optional[ZukanIconIndex]) -- index searched after this one, default
+    to None.
+    """
+
+    def __init__(self, zukan_icons: list, parent: 'ZukanIconIndex' = None):
+        self.parent = parent
+        self.records = list(zukan_icons)
+
+        self.by_name = {}
+        self.by_icon = {}
+        self.by_syntax_name = {}
+        self.by_scope = {}
+        self.by_tag = {}
+        self.by_file_extension = {}
+
+        for r in self.records:
+            name = r.get('name')
+            if name is not None and name not in self.by_name:
+                self.by_name[name] = r
+
+            preferences = r.get('preferences')
+            if preferences and preferences.get('settings'):
+                icon = preferences['settings'].get('icon')
+                if icon is not None:
+                    self.by_icon.setdefault(icon, []).append(r)
+
+            if r.get('tag') is not None:
+                self.by_tag.setdefault(r['tag'], []).append(r)
+
+            for s in r.get('syntax') or []:
+                self.by_syntax_name.setdefault(s.get('name'), []).append((r, s))
+                if s.get('scope'):
+                    self.by_scope.setdefault(s['scope'], []).append((r, s))
+                for e in s.get('file_extensions') or []:
+                    self.by_file_extension.setdefault(e, []).append((r, s))
+
+    def _find(self, map_name: str, key: str) -> list:
+        result = list(getattr(self, map_name).get(key, []))
+        if self.parent is not None:
+            result = self.parent._find(map_name, key) + result
+        return result
+
+    def extend(self, zukan_icons: list) -> 'ZukanIconIndex':
+        """
+        Index with extra records, e.g. 'create_custom_icon' setting, searched after
+        this index. This index is not copied.
+
+        Parameters:
+        zukan_icons (list) -- extra icons records.
+
+        Returns:
+        (ZukanIconIndex) -- index with this index as parent.
+        """
+        return ZukanIconIndex(zukan_icons, self)
+
+    def all_records(self) -> list:
+        if self.parent is not None:
+            return self.parent.all_records() + self.records
+        return list(self.records)
+
+    def has_name(self, name: str) -> bool:
+        return self.record_by_name(name) is not None
+
+    def record_by_name(self, name: str) -> dict:
+        if self.parent is not None:
+            record = self.parent.record_by_name(name)
+            if record is not None:
+                return record
+        return self.by_name.get(name)
+
+    def records_by_icon(self, icon: str) -> list:
+        return self._find('by_icon', icon)
+
+    def records_by_tag(self, tag: str) -> list:
+        return self._find('by_tag', tag)
+
+    def syntaxes_by_name(self, syntax_name: str) -> list:
+        return self._find('by_syntax_name', syntax_name)
+
+    def syntaxes_by_scope(self, scope: str) -> list:
+        return self._find('by_scope', scope)
+
+    def syntaxes_by_file_extension(self, file_extension: str) -> list:
+        return self._find('by_file_extension', file_extension)
+
+
+_index_lock = threading.Lock()
+_index_cache = {'data': None, 'index': None}
+
+
+def zukan_icons_index(zukan_icons: list) -> ZukanIconIndex:
+    """
+    Get index for zukan icons data. Index is rebuilt only when icons data
+    object changes, icons data cache returns the same object while pickle
+    file is unchanged.
+
+    Parameters:
+    zukan_icons (list) -- zukan icons data.
+
+    Returns:
+    (ZukanIconIndex) -- zukan icons index.
+    """
+    with _index_lock:
+        if _index_cache['data'] is not zukan_icons:
+            _index_cache['index'] = ZukanIconIndex(zukan_icons)
+            _index_cache['data'] = zukan_icons
+            logger.debug('zukan icons index built, %d records.', len(zukan_icons))
+        return _index_cache['index']
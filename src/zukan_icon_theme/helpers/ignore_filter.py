@@ -0,0 +1,140 @@
+import logging
+
+from ..utils.file_extensions import (
+    SVG_EXTENSION,
+)
+from ..utils.primary_icons import (
+    TAG_PRIMARY,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_ignored(entry: str) -> str:
+    """
+    Parameters:
+    entry (str) -- 'ignored_icon' entry, icon name, icon, icon SVG or tag.
+
+    Returns:
+    (str) -- entry without SVG extension, e.g. file_type_rust.svg -> file_type_rust
+    """
+    if entry.endswith(SVG_EXTENSION):
+        return entry[: -len(SVG_EXTENSION)]
+    return entry
+
+
+class IgnoreFilter:
+    """
+    'ignored_icon' setting, compiled once for a build.
+
+    Entries are normalized, without SVG extension. After compile, excluded icons
+    data records are kept as frozensets of record ids, so syntaxes, preferences
+    and primary icons builders check a record with a set lookup.
+
+    Records not compiled, e.g. from a single icon build, are checked against
+    entries.
+
+    Parameters:
+    ignored_icon (Iterable) -- 'ignored_icon' setting.
+    """
+
+    def __init__(self, ignored_icon):
+        self.entries = frozenset(
+            normalize_ignored(e) for e in ignored_icon or () if isinstance(e, str)
+        )
+        # Compiled records are kept, their ids can not be reused while filter
+        # exists.
+        self._records = ()
+        self._compiled = frozenset()
+        self._ignored = frozenset()
+        self._option_ignored = frozenset()
+
+    def compile(self, records: list):
+        """
+        Precompute ignored records.
+
+        Parameters:
+        records (list) -- icons data and 'create_custom_icon' records.
+
+        Returns:
+        (IgnoreFilter) -- self.
+        """
+        self._records = tuple(records)
+        self._compiled = frozenset(id(r) for r in self._records)
+
+        if not self.entries:
+            self._ignored = self._option_ignored = frozenset()
+            return self
+
+        self._ignored = frozenset(id(r) for r in self._records if self._match_record(r))
+        self._option_ignored = frozenset(
+            id(r) for r in self._records if self._match_options(r)
+        )
+        logger.debug(
+            '%d ignored icons, %d of %d records excluded.',
+            len(self.entries),
+            len(self._ignored | self._option_ignored),
+            len(self._records),
+        )
+        return self
+
+    def _match_record(self, r: dict) -> bool:
+        if r['name'] in self.entries:
+            return True
+
+        # Icon can not exist in 'create_custom_icon' setting when only creating
+        # syntax
+        if 'preferences' not in r:
+            return False
+
+        return r['preferences']['settings']['icon'] in self.entries or (
+            r.get('tag') is not None and r['tag'] in self.entries
+        )
+
+    def _match_options(self, r: dict) -> bool:
+        return 'icons' in r and any(
+            normalize_ignored(i) in self.entries for i in r['icons']
+        )
+
+    def is_ignored(self, r: dict) -> bool:
+        """
+        Parameters:
+        r (dict) -- icon data.
+
+        Returns:
+        (bool) -- True if icon name, icon, icon SVG or tag is ignored.
+        """
+        if not self.entries:
+            return False
+        if id(r) in self._compiled:
+            return id(r) in self._ignored
+        return self._match_record(r)
+
+    def is_option_ignored(self, r: dict) -> bool:
+        """
+        Parameters:
+        r (dict) -- icon data.
+
+        Returns:
+        (bool) -- True if any of icon options is ignored.
+        """
+        if not self.entries:
+            return False
+        if id(r) in self._compiled:
+            return id(r) in self._option_ignored
+        return self._match_options(r)
+
+    def is_primary_ignored(self, name: str, icon: str) -> bool:
+        """
+        Parameters:
+        name (str) -- primary icon name, e.g. Source
+        icon (str) -- primary icon option, e.g. file_type_source-dark
+
+        Returns:
+        (bool) -- True if 'primary' tag, icon name or icon is ignored.
+        """
+        return (
+            TAG_PRIMARY in self.entries
+            or name in self.entries
+            or normalize_ignored(icon) in self.entries
+        )
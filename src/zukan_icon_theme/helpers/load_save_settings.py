@@ -5,7 +5,7 @@ import sublime
 
 from zipfile import ZipFile
 from ..helpers.read_write_data import dump_pickle_data
-from ..helpers.system_theme import system_theme
+from ..helpers.system_theme import SYSTEM_THEME_TTL, system_theme
 from ..utils.file_settings import (
     USER_SETTINGS,
     ZUKAN_SETTINGS,
@@ -320,6 +320,76 @@ def should_clean_output_dir() -> bool:
     return clean_output_dir
 
 
+def get_build_workers() -> int:
+    """
+    Get build workers setting, number of threads writing generated files.
+
+    Returns:
+    (int) -- build workers setting, 1 writes one file at a time.
+    """
+    build_workers = get_settings(ZUKAN_SETTINGS, 'build_workers')
+
+    if not isinstance(build_workers, int) or build_workers < 1:
+        build_workers = 4
+
+    return build_workers
+
+
+def is_staged_build() -> bool:
+    """
+    Check if staged build setting is true or false.
+
+    Returns:
+    (bool) -- True or False for staged build setting.
+    """
+    staged_build = get_settings(ZUKAN_SETTINGS, 'staged_build')
+
+    return staged_build is True
+
+
+def is_link_primary_icons() -> bool:
+    """
+    Check if link primary icons setting is true or false.
+
+    Returns:
+    (bool) -- True or False for link primary icons setting.
+    """
+    link_primary_icons = get_settings(ZUKAN_SETTINGS, 'link_primary_icons')
+
+    return link_primary_icons is True
+
+
+def get_system_theme_ttl() -> float:
+    """
+    Get system theme ttl setting, seconds system theme result is used.
+
+    Returns:
+    (float) -- system theme ttl setting.
+    """
+    system_theme_ttl = get_settings(ZUKAN_SETTINGS, 'system_theme_ttl')
+
+    if (
+        not isinstance(system_theme_ttl, (int, float))
+        or isinstance(system_theme_ttl, bool)
+        or system_theme_ttl < 0
+    ):
+        system_theme_ttl = SYSTEM_THEME_TTL
+
+    return system_theme_ttl
+
+
+def is_system_theme_watch() -> bool:
+    """
+    Check if system theme watch setting is true or false.
+
+    Returns:
+    (bool) -- True or False for system theme watch setting.
+    """
+    system_theme_watch = get_settings(ZUKAN_SETTINGS, 'system_theme_watch')
+
+    return system_theme_watch is True
+
+
 def is_zukan_listener_enabled() -> bool:
     """
     Check if zukan listener enabled setting is true or false.
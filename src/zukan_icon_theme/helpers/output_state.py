@@ -0,0 +1,135 @@
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def _extension(file_name: str) -> str:
+    # '.sublime-syntax' file, with empty name, has extension '.sublime-syntax'.
+    i = file_name.rfind('.')
+    return file_name[i:] if i >= 0 else ''
+
+
+class ZukanOutputState:
+    """
+    Files in zukan output directories, icons, icons_syntaxes and
+    icons_preferences, grouped by extension.
+
+    A directory is listed again only when its modified time changes. Zukan
+    writers update it in place, with added and removed, so checks after a build
+    do not list directory.
+    """
+
+    def __init__(self):
+        # directory: [mtime_ns, {extension: set of file names}]
+        self._directories = {}
+        self._lock = threading.RLock()
+
+    def invalidate(self, directory: str = None):
+        """
+        Parameters:
+        directory (Optional[str]) -- directory to list again, all if None.
+        """
+        with self._lock:
+            if directory is None:
+                self._directories = {}
+            else:
+                self._directories.pop(directory, None)
+
+    def _mtime(self, directory: str):
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def _state(self, directory: str) -> dict:
+        mtime = self._mtime(directory)
+
+        with self._lock:
+            entry = self._directories.get(directory)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+
+            extensions = {}
+            if mtime is not None:
+                logger.debug('listing %s', directory)
+                try:
+                    for file_name in os.listdir(directory):
+                        extensions.setdefault(_extension(file_name), set()).add(
+                            file_name
+                        )
+                except OSError:
+                    mtime = None
+
+            self._directories[directory] = [mtime, extensions]
+            return extensions
+
+    def files(self, directory: str, extension: str) -> list:
+        """
+        Parameters:
+        directory (str) -- output directory.
+        extension (str) -- files extension, e.g. .sublime-syntax
+
+        Returns:
+        (list) -- sorted file names.
+        """
+        with self._lock:
+            return sorted(self._state(directory).get(extension, ()))
+
+    def count(self, directory: str, extension: str) -> int:
+        with self._lock:
+            return len(self._state(directory).get(extension, ()))
+
+    def has_files(self, directory: str, extension: str) -> bool:
+        """
+        Parameters:
+        directory (str) -- output directory.
+        extension (str) -- files extension, e.g. .tmPreferences
+
+        Returns:
+        (bool) -- True if directory has any file with extension.
+        """
+        return self.count(directory, extension) > 0
+
+    def contains(self, directory: str, file_name: str) -> bool:
+        with self._lock:
+            return file_name in self._state(directory).get(_extension(file_name), ())
+
+    def added(self, file_path: str):
+        """
+        Record a file written by zukan, without listing directory again.
+
+        Parameters:
+        file_path (str) -- path to file.
+        """
+        self._update(file_path, True)
+
+    def removed(self, file_path: str):
+        """
+        Record a file deleted by zukan, without listing directory again.
+
+        Parameters:
+        file_path (str) -- path to file.
+        """
+        self._update(file_path, False)
+
+    def _update(self, file_path: str, exists: bool):
+        directory, file_name = os.path.split(file_path)
+
+        with self._lock:
+            entry = self._directories.get(directory)
+            # Not listed yet, first check lists it.
+            if entry is None:
+                return
+
+            names = entry[1].setdefault(_extension(file_name), set())
+            if exists:
+                names.add(file_name)
+            else:
+                names.discard(file_name)
+
+            entry[0] = self._mtime(directory)
+
+
+output_state = ZukanOutputState()
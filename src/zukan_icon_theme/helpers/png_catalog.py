@@ -0,0 +1,140 @@
+import logging
+import os
+import threading
+
+from ..utils.file_extensions import (
+    PNG_EXTENSION,
+)
+from ..utils.icons_suffix import (
+    ICONS_SUFFIX,
+)
+from ..utils.zukan_paths import (
+    ZUKAN_PKG_ICONS_DATA_PRIMARY_PATH,
+    ZUKAN_PKG_ICONS_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+# '@2x', '@3x', longest first.
+ICONS_SIZE_SUFFIX = sorted((s for s in ICONS_SUFFIX if s), key=len, reverse=True)
+
+
+def split_png_name(file_name: str) -> tuple:
+    """
+    Split PNG file name in icon name and size suffix.
+
+    Example: file_type_rust-dark@2x.png -> ('file_type_rust-dark', '@2x')
+
+    Parameters:
+    file_name (str) -- PNG file name.
+
+    Returns:
+    (Optional[tuple]) -- icon name and suffix, None if not a PNG.
+    """
+    if not file_name.endswith(PNG_EXTENSION):
+        return None
+
+    icon = file_name[: -len(PNG_EXTENSION)]
+    for s in ICONS_SIZE_SUFFIX:
+        if icon.endswith(s):
+            return icon[: -len(s)], s
+    return icon, ''
+
+
+class PngCatalog:
+    """
+    PNG icons in icons and icons_data/primary_icons folders, with their size
+    suffixes, '', '@2x' and '@3x'.
+
+    Each folder is listed once, and again only when its modified time changes.
+
+    Parameters:
+    directories (tuple) -- default folders searched by exists.
+    """
+
+    def __init__(self, directories: tuple):
+        self.directories = directories
+        # directory: [mtime_ns, {icon name: set of suffixes}]
+        self._directories = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._directories = {}
+
+    def _icons(self, directory: str) -> dict:
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        with self._lock:
+            entry = self._directories.get(directory)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+
+            icons = {}
+            if mtime is not None:
+                logger.debug('listing PNGs in %s', directory)
+                try:
+                    for file_name in os.listdir(directory):
+                        png = split_png_name(file_name)
+                        if png:
+                            icons.setdefault(png[0], set()).add(png[1])
+                except OSError:
+                    mtime = None
+
+            self._directories[directory] = [mtime, icons]
+            return icons
+
+    def suffixes(self, icon: str, directories: tuple = None) -> set:
+        """
+        Parameters:
+        icon (str) -- icon name, without extension, e.g. file_type_rust-dark
+        directories (Optional[tuple]) -- folders to search, default to catalog
+        directories.
+
+        Returns:
+        (set) -- size suffixes available, e.g. {'', '@2x', '@3x'}.
+        """
+        suffixes = set()
+        for d in directories or self.directories:
+            suffixes |= self._icons(d).get(icon, set())
+        return suffixes
+
+    def exists(self, icon: str, directories: tuple = None) -> bool:
+        """
+        Check if icon PNG exists, same as os.path.exists on each folder.
+
+        Parameters:
+        icon (str) -- icon name, without extension.
+        directories (Optional[tuple]) -- folders to search, default to catalog
+        directories.
+
+        Returns:
+        (bool) -- True if icon PNG, without size suffix, exists.
+        """
+        return any(
+            '' in self._icons(d).get(icon, ()) for d in directories or self.directories
+        )
+
+    def variant(self, icon: str, dark_light: str) -> str:
+        """
+        Dark or light version of an icon, if it exists.
+
+        Parameters:
+        icon (str) -- icon name, e.g. file_type_rust-dark
+        dark_light (str) -- 'dark' or 'light'.
+
+        Returns:
+        (Optional[str]) -- icon name of version, None if icon has no dark/light
+        versions or version does not exist.
+        """
+        for v in ('-dark', '-light'):
+            if icon.endswith(v):
+                version = icon[: -len(v)] + '-' + dark_light
+                return version if self.exists(version) else None
+        return None
+
+
+png_catalog = PngCatalog((ZUKAN_PKG_ICONS_PATH, ZUKAN_PKG_ICONS_DATA_PRIMARY_PATH))
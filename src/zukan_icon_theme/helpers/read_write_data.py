@@ -2,7 +2,6 @@ import _pickle as pickle
 import errno
 import logging
 import os
-import re
 
 logger = logging.getLogger(__name__)
 
@@ -61,59 +60,3 @@ def read_pickle_data(pickle_file: str) -> dict:
             '[Errno %d] %s: %r', errno.EACCES, os.strerror(errno.EACCES), pickle_file
         )
         raise
-
-
-def edit_contexts_main(file_path: str, scope: str = None):
-    """
-    Edit contexts main for empty list if scope None. If scope exists, it changes
-    for a format compat to ST version < 4075.
-
-    Parameters:
-    file_path (str) -- path to icon syntax file.
-    scope (Optional[str]) -- scope name, default to None.
-    """
-    try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-
-        regex_contexts_main = (
-            r'contexts:\n\s*main:\n\s*- include: .*?\n\s*  apply_prototype: .*?\n'
-        )
-
-        if scope is not None:
-            # Could not find other references, got this contexts main format, for
-            # ST versions lower than 4075, from A File Icon package.
-            include_scope_prop = 'scope:{s}#prototype'.format(s=scope)
-            include_scope = 'scope:{s}'.format(s=scope)
-
-            contexts_main = (
-                'contexts:\n  main:\n    - include: {p}\n      include: {s}\n'.format(
-                    p=include_scope_prop, s=include_scope
-                )
-            )
-
-            content = re.sub(regex_contexts_main, contexts_main, content)
-        else:
-            contexts_main = 'contexts:\n  main: []\n'
-
-            content = re.sub(
-                regex_contexts_main,
-                contexts_main,
-                content,
-            )
-
-        with open(file_path, 'w') as f:
-            f.write(content)
-
-        logger.debug('edited file %r contaxts main.', file_path)
-
-    except FileNotFoundError:
-        logger.error(
-            '[Errno %d] %s: %r', errno.ENOENT, os.strerror(errno.ENOENT), file_path
-        )
-        raise
-    except OSError:
-        logger.error(
-            '[Errno %d] %s: %r', errno.EACCES, os.strerror(errno.EACCES), file_path
-        )
-        raise
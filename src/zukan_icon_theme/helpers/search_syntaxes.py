@@ -1,21 +1,27 @@
 import sublime
+import threading
 
 from ..utils.zukan_paths import (
     ICONS_SYNTAXES_PARTIAL_PATH,
 )
 
 
-def visible_syntaxes_only() -> set:
+def visible_syntaxes_only(all_syntaxes: list = None) -> set:
     """
     Create a list of user ST installed syntaxes, visible only.
 
+    Parameters:
+    all_syntaxes (Optional[list]) -- ST syntaxes, default to None for
+    `sublime.list_syntaxes`.
+
     Returns:
     syntaxes_list_visible (set) -- list of user ST installed syntaxes, excluded
     hidden syntaxes.
     """
     syntaxes_list_visible = set()
 
-    all_syntaxes = sublime.list_syntaxes()
+    if all_syntaxes is None:
+        all_syntaxes = sublime.list_syntaxes()
     for s in all_syntaxes:
         # When testing without Ruamel, the result of sublime list_syntaxes bring
         # icons syntaxes with hidden false, even though they are all marked as
@@ -27,6 +33,66 @@ def visible_syntaxes_only() -> set:
     return syntaxes_list_visible
 
 
+class SyntaxRegistry:
+    """
+    Scopes of ST installed syntaxes, cached while the installed syntaxes do not
+    change.
+
+    `sublime.list_syntaxes` paths and hidden flags are the cache key, they
+    change when packages are installed, removed, enabled or disabled.
+    """
+
+    def __init__(self):
+        self._fingerprint = None
+        self._scopes = set()
+        self._visible_scopes = set()
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        all_syntaxes = sublime.list_syntaxes()
+        fingerprint = frozenset((s.path, s.hidden) for s in all_syntaxes)
+
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                return
+
+            self._scopes = set(s.scope for s in all_syntaxes)
+            self._visible_scopes = set(
+                s.scope for s in visible_syntaxes_only(all_syntaxes)
+            )
+            self._fingerprint = fingerprint
+
+    def invalidate(self):
+        with self._lock:
+            self._fingerprint = None
+
+    def scopes_available(self, scopes: set) -> dict:
+        """
+        Parameters:
+        scopes (set) -- scopes to search.
+
+        Returns:
+        (dict) -- scope and True if a ST syntax, visible or hidden, has it.
+        """
+        self._refresh()
+
+        with self._lock:
+            return {s: s in self._scopes for s in scopes}
+
+    def visible_scopes(self) -> set:
+        """
+        Returns:
+        (set) -- scopes of user ST installed syntaxes, visible only.
+        """
+        self._refresh()
+
+        with self._lock:
+            return set(self._visible_scopes)
+
+
+syntax_registry = SyntaxRegistry()
+
+
 def compare_scopes(zukan_icons_data: list) -> list:
     """
     Compare scopes from user ST installed syntaxes and zukan icon syntaxes.
@@ -37,12 +103,12 @@ def compare_scopes(zukan_icons_data: list) -> list:
     """
     list_scopes_to_remove = []
 
-    user_syntaxes_dict = {y.scope: y for y in visible_syntaxes_only()}
+    user_scopes = syntax_registry.visible_scopes()
 
     for x in zukan_icons_data:
         if x.get('syntax'):
             for s in x['syntax']:
-                if s['scope'] in user_syntaxes_dict:
+                if s['scope'] in user_scopes:
                     # print(s['scope'])
                     list_scopes_to_remove.append(s)
 
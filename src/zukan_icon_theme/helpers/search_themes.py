@@ -2,19 +2,26 @@ import logging
 import os
 import re
 import sublime
+import threading
 
-from ..helpers.cache_theme_info import is_theme_info_valid, save_theme_info
+from contextlib import contextmanager
+
+from ..helpers.cache_theme_info import (
+    get_cached_sidebar_bgcolor,
+    is_theme_info_valid,
+    save_sidebar_bgcolor,
+    save_theme_info,
+)
 from ..helpers.color_dark_light import (
+    REGEX_VAR_NAME,
+    classify,
     convert_to_rgb,
     extract_base_color,
     rgb_dark_light,
-    st_colors_to_hex,
 )
+from ..helpers.color_mod import ColorMod
 from ..helpers.load_save_settings import is_cached_theme_info
 from ..helpers.read_write_data import read_pickle_data
-from ..utils.st_color_palette import (
-    ST_COLOR_PALETTE_DICT,
-)
 from ..utils.zukan_paths import (
     filepath,
     PKG_USER_PARTIAL_PATH,
@@ -24,6 +31,9 @@ from ..utils.zukan_paths import (
 
 logger = logging.getLogger(__name__)
 
+# Regex for 2 subdir, when use sublime find_resources.
+REGEX_ROOT_THEME = re.compile(r'^([^\/]+/[^\/]+/)(?!.*/)(.*sublime-theme)', re.I)
+
 
 def filter_resources_themes(themes_list: list) -> list:
     """
@@ -40,10 +50,8 @@ def filter_resources_themes(themes_list: list) -> list:
     sub dir.
     """
     filter_list = []
-    # Regex for 2 subdir, when use sublime find_resources.
-    expression = re.compile(r'^([^\/]+/[^\/]+/)(?!.*/)(.*sublime-theme)', re.I)
     for name in themes_list:
-        if re.match(expression, name):
+        if REGEX_ROOT_THEME.match(name):
             filter_list.append(name)
     return filter_list
 
@@ -59,6 +67,226 @@ def search_resources_sublime_themes() -> list:
     return filter_resources_themes(themes_list)
 
 
+class ThemeGraph:
+    """
+    sublime-theme and hidden-theme files resolved once, shared by search
+    functions.
+
+    Keeps `find_resources` results, parsed content of each theme, keyed on
+    resource path, and its ancestors from 'extends'.
+
+    Cache lasts one operation: a listener UI update, a build job or a theme
+    command, see `operation`. It is emptied when the first operation starts
+    and when the last one ends, so themes installed, removed or upgraded
+    between operations are read again.
+    """
+
+    def __init__(self):
+        self._resources = {}
+        self._contents = {}
+        self._ancestors = {}
+        self._themes = None
+        self._variables = {}
+        self._color_mods = {}
+        self._operations = 0
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def operation(self):
+        """
+        Scope cache to an operation. Operations can be nested, or run at same
+        time in listener and build jobs worker, cache is shared until all end.
+        """
+        with self._lock:
+            if self._operations == 0:
+                self.invalidate()
+            self._operations += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._operations -= 1
+                if self._operations == 0:
+                    self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._resources = {}
+            self._contents = {}
+            self._ancestors = {}
+            self._themes = None
+            self._variables = {}
+            self._color_mods = {}
+
+    def find_resources(self, pattern: str) -> list:
+        """
+        Parameters:
+        pattern (str) -- resource name or pattern, e.g. Default.sublime-theme
+
+        Returns:
+        (list) -- sublime find_resources result.
+        """
+        with self._lock:
+            if pattern not in self._resources:
+                self._resources[pattern] = sublime.find_resources(pattern)
+            return self._resources[pattern]
+
+    def themes(self) -> list:
+        """
+        Returns:
+        (list) -- sublime-themes in packages root, search_resources_sublime_themes.
+        """
+        with self._lock:
+            if self._themes is None:
+                self._themes = search_resources_sublime_themes()
+            return self._themes
+
+    def content(self, theme_st_path: str) -> dict:
+        """
+        Parameters:
+        theme_st_path (str) -- resource path, e.g.
+        Packages/Theme - Default/Default.sublime-theme
+
+        Returns:
+        (dict) -- parsed theme file.
+        """
+        with self._lock:
+            if theme_st_path not in self._contents:
+                logger.debug('parsing %s', theme_st_path)
+                self._contents[theme_st_path] = sublime.decode_value(
+                    sublime.load_resource(theme_st_path)
+                )
+            return self._contents[theme_st_path]
+
+    def parents(self, theme_st_path: str) -> list:
+        """
+        Hidden themes a theme extends, grouped by 'extends' value. Saved with
+        cached results, to check parents without parsing them, see
+        `cache_theme_info.get_cached_sidebar_bgcolor`.
+
+        Parameters:
+        theme_st_path (str) -- resource path, e.g.
+        Packages/Theme - Treble/Treble Adaptive.sublime-theme
+
+        Returns:
+        (list) -- 'extends' value and its hidden themes resource paths.
+        """
+        parents = []
+        seen = set()
+        theme_content = self.content(theme_st_path)
+        pending = []
+        if isinstance(theme_content, dict) and 'extends' in theme_content:
+            pending.append(theme_content['extends'])
+
+        while pending:
+            extends = pending.pop(0)
+            # Guard against themes extending each other.
+            if extends in seen:
+                continue
+            seen.add(extends)
+
+            hidden_themes = self.hidden_themes(extends)
+            parents.append([extends, hidden_themes])
+            for t in hidden_themes:
+                hidden_theme_content = self.content(t)
+                if 'extends' in hidden_theme_content:
+                    pending.append(hidden_theme_content['extends'])
+        return parents
+
+    def hidden_themes(self, extends: str) -> list:
+        """
+        Parameters:
+        extends (str) -- theme 'extends' value, e.g. Default.sublime-theme
+
+        Returns:
+        (list) -- resources matching 'extends', except Zukan created themes.
+        """
+        # Exclude Zukan created themes, important for Rebuild Files command.
+        return [
+            t
+            for t in self.find_resources(extends)
+            if not t.startswith(PKG_ZUKAN_ICON_THEME_FOLDER)
+        ]
+
+    def ancestors(self, extends: str) -> list:
+        """
+        Hidden themes a theme extends, and their own, in search order.
+
+        Parameters:
+        extends (str) -- theme 'extends' value, e.g. Default.sublime-theme
+
+        Returns:
+        (list) -- hidden themes resource paths.
+        """
+        with self._lock:
+            if extends not in self._ancestors:
+                # Guard against themes extending each other.
+                self._ancestors[extends] = []
+                self._ancestors[extends] = self._resolve(extends)
+            return self._ancestors[extends]
+
+    def resolved_variable(self, theme: str, theme_content: dict, var_value: str):
+        """
+        Parameters:
+        theme (str) -- path theme name.
+        theme_content (dict) -- parsed theme, where variable is resolved.
+        var_value (str) -- variable or color.
+
+        Returns:
+        (Optional[tuple]) -- 'dark' or 'light' list and values resolved, or None
+        if not resolved yet.
+        """
+        with self._lock:
+            entry = self._variables.get(id(theme_content))
+            if entry is None:
+                return None
+            return entry[1].get((theme, var_value))
+
+    def save_resolved_variable(
+        self, theme: str, theme_content: dict, var_value: str, resolved: tuple
+    ):
+        with self._lock:
+            # Content is kept with its results, so its id is not reused.
+            entry = self._variables.setdefault(id(theme_content), (theme_content, {}))
+            entry[1][(theme, var_value)] = resolved
+
+    def color_mod(self, theme_content: dict) -> ColorMod:
+        """
+        Parameters:
+        theme_content (dict) -- parsed theme, with variables.
+
+        Returns:
+        (ColorMod) -- evaluator for theme variables, all evaluated once when
+        theme is first resolved.
+        """
+        with self._lock:
+            entry = self._color_mods.get(id(theme_content))
+            if entry is None:
+                variables = {}
+                if isinstance(theme_content, dict):
+                    variables = theme_content.get('variables', {})
+                evaluator = ColorMod(variables, scheme_background)
+                # Variables refer to each other, evaluated in one pass, later
+                # lookups are dict reads.
+                evaluator.evaluate_all()
+                # Content is kept with its evaluator, so its id is not reused.
+                entry = (theme_content, evaluator)
+                self._color_mods[id(theme_content)] = entry
+            return entry[1]
+
+    def _resolve(self, extends: str) -> list:
+        chain = []
+        for t in self.hidden_themes(extends):
+            chain.append(t)
+            hidden_theme_content = self.content(t)
+            if 'extends' in hidden_theme_content:
+                chain.extend(self.ancestors(hidden_theme_content['extends']))
+        return chain
+
+
+theme_graph = ThemeGraph()
+
+
 def package_theme_exists(theme_name: str) -> bool:
     """
     Check if a Package Theme is installed
@@ -69,10 +297,10 @@ def package_theme_exists(theme_name: str) -> bool:
     Returns:
     (bool) -- True or False for Package Theme
     """
-    theme_st_path = sublime.find_resources(theme_name)
+    theme_st_path = theme_graph.find_resources(theme_name)
     # Excluding themes in Packages sub directories.
     filter_list = filter_resources_themes(theme_st_path)
-    list_all_themes = search_resources_sublime_themes()
+    list_all_themes = theme_graph.themes()
 
     # Check if installed theme file exist.
     for t in filter_list:
@@ -82,37 +310,77 @@ def package_theme_exists(theme_name: str) -> bool:
             return False
 
 
+def scheme_background() -> str:
+    """
+    Color scheme background, saved in user_ui_settings.
+
+    Returns:
+    (str) -- background color.
+    """
+    if os.path.exists(USER_UI_SETTINGS_FILE):
+        user_ui_settings = read_pickle_data(USER_UI_SETTINGS_FILE)
+        return [d.get('background') for d in user_ui_settings][0]
+
+    # After refactor, here raise error that file does not exist
+    # when enter file_type_icon conditions for InstallEvent
+    # 'new_install_manually' or 'new_install_pkg_control'.
+    #
+    # It is created, first time, in SchemeThemeViewListener.
+    # But have not created it yet here.
+    #
+    # Use default dark icon
+    # Fixme: if this happen with Adaptive theme and Dark color-scheme
+    # dark icon will apply. And only correct if change to a light
+    # theme or color-scheme.
+    return '#FFFFFF'
+
+
 def find_variables(
-    var_value: str, theme_content: str, target_list: list, theme: str
+    var_value: str,
+    theme_content: str,
+    target_list: list,
+    theme: str,
+    trace: list = None,
 ) -> list:
     """
     Recursively find variable value. Filter for HSL, RGB, Hex, background and
     ST colors to return dark/light, depending on color HSP.
 
+    Variables resolved are memoized in theme_graph, per theme.
+
     Paramenters:
     var_value (str) -- variable name.
     theme_content (dict) -- parsed json file, sublime-theme.
     target_list (list) -- list if theme and its hidden themes have
     attributes or value.
     theme (str) -- path theme name.
+    trace (Optional[list]) -- values resolved, appended in order. Default to
+    None.
 
     Returns:
     target_list (list) -- 'dark' or 'light' depending on color HSP.
     """
-    regex_hsl = (
-        # r'hsla?\((\d{1,3}),\s*(\d+)(?:%)?\s*,\s*(\d+)(?:%)?\s*(?:,'
-        # '\s*([01]?\d(\.\d+)?|1(\.0+)?))?\)'
-        r'hsla?\((\d+),\s*(-?\d*\.?\d+)%?,\s*(-?\d*\.?\d+)%?(?:,\s*(\d+(\.\d+)?))?\)'
-    )
-    regex_rgb = (
-        r'rgba?\((\d{1,3}),\s*(\d{1,3}),\s*(\d{1,3})(?:,'
-        '\s*([01]?\d(\.\d+)?|1(\.0+)?))?\)'
-    )
-    regex_hex = r'#(?:[0-9a-fA-F]{6}|[0-9a-fA-F]{8})'
+    resolved = theme_graph.resolved_variable(theme, theme_content, var_value)
+
+    if resolved is None:
+        resolved = ([], [])
+        _resolve_variable(var_value, theme_content, resolved[0], theme, resolved[1])
+
+        # Background depends on color scheme, not on theme.
+        if not any('var(--background)' in v for v in resolved[1]):
+            theme_graph.save_resolved_variable(
+                theme, theme_content, var_value, resolved
+            )
+
+    target_list.extend(resolved[0])
+    if trace is not None:
+        trace.extend(resolved[1])
 
-    # Color mod
-    var_value = extract_base_color(var_value)
-    # print(var_value)
+
+def _resolve_variable(
+    var_value: str, theme_content: dict, target_list: list, theme: str, trace: list
+):
+    trace.append(var_value)
 
     # Both Default and Default Dark give HSP = 124.12283073381384.
     # So it chooses icon light for both themes.
@@ -120,105 +388,52 @@ def find_variables(
     #
     # Ensuring here until find a better solution
     if theme == 'Packages/Theme - Default/Default.sublime-theme':
-        dark_light = 'light'
-
-        target_list.append(dark_light)
-
-    # HSL and HSLA
-    elif re.match(regex_hsl, var_value):
-        result = re.findall(regex_hsl, var_value)
-        # print(isinstance(result, str))
-        # print(result[0])
-
-        if result:
-            for r in result:
-                hue, sat, lum, alpha = r[0], r[1], r[2], r[3]
+        target_list.append('light')
+        return
 
-                hsl_color = 'hsl({h}, {s}%, {l}%)'.format(h=hue, s=sat, l=lum)
-
-                if alpha:
-                    hsl_color = 'hsla({h}, {s}%, {l}%, {a})'.format(
-                        h=hue, s=sat, l=lum, a=alpha
-                    )
-
-        dark_light = rgb_dark_light(convert_to_rgb(hsl_color))
-
-        target_list.append(dark_light)
+    # Color mod, adjusters applied
+    if var_value.strip().startswith('color('):
+        rgba, uses_background = theme_graph.color_mod(theme_content).resolve(var_value)
 
-    # RGB and RGBA
-    elif re.match(regex_rgb, var_value):
-        result = re.findall(regex_rgb, var_value)
+        if rgba is not None:
+            # Result depends on color scheme, not cached with theme.
+            if uses_background:
+                trace.append('var(--background)')
 
-        if result:
-            for r in result:
-                red, green, blue, alpha = r[0], r[1], r[2], r[3]
+            target_list.append(rgb_dark_light(list(rgba[:3])))
+            return
 
-                rgb_color = 'rgb({r}, {g}, {b})'.format(r=red, g=green, b=blue)
-
-                if alpha:
-                    rgb_color = 'rgba({r}, {g}, {b}, {a})'.format(
-                        r=red, g=green, b=blue, a=alpha
-                    )
-
-        dark_light = rgb_dark_light(convert_to_rgb(rgb_color))
-
-        target_list.append(dark_light)
-
-    # Hex and Hexa
-    elif re.match(regex_hex, var_value):
-        hex_color = re.findall(regex_hex, var_value)
-        # print(hex_color[0])
+    # Color mod not evaluated, use base color
+    var_value = extract_base_color(var_value)
+    # print(var_value)
 
-        dark_light = rgb_dark_light(convert_to_rgb(hex_color[0]))
+    # HSL, RGB, Hex and ST color palette
+    dark_light = classify(var_value)
 
+    if dark_light is not None:
         target_list.append(dark_light)
 
     # Background
     elif 'var(--background)' in var_value:
         # Get color scheme background and append
-        if os.path.exists(USER_UI_SETTINGS_FILE):
-            user_ui_settings = read_pickle_data(USER_UI_SETTINGS_FILE)
-            bgcolor = [d.get('background') for d in user_ui_settings]
-
-        # After refactor, here raise error that file does not exist
-        # when enter file_type_icon conditions for InstallEvent
-        # 'new_install_manually' or 'new_install_pkg_control'.
-        #
-        # It is created, first time, in SchemeThemeViewListener.
-        # But have not created it yet here.
-        #
-        else:
-            # Use default dark icon
-            # Fixme: if this happen with Adaptive theme and Dark color-scheme
-            # dark icon will apply. And only correct if change to a light
-            # theme or color-scheme.
-            bgcolor = ['#FFFFFF']
-
-        dark_light = rgb_dark_light(convert_to_rgb(bgcolor[0]))
-
-        target_list.append(dark_light)
-
-    # ST color palette
-    # E.g. aliceblue
-    elif var_value in ST_COLOR_PALETTE_DICT:
-        st_color = var_value
-
-        dark_light = rgb_dark_light(convert_to_rgb(st_colors_to_hex(st_color)))
+        dark_light = rgb_dark_light(convert_to_rgb(scheme_background()))
 
         target_list.append(dark_light)
 
     elif 'var' in var_value:
         logger.debug('searching in variables.')
 
+        var_name = REGEX_VAR_NAME.findall(var_value)
+        variables = {}
         if 'variables' in theme_content:
-            for k, v in theme_content['variables'].items():
-                var_name = re.findall(r'var\(([^)]+)\)', var_value)
+            variables = theme_content['variables']
 
-                if k == var_name[0]:
-                    logger.debug('recursive find variables.')
-                    # print(v)
+        if var_name and var_name[0] in variables:
+            logger.debug('recursive find variables.')
 
-                    find_variables(v, theme_content, target_list, theme)
+            _resolve_variable(
+                variables[var_name[0]], theme_content, target_list, theme, trace
+            )
 
     else:
         logger.warning('failed to find sidebar background.')
@@ -232,6 +447,7 @@ def find_attributes(
     target_list: list,
     target_values: list = None,
     class_parent: str = None,
+    trace: list = None,
 ) -> list:
     """
     Search in sublime-theme files if they use icon_file_type. And, if
@@ -249,6 +465,8 @@ def find_attributes(
     theme_content (dict) -- parsed json file, sublime-theme.
     target_list (list) -- list if theme and its hidden themes have
     attributes or value.
+    trace (Optional[list]) -- sidebar background values resolved. Default to
+    None.
     """
     if 'rules' in theme_content:
         class_name_list = [
@@ -274,7 +492,7 @@ def find_attributes(
         if not class_parent and i.get(target_key):
             logger.debug('%s sidebar layer0.tint is %s', theme, i.get(target_key))
 
-            find_variables(i.get(target_key), theme_content, target_list, theme)
+            find_variables(i.get(target_key), theme_content, target_list, theme, trace)
             if target_list:
                 return target_list
 
@@ -287,44 +505,32 @@ def find_attributes_hidden_file(
     target_list: list,
     target_values: list = None,
     class_parent: str = None,
+    trace: list = None,
 ) -> list:
     """
-    Recursively search for attributes, in hidden-theme files.
+    Search for attributes, in hidden-theme files theme extends.
 
     Paramenters:
     theme (str) -- path theme name.
     theme_content (dict) -- parsed json file, hidden-theme.
     target_list (list) -- list if theme and its hidden themes have
     attributes or value.
+    trace (Optional[list]) -- sidebar background values resolved. Default to
+    None.
     """
-    hidden_theme_list = sublime.find_resources(theme_content['extends'])
-    # Exclude Zukan created themes, important for Rebuild Files command.
-    hidden_theme_name = [
-        h for h in hidden_theme_list if not h.startswith(PKG_ZUKAN_ICON_THEME_FOLDER)
-    ]
-    for t in hidden_theme_name:
-        hidden_theme_content = sublime.decode_value(sublime.load_resource(t))
+    for t in theme_graph.ancestors(theme_content['extends']):
         logger.debug('extends %s', t)
         find_attributes(
             theme,
-            hidden_theme_content,
+            theme_graph.content(t),
             class_name,
             target_key,
             target_list,
             target_values,
             class_parent,
+            trace,
         )
         logger.debug('%s target_list is %s', t, target_list)
-        if 'extends' in hidden_theme_content:
-            find_attributes_hidden_file(
-                theme,
-                hidden_theme_content,
-                class_name,
-                target_key,
-                target_list,
-                target_values,
-                class_parent,
-            )
 
 
 def theme_with_opacity(theme_st_path: str) -> bool:
@@ -350,7 +556,7 @@ def theme_with_opacity(theme_st_path: str) -> bool:
     target_key = 'tree_row'
     target_values = ['hover', 'selected']
     target_list = []
-    theme_content = sublime.decode_value(sublime.load_resource(theme_st_path))
+    theme_content = theme_graph.content(theme_st_path)
 
     cached_theme_info = is_cached_theme_info()
 
@@ -395,7 +601,7 @@ def theme_with_opacity(theme_st_path: str) -> bool:
     return bool(theme_info_valid)
 
 
-def find_sidebar_background(theme_st_path: str) -> list:
+def find_sidebar_background(theme_st_path: str, trace: list = None) -> list:
     """
     Find sidebar background color and return 'dark' or 'light', depending on
     color HSP.
@@ -405,6 +611,8 @@ def find_sidebar_background(theme_st_path: str) -> list:
 
     Parameters:
     theme_st_path (str) -- path to theme.
+    trace (Optional[list]) -- values resolved, e.g. var(--sidebar) then its
+    color. Default to None.
 
     Returns:
     target_list (list) -- 'dark' or 'light' depending on color HSP.
@@ -412,7 +620,7 @@ def find_sidebar_background(theme_st_path: str) -> list:
     class_name = 'sidebar_container'
     target_key = 'layer0.tint'
     target_list = []
-    theme_content = sublime.decode_value(sublime.load_resource(theme_st_path))
+    theme_content = theme_graph.content(theme_st_path)
 
     find_attributes(
         theme_st_path,
@@ -420,6 +628,7 @@ def find_sidebar_background(theme_st_path: str) -> list:
         class_name,
         target_key,
         target_list,
+        trace=trace,
     )
     if 'extends' in theme_content:
         find_attributes_hidden_file(
@@ -428,6 +637,7 @@ def find_sidebar_background(theme_st_path: str) -> list:
             class_name,
             target_key,
             target_list,
+            trace=trace,
         )
 
     # print(target_list)
@@ -438,13 +648,16 @@ def get_sidebar_bgcolor(theme_name: str) -> str:
     """
     Get sidebar background color.
 
+    If `cache_theme_info` setting, result is saved in theme_info.json, with
+    values resolved, and theme JSON is not parsed again until theme changes.
+
     Parameters:
     theme_name (str) -- theme name. E.g.: Default.sublime-theme
 
     Returns:
     (str) -- returns value 'dark' or 'light'
     """
-    theme_sublime_path = sublime.find_resources(theme_name)
+    theme_sublime_path = theme_graph.find_resources(theme_name)
 
     for p in theme_sublime_path:
         if p.startswith(PKG_USER_PARTIAL_PATH):
@@ -455,6 +668,29 @@ def get_sidebar_bgcolor(theme_name: str) -> str:
             break
 
     if theme_st_path:
-        bgcolor = find_sidebar_background(theme_st_path)
+        cached_theme_info = is_cached_theme_info()
+
+        if cached_theme_info:
+            theme_file_path = filepath(os.path.join('../../../../..', theme_st_path))
+            background = scheme_background()
+            # Parent themes can change without theme file changing.
+            cached_bgcolor = get_cached_sidebar_bgcolor(
+                theme_file_path, background, theme_graph.hidden_themes
+            )
+            if cached_bgcolor is not None:
+                return cached_bgcolor
+
+        trace = []
+        bgcolor = find_sidebar_background(theme_st_path, trace)
+
+        if cached_theme_info and bgcolor:
+            save_sidebar_bgcolor(
+                theme_file_path,
+                bgcolor[0],
+                trace,
+                # Adaptive themes
+                background if any('var(--background)' in v for v in trace) else None,
+                theme_graph.parents(theme_st_path),
+            )
 
     return bgcolor[0]
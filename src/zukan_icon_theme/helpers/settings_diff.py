@@ -0,0 +1,132 @@
+import logging
+
+from ..helpers.custom_icon import data
+from ..helpers.ignore_filter import normalize_ignored
+from ..helpers.remove_empty_dict import remove_empty_dict
+from ..utils.primary_icons import (
+    PRIMARY_ICONS,
+    TAG_PRIMARY,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _ignored_entries(ignored_icon: list) -> frozenset:
+    return frozenset(
+        normalize_ignored(e) for e in ignored_icon or () if isinstance(e, str)
+    )
+
+
+class SettingsDiff:
+    """
+    Changes in icons settings, 'ignored_icon', 'change_icon' and
+    'create_custom_icon', between saved zukan current settings and new ones.
+
+    Used to rebuild only icons records affected by the change.
+
+    Parameters:
+    old (dict) -- settings from 'zukan_current_settings.pkl'.
+    new (dict) -- settings from 'Zukan Icon Theme.sublime-settings'.
+    """
+
+    def __init__(self, old: dict, new: dict):
+        old_ignored = _ignored_entries(old.get('ignored_icon'))
+        new_ignored = _ignored_entries(new.get('ignored_icon'))
+        self.ignored_added = new_ignored - old_ignored
+        self.ignored_removed = old_ignored - new_ignored
+
+        old_change_icon = old.get('change_icon') or {}
+        new_change_icon = new.get('change_icon') or {}
+        self.change_icon_keys = frozenset(
+            k
+            for k in set(old_change_icon) | set(new_change_icon)
+            if old_change_icon.get(k) != new_change_icon.get(k)
+        )
+
+        # Dicts are not hashable, 'create_custom_icon' lists are short.
+        old_custom_icon = list(old.get('create_custom_icon') or [])
+        new_custom_icon = list(new.get('create_custom_icon') or [])
+        self.custom_icon_added = [
+            c for c in new_custom_icon if c not in old_custom_icon
+        ]
+        self.custom_icon_removed = [
+            c for c in old_custom_icon if c not in new_custom_icon
+        ]
+
+        self.names = (
+            self.ignored_added
+            | self.ignored_removed
+            | self.change_icon_keys
+            | frozenset(
+                c['name']
+                for c in self.custom_icon_added + self.custom_icon_removed
+                if isinstance(c, dict) and 'name' in c
+            )
+        )
+
+    def has_changes(self) -> bool:
+        return bool(
+            self.ignored_added
+            or self.ignored_removed
+            or self.change_icon_keys
+            or self.custom_icon_added
+            or self.custom_icon_removed
+        )
+
+    def is_icon_changed(self, r: dict) -> bool:
+        """
+        Parameters:
+        r (dict) -- icon data.
+
+        Returns:
+        (bool) -- True if icon name, icon, tag or any icon option changed in
+        settings.
+        """
+        if r.get('name') in self.names:
+            return True
+
+        if 'preferences' in r and (
+            normalize_ignored(r['preferences']['settings']['icon']) in self.names
+        ):
+            return True
+
+        if r.get('tag') is not None and r['tag'] in self.names:
+            return True
+
+        return any(normalize_ignored(i) in self.names for i in r.get('icons') or ())
+
+    def affects_primary(self) -> bool:
+        """
+        Returns:
+        (bool) -- True if primary icons PNGs may change.
+        """
+        if TAG_PRIMARY in self.names:
+            return True
+
+        return any(
+            p[0] in self.names or any(i in self.names for i in p[2])
+            for p in PRIMARY_ICONS
+        )
+
+    def removed_custom_icons(self) -> list:
+        """
+        Icons data of removed or edited 'create_custom_icon' entries, to find
+        their files.
+
+        Returns:
+        (list) -- icons data.
+        """
+        removed = []
+
+        for c in self.custom_icon_removed:
+            if not isinstance(c, dict) or 'name' not in c:
+                continue
+            try:
+                od = data(remove_empty_dict(c))
+            except KeyError:
+                logger.debug('%s invalid, it was not built', c)
+                continue
+            if od:
+                removed.append(od)
+
+        return removed
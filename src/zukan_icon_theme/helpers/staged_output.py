@@ -0,0 +1,150 @@
+import errno
+import logging
+import os
+import shutil
+import time
+
+from ..helpers.output_state import output_state
+from ..utils.zukan_paths import (
+    ZUKAN_BUILD_STAGING_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def unshare_file(file_path: str):
+    """
+    Remove a file hardlinked by a staged build before writing it in place, so
+    its copy in 'previous' is not changed.
+
+    Parameters:
+    file_path (str) -- path to file.
+    """
+    try:
+        if os.stat(file_path).st_nlink > 1:
+            os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
+class StagedOutput:
+    """
+    Generate files for an output directory in a staging directory, then swap it
+    in with directory renames, so ST sees one change instead of one per file.
+
+    The replaced directory is kept in 'previous', until next build, for
+    rollback. Staging and previous are outside Packages.
+
+    Parameters:
+    directory (str) -- output directory, e.g. icons_syntaxes.
+    staging_root (str) -- staging root path, default to ZUKAN_BUILD_STAGING_PATH.
+    """
+
+    def __init__(self, directory: str, staging_root: str = ZUKAN_BUILD_STAGING_PATH):
+        self.directory = directory
+        self.name = os.path.basename(directory)
+        self.staging = os.path.join(staging_root, 'staging', self.name)
+        self.previous = os.path.join(staging_root, 'previous', self.name)
+
+    def staged_path(self, file_path: str) -> str:
+        """
+        Parameters:
+        file_path (str) -- file path in output directory.
+
+        Returns:
+        (str) -- file path in staging directory.
+        """
+        return os.path.join(self.staging, os.path.relpath(file_path, self.directory))
+
+    def prepare(self, exclude: set):
+        """
+        Create an empty staging directory, and hardlink files from output
+        directory that are kept, e.g. unchanged files, or stale files when
+        'clean_output_dir' is False. Files are copied if filesystem does not
+        support hardlinks.
+
+        After swap, kept files are shared by output and previous directories.
+        Files written in place later use unshare_file first.
+
+        Parameters:
+        exclude (set) -- output directory paths not copied, files generated
+        in this build or deleted.
+        """
+        if os.path.exists(self.staging):
+            shutil.rmtree(self.staging)
+        os.makedirs(self.staging)
+
+        if not os.path.exists(self.directory):
+            return
+
+        for file_name in os.listdir(self.directory):
+            file_path = os.path.join(self.directory, file_name)
+
+            if file_path not in exclude and os.path.isfile(file_path):
+                self._keep(file_path)
+
+    def _keep(self, file_path: str):
+        staged_path = self.staged_path(file_path)
+        try:
+            os.link(file_path, staged_path)
+        except (AttributeError, OSError):
+            shutil.copy2(file_path, staged_path)
+
+    def swap(self) -> bool:
+        """
+        Move output directory to previous, and staging directory to output
+        directory. If it fails, output directory is restored.
+
+        Returns:
+        (bool) -- True if staging directory was swapped in.
+        """
+        start = time.perf_counter()
+
+        try:
+            if os.path.exists(self.previous):
+                shutil.rmtree(self.previous)
+            if not os.path.exists(os.path.dirname(self.previous)):
+                os.makedirs(os.path.dirname(self.previous))
+            if os.path.exists(self.directory):
+                os.rename(self.directory, self.previous)
+            os.rename(self.staging, self.directory)
+            # New directory, listed again.
+            output_state.invalidate(self.directory)
+        except OSError:
+            logger.error(
+                '[Errno %d] %s: %r',
+                errno.EACCES,
+                os.strerror(errno.EACCES),
+                self.directory,
+            )
+            # Output directory already moved, put it back.
+            if not os.path.exists(self.directory) and os.path.exists(self.previous):
+                os.rename(self.previous, self.directory)
+            return False
+
+        logger.info(
+            '%s swapped in %.3fs, %d files.',
+            self.name,
+            time.perf_counter() - start,
+            len(os.listdir(self.directory)),
+        )
+        return True
+
+    def rollback(self) -> bool:
+        """
+        Restore output directory from previous build.
+
+        Returns:
+        (bool) -- True if previous directory was restored.
+        """
+        if not os.path.exists(self.previous):
+            return False
+
+        if os.path.exists(self.staging):
+            shutil.rmtree(self.staging)
+        if os.path.exists(self.directory):
+            os.rename(self.directory, self.staging)
+        os.rename(self.previous, self.directory)
+
+        logger.info('%s restored from previous build.', self.name)
+        return True
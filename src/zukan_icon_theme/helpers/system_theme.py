@@ -1,15 +1,28 @@
 import json
+import logging
 import platform
 import subprocess
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+BUSCTL_PATH = '/usr/bin/busctl'
+
+# Seconds a system theme result is used before asking system again.
+SYSTEM_THEME_TTL = 5.0
 
 
 # ST Theme 'auto' has an open issue
 # https://github.com/sublimehq/sublime_text/issues/5194
-def linux_theme() -> bool:
+def linux_theme(busctl: str = BUSCTL_PATH) -> bool:
     """
     Code from
     https://github.com/smac89/autodark-sublime-plugin/blob/main/helpers.py
 
+    Parameters:
+    busctl (str) -- busctl path. Default to /usr/bin/busctl.
+
     Returns:
     (bool) -- True for 'dark' theme.
     """
@@ -17,7 +30,7 @@ def linux_theme() -> bool:
 
     p = subprocess.check_output(
         [
-            '/usr/bin/busctl',
+            busctl,
             '--user',
             '--json=short',
             'call',
@@ -79,13 +92,18 @@ def windows_theme() -> bool:  # pragma: no cover
             return value == 0
 
 
-def system_theme() -> bool:
+def read_system_theme(busctl: str = BUSCTL_PATH) -> bool:
     """
+    Ask system, without cache.
+
+    Parameters:
+    busctl (str) -- busctl path, Linux only. Default to /usr/bin/busctl.
+
     Returns:
     (bool) -- True for 'dark' theme.
     """
     if platform.system() == 'Linux':
-        return linux_theme()
+        return linux_theme(busctl)
 
     if platform.system() == 'Darwin':
         return macos_theme()
@@ -93,3 +111,144 @@ def system_theme() -> bool:
     # Windows module only
     if platform.system() == 'Windows':  # pragma: no cover
         return windows_theme()
+
+
+class SystemAppearance:
+    """
+    System theme, dark or light, kept for ttl seconds.
+
+    On Linux, watch starts one 'busctl monitor' process that updates system
+    theme when it changes, instead of spawning busctl for each check.
+
+    Parameters:
+    ttl (float) -- seconds a result is used. Default to 5.
+    busctl (str) -- busctl path. Default to /usr/bin/busctl.
+    """
+
+    def __init__(self, ttl: float = SYSTEM_THEME_TTL, busctl: str = BUSCTL_PATH):
+        self.ttl = ttl
+        self.busctl = busctl
+        self._dark = None
+        self._expires = 0.0
+        self._watcher = None
+        self._lock = threading.Lock()
+
+    def is_dark(self) -> bool:
+        """
+        Returns:
+        (bool) -- True for 'dark' theme.
+        """
+        with self._lock:
+            if self._dark is not None and (
+                self.is_watching() or time.monotonic() < self._expires
+            ):
+                return self._dark
+
+        dark = read_system_theme(self.busctl)
+        self._set(dark)
+        return dark
+
+    def invalidate(self):
+        with self._lock:
+            self._dark = None
+            self._expires = 0.0
+
+    def _set(self, dark: bool):
+        with self._lock:
+            self._dark = dark
+            self._expires = time.monotonic() + self.ttl
+
+    def configure(self, ttl: float, watch: bool):
+        """
+        Parameters:
+        ttl (float) -- seconds a result is used.
+        watch (bool) -- on Linux, watch system theme changes.
+        """
+        self.ttl = ttl
+        self.invalidate()
+
+        if watch and platform.system() == 'Linux':
+            self.start_watch()
+        else:
+            self.stop_watch()
+
+    def is_watching(self) -> bool:
+        return self._watcher is not None and self._watcher.poll() is None
+
+    def start_watch(self):
+        """
+        Start 'busctl monitor', listening to appearance SettingChanged signals.
+        """
+        if self.is_watching():
+            return
+
+        try:
+            self._watcher = subprocess.Popen(
+                [
+                    self.busctl,
+                    '--user',
+                    '--json=short',
+                    'monitor',
+                    '--match',
+                    "type='signal',interface='org.freedesktop.portal.Settings',"
+                    "member='SettingChanged'",
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                universal_newlines=True,
+            )
+        except OSError:
+            logger.warning('could not watch system theme, %s not found.', self.busctl)
+            self._watcher = None
+            return
+
+        threading.Thread(
+            target=self._read_watcher, args=(self._watcher,), daemon=True
+        ).start()
+
+    def _read_watcher(self, watcher: subprocess.Popen):
+        dark_light_dict = {1: 'dark', 2: 'light'}
+
+        try:
+            for line in watcher.stdout:
+                try:
+                    data = json.loads(line)['payload']['data']
+                    if data[:2] != ['org.freedesktop.appearance', 'color-scheme']:
+                        continue
+                    system_scheme = data[2]['data']
+                except (ValueError, KeyError, IndexError, TypeError):
+                    logger.debug('skipping busctl monitor message %r', line)
+                    continue
+
+                logger.debug('system theme changed to %s', system_scheme)
+                self._set(dark_light_dict.get(system_scheme) == 'dark')
+        except Exception:
+            logger.exception('system theme watcher failed.')
+        finally:
+            # Watcher ended, results expire with ttl again.
+            self._set_expired()
+            if self._watcher is watcher:
+                self.stop_watch()
+
+    def _set_expired(self):
+        with self._lock:
+            self._expires = 0.0
+
+    def stop_watch(self):
+        watcher = self._watcher
+        self._watcher = None
+
+        if watcher is not None and watcher.poll() is None:
+            watcher.terminate()
+            watcher.wait()
+
+
+system_appearance = SystemAppearance()
+
+
+def system_theme() -> bool:
+    """
+    Returns:
+    (bool) -- True for 'dark' theme.
+    """
+    return system_appearance.is_dark()
@@ -30,13 +30,18 @@ THE SOFTWARE.
 
 import sublime
 
+from ..helpers.build_jobs import BuildJob
+
 
 class ThreadProgress:
     """
     Animates an indicator in the status area while a thread runs
 
+    A BuildJob also shows its running phase, items done and rate, jobs queued
+    while it runs, and its duration once complete.
+
     Parameters:
-    thread (str) -- the thread to track for activity
+    thread (str) -- the thread or BuildJob to track for activity
     message (str) -- the message to display next to the activity indicator
     success_message (str) -- the message to display once the thread is complete
     dialog_message (Optional[str]) -- the message to display in a dialog once the
@@ -77,7 +82,10 @@ class ThreadProgress:
             if hasattr(self.thread, 'result') and not self.thread.result:
                 cleanup()
                 return
-            active_view.set_status('_zukan', self.success_message)
+            success_message = self.success_message
+            if isinstance(self.thread, BuildJob) and self.thread.duration is not None:
+                success_message += ' in %.1fs' % self.thread.duration
+            active_view.set_status('_zukan', success_message)
             sublime.set_timeout(cleanup, 1000)
             if self.dialog_message is not None:
                 sublime.message_dialog(self.dialog_message)
@@ -86,9 +94,17 @@ class ThreadProgress:
         before = i % self.size
         after = (self.size - 1) - before
 
+        message = self.message
+        if isinstance(self.thread, BuildJob):
+            status = self.thread.status()
+            if status:
+                message += ': ' + status
+            if self.thread.queue_depth():
+                message += ' (%d queued)' % self.thread.queue_depth()
+
         active_view.set_status(
             '_zukan',
-            '%s %s ⦿ %s' % (self.message, ' ⦾ ' * before, ' ⦾ ' * after),
+            '%s %s ⦿ %s' % (message, ' ⦾ ' * before, ' ⦾ ' * after),
             # '%s %s ◍ %s' % (self.message, ' ၀ ' * before, ' ၀ ' * after)
             # '%s [%s=%s]' % (self.message, ' ' * before, ' ' * after)
         )
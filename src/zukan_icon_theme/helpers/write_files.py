@@ -0,0 +1,85 @@
+import errno
+import logging
+import os
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from ..helpers.staged_output import unshare_file
+
+logger = logging.getLogger(__name__)
+
+
+def _write_file(session, file_path: str, content: str):
+    if session is not None:
+        session.write(file_path, content)
+    else:
+        unshare_file(file_path)
+        with open(file_path, 'w') as f:
+            f.write(content)
+
+
+def _log_error(file_path: str, error: OSError):
+    if isinstance(error, FileNotFoundError):
+        logger.error(
+            '[Errno %d] %s: %r', errno.ENOENT, os.strerror(errno.ENOENT), file_path
+        )
+    else:
+        logger.error(
+            '[Errno %d] %s: %r', errno.EACCES, os.strerror(errno.EACCES), file_path
+        )
+
+
+def write_files(files: list, session=None, workers: int = 1, progress=None) -> dict:
+    """
+    Write rendered files, using a thread pool if workers is more than 1.
+
+    A file that fails does not stop others from being written.
+
+    Parameters:
+    files (list) -- tuples (file path, file content).
+    session (Optional[BuildSession]) -- build session, skip writing if file did
+    not change. Default to None.
+    workers (int) -- number of threads, 1 writes one file at a time. Default to 1.
+    progress (Optional[ProgressPhase]) -- build phase, advanced for each file.
+    Default to None.
+
+    Returns:
+    errors (dict) -- file path and OSError for files not written.
+    """
+    errors = {}
+    start = time.perf_counter()
+
+    if workers <= 1 or len(files) <= 1:
+        for file_path, content in files:
+            try:
+                _write_file(session, file_path, content)
+            except OSError as error:
+                errors[file_path] = error
+            if progress is not None:
+                progress.advance()
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_write_file, session, file_path, content): file_path
+                for file_path, content in files
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except OSError as error:
+                    errors[futures[future]] = error
+                if progress is not None:
+                    progress.advance()
+
+    for file_path in sorted(errors):
+        _log_error(file_path, errors[file_path])
+
+    logger.debug(
+        '%d files processed in %.3fs, %d workers, %d errors.',
+        len(files),
+        time.perf_counter() - start,
+        workers,
+        len(errors),
+    )
+
+    return errors
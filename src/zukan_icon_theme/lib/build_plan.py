@@ -0,0 +1,455 @@
+import copy
+import logging
+import os
+import time
+
+from ..helpers.build_manifest import build_manifest
+from ..helpers.build_progress import build_progress
+from ..helpers.copy_primary_icons import apply_primary_icons, plan_primary_icons
+from ..helpers.custom_icon import generate_custom_icon
+from ..helpers.dict_to_preference import build_preference
+from ..helpers.dict_to_syntax import build_syntax
+from ..helpers.edit_file_extension import extension_ownership
+from ..helpers.icons_data_cache import thaw
+from ..helpers.ignore_filter import IgnoreFilter
+from ..helpers.load_save_settings import (
+    get_build_workers,
+    get_theme_name,
+    is_link_primary_icons,
+    is_staged_build,
+)
+from ..helpers.output_state import output_state
+from ..helpers.search_themes import get_sidebar_bgcolor
+from ..helpers.settings_diff import SettingsDiff
+from ..helpers.staged_output import StagedOutput
+from ..helpers.write_files import write_files
+from ..utils.file_extensions import (
+    PNG_EXTENSION,
+    SUBLIME_SYNTAX_EXTENSION,
+    TMPREFERENCES_EXTENSION,
+)
+from ..utils.zukan_paths import (
+    ZUKAN_PKG_ICONS_PREFERENCES_PATH,
+    ZUKAN_PKG_ICONS_SYNTAXES_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BuildSnapshot:
+    """
+    Icons data, zukan settings and theme state, read once for a build.
+
+    Parameters:
+    zukan_syntax (ZukanSyntax) -- syntaxes builder, used for icons data, settings
+    and scopes.
+    zukan_preference (ZukanPreference) -- preferences builder, used for settings.
+    """
+
+    def __init__(self, zukan_syntax, zukan_preference):
+        self.zukan_icons = zukan_syntax.zukan_icons_data()
+
+        # 'create_custom_icon' setting
+        custom_icons = generate_custom_icon(self.zukan_icons)
+        self.icons_syntaxes = self.zukan_icons + [
+            c for c in custom_icons if 'syntax' in c
+        ]
+        self.icons_preferences = self.zukan_icons + [
+            c for c in custom_icons if 'preferences' in c
+        ]
+
+        self.ignored_icon = set(zukan_syntax.ignored_icon_setting())
+        self.ignore_filter = IgnoreFilter(self.ignored_icon).compile(
+            self.icons_syntaxes + self.icons_preferences
+        )
+        self.change_icon = zukan_preference.change_icon_setting()
+        self.extension_ownership = extension_ownership(
+            zukan_syntax.change_icon_file_extension_setting()
+        )
+        self.auto_prefer_icon, self.prefer_icon = zukan_preference.prefer_icon_setting()
+        self.clean_output_dir = zukan_syntax.clean_output_dir_setting()
+        self.build_workers = get_build_workers()
+        self.staged_build = is_staged_build()
+        self.link_primary_icons = is_link_primary_icons()
+
+        self.theme_name = get_theme_name()
+        self.bgcolor = get_sidebar_bgcolor(self.theme_name)
+
+        self.compare_scopes_set = zukan_syntax.get_compare_scopes(self.zukan_icons)
+        self.sublime_scope_set = zukan_syntax.get_sublime_scope_set()
+
+
+class BuildPlan:
+    """
+    Output files for a build: sublime-syntaxes, tmPreferences, primary icons
+    PNGs and stale files to delete.
+
+    Parameters:
+    snapshot (BuildSnapshot) -- build state.
+    zukan_syntax (ZukanSyntax) -- syntaxes builder.
+    zukan_preference (ZukanPreference) -- preferences builder.
+    """
+
+    def __init__(self, snapshot: BuildSnapshot, zukan_syntax, zukan_preference):
+        self.snapshot = snapshot
+
+        with build_progress.phase(
+            'select syntaxes', len(snapshot.icons_syntaxes)
+        ) as progress:
+            self.syntaxes = zukan_syntax.select_icons_syntaxes(
+                snapshot.icons_syntaxes,
+                snapshot.compare_scopes_set,
+                snapshot.extension_ownership,
+                snapshot.ignore_filter,
+                snapshot.sublime_scope_set,
+            )
+            progress.advance(len(snapshot.icons_syntaxes))
+
+        self.preferences = []
+        with build_progress.phase(
+            'select preferences', len(snapshot.icons_preferences)
+        ) as progress:
+            for p, _, filename in zukan_preference.select_icons_preferences(
+                snapshot.icons_preferences, snapshot.ignore_filter
+            ):
+                # Icons data is read-only, settings are applied to a copy.
+                p = zukan_preference.apply_icon_preferences(
+                    thaw(p),
+                    snapshot.bgcolor,
+                    snapshot.theme_name,
+                    snapshot.change_icon,
+                    snapshot.auto_prefer_icon,
+                    snapshot.prefer_icon,
+                )
+                self.preferences.append(
+                    (
+                        os.path.join(ZUKAN_PKG_ICONS_PREFERENCES_PATH, filename),
+                        p['preferences'],
+                    )
+                )
+            progress.advance(len(snapshot.icons_preferences))
+
+        self.primary_icons = plan_primary_icons(
+            snapshot.bgcolor,
+            snapshot.theme_name,
+            snapshot.auto_prefer_icon,
+            snapshot.prefer_icon,
+            snapshot.change_icon,
+            snapshot.ignore_filter,
+        )
+
+        self.deletions = []
+        if snapshot.clean_output_dir:
+            self.deletions = self._stale_files(
+                ZUKAN_PKG_ICONS_SYNTAXES_PATH, SUBLIME_SYNTAX_EXTENSION, self.syntaxes
+            ) + self._stale_files(
+                ZUKAN_PKG_ICONS_PREFERENCES_PATH,
+                TMPREFERENCES_EXTENSION,
+                self.preferences,
+            )
+
+    def _stale_files(self, directory: str, extension: str, outputs: list) -> list:
+        if not os.path.exists(directory):
+            return []
+
+        output_paths = set(o[0] for o in outputs)
+
+        return [
+            os.path.join(directory, f)
+            for f in output_state.files(directory, extension)
+            if os.path.join(directory, f) not in output_paths
+        ]
+
+
+class ChangedIconsPlan(BuildPlan):
+    """
+    BuildPlan limited to files of icons affected by a settings change, e.g. one
+    icon added to 'ignored_icon'.
+
+    Files of changed icons, and of any icon sharing those files, are planned
+    again. Files no longer planned are deleted, other files in output
+    directories are not touched.
+
+    Parameters:
+    snapshot (BuildSnapshot) -- build state.
+    zukan_syntax (ZukanSyntax) -- syntaxes builder.
+    zukan_preference (ZukanPreference) -- preferences builder.
+    settings_diff (SettingsDiff) -- icons settings changes.
+    """
+
+    def __init__(
+        self,
+        snapshot: BuildSnapshot,
+        zukan_syntax,
+        zukan_preference,
+        settings_diff: SettingsDiff,
+    ):
+        changed = [
+            r
+            for r in snapshot.icons_syntaxes + snapshot.icons_preferences
+            if settings_diff.is_icon_changed(r)
+        ] + settings_diff.removed_custom_icons()
+
+        syntax_files = set(
+            k['name'] + SUBLIME_SYNTAX_EXTENSION
+            for r in changed
+            for k in r.get('syntax') or ()
+        )
+        preference_files = set(
+            zukan_preference._get_file_name(r['preferences']['settings']['icon'])
+            for r in changed
+            if 'preferences' in r
+        )
+
+        # Only records writing changed files, other settings still apply.
+        partial = copy.copy(snapshot)
+        partial.icons_syntaxes = [
+            s
+            for s in snapshot.icons_syntaxes
+            if any(
+                k['name'] + SUBLIME_SYNTAX_EXTENSION in syntax_files
+                for k in s.get('syntax') or ()
+            )
+        ]
+        partial.icons_preferences = [
+            p
+            for p in snapshot.icons_preferences
+            if zukan_preference._get_file_name(p['preferences']['settings']['icon'])
+            in preference_files
+        ]
+        partial.clean_output_dir = False
+
+        super().__init__(partial, zukan_syntax, zukan_preference)
+        self.snapshot = snapshot
+
+        if not settings_diff.affects_primary():
+            self.primary_icons = []
+
+        self.deletions = self._unplanned_files(
+            ZUKAN_PKG_ICONS_SYNTAXES_PATH, syntax_files, self.syntaxes
+        ) + self._unplanned_files(
+            ZUKAN_PKG_ICONS_PREFERENCES_PATH, preference_files, self.preferences
+        )
+
+        logger.debug(
+            '%d changed icons, %d sublime-syntaxes, %d tmPreferences, %d deletions.',
+            len(changed),
+            len(self.syntaxes),
+            len(self.preferences),
+            len(self.deletions),
+        )
+
+    def _unplanned_files(self, directory: str, files: set, outputs: list) -> list:
+        output_paths = set(o[0] for o in outputs)
+
+        return [
+            os.path.join(directory, f)
+            for f in sorted(files)
+            if os.path.join(directory, f) not in output_paths
+            and output_state.contains(directory, f)
+        ]
+
+
+class BuildPlanExecutor:
+    """
+    Write BuildPlan files, skipping unchanged ones with build manifest.
+
+    Files contents are rendered first, then written by a thread pool.
+
+    Parameters:
+    workers (int) -- number of threads writing files, 1 writes one file at a
+    time. Default to 1.
+    staged (bool) -- write changed files in a staging directory, and swap it
+    with output directory. Default to False.
+    """
+
+    def __init__(self, workers: int = 1, staged: bool = False):
+        self.workers = workers
+        self.staged = staged
+
+    def _emit(
+        self,
+        name: str,
+        directory: str,
+        extension: str,
+        files: list,
+        deletions: list,
+    ):
+        """
+        Write files and delete stale ones, in output directory or through a
+        staging directory.
+
+        Parameters:
+        name (str) -- build progress phase name.
+        directory (str) -- output directory.
+        extension (str) -- output files extension.
+        files (list) -- file path and content.
+        deletions (list) -- stale files paths.
+
+        Returns:
+        session (BuildSession) -- build session, not finished.
+        errors (dict) -- file path and OSError for files not written.
+        """
+        with build_progress.phase(name, len(files)) as progress:
+            return self._emit_files(directory, extension, files, deletions, progress)
+
+    def _emit_files(
+        self, directory: str, extension: str, files: list, deletions: list, progress
+    ):
+        session = build_manifest.session(directory, extension)
+
+        if self.staged:
+            changed = [(p, c) for p, c in files if session.emit(p, c)]
+            # Unchanged files are done.
+            progress.advance(len(files) - len(changed))
+
+            # Nothing to swap, ST sees no change.
+            if not changed and not deletions:
+                return session, {}
+
+            staged_output = StagedOutput(directory)
+            staged_output.prepare(set(p for p, _ in changed) | set(deletions))
+            errors = write_files(
+                [(staged_output.staged_path(p), c) for p, c in changed],
+                None,
+                self.workers,
+                progress,
+            )
+
+            if not errors and staged_output.swap():
+                for f in deletions:
+                    session.forget(f)
+                return session, {}
+
+            logger.warning('%s staged build failed, writing in place.', extension)
+            session = build_manifest.session(directory, extension)
+
+        errors = write_files(files, session, self.workers, progress)
+        for f in deletions:
+            session.delete(f)
+
+        return session, errors
+
+    def execute(self, plan: BuildPlan) -> dict:
+        """
+        Parameters:
+        plan (BuildPlan) -- build plan.
+
+        Returns:
+        (dict) -- written, skipped, deleted and errors counts for sublime-syntaxes
+        and tmPreferences, copied, linked, skipped and removed counts for primary
+        icons PNGs.
+        """
+        for d in (ZUKAN_PKG_ICONS_SYNTAXES_PATH, ZUKAN_PKG_ICONS_PREFERENCES_PATH):
+            if not os.path.exists(d):
+                os.makedirs(d)
+
+        # Build order: syntax then preferences.
+        syntaxes_session, syntaxes_errors = self._emit(
+            'syntaxes',
+            ZUKAN_PKG_ICONS_SYNTAXES_PATH,
+            SUBLIME_SYNTAX_EXTENSION,
+            [
+                (syntax_filepath, build_syntax(k, contexts_main))
+                for syntax_filepath, k, contexts_main in plan.syntaxes
+            ],
+            [f for f in plan.deletions if f.endswith(SUBLIME_SYNTAX_EXTENSION)],
+        )
+        logger.info('sublime-syntaxes created.')
+
+        preferences_session, preferences_errors = self._emit(
+            'preferences',
+            ZUKAN_PKG_ICONS_PREFERENCES_PATH,
+            TMPREFERENCES_EXTENSION,
+            [
+                (preferences_filepath, build_preference(preferences))
+                for preferences_filepath, preferences in plan.preferences
+            ],
+            [f for f in plan.deletions if f.endswith(TMPREFERENCES_EXTENSION)],
+        )
+        logger.info('tmPreferences created.')
+
+        primary_icons = apply_primary_icons(
+            plan.primary_icons, plan.snapshot.link_primary_icons
+        )
+        logger.info(
+            'primary icons: %d copied, %d linked, %d skipped, %d removed.',
+            primary_icons['copied'],
+            primary_icons['linked'],
+            primary_icons['skipped'],
+            primary_icons['removed'],
+        )
+
+        report = {
+            SUBLIME_SYNTAX_EXTENSION: syntaxes_session.finish(),
+            TMPREFERENCES_EXTENSION: preferences_session.finish(),
+            PNG_EXTENSION: primary_icons,
+        }
+        report[SUBLIME_SYNTAX_EXTENSION]['errors'] = len(syntaxes_errors)
+        report[TMPREFERENCES_EXTENSION]['errors'] = len(preferences_errors)
+
+        return report
+
+
+def build_icons_files(zukan_syntax, zukan_preference) -> dict:
+    """
+    Build sublime-syntaxes, tmPreferences and primary icons from a single
+    snapshot of icons data, settings and theme.
+
+    Parameters:
+    zukan_syntax (ZukanSyntax) -- syntaxes builder.
+    zukan_preference (ZukanPreference) -- preferences builder.
+
+    Returns:
+    (dict) -- written, skipped, deleted and errors counts for sublime-syntaxes
+    and tmPreferences, copied, linked, skipped and removed counts for primary
+    icons PNGs.
+    """
+    start = time.perf_counter()
+    snapshot = BuildSnapshot(zukan_syntax, zukan_preference)
+    snapshot_time = time.perf_counter()
+
+    plan = BuildPlan(snapshot, zukan_syntax, zukan_preference)
+    plan_time = time.perf_counter()
+
+    report = BuildPlanExecutor(snapshot.build_workers, snapshot.staged_build).execute(
+        plan
+    )
+    end = time.perf_counter()
+
+    logger.info(
+        'icons files built in %.3fs: snapshot %.3fs, plan %.3fs, execute %.3fs.',
+        end - start,
+        snapshot_time - start,
+        plan_time - snapshot_time,
+        end - plan_time,
+    )
+    return report
+
+
+def build_changed_icons_files(
+    zukan_syntax, zukan_preference, settings_diff: SettingsDiff
+) -> dict:
+    """
+    Build only sublime-syntaxes, tmPreferences and primary icons affected by
+    icons settings changes.
+
+    Parameters:
+    zukan_syntax (ZukanSyntax) -- syntaxes builder.
+    zukan_preference (ZukanPreference) -- preferences builder.
+    settings_diff (SettingsDiff) -- icons settings changes.
+
+    Returns:
+    (dict) -- written, skipped, deleted and errors counts for sublime-syntaxes
+    and tmPreferences, copied, linked, skipped and removed counts for primary
+    icons PNGs.
+    """
+    start = time.perf_counter()
+    snapshot = BuildSnapshot(zukan_syntax, zukan_preference)
+    plan = ChangedIconsPlan(snapshot, zukan_syntax, zukan_preference, settings_diff)
+
+    # Few files change, written in place. Staging would copy all kept files.
+    report = BuildPlanExecutor(snapshot.build_workers).execute(plan)
+
+    logger.info('changed icons files built in %.3fs.', time.perf_counter() - start)
+    return report
@@ -4,9 +4,13 @@ import logging
 import os
 
 from collections.abc import Set
+from ..helpers.build_manifest import BuildSession, build_manifest
 from ..helpers.copy_primary_icons import copy_primary_icons
 from ..helpers.custom_icon import generate_custom_icon
 from ..helpers.dict_to_preference import save_tm_preferences
+from ..helpers.icons_data_cache import read_zukan_icons_data, thaw
+from ..helpers.icons_index import ZukanIconIndex, zukan_icons_index
+from ..helpers.ignore_filter import IgnoreFilter
 from ..helpers.load_save_settings import (
     get_change_icon_settings,
     get_ignored_icon_settings,
@@ -14,18 +18,17 @@ from ..helpers.load_save_settings import (
     get_theme_name,
     should_clean_output_dir,
 )
-from ..helpers.read_write_data import read_pickle_data
+from ..helpers.output_state import output_state
+from ..helpers.png_catalog import png_catalog
 from ..helpers.search_themes import get_sidebar_bgcolor
 from ..utils.file_extensions import (
     PNG_EXTENSION,
-    SVG_EXTENSION,
     TMPREFERENCES_EXTENSION,
 )
 from ..utils.primary_icons import (
     PRIMARY_ICONS,
 )
 from ..utils.zukan_paths import (
-    ZUKAN_PKG_ICONS_DATA_PRIMARY_PATH,
     ZUKAN_PKG_ICONS_PATH,
     ZUKAN_PKG_ICONS_PREFERENCES_PATH,
     ZUKAN_ICONS_DATA_FILE,
@@ -58,7 +61,7 @@ class ZukanPreference:
         return get_theme_name()
 
     def zukan_icons_data(self) -> list:
-        return read_pickle_data(ZUKAN_ICONS_DATA_FILE)
+        return read_zukan_icons_data(ZUKAN_ICONS_DATA_FILE)
 
     def sidebar_bgcolor(self, theme_name: str) -> str:
         return get_sidebar_bgcolor(theme_name)
@@ -78,21 +81,30 @@ class ZukanPreference:
         Batch create preferences, delete plist tags and copy primary icons, to
         use with Thread together in install events.
         """
-        try:
-            if not os.path.exists(ZUKAN_PKG_ICONS_PREFERENCES_PATH):
-                os.makedirs(ZUKAN_PKG_ICONS_PREFERENCES_PATH)
-            # Deleting unused files for 'create_custom_icon' if preferences do not exist
-            # and not in 'create_custom_icon' anymore.
-            if self.clean_output_dir_setting() and any(
-                preference.endswith(TMPREFERENCES_EXTENSION)
-                for preference in os.listdir(ZUKAN_PKG_ICONS_PREFERENCES_PATH)
-            ):
-                self.delete_icons_preferences()
-        finally:
-            theme_name = self.theme_name_setting()
-            bgcolor = self.sidebar_bgcolor(theme_name)
-            self.create_icons_preferences(bgcolor, theme_name)
-            copy_primary_icons(bgcolor, theme_name)
+        if not os.path.exists(ZUKAN_PKG_ICONS_PREFERENCES_PATH):
+            os.makedirs(ZUKAN_PKG_ICONS_PREFERENCES_PATH)
+
+        session = self.build_session()
+        theme_name = self.theme_name_setting()
+        bgcolor = self.sidebar_bgcolor(theme_name)
+        self.create_icons_preferences(bgcolor, theme_name, session)
+        # Deleting unused files for 'create_custom_icon' if preferences do not exist
+        # and not in 'create_custom_icon' anymore.
+        if self.clean_output_dir_setting():
+            session.delete_stale()
+        session.finish()
+        copy_primary_icons(bgcolor, theme_name)
+
+    def build_session(self) -> BuildSession:
+        """
+        Build session for icons_preferences folder.
+
+        Returns:
+        (BuildSession) -- build session.
+        """
+        return build_manifest.session(
+            ZUKAN_PKG_ICONS_PREFERENCES_PATH, TMPREFERENCES_EXTENSION
+        )
 
     def _apply_change_icon(self, p: dict, change_icon: dict):
         if change_icon:
@@ -122,17 +134,7 @@ class ZukanPreference:
                             'icon'
                         ].replace('-light', '-dark')
 
-                    if os.path.exists(
-                        os.path.join(
-                            ZUKAN_PKG_ICONS_PATH,
-                            prefer_icon_version + PNG_EXTENSION,
-                        )
-                    ) or os.path.exists(
-                        os.path.join(
-                            ZUKAN_PKG_ICONS_DATA_PRIMARY_PATH,
-                            prefer_icon_version + PNG_EXTENSION,
-                        )
-                    ):
+                    if png_catalog.exists(prefer_icon_version):
                         p['preferences']['settings']['icon'] = prefer_icon_version
                         logger.debug(
                             'prefer icon %s',
@@ -170,17 +172,7 @@ class ZukanPreference:
                         '-light', '-dark'
                     )
 
-                if os.path.exists(
-                    os.path.join(
-                        ZUKAN_PKG_ICONS_PATH,
-                        prefer_icon_version + PNG_EXTENSION,
-                    )
-                ) or os.path.exists(
-                    os.path.join(
-                        ZUKAN_PKG_ICONS_DATA_PRIMARY_PATH,
-                        prefer_icon_version + PNG_EXTENSION,
-                    )
-                ):
+                if png_catalog.exists(prefer_icon_version):
                     p['preferences']['settings']['icon'] = prefer_icon_version
                     logger.debug(
                         'prefer icon %s',
@@ -201,11 +193,8 @@ class ZukanPreference:
                     )
 
     def _png_exists(self, p: dict):
-        if not os.path.exists(
-            os.path.join(
-                ZUKAN_PKG_ICONS_PATH,
-                p['preferences']['settings']['icon'] + PNG_EXTENSION,
-            )
+        if not png_catalog.exists(
+            p['preferences']['settings']['icon'], (ZUKAN_PKG_ICONS_PATH,)
         ):
             logger.warning(
                 '%s%s not found',
@@ -213,30 +202,28 @@ class ZukanPreference:
                 PNG_EXTENSION,
             )
 
-    def handle_icon_preferences(
+    def apply_icon_preferences(
         self,
         p: dict,
-        icon_name: str,
-        filename: str,
         bgcolor: str,
         theme_name: str,
         change_icon: dict,
         auto_prefer_icon: bool,
         prefer_icon: dict,
-    ):
+    ) -> dict:
         """
-        Handle the zukan settings to choose icon option, version or ignore an icon.
+        Apply the zukan settings to choose icon option or version.
 
         Parameters:
-        p (dict) -- dict with icon data.
-        icon_name (str) -- icon name or icon option name.
-        filename (str) -- icon name or icon option name with tmPreferences file
-        extension, excluding '-dark' or '-light' from name.
+        p (dict) -- dict with icon data, edited in place.
         bgcolor (str) -- theme background color.
         theme_name (str) -- theme name.
         change_icon (dict) -- dictionary with name and icon name.
         auto_prefer_icon (bool) -- auto prefere icon settiong, true or false.
         prefer_icon (dict) -- dictionary with theme name and prefer icon, light or dark.
+
+        Returns:
+        p (dict) -- dict with icon data.
         """
         # 'change_icon' setting
         self._apply_change_icon(p, change_icon)
@@ -260,9 +247,42 @@ class ZukanPreference:
 
         # print(p['preferences'])
 
+        return p
+
+    def handle_icon_preferences(
+        self,
+        p: dict,
+        icon_name: str,
+        filename: str,
+        bgcolor: str,
+        theme_name: str,
+        change_icon: dict,
+        auto_prefer_icon: bool,
+        prefer_icon: dict,
+        session: BuildSession = None,
+    ):
+        """
+        Handle the zukan settings to choose icon option, version or ignore an icon.
+
+        Parameters:
+        p (dict) -- dict with icon data.
+        icon_name (str) -- icon name or icon option name.
+        filename (str) -- icon name or icon option name with tmPreferences file
+        extension, excluding '-dark' or '-light' from name.
+        bgcolor (str) -- theme background color.
+        theme_name (str) -- theme name.
+        change_icon (dict) -- dictionary with name and icon name.
+        auto_prefer_icon (bool) -- auto prefere icon settiong, true or false.
+        prefer_icon (dict) -- dictionary with theme name and prefer icon, light or dark.
+        session (Optional[BuildSession]) -- build session, default to None.
+        """
+        self.apply_icon_preferences(
+            p, bgcolor, theme_name, change_icon, auto_prefer_icon, prefer_icon
+        )
+
         preferences_filepath = os.path.join(ZUKAN_PKG_ICONS_PREFERENCES_PATH, filename)
 
-        save_tm_preferences(p['preferences'], preferences_filepath)
+        save_tm_preferences(p['preferences'], preferences_filepath, session)
 
     def get_list_icons_preferences(self):
         list_all_icons_preferences = []
@@ -276,6 +296,22 @@ class ZukanPreference:
 
         return list_all_icons_preferences
 
+    def get_icons_index(self) -> ZukanIconIndex:
+        """
+        Index for icons data and 'create_custom_icon' setting preferences.
+
+        Returns:
+        (ZukanIconIndex) -- icons index, custom icons searched last.
+        """
+        zukan_icons = self.zukan_icons_data()
+
+        # 'create_custom_icon' setting
+        custom_list = [
+            p for p in generate_custom_icon(zukan_icons) if 'preferences' in p
+        ]
+
+        return zukan_icons_index(zukan_icons).extend(custom_list)
+
     def _get_file_name(self, icon_name: str) -> str:
         # Remove '-dark' and '-light' from tmPreferences name.
         if icon_name.endswith('-dark'):
@@ -300,36 +336,28 @@ class ZukanPreference:
         bgcolor (str) -- theme background color.
         theme_name (str) -- theme name.
         """
-        list_all_icons_preferences = self.get_list_icons_preferences()
-        # print(list_all_icons_preferences)
+        icons_index = self.get_icons_index()
 
         auto_prefer_icon, prefer_icon = self.prefer_icon_setting()
         change_icon = self.change_icon_setting()
-        ignored_icon = self.ignored_icon_setting()
+        ignore_filter = IgnoreFilter(self.ignored_icon_setting())
 
-        for p in list_all_icons_preferences:
-            if (
-                p['preferences']['settings']['icon'] == preference_name
-                and p['preferences'].get('scope') is not None
-                and not (
-                    p['name'] in ignored_icon
-                    or p['preferences']['settings']['icon'] in ignored_icon
-                    or (p['preferences']['settings']['icon'] + SVG_EXTENSION)
-                    in ignored_icon
-                    or (p.get('tag') is not None and p['tag'] in ignored_icon)
-                    # Icons options
-                    # Need to add SVG_EXTENSION to icons options
-                    or (
-                        'icons' in p and any(x for x in p['icons'] if x in ignored_icon)
-                    )
-                )
-            ):
+        for p in icons_index.records_by_icon(preference_name):
+            if p['preferences'].get('scope') is None:
+                continue
+
+            if ignore_filter.is_ignored(p):
+                logger.info('ignored icon %s', p['name'])
+
+            # Icons options
+            elif not ignore_filter.is_option_ignored(p):
                 # Remove '-dark' and '-light' from tmPreferences name.
                 icon_name = p['preferences']['settings']['icon']
                 filename = self._get_file_name(icon_name)
 
+                # Icons data is read-only, settings are applied to a copy.
                 self.handle_icon_preferences(
-                    p,
+                    thaw(p),
                     icon_name,
                     filename,
                     bgcolor,
@@ -339,19 +367,6 @@ class ZukanPreference:
                     prefer_icon,
                 )
 
-            elif (
-                p['preferences']['settings']['icon'] == preference_name
-                and p['preferences'].get('scope') is not None
-                and (
-                    p['name'] in ignored_icon
-                    or p['preferences']['settings']['icon'] in ignored_icon
-                    or (p['preferences']['settings']['icon'] + SVG_EXTENSION)
-                    in ignored_icon
-                    or (p.get('tag') is not None and p['tag'] in ignored_icon)
-                )
-            ):
-                logger.info('ignored icon %s', p['name'])
-
     def create_icon_preference(
         self, preference_name: str, bgcolor: str, theme_name: str
     ):
@@ -392,7 +407,9 @@ class ZukanPreference:
                 fname,
             )
 
-    def prepare_icons_preferences_list(self, bgcolor: str, theme_name: str):
+    def prepare_icons_preferences_list(
+        self, bgcolor: str, theme_name: str, session: BuildSession = None
+    ):
         """
         Prepare icons preferences list, from icons data and setting 'create_custom_icon'.
         And handle the zukan settings to choose icon option, version or ignore an icon.
@@ -400,58 +417,81 @@ class ZukanPreference:
         Parameters:
         bgcolor (str) -- theme background color.
         theme_name (str) -- theme name.
+        session (Optional[BuildSession]) -- build session, default to None.
         """
         list_all_icons_preferences = self.get_list_icons_preferences()
 
         auto_prefer_icon, prefer_icon = self.prefer_icon_setting()
         change_icon = self.change_icon_setting()
-        ignored_icon = self.ignored_icon_setting()
+        ignore_filter = IgnoreFilter(self.ignored_icon_setting()).compile(
+            list_all_icons_preferences
+        )
+
+        for p, icon_name, filename in self.select_icons_preferences(
+            list_all_icons_preferences, ignore_filter
+        ):
+            # Icons data is read-only, settings are applied to a copy.
+            self.handle_icon_preferences(
+                thaw(p),
+                icon_name,
+                filename,
+                bgcolor,
+                theme_name,
+                change_icon,
+                auto_prefer_icon,
+                prefer_icon,
+                session,
+            )
+
+    def select_icons_preferences(
+        self, list_all_icons_preferences: list, ignore_filter: IgnoreFilter
+    ) -> list:
+        """
+        Icons preferences to create, excluding 'ignored_icon' setting and icons
+        without scope.
+
+        Parameters:
+        list_all_icons_preferences (list) -- icons data and 'create_custom_icon'.
+        ignore_filter (IgnoreFilter) -- 'ignored_icon' setting.
+
+        Returns:
+        (list) -- tuples (icon data, icon name, tmPreferences file name).
+        """
+        icons_preferences = []
 
         for p in list_all_icons_preferences:
+            is_ignored = ignore_filter.is_ignored(p)
+
             if p['preferences'].get('scope') is not None and not (
-                p['name'] in ignored_icon
-                or p['preferences']['settings']['icon'] in ignored_icon
-                or (p['preferences']['settings']['icon'] + SVG_EXTENSION)
-                in ignored_icon
-                or (p.get('tag') is not None and p['tag'] in ignored_icon)
+                is_ignored
                 # Icons options
-                # Need to add SVG_EXTENSION to icons options
-                or ('icons' in p and any(x for x in p['icons'] if x in ignored_icon))
+                or ignore_filter.is_option_ignored(p)
             ):
                 # Remove '-dark' and '-light' from tmPreferences name.
                 icon_name = p['preferences']['settings']['icon']
                 filename = self._get_file_name(icon_name)
 
-                self.handle_icon_preferences(
-                    p,
-                    icon_name,
-                    filename,
-                    bgcolor,
-                    theme_name,
-                    change_icon,
-                    auto_prefer_icon,
-                    prefer_icon,
-                )
+                icons_preferences.append((p, icon_name, filename))
 
-            elif (
-                p['name'] in ignored_icon
-                or p['preferences']['settings']['icon'] in ignored_icon
-                or (p['preferences']['settings']['icon'] + SVG_EXTENSION)
-                in ignored_icon
-                or (p.get('tag') is not None and p['tag'] in ignored_icon)
-            ):
+            elif is_ignored:
                 logger.info('ignored icon %s', p['name'])
 
-    def create_icons_preferences(self, bgcolor: str, theme_name: str):
+        return icons_preferences
+
+    def create_icons_preferences(
+        self, bgcolor: str, theme_name: str, session: BuildSession = None
+    ):
         """
         Create icons tmPreferences files.
 
         Parameters:
         bgcolor (str) -- theme background color.
         theme_name (str) -- theme name.
+        session (Optional[BuildSession]) -- build session, skip unchanged files.
+        Default to None.
         """
         try:
-            self.prepare_icons_preferences_list(bgcolor, theme_name)
+            self.prepare_icons_preferences_list(bgcolor, theme_name, session)
 
             logger.info('tmPreferences created.')
 
@@ -486,6 +526,7 @@ class ZukanPreference:
                 ZUKAN_PKG_ICONS_PREFERENCES_PATH, preference_name
             )
             os.remove(preference_file)
+            output_state.removed(preference_file)
             logger.info(
                 'deleting icon preference %s', os.path.basename(preference_file)
             )
@@ -537,12 +578,9 @@ class ZukanPreference:
         try:
             list_preferences_installed = []
             if os.path.exists(ZUKAN_PKG_ICONS_PREFERENCES_PATH):
-                for file in glob.glob(
-                    os.path.join(
-                        ZUKAN_PKG_ICONS_PREFERENCES_PATH, '*' + TMPREFERENCES_EXTENSION
-                    )
-                ):
-                    list_preferences_installed.append(os.path.basename(file))
+                list_preferences_installed = output_state.files(
+                    ZUKAN_PKG_ICONS_PREFERENCES_PATH, TMPREFERENCES_EXTENSION
+                )
                 return list_preferences_installed
             else:
                 raise FileNotFoundError(logger.error('file or directory do not exist.'))
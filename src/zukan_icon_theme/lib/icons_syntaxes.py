@@ -2,32 +2,31 @@ import errno
 import glob
 import logging
 import os
-import re
 import sublime
-import threading
 
 from collections.abc import Set
+from ..helpers.build_jobs import SCOPE_SYNTAXES, BuildJob, build_jobs
+from ..helpers.build_manifest import BuildSession, build_manifest
 from ..helpers.copy_primary_icons import copy_primary_icons
 from ..helpers.custom_icon import generate_custom_icon
-from ..helpers.dict_to_syntax import save_sublime_syntax
-from ..helpers.edit_file_extension import edit_file_extension
+from ..helpers.dict_to_syntax import build_contexts_main, save_sublime_syntax
+from ..helpers.edit_file_extension import ExtensionOwnership, extension_ownership
+from ..helpers.icons_data_cache import read_zukan_icons_data
+from ..helpers.icons_index import ZukanIconIndex, zukan_icons_index
+from ..helpers.ignore_filter import IgnoreFilter
 from ..helpers.load_save_settings import (
     get_change_icon_settings,
     get_ignored_icon_settings,
     should_clean_output_dir,
 )
-from ..helpers.read_write_data import (
-    edit_contexts_main,
-    read_pickle_data,
-)
-from ..helpers.search_syntaxes import compare_scopes
+from ..helpers.output_state import output_state
+from ..helpers.search_syntaxes import compare_scopes, syntax_registry
 from ..helpers.thread_progress import ThreadProgress
 from ..utils.contexts_scopes import (
     CONTEXTS_SCOPES,
 )
 from ..utils.file_extensions import (
     SUBLIME_SYNTAX_EXTENSION,
-    SVG_EXTENSION,
 )
 from ..utils.zukan_paths import (
     ZUKAN_PKG_ICONS_SYNTAXES_PATH,
@@ -46,7 +45,7 @@ class ZukanSyntax:
         self.sublime_version = int(sublime.version())
 
     def zukan_icons_data(self) -> list:
-        return read_pickle_data(ZUKAN_ICONS_DATA_FILE)
+        return read_zukan_icons_data(ZUKAN_ICONS_DATA_FILE)
 
     def change_icon_file_extension_setting(self) -> list:
         _, change_icon_file_extension = get_change_icon_settings()
@@ -67,48 +66,56 @@ class ZukanSyntax:
         file_name (str) -- syntax file name, without extension.
         syntax_name (str) -- syntax name, file name and extension.
         """
-        ts = threading.Thread(
-            target=self.build_icon_syntax, args=(file_name, syntax_name)
+        job = build_jobs.submit(
+            BuildJob(
+                ('build_icon_syntax', file_name),
+                self.build_icon_syntax,
+                (file_name, syntax_name),
+                SCOPE_SYNTAXES,
+            )
         )
-        ts.start()
-        ThreadProgress(ts, 'Building zukan syntaxes', 'Build done')
+        ThreadProgress(job, 'Building zukan syntaxes', 'Build done')
 
     def install_syntaxes(self):
         """
         Using Thread to install syntax to avoid freezing ST to build syntaxes.
         """
-        ts = threading.Thread(target=self.build_icons_syntaxes)
-        ts.start()
-        ThreadProgress(ts, 'Building zukan syntaxes', 'Build done')
+        job = build_jobs.submit(
+            BuildJob(
+                ('build_icons_syntaxes',),
+                self.build_icons_syntaxes,
+                scope=SCOPE_SYNTAXES,
+                full=True,
+            )
+        )
+        ThreadProgress(job, 'Building zukan syntaxes', 'Build done')
 
     def build_icon_syntax(self, file_name: str, syntax_name: str):
         """
-        Batch create syntax, edit context scope, and copy primary icons,
-        to use with Thread together in install events.
+        Batch create syntax and copy primary icons, to use with Thread together
+        in install events.
 
         Parameters:
         file_name (str) -- syntax file name, without extension.
         syntax_name (str) -- syntax name, file name and extension.
         """
         self.create_icon_syntax(file_name)
-        self.edit_context_scope(syntax_name)
         copy_primary_icons()
 
     def build_icons_syntaxes(self):
         """
-        Batch create syntaxes, edit contexts scopes and copy primary icons,
-        to use with Thread together in install events.
+        Batch create syntaxes and copy primary icons, to use with Thread together
+        in install events.
         """
         if not os.path.exists(ZUKAN_PKG_ICONS_SYNTAXES_PATH):
             os.makedirs(ZUKAN_PKG_ICONS_SYNTAXES_PATH)
+        session = self.build_session()
+        self.create_icons_syntaxes(session)
         # Deleting syntax for 'change_icon_file_extension' and 'create_custom_icon'
-        if self.clean_output_dir_setting() and any(
-            syntax.endswith(SUBLIME_SYNTAX_EXTENSION)
-            for syntax in os.listdir(ZUKAN_PKG_ICONS_SYNTAXES_PATH)
-        ):
-            self.delete_icons_syntaxes()
-        self.create_icons_syntaxes()
-        self.edit_contexts_scopes()
+        # that were not created in this build.
+        if self.clean_output_dir_setting():
+            session.delete_stale()
+        session.finish()
         copy_primary_icons()
 
     def get_list_icons_syntaxes(self, zukan_icons: list) -> list:
@@ -120,6 +127,32 @@ class ZukanSyntax:
 
         return list_all_icons_syntaxes
 
+    def build_session(self) -> BuildSession:
+        """
+        Build session for icons_syntaxes folder.
+
+        Returns:
+        (BuildSession) -- build session.
+        """
+        return build_manifest.session(
+            ZUKAN_PKG_ICONS_SYNTAXES_PATH, SUBLIME_SYNTAX_EXTENSION
+        )
+
+    def get_icons_index(self, zukan_icons: list) -> ZukanIconIndex:
+        """
+        Index for icons data and 'create_custom_icon' setting syntaxes.
+
+        Parameters:
+        zukan_icons (list) -- zukan icons data.
+
+        Returns:
+        (ZukanIconIndex) -- icons index, custom icons searched last.
+        """
+        # 'create_custom_icon' setting
+        custom_list = [s for s in generate_custom_icon(zukan_icons) if 'syntax' in s]
+
+        return zukan_icons_index(zukan_icons).extend(custom_list)
+
     def get_compare_scopes(self, zukan_icons: list) -> Set:
         zukan_compare_scopes = compare_scopes(zukan_icons)
 
@@ -132,17 +165,41 @@ class ZukanSyntax:
     def get_sublime_scope_set(self) -> Set:
         syntax_contexts_scope_set = set(c['scope'] for c in CONTEXTS_SCOPES)
 
-        sublime_scope_set = {}
-        for s in syntax_contexts_scope_set:
-            sublime_scope = sublime.find_syntax_by_scope(s)
-            if sublime_scope:
-                sublime_scope_set[s] = True
-            else:
-                sublime_scope_set[s] = False
+        sublime_scope_set = syntax_registry.scopes_available(syntax_contexts_scope_set)
 
         # print(sublime_scope_set)
         return sublime_scope_set
 
+    def get_contexts_main(self, filename: str, sublime_scope_set: dict) -> str:
+        """
+        Contexts main for a zukan icon sublime-syntax, decided before file is
+        written.
+
+        If syntax not installed or disabled, it changes contexts main for empty list.
+        This avoid error in console about syntax not found. If syntax installed
+        and ST version lower than 4075, it changes to a compat contexts main.
+
+        Parameters:
+        filename (str) -- sublime-syntax file name.
+        sublime_scope_set (dict) -- contexts scopes, True if installed.
+
+        Returns:
+        (Optional[str]) -- contexts main, None if it does not change.
+        """
+        for c in CONTEXTS_SCOPES:
+            if c['startsWith'] not in filename:
+                continue
+
+            if sublime_scope_set.get(c['scope']):
+                # Change to compat with ST3 contexts main
+                if self.sublime_version < 4075:
+                    return build_contexts_main(c['scope'])
+            else:
+                # Syntaxes not installed or disabled
+                return build_contexts_main()
+
+        return None
+
     def create_icon_syntax(self, syntax_name: str):
         """
         Create icon sublime-syntax file.
@@ -153,76 +210,45 @@ class ZukanSyntax:
         try:
             zukan_icons = self.zukan_icons_data()
             compare_scopes_set = self.get_compare_scopes(zukan_icons)
-            change_icon_file_extension = self.change_icon_file_extension_setting()
-            ignored_icon = self.ignored_icon_setting()
+            ownership = extension_ownership(self.change_icon_file_extension_setting())
+            ignore_filter = IgnoreFilter(self.ignored_icon_setting())
+            sublime_scope_set = self.get_sublime_scope_set()
 
-            list_all_icons_syntaxes = self.get_list_icons_syntaxes(zukan_icons)
+            icons_index = self.get_icons_index(zukan_icons)
 
-            for s in list_all_icons_syntaxes:
-                if (
-                    any('syntax' in d for d in s)
-                    and s.get('syntax') is not None
-                    # 'ignored_icon' setting
-                    and not (
-                        s['name'] in ignored_icon
-                        or (
-                            # Icon can not exist in 'create_custom_icon' setting
-                            # when only creating syntax
-                            'preferences' in s
-                            and (
-                                s['preferences']['settings']['icon'] in ignored_icon
-                                or (
-                                    s['preferences']['settings']['icon'] + SVG_EXTENSION
-                                )
-                                in ignored_icon
-                                or (
-                                    s.get('tag') is not None
-                                    and s['tag'] in ignored_icon
-                                )
-                            )
-                        )
-                    )
-                ):
-                    for k in s['syntax']:
-                        scope = k.get('scope')
-
-                        if (
-                            scope
-                            and scope not in compare_scopes_set
-                            and k['name'] == syntax_name
-                        ):
-                            filename = k['name'] + SUBLIME_SYNTAX_EXTENSION
-
-                            # 'change_scope_file_extension' setting
-                            k['file_extensions'] = edit_file_extension(
-                                k['file_extensions'],
-                                k['scope'],
-                                change_icon_file_extension,
-                            )
+            for s, k in icons_index.syntaxes_by_name(syntax_name):
+                # 'ignored_icon' setting
+                if ignore_filter.is_ignored(s):
+                    logger.info('ignored icon %s', s['name'])
+                    continue
 
-                            # file_extensions list can be empty
-                            if k['file_extensions']:
-                                syntax_filepath = os.path.join(
-                                    ZUKAN_PKG_ICONS_SYNTAXES_PATH, filename
-                                )
-                                # print(save_sublime_syntax(k, syntax_filepath))
-                                save_sublime_syntax(k, syntax_filepath)
-                                logger.info('%s created.', filename)
-                elif (
-                    any('syntax' in d for d in s)
-                    and s.get('syntax') is not None
-                    and (
-                        s['name'] in ignored_icon
-                        or s['preferences']['settings']['icon'] in ignored_icon
-                        or (s['preferences']['settings']['icon'] + SVG_EXTENSION)
-                        in ignored_icon
-                        or (s.get('tag') is not None and s['tag'] in ignored_icon)
+                scope = k.get('scope')
+
+                if scope and scope not in compare_scopes_set:
+                    filename = k['name'] + SUBLIME_SYNTAX_EXTENSION
+
+                    # 'change_scope_file_extension' setting
+                    # Icons data is read-only, edit a copy.
+                    k = dict(
+                        k,
+                        file_extensions=ownership.filter_file_extensions(
+                            k['file_extensions'], k['scope']
+                        ),
                     )
-                ):
-                    for k in s['syntax']:
-                        if k['name'] == syntax_name:
-                            logger.info('ignored icon %s', s['name'])
-            # return self.zukan_icons
+
+                    # file_extensions list can be empty
+                    if k['file_extensions']:
+                        syntax_filepath = os.path.join(
+                            ZUKAN_PKG_ICONS_SYNTAXES_PATH, filename
+                        )
+                        save_sublime_syntax(
+                            k,
+                            syntax_filepath,
+                            contexts_main=self.get_contexts_main(
+                                filename, sublime_scope_set
+                            ),
+                        )
+                        logger.info('%s created.', filename)
         except FileNotFoundError:
             logger.error(
                 '[Errno %d] %s: %r', errno.ENOENT, os.strerror(errno.ENOENT), filename
@@ -232,73 +258,99 @@ class ZukanSyntax:
                 '[Errno %d] %s: %r', errno.EACCES, os.strerror(errno.EACCES), filename
             )
 
-    def create_icons_syntaxes(self):
+    def select_icons_syntaxes(
+        self,
+        list_all_icons_syntaxes: list,
+        compare_scopes_set: Set,
+        ownership: ExtensionOwnership,
+        ignore_filter: IgnoreFilter,
+        sublime_scope_set: dict,
+    ) -> list:
+        """
+        Icons sublime-syntaxes to create, excluding 'ignored_icon' setting,
+        syntaxes that already exist in ST and syntaxes without file extensions.
+
+        Parameters:
+        list_all_icons_syntaxes (list) -- icons data and 'create_custom_icon'.
+        compare_scopes_set (Set) -- scopes that exist in ST.
+        ownership (ExtensionOwnership) -- file extensions owners, from
+        'change_icon_file_extension' setting.
+        ignore_filter (IgnoreFilter) -- 'ignored_icon' setting.
+        sublime_scope_set (dict) -- contexts scopes, True if installed.
+
+        Returns:
+        (list) -- tuples (sublime-syntax file path, sublime-syntax dict, contexts
+        main or None).
+        """
+        icons_syntaxes = []
+
+        for s in list_all_icons_syntaxes:
+            # 'ignored_icon' setting
+            is_ignored = ignore_filter.is_ignored(s)
+
+            if s.get('syntax') is not None and not is_ignored:
+                for k in s['syntax']:
+                    scope = k.get('scope')
+
+                    if scope and scope not in compare_scopes_set:
+                        filename = k['name'] + SUBLIME_SYNTAX_EXTENSION
+
+                        # 'change_scope_file_extension' setting
+                        # Icons data is read-only, edit a copy.
+                        k = dict(
+                            k,
+                            file_extensions=ownership.filter_file_extensions(
+                                k['file_extensions'], k['scope']
+                            ),
+                        )
+
+                        # file_extensions list can be empty
+                        if k['file_extensions']:
+                            syntax_filepath = os.path.join(
+                                ZUKAN_PKG_ICONS_SYNTAXES_PATH, filename
+                            )
+                            icons_syntaxes.append(
+                                (
+                                    syntax_filepath,
+                                    k,
+                                    self.get_contexts_main(filename, sublime_scope_set),
+                                )
+                            )
+
+            elif is_ignored:
+                logger.info('ignored icon %s', s['name'])
+
+        return icons_syntaxes
+
+    def create_icons_syntaxes(self, session: BuildSession = None):
         """
         Create icons sublime-syntaxes files.
+
+        Parameters:
+        session (Optional[BuildSession]) -- build session, skip unchanged files.
+        Default to None.
         """
         try:
             zukan_icons = self.zukan_icons_data()
             compare_scopes_set = self.get_compare_scopes(zukan_icons)
-            change_icon_file_extension = self.change_icon_file_extension_setting()
-            ignored_icon = self.ignored_icon_setting()
+            ownership = extension_ownership(self.change_icon_file_extension_setting())
+            sublime_scope_set = self.get_sublime_scope_set()
 
             list_all_icons_syntaxes = self.get_list_icons_syntaxes(zukan_icons)
+            ignore_filter = IgnoreFilter(self.ignored_icon_setting()).compile(
+                list_all_icons_syntaxes
+            )
 
-            for s in list_all_icons_syntaxes:
-                if (
-                    any('syntax' in d for d in s)
-                    and s.get('syntax') is not None
-                    # 'ignored_icon' setting
-                    and not (
-                        s['name'] in ignored_icon
-                        or (
-                            # Icon can not exist in 'create_custom_icon' setting
-                            # when only creating syntax
-                            'preferences' in s
-                            and (
-                                s['preferences']['settings']['icon'] in ignored_icon
-                                or (
-                                    s['preferences']['settings']['icon'] + SVG_EXTENSION
-                                )
-                                in ignored_icon
-                                or (
-                                    s.get('tag') is not None
-                                    and s['tag'] in ignored_icon
-                                )
-                            )
-                        )
-                    )
-                ):
-                    for k in s['syntax']:
-                        scope = k.get('scope')
-
-                        # if k['scope'] not in compare_scopes_set:
-                        if scope and scope not in compare_scopes_set:
-                            filename = k['name'] + SUBLIME_SYNTAX_EXTENSION
-
-                            # 'change_scope_file_extension' setting
-                            k['file_extensions'] = edit_file_extension(
-                                k['file_extensions'],
-                                k['scope'],
-                                change_icon_file_extension,
-                            )
-
-                            # file_extensions list can be empty
-                            if k['file_extensions']:
-                                syntax_filepath = os.path.join(
-                                    ZUKAN_PKG_ICONS_SYNTAXES_PATH, filename
-                                )
-
-                                save_sublime_syntax(k, syntax_filepath)
+            for syntax_filepath, k, contexts_main in self.select_icons_syntaxes(
+                list_all_icons_syntaxes,
+                compare_scopes_set,
+                ownership,
+                ignore_filter,
+                sublime_scope_set,
+            ):
+                filename = os.path.basename(syntax_filepath)
+                save_sublime_syntax(k, syntax_filepath, session, contexts_main)
 
-                elif (
-                    s['name'] in ignored_icon
-                    or s['preferences']['settings']['icon'] in ignored_icon
-                    or (s['preferences']['settings']['icon'] + SVG_EXTENSION)
-                    in ignored_icon
-                    or (s.get('tag') is not None and s['tag'] in ignored_icon)
-                ):
-                    logger.info('ignored icon %s', s['name'])
             logger.info('sublime-syntaxes created.')
 
             # return self.zukan_icons
@@ -323,6 +375,7 @@ class ZukanSyntax:
         try:
             syntax_file = os.path.join(ZUKAN_PKG_ICONS_SYNTAXES_PATH, syntax_name)
             os.remove(syntax_file)
+            output_state.removed(syntax_file)
             logger.info('deleting icon syntax %s', os.path.basename(syntax_file))
             return syntax_name
         except FileNotFoundError:
@@ -371,127 +424,6 @@ class ZukanSyntax:
                 '[Errno %d] %s: %r', errno.EACCES, os.strerror(errno.EACCES), s
             )
 
-    def edit_context_scope(self, syntax_name: str):
-        """
-        Edit contexts main in zukan icon sublime-syntax file.
-
-        If syntax not installed or disabled, it changes contexts main for empty list.
-        This avoid error in console about syntax not found.
-
-        Parameters:
-        syntax_name (str) -- icon syntax file name.
-        """
-        syntax_file = os.path.join(ZUKAN_PKG_ICONS_SYNTAXES_PATH, syntax_name)
-        # sublime_version = int(sublime.version())
-
-        if os.path.exists(syntax_file):
-            logger.info('editing icon context scope if syntax not installed.')
-
-            try:
-                with open(syntax_file, 'r') as f:
-                    content = f.read()
-
-                regex_contexts_main = (
-                    r'contexts:\n\s*main:\n\s*- include: .*?\n\s*'
-                    '  apply_prototype: .*?\n'
-                )
-
-                sublime_scope_set = self.get_sublime_scope_set()
-
-                contexts_main_scope = content.find('- include: scope:')
-                # Need to exclude the apply_prototype line
-                if contexts_main_scope != -1:
-                    scope_start = contexts_main_scope + len('- include: scope:')
-                    scope_end = content.find(' ', scope_start)
-                    if scope_end == -1:
-                        scope_end = content.find('\n', scope_start)
-
-                    scope = content[scope_start:scope_end].strip()
-                else:
-                    scope = ''
-
-                # print(scope)
-
-                if sublime_scope_set.get(scope) is True:
-                    if self.sublime_version >= 4075:
-                        return
-                    else:
-                        # Could not find other references, got this contexts main
-                        # format, for ST versions lower than 4075, from A File
-                        # Icon package.
-                        include_scope_prop = 'scope:{s}#prototype'.format(s=scope)
-                        include_scope = 'scope:{s}'.format(s=scope)
-
-                        contexts_main = (
-                            'contexts:\n  main:\n    - include: {p}\n      '
-                            'include: {s}\n'.format(
-                                p=include_scope_prop, s=include_scope
-                            )
-                        )
-
-                        content = re.sub(regex_contexts_main, contexts_main, content)
-                else:
-                    contexts_main = 'contexts:\n  main: []\n'
-
-                    content = re.sub(
-                        regex_contexts_main,
-                        contexts_main,
-                        content,
-                    )
-
-                # print(content)
-
-                with open(syntax_file, 'w') as f:
-                    f.write(content)
-
-            except FileNotFoundError:
-                logger.error(
-                    '[Errno %d] %s: %r',
-                    errno.ENOENT,
-                    os.strerror(errno.ENOENT),
-                    syntax_file,
-                )
-            except OSError:
-                logger.error(
-                    '[Errno %d] %s: %r',
-                    errno.EACCES,
-                    os.strerror(errno.EACCES),
-                    syntax_file,
-                )
-
-    def edit_contexts_scopes(self):
-        """
-        Edit contexts main in zukan icons sublime-syntax files.
-
-        If syntax not installed or disabled, it changes contexts main for empty list.
-        This avoid error in console about syntax not found.
-        """
-        logger.info('editing icons contexts scopes if syntax not installed.')
-
-        # sublime_version = int(sublime.version())
-        installed_syntaxes_list = self.list_created_icons_syntaxes()
-        sublime_scope_set = self.get_sublime_scope_set()
-
-        for c in CONTEXTS_SCOPES:
-            if sublime_scope_set.get(c['scope']):
-                # print(c)
-                for i in installed_syntaxes_list:
-                    # Change to compat with ST3 contexts main
-                    if c['startsWith'] in i and self.sublime_version < 4075:
-                        # print(i)
-                        edit_contexts_main(
-                            os.path.join(ZUKAN_PKG_ICONS_SYNTAXES_PATH, i), c['scope']
-                        )
-            else:
-                # Syntaxes not installed or disabled
-                for i in installed_syntaxes_list:
-                    # Change contexts main empty if not installed or disable
-                    if c['startsWith'] in i:
-                        # print(i)
-                        edit_contexts_main(
-                            os.path.join(ZUKAN_PKG_ICONS_SYNTAXES_PATH, i), None
-                        )
-
     def list_created_icons_syntaxes(self) -> list:
         """
         List all sublime-syntax files in Zukan Icon Theme/icons_syntaxes folder.
@@ -503,12 +435,9 @@ class ZukanSyntax:
         try:
             list_syntaxes_installed = []
             if os.path.exists(ZUKAN_PKG_ICONS_SYNTAXES_PATH):
-                for file in glob.glob(
-                    os.path.join(
-                        ZUKAN_PKG_ICONS_SYNTAXES_PATH, '*' + SUBLIME_SYNTAX_EXTENSION
-                    )
-                ):
-                    list_syntaxes_installed.append(os.path.basename(file))
+                list_syntaxes_installed = output_state.files(
+                    ZUKAN_PKG_ICONS_SYNTAXES_PATH, SUBLIME_SYNTAX_EXTENSION
+                )
                 return list_syntaxes_installed
             else:
                 raise FileNotFoundError(logger.error('file or directory do not exist.'))
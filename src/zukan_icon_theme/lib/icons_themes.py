@@ -2,8 +2,12 @@ import errno
 import glob
 import logging
 import os
+import time
 
+from ..helpers.build_progress import build_progress
+from ..helpers.cache_theme_info import theme_info_store
 from ..helpers.load_save_settings import get_theme_settings
+from ..helpers.output_state import output_state
 from ..helpers.search_themes import (
     search_resources_sublime_themes,
     theme_with_opacity,
@@ -60,10 +64,7 @@ class ZukanTheme:
                     ZUKAN_PKG_ICONS_PATH, os.path.basename(theme_st_path)
                 )
 
-                if theme_with_opacity(theme_st_path):
-                    file_content = TEMPLATE_JSON
-                else:
-                    file_content = TEMPLATE_JSON_WITH_OPACITY
+                file_content = self.icon_theme_content(theme_st_path)
 
                 with open(theme_filepath, 'w') as f:
                     f.write(file_content)
@@ -94,17 +95,66 @@ class ZukanTheme:
                 theme_st_path,
             )
 
+    def icon_theme_content(self, theme_st_path: str) -> str:
+        """
+        Icon theme template for a theme, depending on theme opacity.
+
+        Parameters:
+        theme_st_path (str) -- installed theme name.
+
+        Returns:
+        (str) -- sublime-theme json template.
+        """
+        if theme_with_opacity(theme_st_path):
+            return TEMPLATE_JSON
+        return TEMPLATE_JSON_WITH_OPACITY
+
     def create_icons_themes(self):
         """
         Create all sublime-themes files from installed themes.
+
+        Themes are listed once, and parsed once with their hidden themes. Files
+        that already have the template are not written.
         """
+        start = time.perf_counter()
         list_all_themes = self.get_all_sublime_themes()
 
         try:
             # list_all_themes = search_resources_sublime_themes()
             if list_all_themes is not None:
-                for theme in list_all_themes:
-                    self.create_icon_theme(theme)
+                ignored_theme = set(self.ignored_theme_setting())
+                icons_themes = {}
+
+                with build_progress.phase('themes', len(list_all_themes)) as progress:
+                    # `cache_theme_info` saved once, for all themes.
+                    with theme_info_store.batch():
+                        for theme in list_all_themes:
+                            file_name = os.path.basename(theme)
+                            progress.advance()
+
+                            if file_name in ignored_theme:
+                                logger.info('ignored theme %s', file_name)
+                                continue
+
+                            icons_themes[
+                                os.path.join(ZUKAN_PKG_ICONS_PATH, file_name)
+                            ] = self.icon_theme_content(theme)
+
+                    written = 0
+                    for theme_filepath, file_content in icons_themes.items():
+                        if self._write_icon_theme(theme_filepath, file_content):
+                            logger.info(
+                                'creating icon theme %s',
+                                os.path.basename(theme_filepath),
+                            )
+                            written += 1
+
+                logger.debug(
+                    '%d icons themes, %d written in %.3fs.',
+                    len(icons_themes),
+                    written,
+                    time.perf_counter() - start,
+                )
                 return list_all_themes
             else:
                 raise FileNotFoundError(logger.error('list is empty.'))
@@ -123,6 +173,19 @@ class ZukanTheme:
                 list_all_themes,
             )
 
+    def _write_icon_theme(self, theme_filepath: str, file_content: str) -> bool:
+        try:
+            with open(theme_filepath, 'r') as f:
+                if f.read() == file_content:
+                    return False
+        except OSError:
+            pass
+
+        with open(theme_filepath, 'w') as f:
+            f.write(file_content)
+        output_state.added(theme_filepath)
+        return True
+
     def delete_icon_theme(self, theme_name: str):
         """
         Delete sublime-theme file in Zukan Icon Theme/icons folder.
@@ -135,6 +198,7 @@ class ZukanTheme:
         try:
             theme_file = os.path.join(ZUKAN_PKG_ICONS_PATH, theme_name)
             os.remove(theme_file)
+            output_state.removed(theme_file)
             logger.info('deleting icon theme %s', os.path.basename(theme_file))
             return theme_name
         except FileNotFoundError:
@@ -202,10 +266,9 @@ class ZukanTheme:
         try:
             list_themes_installed = []
             if os.path.exists(ZUKAN_PKG_ICONS_PATH):
-                for file in glob.glob(
-                    os.path.join(ZUKAN_PKG_ICONS_PATH, '*' + SUBLIME_THEME_EXTENSION)
-                ):
-                    list_themes_installed.append(os.path.basename(file))
+                list_themes_installed = output_state.files(
+                    ZUKAN_PKG_ICONS_PATH, SUBLIME_THEME_EXTENSION
+                )
                 return list_themes_installed
             else:
                 raise FileNotFoundError(logger.error('file or directory do not exist.'))
@@ -81,6 +81,14 @@ ZUKAN_PKG_ICONS_SYNTAXES_PATH = os.path.join(
     PACKAGES_PATH, PACKAGE_NAME, 'icons_syntaxes'
 )
 
+# Outside Packages, so ST does not load staged or previous files.
+# ZUKAN_BUILD_STAGING_PATH = os.path.join(
+#     os.path.dirname(sublime.packages_path()), PACKAGE_NAME + ' Build'
+# )
+ZUKAN_BUILD_STAGING_PATH = os.path.join(
+    os.path.dirname(PACKAGES_PATH), PACKAGE_NAME + ' Build'
+)
+
 # ZUKAN_PKG_PATH = os.path.join(sublime.packages_path(), PACKAGE_NAME)
 ZUKAN_PKG_PATH = os.path.join(PACKAGES_PATH, PACKAGE_NAME)
 
@@ -126,6 +134,13 @@ ZUKAN_ICONS_DATA_FILE = os.path.join(
     'zukan_icons_data' + PICKLE_EXTENSION,
 )
 
+# ZUKAN_BUILD_MANIFEST_FILE = os.path.join(
+#     sublime.packages_path(), PACKAGE_NAME, 'sublime', 'zukan_build_manifest' + JSON_ENTENSION
+# )
+ZUKAN_BUILD_MANIFEST_FILE = os.path.join(
+    PACKAGES_PATH, PACKAGE_NAME, 'sublime', 'zukan_build_manifest' + JSON_ENTENSION
+)
+
 # ZUKAN_CURRENT_SETTINGS_FILE = os.path.join(
 #     sublime.packages_path(), PACKAGE_NAME, 'sublime', 'zukan_current_settings' + PICKLE_EXTENSION
 # )
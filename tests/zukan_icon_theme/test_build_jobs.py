@@ -0,0 +1,172 @@
+import importlib
+import threading
+
+from unittest import TestCase
+
+build_jobs = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.build_jobs'
+)
+
+
+class TestBuildJobScheduler(TestCase):
+    def setUp(self):
+        self.scheduler = build_jobs.BuildJobScheduler()
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def record(self, name):
+        self.calls.append(name)
+
+    def blocking(self):
+        self.started.set()
+        self.release.wait(5)
+
+    def job(self, key, scope=build_jobs.SCOPE_ICONS_FILES, full=False):
+        return build_jobs.BuildJob(key, self.record, (key[0],), scope, full)
+
+    def start_blocking_job(self):
+        # Keep worker busy, so next jobs stay pending.
+        blocking_job = self.scheduler.submit(
+            build_jobs.BuildJob(('blocking',), self.blocking)
+        )
+        self.assertTrue(self.started.wait(5))
+        return blocking_job
+
+    def test_submit_runs_job(self):
+        job = self.scheduler.submit(self.job(('build_icons_syntaxes',)))
+
+        self.assertTrue(job.wait(5))
+        self.assertFalse(job.is_alive())
+        self.assertTrue(job.result)
+        self.assertIsNotNone(job.duration)
+        self.assertEqual(self.calls, ['build_icons_syntaxes'])
+        self.assertIn('build_icons_syntaxes', self.scheduler.durations)
+
+    def test_job_progress_summary(self):
+        def build():
+            with build_jobs.build_progress.phase('syntaxes', 2) as progress:
+                progress.advance(2)
+
+        job = self.scheduler.submit(
+            build_jobs.BuildJob(('build_icons_syntaxes',), build)
+        )
+
+        self.assertTrue(job.wait(5))
+        self.assertTrue(job.summary.startswith('syntaxes 2 in '))
+        self.assertEqual(job.status(), '')
+
+    def test_jobs_run_in_order(self):
+        self.start_blocking_job()
+        first = self.scheduler.submit(self.job(('first',)))
+        second = self.scheduler.submit(self.job(('second',)))
+        self.assertEqual(self.scheduler.depth(), 2)
+        self.assertEqual(first.queue_depth(), 2)
+
+        self.release.set()
+
+        self.assertTrue(second.wait(5))
+        self.assertEqual(self.calls, ['first', 'second'])
+
+    def test_identical_pending_job(self):
+        self.start_blocking_job()
+        first = self.scheduler.submit(self.job(('build_icon_syntax', 'ATest')))
+        second = self.scheduler.submit(self.job(('build_icon_syntax', 'ATest')))
+
+        self.assertIs(second.absorbed_by, first)
+        self.assertEqual(self.scheduler.depth(), 1)
+        self.assertTrue(second.is_alive())
+
+        self.release.set()
+
+        self.assertTrue(second.wait(5))
+        self.assertFalse(second.is_alive())
+        self.assertTrue(second.result)
+        self.assertEqual(second.duration, first.duration)
+        self.assertEqual(self.calls, ['build_icon_syntax'])
+
+    def test_full_job_absorbs_pending_jobs(self):
+        self.start_blocking_job()
+        syntax = self.scheduler.submit(
+            self.job(('build_icon_syntax', 'ATest'), build_jobs.SCOPE_SYNTAXES)
+        )
+        themes = self.scheduler.submit(
+            self.job(('create_icons_themes',), frozenset(['themes']))
+        )
+        full = self.scheduler.submit(
+            self.job(('build_icons_syntaxes',), build_jobs.SCOPE_SYNTAXES, True)
+        )
+
+        self.assertIs(syntax.absorbed_by, full)
+        self.assertIsNone(themes.absorbed_by)
+        self.assertEqual(self.scheduler.depth(), 2)
+
+        self.release.set()
+
+        self.assertTrue(full.wait(5))
+        self.assertTrue(syntax.wait(5))
+        self.assertTrue(syntax.result)
+        self.assertIsNotNone(syntax.duration)
+        self.assertEqual(self.calls, ['create_icons_themes', 'build_icons_syntaxes'])
+
+    def test_absorbed_job_chain_result(self):
+        self.start_blocking_job()
+        first = self.scheduler.submit(self.job(('build_icon_syntax', 'ATest')))
+        second = self.scheduler.submit(self.job(('build_icon_syntax', 'ATest')))
+        full = self.scheduler.submit(self.job(('install_batch',), full=True))
+
+        self.assertIs(first.absorbed_by, full)
+        self.release.set()
+
+        self.assertTrue(second.wait(5))
+        self.assertTrue(first.result)
+        self.assertTrue(second.result)
+
+    def test_pending_full_job_covers_job(self):
+        self.start_blocking_job()
+        full = self.scheduler.submit(self.job(('install_batch',), full=True))
+        partial = self.scheduler.submit(
+            self.job(('build_icon_syntax', 'ATest'), build_jobs.SCOPE_SYNTAXES)
+        )
+
+        self.assertIs(partial.absorbed_by, full)
+        self.assertEqual(self.scheduler.depth(), 1)
+
+    def test_running_job_not_absorbed(self):
+        blocking_job = self.start_blocking_job()
+        job = self.scheduler.submit(build_jobs.BuildJob(('blocking',), self.record))
+
+        self.assertIsNone(job.absorbed_by)
+        self.assertIs(self.scheduler.running(), blocking_job)
+        self.assertEqual(self.scheduler.depth(), 1)
+
+    def test_cancel(self):
+        self.start_blocking_job()
+        job = self.scheduler.submit(self.job(('build_icons_preferences',)))
+
+        job.cancel()
+
+        self.assertTrue(job.cancelled)
+        self.assertFalse(job.is_alive())
+        self.assertFalse(job.result)
+        self.assertEqual(self.scheduler.depth(), 0)
+        self.assertFalse(self.scheduler.cancel(job))
+
+        self.release.set()
+
+    def test_job_error(self):
+        def fail():
+            raise ValueError('fail')
+
+        job = self.scheduler.submit(build_jobs.BuildJob(('fail',), fail))
+
+        self.assertTrue(job.wait(5))
+        self.assertFalse(job.result)
+
+        # Worker keeps running next jobs.
+        job = self.scheduler.submit(self.job(('after_fail',)))
+        self.assertTrue(job.wait(5))
+        self.assertEqual(self.calls, ['after_fail'])
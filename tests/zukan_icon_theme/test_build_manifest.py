@@ -0,0 +1,161 @@
+import importlib
+import json
+import os
+import shutil
+import tempfile
+
+from unittest import TestCase
+
+build_manifest = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.build_manifest'
+)
+
+
+class TestContentHash(TestCase):
+    def test_content_hash(self):
+        self.assertEqual(
+            build_manifest.content_hash('atest'), build_manifest.content_hash('atest')
+        )
+        self.assertNotEqual(
+            build_manifest.content_hash('atest'), build_manifest.content_hash('atest2')
+        )
+        self.assertNotEqual(
+            build_manifest.content_hash('atest'),
+            build_manifest.content_hash('atest', 'source.atest'),
+        )
+
+
+class TestBuildManifest(TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.test_dir, 'icons_syntaxes')
+        os.makedirs(self.output_dir)
+        self.manifest_file = os.path.join(
+            self.test_dir, 'sublime', 'zukan_build_manifest.json'
+        )
+        self.test_file = os.path.join(self.output_dir, 'ATest-1.sublime-syntax')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def new_session(self, context: str = ''):
+        manifest = build_manifest.BuildManifest(self.manifest_file, self.test_dir)
+        return manifest.session(self.output_dir, '.sublime-syntax', context)
+
+    def test_write_new_file(self):
+        session = self.new_session()
+
+        self.assertTrue(session.write(self.test_file, 'atest'))
+        report = session.finish()
+
+        self.assertEqual(report, {'written': 1, 'skipped': 0, 'deleted': 0})
+        with open(self.manifest_file, 'r') as f:
+            manifest = json.load(f)
+        self.assertIn('icons_syntaxes/ATest-1.sublime-syntax', manifest['files'])
+
+    def test_write_unchanged_skipped(self):
+        session = self.new_session()
+        session.write(self.test_file, 'atest')
+        session.finish()
+
+        session = self.new_session()
+
+        self.assertFalse(session.write(self.test_file, 'atest'))
+        self.assertEqual(session.finish()['skipped'], 1)
+
+    def test_write_changed_content(self):
+        session = self.new_session()
+        session.write(self.test_file, 'atest')
+        session.finish()
+
+        session = self.new_session()
+
+        self.assertTrue(session.write(self.test_file, 'atest2'))
+        with open(self.test_file, 'r') as f:
+            self.assertEqual(f.read(), 'atest2')
+
+    def test_write_changed_context(self):
+        session = self.new_session('source.atest')
+        session.write(self.test_file, 'atest')
+        session.finish()
+
+        session = self.new_session()
+
+        self.assertTrue(session.write(self.test_file, 'atest'))
+
+    def test_write_file_deleted(self):
+        session = self.new_session()
+        session.write(self.test_file, 'atest')
+        session.finish()
+        os.remove(self.test_file)
+
+        session = self.new_session()
+
+        self.assertTrue(session.write(self.test_file, 'atest'))
+        self.assertTrue(os.path.exists(self.test_file))
+
+    def test_write_file_edited_after_build(self):
+        session = self.new_session()
+        session.write(self.test_file, 'atest')
+        session.finish()
+        with open(self.test_file, 'w') as f:
+            f.write('edited by user')
+
+        session = self.new_session()
+
+        self.assertTrue(session.write(self.test_file, 'atest'))
+
+    def test_finish_records_edit_after_write(self):
+        session = self.new_session()
+        session.write(self.test_file, 'atest')
+        # e.g. contexts main edited after sublime-syntax is written.
+        with open(self.test_file, 'w') as f:
+            f.write('atest edited')
+        session.finish()
+
+        session = self.new_session()
+
+        self.assertFalse(session.write(self.test_file, 'atest'))
+        with open(self.test_file, 'r') as f:
+            self.assertEqual(f.read(), 'atest edited')
+
+    def test_delete_stale(self):
+        stale_file = os.path.join(self.output_dir, 'ATest-2.sublime-syntax')
+        other_file = os.path.join(self.output_dir, 'atest.tmPreferences')
+        for f in (stale_file, other_file):
+            with open(f, 'w') as fh:
+                fh.write('atest')
+
+        session = self.new_session()
+        session.write(self.test_file, 'atest')
+        session.delete_stale()
+        report = session.finish()
+
+        self.assertFalse(os.path.exists(stale_file))
+        self.assertTrue(os.path.exists(other_file))
+        self.assertTrue(os.path.exists(self.test_file))
+        self.assertEqual(report['deleted'], 1)
+
+    def test_emit_written_outside_session(self):
+        session = self.new_session()
+        self.assertTrue(session.emit(self.test_file, 'atest'))
+        with open(self.test_file, 'w') as f:
+            f.write('atest')
+        session.forget(os.path.join(self.output_dir, 'ATest-2.sublime-syntax'))
+        report = session.finish()
+
+        self.assertEqual(report, {'written': 1, 'skipped': 0, 'deleted': 1})
+
+        session = self.new_session()
+        self.assertFalse(session.emit(self.test_file, 'atest'))
+        self.assertEqual(session.report()['skipped'], 1)
+
+    def test_invalid_manifest(self):
+        os.makedirs(os.path.dirname(self.manifest_file))
+        with open(self.manifest_file, 'w') as f:
+            f.write('{invalid')
+
+        session = self.new_session()
+
+        with self.assertLogs(build_manifest.logger, level='WARNING'):
+            self.assertTrue(session.write(self.test_file, 'atest'))
@@ -0,0 +1,368 @@
+import importlib
+import os
+
+from unittest import TestCase
+from unittest.mock import ANY, call, patch, MagicMock
+
+build_plan = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.lib.build_plan'
+)
+
+TEST_SYNTAX = {
+    'name': 'ATest',
+    'scope': 'source.atest',
+    'file_extensions': ['atest'],
+    'contexts': {'main': []},
+}
+TEST_PREFERENCES = {
+    'scope': 'source.atest',
+    'settings': {'icon': 'atest'},
+}
+
+
+class TestBuildPlan(TestCase):
+    def setUp(self):
+        self.zukan_syntax = MagicMock()
+        self.zukan_syntax.zukan_icons_data.return_value = [{'name': 'ATest'}]
+        self.zukan_syntax.ignored_icon_setting.return_value = ['ignored']
+        self.zukan_syntax.change_icon_file_extension_setting.return_value = []
+        self.zukan_syntax.clean_output_dir_setting.return_value = False
+        self.zukan_syntax.get_compare_scopes.return_value = set()
+        self.zukan_syntax.get_sublime_scope_set.return_value = {}
+        self.zukan_syntax.select_icons_syntaxes.return_value = [
+            (
+                os.path.join(
+                    build_plan.ZUKAN_PKG_ICONS_SYNTAXES_PATH, 'ATest.sublime-syntax'
+                ),
+                TEST_SYNTAX,
+                'contexts:\n  main: []\n',
+            )
+        ]
+
+        self.zukan_preference = MagicMock()
+        self.zukan_preference.change_icon_setting.return_value = {}
+        self.zukan_preference.prefer_icon_setting.return_value = (False, {})
+        self.zukan_preference.select_icons_preferences.return_value = [
+            ({'preferences': TEST_PREFERENCES}, 'atest', 'atest.tmPreferences')
+        ]
+        self.zukan_preference.apply_icon_preferences.side_effect = lambda p, *args: p
+
+        self.patches = [
+            patch.object(build_plan, 'generate_custom_icon', return_value=[]),
+            patch.object(
+                build_plan, 'get_theme_name', return_value='Default.sublime-theme'
+            ),
+            patch.object(build_plan, 'get_sidebar_bgcolor', return_value='#000000'),
+            patch.object(build_plan, 'plan_primary_icons', return_value=[]),
+            patch.object(build_plan, 'get_build_workers', return_value=4),
+            patch.object(build_plan, 'is_staged_build', return_value=False),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_snapshot_reads_settings_once(self):
+        snapshot = build_plan.BuildSnapshot(self.zukan_syntax, self.zukan_preference)
+
+        self.zukan_syntax.zukan_icons_data.assert_called_once()
+        self.zukan_syntax.ignored_icon_setting.assert_called_once()
+        build_plan.get_theme_name.assert_called_once()
+        build_plan.get_sidebar_bgcolor.assert_called_once_with('Default.sublime-theme')
+        self.assertEqual(snapshot.ignored_icon, {'ignored'})
+        self.assertEqual(snapshot.ignore_filter.entries, frozenset({'ignored'}))
+        self.assertEqual(snapshot.bgcolor, '#000000')
+
+    def test_plan(self):
+        snapshot = build_plan.BuildSnapshot(self.zukan_syntax, self.zukan_preference)
+        build_plan.build_progress.reset()
+        plan = build_plan.BuildPlan(snapshot, self.zukan_syntax, self.zukan_preference)
+
+        self.assertEqual(len(plan.syntaxes), 1)
+        self.assertEqual(
+            [p.name for p in build_plan.build_progress.phases()],
+            ['select syntaxes', 'select preferences'],
+        )
+        self.assertEqual(
+            plan.preferences,
+            [
+                (
+                    os.path.join(
+                        build_plan.ZUKAN_PKG_ICONS_PREFERENCES_PATH,
+                        'atest.tmPreferences',
+                    ),
+                    TEST_PREFERENCES,
+                )
+            ],
+        )
+        self.zukan_preference.apply_icon_preferences.assert_called_once_with(
+            {'preferences': TEST_PREFERENCES},
+            '#000000',
+            'Default.sublime-theme',
+            {},
+            False,
+            {},
+        )
+        self.assertEqual(plan.deletions, [])
+
+    @patch.object(build_plan.output_state, 'files')
+    @patch.object(build_plan.os.path, 'exists')
+    def test_plan_clean_output_dir(self, mock_exists, mock_files):
+        self.zukan_syntax.clean_output_dir_setting.return_value = True
+        mock_exists.return_value = True
+        mock_files.side_effect = [
+            ['ATest-2.sublime-syntax', 'ATest.sublime-syntax'],
+            ['atest-2.tmPreferences', 'atest.tmPreferences'],
+        ]
+
+        snapshot = build_plan.BuildSnapshot(self.zukan_syntax, self.zukan_preference)
+        plan = build_plan.BuildPlan(snapshot, self.zukan_syntax, self.zukan_preference)
+
+        self.assertEqual(
+            plan.deletions,
+            [
+                os.path.join(
+                    build_plan.ZUKAN_PKG_ICONS_SYNTAXES_PATH, 'ATest-2.sublime-syntax'
+                ),
+                os.path.join(
+                    build_plan.ZUKAN_PKG_ICONS_PREFERENCES_PATH,
+                    'atest-2.tmPreferences',
+                ),
+            ],
+        )
+
+    @patch.object(build_plan.output_state, 'contains', return_value=True)
+    def test_changed_icons_plan(self, mock_contains):
+        atest = {
+            'name': 'ATest',
+            'syntax': [TEST_SYNTAX],
+            'preferences': TEST_PREFERENCES,
+        }
+        btest = {
+            'name': 'BTest',
+            'syntax': [dict(TEST_SYNTAX, name='BTest')],
+            'preferences': {'scope': 'source.btest', 'settings': {'icon': 'btest'}},
+        }
+        self.zukan_syntax.zukan_icons_data.return_value = [atest, btest]
+        self.zukan_syntax.select_icons_syntaxes.return_value = []
+        self.zukan_preference.select_icons_preferences.return_value = []
+        self.zukan_preference._get_file_name.side_effect = lambda icon: (
+            icon + '.tmPreferences'
+        )
+        diff = build_plan.SettingsDiff(
+            {'ignored_icon': ['ignored']}, {'ignored_icon': ['ignored', 'ATest']}
+        )
+
+        snapshot = build_plan.BuildSnapshot(self.zukan_syntax, self.zukan_preference)
+        plan = build_plan.ChangedIconsPlan(
+            snapshot, self.zukan_syntax, self.zukan_preference, diff
+        )
+
+        self.assertEqual(
+            self.zukan_syntax.select_icons_syntaxes.call_args[0][0], [atest]
+        )
+        self.assertEqual(
+            self.zukan_preference.select_icons_preferences.call_args[0][0], [atest]
+        )
+        self.assertIs(plan.snapshot, snapshot)
+        self.assertEqual(plan.primary_icons, [])
+        self.assertEqual(
+            plan.deletions,
+            [
+                os.path.join(
+                    build_plan.ZUKAN_PKG_ICONS_SYNTAXES_PATH, 'ATest.sublime-syntax'
+                ),
+                os.path.join(
+                    build_plan.ZUKAN_PKG_ICONS_PREFERENCES_PATH, 'atest.tmPreferences'
+                ),
+            ],
+        )
+
+    @patch.object(build_plan, 'apply_primary_icons')
+    @patch.object(build_plan, 'write_files', return_value={})
+    @patch.object(build_plan, 'build_manifest')
+    @patch.object(build_plan.os.path, 'exists', return_value=True)
+    def test_execute(
+        self,
+        mock_exists,
+        mock_manifest,
+        mock_write_files,
+        mock_apply_primary,
+    ):
+        syntaxes_session = MagicMock()
+        preferences_session = MagicMock()
+        mock_manifest.session.side_effect = [syntaxes_session, preferences_session]
+        primary_icons = {'copied': 0, 'linked': 0, 'skipped': 3, 'removed': 0}
+        mock_apply_primary.return_value = primary_icons
+        stale_syntax = os.path.join(
+            build_plan.ZUKAN_PKG_ICONS_SYNTAXES_PATH, 'ATest-2.sublime-syntax'
+        )
+
+        snapshot = build_plan.BuildSnapshot(self.zukan_syntax, self.zukan_preference)
+        plan = build_plan.BuildPlan(snapshot, self.zukan_syntax, self.zukan_preference)
+        plan.deletions = [stale_syntax]
+        build_plan.build_progress.reset()
+        report = build_plan.BuildPlanExecutor(2).execute(plan)
+
+        self.assertEqual(
+            [p.name for p in build_plan.build_progress.phases()],
+            ['syntaxes', 'preferences'],
+        )
+
+        mock_manifest.session.assert_has_calls(
+            [
+                call(
+                    build_plan.ZUKAN_PKG_ICONS_SYNTAXES_PATH,
+                    build_plan.SUBLIME_SYNTAX_EXTENSION,
+                ),
+                call(
+                    build_plan.ZUKAN_PKG_ICONS_PREFERENCES_PATH,
+                    build_plan.TMPREFERENCES_EXTENSION,
+                ),
+            ]
+        )
+        mock_write_files.assert_has_calls(
+            [
+                call(
+                    [
+                        (
+                            plan.syntaxes[0][0],
+                            '%YAML 1.2\n---\nname: ATest\nscope: source.atest\n'
+                            'file_extensions:\n  - atest\ncontexts:\n  main: []\n',
+                        )
+                    ],
+                    syntaxes_session,
+                    2,
+                    ANY,
+                ),
+                call(
+                    [
+                        (
+                            plan.preferences[0][0],
+                            build_plan.build_preference(TEST_PREFERENCES),
+                        )
+                    ],
+                    preferences_session,
+                    2,
+                    ANY,
+                ),
+            ]
+        )
+        syntaxes_session.delete.assert_called_once_with(stale_syntax)
+        preferences_session.delete.assert_not_called()
+        mock_apply_primary.assert_called_once_with([], snapshot.link_primary_icons)
+        self.assertEqual(
+            report,
+            {
+                build_plan.SUBLIME_SYNTAX_EXTENSION: syntaxes_session.finish(),
+                build_plan.TMPREFERENCES_EXTENSION: preferences_session.finish(),
+                build_plan.PNG_EXTENSION: primary_icons,
+            },
+        )
+        syntaxes_session.finish.return_value.__setitem__.assert_called_with('errors', 0)
+
+    @patch.object(build_plan, 'apply_primary_icons')
+    @patch.object(build_plan, 'write_files', return_value={})
+    @patch.object(build_plan, 'StagedOutput')
+    @patch.object(build_plan, 'build_manifest')
+    @patch.object(build_plan.os.path, 'exists', return_value=True)
+    def test_execute_staged(
+        self,
+        mock_exists,
+        mock_manifest,
+        mock_staged_output,
+        mock_write_files,
+        mock_apply_primary,
+    ):
+        syntaxes_session = MagicMock()
+        syntaxes_session.emit.return_value = True
+        preferences_session = MagicMock()
+        preferences_session.emit.return_value = False
+        mock_manifest.session.side_effect = [syntaxes_session, preferences_session]
+        staged = mock_staged_output.return_value
+        staged.staged_path.side_effect = lambda p: 'staging/' + os.path.basename(p)
+        staged.swap.return_value = True
+        stale_syntax = os.path.join(
+            build_plan.ZUKAN_PKG_ICONS_SYNTAXES_PATH, 'ATest-2.sublime-syntax'
+        )
+
+        snapshot = build_plan.BuildSnapshot(self.zukan_syntax, self.zukan_preference)
+        plan = build_plan.BuildPlan(snapshot, self.zukan_syntax, self.zukan_preference)
+        plan.deletions = [stale_syntax]
+        build_plan.BuildPlanExecutor(2, staged=True).execute(plan)
+
+        # Preferences unchanged, only syntaxes are staged and swapped.
+        mock_staged_output.assert_called_once_with(
+            build_plan.ZUKAN_PKG_ICONS_SYNTAXES_PATH
+        )
+        staged.prepare.assert_called_once_with({plan.syntaxes[0][0], stale_syntax})
+        mock_write_files.assert_called_once_with(
+            [
+                (
+                    'staging/ATest.sublime-syntax',
+                    '%YAML 1.2\n---\nname: ATest\nscope: source.atest\n'
+                    'file_extensions:\n  - atest\ncontexts:\n  main: []\n',
+                )
+            ],
+            None,
+            2,
+            ANY,
+        )
+        staged.swap.assert_called_once()
+        syntaxes_session.forget.assert_called_once_with(stale_syntax)
+        syntaxes_session.delete.assert_not_called()
+        preferences_session.finish.assert_called_once()
+
+    @patch.object(build_plan, 'apply_primary_icons')
+    @patch.object(build_plan, 'write_files', return_value={})
+    @patch.object(build_plan, 'StagedOutput')
+    @patch.object(build_plan, 'build_manifest')
+    @patch.object(build_plan.os.path, 'exists', return_value=True)
+    def test_execute_staged_swap_failed(
+        self,
+        mock_exists,
+        mock_manifest,
+        mock_staged_output,
+        mock_write_files,
+        mock_apply_primary,
+    ):
+        sessions = [MagicMock() for _ in range(3)]
+        sessions[0].emit.return_value = True
+        sessions[2].emit.return_value = False
+        mock_manifest.session.side_effect = sessions
+        mock_staged_output.return_value.swap.return_value = False
+
+        snapshot = build_plan.BuildSnapshot(self.zukan_syntax, self.zukan_preference)
+        plan = build_plan.BuildPlan(snapshot, self.zukan_syntax, self.zukan_preference)
+        report = build_plan.BuildPlanExecutor(2, staged=True).execute(plan)
+
+        # Syntaxes written in place, with a new session.
+        self.assertEqual(mock_write_files.call_count, 2)
+        self.assertIs(mock_write_files.call_args[0][1], sessions[1])
+        self.assertIs(report[build_plan.SUBLIME_SYNTAX_EXTENSION], sessions[1].finish())
+        sessions[0].finish.assert_not_called()
+
+    @patch.object(build_plan, 'BuildPlanExecutor')
+    def test_build_icons_files(self, mock_executor):
+        mock_executor.return_value.execute.return_value = {}
+
+        self.assertEqual(
+            build_plan.build_icons_files(self.zukan_syntax, self.zukan_preference), {}
+        )
+        mock_executor.assert_called_once_with(4, False)
+
+    @patch.object(build_plan, 'is_staged_build', return_value=True)
+    @patch.object(build_plan, 'ChangedIconsPlan')
+    @patch.object(build_plan, 'BuildPlanExecutor')
+    def test_build_changed_icons_files_not_staged(
+        self, mock_executor, mock_plan, mock_staged
+    ):
+        mock_executor.return_value.execute.return_value = {}
+
+        build_plan.build_changed_icons_files(
+            self.zukan_syntax, self.zukan_preference, MagicMock()
+        )
+
+        mock_executor.assert_called_once_with(4)
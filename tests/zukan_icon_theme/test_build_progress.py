@@ -0,0 +1,76 @@
+import importlib
+
+from unittest import TestCase
+from unittest.mock import patch
+
+build_progress = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.build_progress'
+)
+
+
+class TestBuildProgress(TestCase):
+    def setUp(self):
+        self.progress = build_progress.BuildProgress()
+
+    @patch.object(build_progress.time, 'perf_counter')
+    def test_phase_status(self, mock_perf_counter):
+        mock_perf_counter.return_value = 10.0
+        phase = self.progress.phase('syntaxes', 480)
+        phase.advance(120)
+        mock_perf_counter.return_value = 10.5
+
+        self.assertTrue(phase.is_running())
+        self.assertEqual(self.progress.status(), 'syntaxes 120/480, 240 files/s, 0.5s')
+
+    @patch.object(build_progress.time, 'perf_counter')
+    def test_phase_without_total(self, mock_perf_counter):
+        mock_perf_counter.side_effect = [10.0, 10.25]
+
+        self.progress.phase('preferences')
+
+        self.assertEqual(self.progress.status(), 'preferences, 0.2s')
+
+    def test_phase_finish(self):
+        with self.progress.phase('themes', 2) as phase:
+            phase.advance(2)
+
+        self.assertFalse(phase.is_running())
+        self.assertEqual(self.progress.status(), '')
+        self.assertEqual(phase.done, 2)
+
+    @patch.object(build_progress.time, 'perf_counter')
+    def test_phase_runs_twice(self, mock_perf_counter):
+        mock_perf_counter.side_effect = [0.0, 1.0, 5.0, 6.0]
+
+        with self.progress.phase('preferences', 2) as phase:
+            phase.advance(2)
+        with self.progress.phase('preferences', 3) as phase_2:
+            phase_2.advance(3)
+
+        self.assertIs(phase, phase_2)
+        self.assertEqual(phase.total, 5)
+        self.assertEqual(phase.done, 5)
+        self.assertEqual(phase.elapsed, 2.0)
+        self.assertEqual(len(self.progress.phases()), 1)
+
+    @patch.object(build_progress.time, 'perf_counter')
+    def test_summary(self, mock_perf_counter):
+        mock_perf_counter.side_effect = [0.0, 0.5, 1.0, 1.1]
+
+        with self.progress.phase('syntaxes', 480) as phase:
+            phase.advance(480)
+        with self.progress.phase('themes'):
+            pass
+
+        self.assertEqual(
+            self.progress.summary(), 'syntaxes 480 in 0.50s (960/s), themes 0.10s'
+        )
+
+    def test_reset(self):
+        with self.progress.phase('syntaxes'):
+            pass
+
+        self.progress.reset()
+
+        self.assertEqual(self.progress.phases(), [])
+        self.assertEqual(self.progress.summary(), '')
@@ -1,5 +1,8 @@
 import importlib
 import json
+import os
+import shutil
+import tempfile
 
 from datetime import datetime, timedelta
 from unittest import TestCase
@@ -12,6 +15,9 @@ cache_theme_info = importlib.import_module(
 
 class TestCacheThemeInfo(TestCase):
     def setUp(self):
+        cache_theme_info.theme_info_store.invalidate()
+        self.patcher = patch.object(cache_theme_info.os, 'replace')
+        self.mock_replace = self.patcher.start()
         self.test_theme = '/test/path/Treble Adaptive.sublime-theme'
         self.test_theme_default = '/test/path/Default.sublime-theme'
         self.test_theme_info = {
@@ -34,6 +40,10 @@ class TestCacheThemeInfo(TestCase):
             ]
         }
 
+    def tearDown(self):
+        self.patcher.stop()
+        cache_theme_info.theme_info_store.invalidate()
+
     @patch('os.path.getmtime')
     def test_get_modified_time(self, mock_getmtime):
         mock_getmtime.return_value = 1000
@@ -249,36 +259,203 @@ class TestCacheThemeInfo(TestCase):
         self.assertEqual(theme['opacity']['value'], True)
         self.assertEqual(theme['opacity']['last_updated'], 1000)
 
-        mock_file.assert_has_calls([call(cache_theme_info.THEME_INFO_FILE, 'w')])
+        mock_file.assert_has_calls(
+            [call(cache_theme_info.THEME_INFO_FILE + '.tmp', 'w')]
+        )
+        self.mock_replace.assert_called_once_with(
+            cache_theme_info.THEME_INFO_FILE + '.tmp',
+            cache_theme_info.THEME_INFO_FILE,
+        )
 
         mock_file().read.assert_not_called()
 
+        self.assertIsInstance(parsed_data.pop('created'), float)
         self.assertEqual(parsed_data, self.test_theme_info)
 
     @patch('os.path.exists')
-    @patch('os.path.getctime')
+    @patch.object(cache_theme_info, 'get_modified_time')
+    @patch.object(cache_theme_info, 'get_file_path')
+    @patch('builtins.open', new_callable=mock_open)
+    def test_save_sidebar_bgcolor(
+        self, mock_file, mock_get_path, mock_mod_time, mock_exists
+    ):
+        mock_exists.return_value = True
+        mock_get_path.return_value = self.test_theme
+        mock_mod_time.return_value = 1000
+        mock_file().read.return_value = json.dumps(self.test_theme_info)
+
+        cache_theme_info.save_sidebar_bgcolor(
+            self.test_theme, 'dark', ['var(--background)'], '#000000'
+        )
+
+        written_data = ''
+        for call_args in mock_file().write.call_args_list:
+            written_data += call_args[0][0]
+        theme = json.loads(written_data)['themes'][0]
+
+        self.assertEqual(theme['opacity'], {'value': True, 'last_updated': 1000})
+        self.assertEqual(
+            theme['sidebar_bgcolor'],
+            {
+                'value': 'dark',
+                'trace': ['var(--background)'],
+                'background': '#000000',
+                'parents': [],
+                'last_updated': 1000,
+            },
+        )
+
+    @patch.object(cache_theme_info, 'get_file_path')
+    @patch.object(cache_theme_info, 'get_modified_time', return_value=2000)
+    def test_is_parents_changed(self, mock_mod_time, mock_get_path):
+        mock_get_path.return_value = '/test/path/Treble.hidden-theme'
+        parents = [
+            [
+                'Treble.hidden-theme',
+                [['Packages/Theme - Treble/Treble.hidden-theme', 1000]],
+            ]
+        ]
+
+        # Parent theme upgraded.
+        self.assertTrue(cache_theme_info.is_parents_changed(parents))
+
+        mock_mod_time.return_value = 1000
+        self.assertFalse(cache_theme_info.is_parents_changed(parents))
+        self.assertFalse(cache_theme_info.is_parents_changed([]))
+        # Saved before parents were checked.
+        self.assertTrue(cache_theme_info.is_parents_changed(None))
+
+    @patch.object(cache_theme_info, 'get_file_path', return_value='Theme - Default')
+    def test_get_resource_modified_time_default_theme(self, mock_get_path):
+        self.assertEqual(
+            cache_theme_info.get_resource_modified_time(
+                'Packages/Theme - Default/Default.hidden-theme'
+            ),
+            cache_theme_info.sublime.version(),
+        )
+
+    @patch('os.path.exists', return_value=True)
+    @patch.object(cache_theme_info, 'get_modified_time', return_value=1000)
+    @patch.object(cache_theme_info, 'get_file_path')
+    def test_get_cached_sidebar_bgcolor(
+        self, mock_get_path, mock_mod_time, mock_exists
+    ):
+        mock_get_path.return_value = self.test_theme
+        self.test_theme_info['themes'][0]['sidebar_bgcolor'] = {
+            'value': 'dark',
+            'trace': ['var(--background)'],
+            'background': '#000000',
+            'parents': [
+                [
+                    'Treble.hidden-theme',
+                    [['Packages/Theme - Treble/Treble.hidden-theme', 1000]],
+                ]
+            ],
+            'last_updated': 1000,
+        }
+        read_data = json.dumps(self.test_theme_info)
+
+        with patch('builtins.open', mock_open(read_data=read_data)):
+            self.assertEqual(
+                cache_theme_info.get_cached_sidebar_bgcolor(self.test_theme, '#000000'),
+                'dark',
+            )
+            # Color scheme changed.
+            self.assertIsNone(
+                cache_theme_info.get_cached_sidebar_bgcolor(self.test_theme, '#FFFFFF')
+            )
+
+        # Parent theme resolves to same file.
+        with patch('builtins.open', mock_open(read_data=read_data)):
+            self.assertEqual(
+                cache_theme_info.get_cached_sidebar_bgcolor(
+                    self.test_theme,
+                    '#000000',
+                    lambda extends: ['Packages/Theme - Treble/Treble.hidden-theme'],
+                ),
+                'dark',
+            )
+
+        # Parent theme overridden by another file.
+        with patch('builtins.open', mock_open(read_data=read_data)):
+            self.assertIsNone(
+                cache_theme_info.get_cached_sidebar_bgcolor(
+                    self.test_theme,
+                    '#000000',
+                    lambda extends: [
+                        'Packages/Theme - Treble/Treble.hidden-theme',
+                        'Packages/User/Treble.hidden-theme',
+                    ],
+                )
+            )
+
+        # Theme changed.
+        mock_mod_time.return_value = 2000
+        with patch('builtins.open', mock_open(read_data=read_data)):
+            self.assertIsNone(
+                cache_theme_info.get_cached_sidebar_bgcolor(self.test_theme, '#000000')
+            )
+
+    @patch('os.path.exists', return_value=True)
+    @patch.object(cache_theme_info, 'get_modified_time', return_value=1000)
+    @patch.object(cache_theme_info, 'get_file_path')
+    def test_get_cached_sidebar_bgcolor_not_saved(
+        self, mock_get_path, mock_mod_time, mock_exists
+    ):
+        mock_get_path.return_value = self.test_theme
+        read_data = json.dumps(self.test_theme_info)
+
+        with patch('builtins.open', mock_open(read_data=read_data)):
+            self.assertIsNone(
+                cache_theme_info.get_cached_sidebar_bgcolor(self.test_theme, '#000000')
+            )
+
+    @patch('os.path.exists')
     @patch.object(cache_theme_info, 'get_cached_theme_info_lifespan')
-    def test_cache_theme_info_lifespan(self, mock_lifespan, mock_ctime, mock_exists):
+    def test_cache_theme_info_lifespan(self, mock_lifespan, mock_exists):
         mock_exists.return_value = True
         mock_lifespan.return_value = 30
         # Set creation time to 31 days ago
-        mock_ctime.return_value = (datetime.now() - timedelta(days=31)).timestamp()
+        self.test_theme_info['created'] = (
+            datetime.now() - timedelta(days=31)
+        ).timestamp()
+        read_data = json.dumps(self.test_theme_info)
 
-        result = cache_theme_info.cache_theme_info_lifespan()
+        with patch('builtins.open', mock_open(read_data=read_data)):
+            result = cache_theme_info.cache_theme_info_lifespan()
         self.assertTrue(result)
 
     @patch('os.path.exists')
-    @patch('os.path.getctime')
     @patch.object(cache_theme_info, 'get_cached_theme_info_lifespan')
-    def test_cache_theme_info_not_expired(self, mock_lifespan, mock_ctime, mock_exists):
+    def test_cache_theme_info_not_expired(self, mock_lifespan, mock_exists):
         mock_exists.return_value = True
         mock_lifespan.return_value = 30
         # Set creation time to 29 days ago
-        mock_ctime.return_value = (datetime.now() - timedelta(days=29)).timestamp()
+        self.test_theme_info['created'] = (
+            datetime.now() - timedelta(days=29)
+        ).timestamp()
+        read_data = json.dumps(self.test_theme_info)
 
-        result = cache_theme_info.cache_theme_info_lifespan()
+        with patch('builtins.open', mock_open(read_data=read_data)):
+            result = cache_theme_info.cache_theme_info_lifespan()
         self.assertFalse(result)
 
+    @patch('os.path.exists')
+    @patch('os.path.getctime')
+    @patch.object(cache_theme_info, 'get_cached_theme_info_lifespan')
+    def test_cache_theme_info_lifespan_no_created(
+        self, mock_lifespan, mock_ctime, mock_exists
+    ):
+        mock_exists.return_value = True
+        mock_lifespan.return_value = 30
+        # File saved before creation time was kept.
+        mock_ctime.return_value = (datetime.now() - timedelta(days=31)).timestamp()
+        read_data = json.dumps(self.test_theme_info)
+
+        with patch('builtins.open', mock_open(read_data=read_data)):
+            result = cache_theme_info.cache_theme_info_lifespan()
+        self.assertTrue(result)
+
     @patch('os.path.exists')
     def test_cache_theme_info_no_file(self, mock_exists):
         mock_exists.return_value = False
@@ -298,3 +475,75 @@ class TestCacheThemeInfo(TestCase):
         mock_lifespan.return_value = False
         cache_theme_info.delete_cached_theme_info()
         mock_remove.assert_not_called()
+
+
+class TestThemeInfoStore(TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.theme_info_file = os.path.join(self.test_dir, 'theme_info.json')
+        self.store = cache_theme_info.ThemeInfoStore(self.theme_info_file)
+        self.themes = [
+            os.path.join(self.test_dir, 'Theme {n}.sublime-theme'.format(n=n))
+            for n in range(3)
+        ]
+        for t in self.themes:
+            with open(t, 'w') as f:
+                f.write('{}')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_save_and_get(self):
+        self.store.save(self.themes[0], 'opacity', {'value': True})
+
+        self.assertEqual(self.store.get(self.themes[0], 'opacity')['value'], True)
+        self.assertIsNone(self.store.get(self.themes[0], 'sidebar_bgcolor'))
+        self.assertIsNone(self.store.get(self.themes[1], 'opacity'))
+
+        # Loaded from file.
+        store = cache_theme_info.ThemeInfoStore(self.theme_info_file)
+        self.assertEqual(store.get(self.themes[0], 'opacity')['value'], True)
+
+    def test_batch_writes_once(self):
+        with patch.object(
+            cache_theme_info.json, 'dump', wraps=cache_theme_info.json.dump
+        ) as mock_dump:
+            with self.store.batch():
+                for t in self.themes:
+                    self.store.save(t, 'opacity', {'value': False})
+                self.assertFalse(os.path.exists(self.theme_info_file))
+
+            mock_dump.assert_called_once()
+
+        with open(self.theme_info_file, 'r') as f:
+            self.assertEqual(len(json.load(f)['themes']), 3)
+
+    def test_save_unchanged_not_written(self):
+        self.store.save(self.themes[0], 'opacity', {'value': True})
+
+        with patch.object(cache_theme_info.json, 'dump') as mock_dump:
+            self.store.save(self.themes[0], 'opacity', {'value': True})
+
+            mock_dump.assert_not_called()
+
+    def test_created_kept_on_save(self):
+        self.store.save(self.themes[0], 'opacity', {'value': True})
+        created = self.store.created()
+
+        with open(self.theme_info_file, 'r') as f:
+            self.assertEqual(json.load(f)['created'], created)
+
+        self.store.save(self.themes[1], 'opacity', {'value': True})
+        store = cache_theme_info.ThemeInfoStore(self.theme_info_file)
+        self.assertEqual(store.created(), created)
+
+    def test_file_changed_read_again(self):
+        self.store.save(self.themes[0], 'opacity', {'value': True})
+
+        # Another ST instance writes theme info.
+        store = cache_theme_info.ThemeInfoStore(self.theme_info_file)
+        store.save(self.themes[1], 'opacity', {'value': False})
+        stat = os.stat(self.theme_info_file)
+        os.utime(self.theme_info_file, (stat.st_atime, stat.st_mtime + 10))
+
+        self.assertEqual(self.store.get(self.themes[1], 'opacity')['value'], False)
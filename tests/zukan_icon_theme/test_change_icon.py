@@ -51,7 +51,7 @@ class TestChangeResetIcon(TestCase):
             'Name and icon name inputs are required'
         )
 
-    @patch('os.path.exists')
+    @patch.object(change_icon.png_catalog, 'exists')
     @patch.object(change_icon.sublime, 'error_message')
     def test_png_exists_file_not_found(self, mock_error_message, mock_exists):
         mock_exists.return_value = False
@@ -66,7 +66,7 @@ class TestChangeResetIcon(TestCase):
         )
         mock_error_message.assert_called_once_with(expected_message)
 
-    @patch('os.path.exists')
+    @patch.object(change_icon.png_catalog, 'exists')
     @patch.object(change_icon.sublime, 'error_message')
     def test_png_exists_primary_icon(self, mock_error_message, mock_exists):
         mock_exists.return_value = False
@@ -77,19 +77,53 @@ class TestColorDarkLight(TestCase):
 
     # st_colors_to_hex
     def test_st_colors_to_hex(self):
-        ST_COLOR_PALETTE = [
-            ('primary', '#392E2A'),  # Biohack
-            ('secondary', '#F9EFDA'),  # DO
-        ]
+        ST_COLOR_PALETTE_DICT = {
+            'primary': '#392E2A',  # Biohack
+            'secondary': '#F9EFDA',  # DO
+        }
         with patch.object(
             color_dark_light,
-            'ST_COLOR_PALETTE',
-            ST_COLOR_PALETTE,
+            'ST_COLOR_PALETTE_DICT',
+            ST_COLOR_PALETTE_DICT,
         ):
             self.assertEqual(color_dark_light.st_colors_to_hex('primary'), '#392E2A')
             self.assertEqual(color_dark_light.st_colors_to_hex('secondary'), '#F9EFDA')
             self.assertIsNone(color_dark_light.st_colors_to_hex('not_exist'))
 
+    # classify
+    def test_classify(self):
+        list_classify = [
+            ('#392E2A', 'dark'),  # Biohack
+            ('#F9EFDA', 'light'),  # DO
+            ('hsl(0, 0%, 10%)', 'dark'),
+            ('hsla(0, 0%, 95%, 0.5)', 'light'),
+            ('rgb(24, 23, 27)', 'dark'),
+            ('rgba(249, 239, 218, 0.8)', 'light'),
+            ('color(#FFFFFF blend(#000 50%))', 'dark'),
+            ('color(#FFFFFF blend(#000 60%))', 'light'),
+            ('color(#000 l(+ 90%))', 'light'),
+            ('color(#FFFFFF blend(var(sidebar_bg) 50%))', 'light'),
+            ('aliceblue', 'light'),
+            ('black', 'dark'),
+            ('var(--background)', None),
+            ('var(sidebar_bg)', None),
+        ]
+        for color, expected in list_classify:
+            self.assertEqual(color_dark_light.classify(color), expected, color)
+
+    def test_classify_cached(self):
+        color_dark_light.classify.cache_clear()
+
+        with patch.object(
+            color_dark_light,
+            'rgb_dark_light',
+            wraps=color_dark_light.rgb_dark_light,
+        ) as mock_rgb_dark_light:
+            for _ in range(3):
+                self.assertEqual(color_dark_light.classify('#123456'), 'dark')
+
+            mock_rgb_dark_light.assert_called_once()
+
     # extract_numbers_from_hsl
     def test_extract_numbers_from_hsl(self):
         list_extract_hsl = [
@@ -0,0 +1,133 @@
+import importlib
+
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+color_mod = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.color_mod'
+)
+
+
+class TestColorMod(TestCase):
+    def assertColor(self, result, expected):
+        self.assertIsNotNone(result)
+        for r, e in zip(result, expected):
+            self.assertAlmostEqual(r, e, places=1)
+
+    def test_literal(self):
+        list_literal = [
+            ('#fff', (255, 255, 255, 1.0)),
+            ('#00000080', (0, 0, 0, 128 / 255)),
+            ('rgb(24, 23, 27)', (24, 23, 27, 1.0)),
+            ('rgba(249, 239, 218, 0.8)', (249, 239, 218, 0.8)),
+            ('hsl(0, 0%, 100%)', (255, 255, 255, 1.0)),
+            ('hsla(120, 100%, 25%, 0.5)', (0, 127.5, 0, 0.5)),
+            ('black', (0, 0, 0, 1.0)),
+        ]
+        for color, expected in list_literal:
+            with self.subTest(color):
+                self.assertColor(color_mod.ColorMod().evaluate(color), expected)
+
+    def test_not_color(self):
+        for value in ('var(sidebar_bg)', 'foo', 'color(#fff unknown(1))', 'color('):
+            with self.subTest(value):
+                self.assertIsNone(color_mod.ColorMod().evaluate(value))
+
+    def test_adjusters(self):
+        list_color_mod = [
+            ('color(#FFFFFF blend(#000 50%))', (127.5, 127.5, 127.5, 1.0)),
+            ('color(#FFFFFF blend(#000 25%))', (63.75, 63.75, 63.75, 1.0)),
+            ('color(#000 blenda(#fff0 50%))', (127.5, 127.5, 127.5, 0.5)),
+            ('color(#000 alpha(0.25))', (0, 0, 0, 0.25)),
+            ('color(#000 a(- 50%))', (0, 0, 0, 0.5)),
+            ('color(#000 l(+ 20%))', (51, 51, 51, 1.0)),
+            ('color(#fff lightness(50%))', (127.5, 127.5, 127.5, 1.0)),
+            ('color(hsl(0, 100%, 50%) s(0%))', (127.5, 127.5, 127.5, 1.0)),
+            ('color(color(#000 l(+ 20%)) l(+ 20%))', (102, 102, 102, 1.0)),
+        ]
+        for color, expected in list_color_mod:
+            with self.subTest(color):
+                self.assertColor(color_mod.ColorMod().evaluate(color), expected)
+
+    def test_min_contrast(self):
+        result = color_mod.ColorMod().evaluate('color(#777 min-contrast(#fff 7))')
+        self.assertGreaterEqual(color_mod.contrast_ratio(result, (255, 255, 255)), 7)
+
+        # Already contrasting, unchanged.
+        self.assertColor(
+            color_mod.ColorMod().evaluate('color(#000 min-contrast(#fff 4.5))'),
+            (0, 0, 0, 1.0),
+        )
+
+    def test_variables(self):
+        evaluator = color_mod.ColorMod(
+            {
+                'sidebar_bg': 'color(var(base) blend(var(--background) 50%))',
+                'base': '#000000',
+                'loop': 'var(loop)',
+                'font_size': 12,
+            },
+            '#ffffff',
+        )
+        color, uses_background = evaluator.resolve('var(sidebar_bg)')
+
+        self.assertColor(color, (127.5, 127.5, 127.5, 1.0))
+        self.assertTrue(uses_background)
+        self.assertEqual(evaluator.resolve('var(base)'), ((0, 0, 0, 1.0), False))
+        self.assertEqual(evaluator.resolve('var(loop)'), (None, False))
+
+    def test_variables_evaluated_once(self):
+        background = MagicMock(return_value='#000000')
+        evaluator = color_mod.ColorMod(
+            {
+                'a': 'color(var(--background) l(+ 10%))',
+                'b': 'color(var(a) l(+ 10%))',
+                'c': 'color(var(b) l(+ 10%))',
+            },
+            background,
+        )
+
+        with patch.object(
+            evaluator, '_literal', wraps=evaluator._literal
+        ) as mock_literal:
+            color, uses_background = evaluator.resolve('var(c)')
+            evaluator.resolve('var(b)')
+            self.assertTrue(evaluator.resolve('var(c)')[1])
+
+        self.assertColor(color, (76.5, 76.5, 76.5, 1.0))
+        self.assertTrue(uses_background)
+        # Background literal, parsed once.
+        self.assertEqual(mock_literal.call_count, 1)
+        background.assert_called_once()
+
+    def test_evaluate_all_once(self):
+        background = MagicMock(return_value='#000000')
+        evaluator = color_mod.ColorMod(
+            {
+                'a': 'color(var(--background) l(+ 10%))',
+                'b': 'color(var(a) l(+ 10%))',
+                'c': 'color(var(b) l(+ 10%))',
+                'size': 12,
+            },
+            background,
+        )
+
+        with patch.object(
+            evaluator, '_literal', wraps=evaluator._literal
+        ) as mock_literal:
+            result = evaluator.evaluate_all()
+            evaluator.evaluate_all()
+            self.assertTrue(evaluator.resolve('var(c)')[1])
+
+        self.assertColor(result['c'], (76.5, 76.5, 76.5, 1.0))
+        self.assertIsNone(result['size'])
+        # Background literal, parsed once.
+        self.assertEqual(mock_literal.call_count, 1)
+        background.assert_called_once()
+
+    def test_hsl_rgb(self):
+        for rgb in ((255, 0, 0), (12, 200, 99), (59, 39, 61), (128, 128, 128)):
+            with self.subTest(rgb):
+                result = color_mod.hsl_to_rgb(*color_mod.rgb_to_hsl(*rgb))
+                for r, e in zip(result, rgb):
+                    self.assertAlmostEqual(r, e, places=6)
@@ -1,5 +1,7 @@
 import importlib
 import os
+import shutil
+import tempfile
 
 from unittest import TestCase
 from unittest.mock import call, patch
@@ -11,6 +13,7 @@ copy_primary_icons = importlib.import_module(
 
 
 class TestCopyPrimaryIcons(TestCase):
+    @patch.object(copy_primary_icons, 'is_identical_png', return_value=False)
     @patch.object(copy_primary_icons, 'get_prefer_icon_settings')
     @patch.object(copy_primary_icons, 'get_change_icon_settings')
     @patch.object(copy_primary_icons, 'get_ignored_icon_settings')
@@ -31,6 +34,7 @@ class TestCopyPrimaryIcons(TestCase):
         mock_get_ignored_icon_settings,
         mock_get_change_icon_settings,
         mock_get_prefer_icon_settings,
+        mock_is_identical_png,
     ):
         mock_copy2.reset_mock()
 
@@ -74,6 +78,7 @@ class TestCopyPrimaryIcons(TestCase):
             str(copy_primary_icons.ICONS_SUFFIX[2]),
         )
 
+    @patch.object(copy_primary_icons, 'is_identical_png', return_value=False)
     @patch.object(copy_primary_icons, 'get_prefer_icon_settings')
     @patch.object(copy_primary_icons, 'get_change_icon_settings')
     @patch.object(copy_primary_icons, 'get_ignored_icon_settings')
@@ -94,6 +99,7 @@ class TestCopyPrimaryIcons(TestCase):
         mock_get_ignored_icon_settings,
         mock_get_change_icon_settings,
         mock_get_prefer_icon_settings,
+        mock_is_identical_png,
     ):
         mock_copy2.reset_mock()
 
@@ -137,6 +143,7 @@ class TestCopyPrimaryIcons(TestCase):
             str(copy_primary_icons.ICONS_SUFFIX[2]),
         )
 
+    @patch.object(copy_primary_icons, 'is_identical_png', return_value=False)
     @patch.object(copy_primary_icons, 'get_prefer_icon_settings')
     @patch.object(copy_primary_icons, 'get_change_icon_settings')
     @patch.object(copy_primary_icons, 'get_ignored_icon_settings')
@@ -157,6 +164,7 @@ class TestCopyPrimaryIcons(TestCase):
         mock_get_ignored_icon_settings,
         mock_get_change_icon_settings,
         mock_get_prefer_icon_settings,
+        mock_is_identical_png,
     ):
         mock_copy2.reset_mock()
 
@@ -200,6 +208,7 @@ class TestCopyPrimaryIcons(TestCase):
             str(copy_primary_icons.ICONS_SUFFIX[2]),
         )
 
+    @patch.object(copy_primary_icons, 'is_identical_png', return_value=False)
     @patch.object(copy_primary_icons, 'get_prefer_icon_settings')
     @patch.object(copy_primary_icons, 'get_change_icon_settings')
     @patch.object(copy_primary_icons, 'get_ignored_icon_settings')
@@ -220,6 +229,7 @@ class TestCopyPrimaryIcons(TestCase):
         mock_get_ignored_icon_settings,
         mock_get_change_icon_settings,
         mock_get_prefer_icon_settings,
+        mock_is_identical_png,
     ):
         mock_copy2.reset_mock()
 
@@ -383,6 +393,7 @@ class TestCopyPrimaryIcons(TestCase):
             str(copy_primary_icons.ICONS_SUFFIX[2]),
         )
 
+    @patch.object(copy_primary_icons, 'is_identical_png', return_value=False)
     @patch.object(copy_primary_icons, 'get_prefer_icon_settings')
     @patch.object(copy_primary_icons, 'get_change_icon_settings')
     @patch.object(copy_primary_icons, 'get_ignored_icon_settings')
@@ -403,6 +414,7 @@ class TestCopyPrimaryIcons(TestCase):
         mock_get_ignored_icon_settings,
         mock_get_change_icon_settings,
         mock_get_prefer_icon_settings,
+        mock_is_identical_png,
     ):
         mock_copy2.reset_mock()
 
@@ -445,3 +457,82 @@ class TestCopyPrimaryIcons(TestCase):
             'file_type_source-dark',
             str(copy_primary_icons.ICONS_SUFFIX[2]),
         )
+
+
+class TestApplyPrimaryIcons(TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.src = self.png('source.png', b'atest')
+        self.dst = os.path.join(self.test_dir, 'atest.png')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def png(self, file_name: str, content: bytes) -> str:
+        file_path = os.path.join(self.test_dir, file_name)
+        with open(file_path, 'wb') as f:
+            f.write(content)
+        return file_path
+
+    def test_apply_primary_icons_copy(self):
+        summary = copy_primary_icons.apply_primary_icons([('copy', self.src, self.dst)])
+
+        self.assertEqual(
+            summary, {'copied': 1, 'linked': 0, 'skipped': 0, 'removed': 0}
+        )
+        self.assertTrue(copy_primary_icons.is_identical_png(self.src, self.dst))
+
+    @patch.object(copy_primary_icons.shutil, 'copy2')
+    def test_apply_primary_icons_skip_identical(self, mock_copy2):
+        self.png('atest.png', b'atest')
+
+        summary = copy_primary_icons.apply_primary_icons([('copy', self.src, self.dst)])
+
+        self.assertEqual(summary['skipped'], 1)
+        mock_copy2.assert_not_called()
+
+    def test_apply_primary_icons_replace_different(self):
+        self.png('atest.png', b'btest')
+
+        summary = copy_primary_icons.apply_primary_icons([('copy', self.src, self.dst)])
+
+        self.assertEqual(summary['copied'], 1)
+        with open(self.dst, 'rb') as f:
+            self.assertEqual(f.read(), b'atest')
+
+    def test_apply_primary_icons_link(self):
+        summary = copy_primary_icons.apply_primary_icons(
+            [('copy', self.src, self.dst)], link=True
+        )
+
+        self.assertEqual(summary['linked'], 1)
+        self.assertTrue(os.path.samefile(self.src, self.dst))
+
+    def test_apply_primary_icons_link_replaced_by_copy(self):
+        other = self.png('other.png', b'other')
+        os.link(other, self.dst)
+
+        copy_primary_icons.apply_primary_icons([('copy', self.src, self.dst)])
+
+        # Removed before copy, linked source is not overwritten.
+        with open(other, 'rb') as f:
+            self.assertEqual(f.read(), b'other')
+        with open(self.dst, 'rb') as f:
+            self.assertEqual(f.read(), b'atest')
+
+    @patch.object(copy_primary_icons.os, 'link', side_effect=OSError)
+    def test_apply_primary_icons_link_unsupported(self, mock_link):
+        summary = copy_primary_icons.apply_primary_icons(
+            [('copy', self.src, self.dst)], link=True
+        )
+
+        self.assertEqual(summary['copied'], 1)
+        self.assertTrue(os.path.exists(self.dst))
+
+    def test_apply_primary_icons_remove(self):
+        self.png('atest.png', b'atest')
+
+        summary = copy_primary_icons.apply_primary_icons([('remove', self.dst)])
+
+        self.assertEqual(summary['removed'], 1)
+        self.assertFalse(os.path.exists(self.dst))
@@ -50,7 +50,7 @@ class TestCreateDeleteCustomIcon(TestCase):
         self.icon_handler.message_required_name('valid_name')
         mock_error.assert_not_called()
 
-    @patch('os.path.exists')
+    @patch.object(create_custom_icon.png_catalog, 'exists')
     @patch.object(create_custom_icon.sublime, 'error_message')
     def test_png_exists(self, mock_error, mock_exists):
         mock_exists.return_value = False
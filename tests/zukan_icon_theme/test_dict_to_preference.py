@@ -1,13 +1,23 @@
 import errno
 import importlib
+import logging
 import os
+import time
 
-from unittest import TestCase
+from unittest import TestCase, skipUnless
 from unittest.mock import patch, mock_open
 
 dict_to_preference = importlib.import_module(
     'Zukan Icon Theme.src.zukan_icon_theme.helpers.dict_to_preference'
 )
+read_write_data = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.read_write_data'
+)
+zukan_paths = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.utils.zukan_paths'
+)
+
+logger = logging.getLogger(__name__)
 
 
 class TestPreferencesFunctions(TestCase):
@@ -133,3 +143,62 @@ class TestPreferencesFunctions(TestCase):
         mock_logger.assert_called_with(
             '[Errno %d] %s: %r', errno.EACCES, os.strerror(errno.EACCES), file_path
         )
+
+
+def legacy_dict_to_preference(preference_dict: dict, multiplier: int = 2) -> str:
+    # String concatenation renderer, before list join. Reference for benchmark.
+    indent = '\t' * multiplier
+    data = ''
+
+    for k, v in preference_dict.items():
+        if isinstance(v, dict):
+            data += '{i}<key>{k}</key>\n'.format(i=indent, k=k)
+            data += '{i}<dict>\n'.format(i=indent)
+            data += legacy_dict_to_preference(v, multiplier + 1)
+            data += '{i}</dict>\n'.format(i=indent)
+        else:
+            data += '{i}<key>{k}</key>\n'.format(i=indent, k=k)
+            data += '{i}<string>{v}</string>\n'.format(i=indent, v=v)
+
+    return data
+
+
+class TestRenderPreferenceLegacy(TestCase):
+    def setUp(self):
+        if not os.path.exists(zukan_paths.ZUKAN_ICONS_DATA_FILE):
+            self.skipTest('zukan icons data not found.')
+
+        self.preferences = [
+            icon['preferences']
+            for icon in read_write_data.read_pickle_data(
+                zukan_paths.ZUKAN_ICONS_DATA_FILE
+            )
+            if icon.get('preferences')
+        ]
+
+    def test_render_identical(self):
+        for p in self.preferences:
+            self.assertEqual(
+                dict_to_preference.dict_to_preference(p), legacy_dict_to_preference(p)
+            )
+
+    # Timings vary with runner load, run on demand and only logged.
+    @skipUnless(os.environ.get('ZUKAN_BENCHMARK'), 'set ZUKAN_BENCHMARK to run.')
+    def test_render_benchmark(self):
+        legacy_time = self.best_time(legacy_dict_to_preference)
+        new_time = self.best_time(dict_to_preference.dict_to_preference)
+        logger.info(
+            '%d tmPreferences rendered: legacy %.4fs, list join %.4fs',
+            len(self.preferences),
+            legacy_time,
+            new_time,
+        )
+
+    def best_time(self, render) -> float:
+        times = []
+        for _ in range(5):
+            start = time.perf_counter()
+            for item in self.preferences:
+                render(item)
+            times.append(time.perf_counter() - start)
+        return min(times)
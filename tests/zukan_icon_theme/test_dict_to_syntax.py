@@ -1,13 +1,23 @@
 import errno
 import importlib
+import logging
 import os
+import time
 
-from unittest import TestCase
+from unittest import TestCase, skipUnless
 from unittest.mock import patch, mock_open
 
 dict_to_syntax = importlib.import_module(
     'Zukan Icon Theme.src.zukan_icon_theme.helpers.dict_to_syntax'
 )
+read_write_data = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.read_write_data'
+)
+zukan_paths = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.utils.zukan_paths'
+)
+
+logger = logging.getLogger(__name__)
 
 
 class TestSublimeSyntax(TestCase):
@@ -58,6 +68,31 @@ contexts_main:
         result = dict_to_syntax.build_syntax(syntax_dict)
         self.assertEqual(result, expected)
 
+    def test_build_syntax_contexts_main(self):
+        syntax_dict = {
+            'name': 'ATest-2',
+            'contexts': {
+                'main': [{'include': 'scope:source.atest', 'apply_prototype': True}]
+            },
+        }
+
+        result = dict_to_syntax.build_syntax(
+            syntax_dict, dict_to_syntax.build_contexts_main()
+        )
+        self.assertEqual(
+            result, '%YAML 1.2\n---\nname: ATest-2\ncontexts:\n  main: []\n'
+        )
+
+        result = dict_to_syntax.build_syntax(
+            syntax_dict, dict_to_syntax.build_contexts_main('source.atest')
+        )
+        self.assertEqual(
+            result,
+            '%YAML 1.2\n---\nname: ATest-2\ncontexts:\n  main:\n'
+            '    - include: scope:source.atest#prototype\n'
+            '      include: scope:source.atest\n',
+        )
+
     @patch('builtins.open', new_callable=mock_open)
     @patch.object(dict_to_syntax, 'logger')
     def test_save_sublime_syntax(self, mock_logger, mock_open):
@@ -94,3 +129,78 @@ contexts_main:
         mock_logger.error.assert_called_once_with(
             '[Errno %d] %s: %r', errno.EACCES, os.strerror(errno.EACCES), file_path
         )
+
+
+def legacy_dict_to_syntax(syntax_dict: dict, multiplier: int = 0) -> str:
+    # String concatenation renderer, before list join. Reference for benchmark.
+    data = ''
+    indent = '  ' * multiplier
+
+    for k, v in syntax_dict.items():
+        data += '{i}{k}:'.format(i=indent, k=k)
+
+        if isinstance(v, dict):
+            data += '\n'
+            data += legacy_dict_to_syntax(v, multiplier + 1)
+        elif isinstance(v, list):
+            if not v:
+                data += ' []\n'
+            if v and all(isinstance(i, str) for i in v):
+                data += '\n'
+                for list_item in v:
+                    data += '{i}  - {l}\n'.format(i=indent, l=list_item)
+            if v and all(isinstance(i, dict) for i in v):
+                data += '\n'
+                for tuple_list in v:
+                    for i, (x, y) in enumerate(tuple_list.items()):
+                        if isinstance(y, bool):
+                            y = 'true' if y is True else 'false'
+                        if i == 0:
+                            data += '{i}  - {k}: {v}\n'.format(i=indent, k=x, v=y)
+                        else:
+                            data += '{i}    {k}: {v}\n'.format(i=indent, k=x, v=y)
+        else:
+            if isinstance(v, bool):
+                v = 'true' if v is True else 'false'
+            data += ' {v}\n'.format(v=v)
+
+    return data
+
+
+class TestRenderSyntaxLegacy(TestCase):
+    def setUp(self):
+        if not os.path.exists(zukan_paths.ZUKAN_ICONS_DATA_FILE):
+            self.skipTest('zukan icons data not found.')
+
+        self.syntaxes = [
+            s
+            for icon in read_write_data.read_pickle_data(
+                zukan_paths.ZUKAN_ICONS_DATA_FILE
+            )
+            for s in icon.get('syntax') or []
+        ]
+
+    def test_render_identical(self):
+        for s in self.syntaxes:
+            self.assertEqual(dict_to_syntax.dict_to_syntax(s), legacy_dict_to_syntax(s))
+
+    # Timings vary with runner load, run on demand and only logged.
+    @skipUnless(os.environ.get('ZUKAN_BENCHMARK'), 'set ZUKAN_BENCHMARK to run.')
+    def test_render_benchmark(self):
+        legacy_time = self.best_time(legacy_dict_to_syntax)
+        new_time = self.best_time(dict_to_syntax.dict_to_syntax)
+        logger.info(
+            '%d sublime-syntaxes rendered: legacy %.4fs, list join %.4fs',
+            len(self.syntaxes),
+            legacy_time,
+            new_time,
+        )
+
+    def best_time(self, render) -> float:
+        times = []
+        for _ in range(5):
+            start = time.perf_counter()
+            for item in self.syntaxes:
+                render(item)
+            times.append(time.perf_counter() - start)
+        return min(times)
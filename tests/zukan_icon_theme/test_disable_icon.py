@@ -13,7 +13,7 @@ class TestDisableEnableIcon(TestCase):
         self.zukan_syntax = Mock(spec=disable_icon.ZukanSyntax)
         self.disable_enable_icon = disable_icon.DisableEnableIcon(self.zukan_syntax)
 
-    @patch.object(disable_icon, 'read_pickle_data')
+    @patch.object(disable_icon, 'read_zukan_icons_data')
     def test_zukan_icons_data(self, mock_read):
         mock_data = [{'name': 'ATest'}, {'name': 'ATest-1'}]
         mock_read.return_value = mock_data
@@ -37,7 +37,7 @@ class TestDisableEnableIcon(TestCase):
         result = self.disable_enable_icon.get_list_all_icons_syntaxes(mock_icons)
         self.assertEqual(result, mock_syntaxes)
 
-    @patch.object(disable_icon, 'read_pickle_data')
+    @patch.object(disable_icon, 'read_zukan_icons_data')
     @patch.object(disable_icon, 'get_ignored_icon_settings')
     def test_get_list_not_ignored_icons(self, mock_ignored, mock_read):
         mock_icons = [{'name': 'ATest-1'}, {'name': 'ATest-2'}]
@@ -150,3 +150,43 @@ class TestEditFileExtension(TestCase):
         )
 
         self.assertEqual(result, ['cmake'])
+
+
+class TestExtensionOwnership(TestCase):
+    def test_owner(self):
+        ownership = edit_file_extension.ExtensionOwnership(
+            [{'scope': 'source.toml.poetry', 'file_extensions': ['pyproject.toml']}]
+        )
+
+        self.assertEqual(ownership.owner('pyproject.toml'), 'source.toml.poetry')
+        self.assertEqual(ownership.owner('ino'), 'source.arduino')
+        self.assertIsNone(ownership.owner('atest'))
+
+    def test_filter_file_extensions(self):
+        ownership = edit_file_extension.ExtensionOwnership(
+            [{'scope': 'source.atest', 'file_extensions': ['abc', 'ino']}]
+        )
+
+        self.assertEqual(
+            ownership.filter_file_extensions(['abc', 'ino', 'xyz'], 'source.atest'),
+            ['abc', 'ino', 'xyz'],
+        )
+        self.assertEqual(
+            ownership.filter_file_extensions(['abc', 'ino', 'xyz'], 'source.arduino'),
+            ['xyz'],
+        )
+
+    def test_extension_ownership_cached(self):
+        change_icon_file_extension = [
+            {'scope': 'source.atest', 'file_extensions': ['abc']}
+        ]
+
+        ownership = edit_file_extension.extension_ownership(change_icon_file_extension)
+
+        self.assertIs(
+            edit_file_extension.extension_ownership(
+                [{'scope': 'source.atest', 'file_extensions': ['abc']}]
+            ),
+            ownership,
+        )
+        self.assertIsNot(edit_file_extension.extension_ownership([]), ownership)
@@ -0,0 +1,118 @@
+import _pickle as pickle
+import copy
+import importlib
+import os
+import shutil
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+icons_data_cache = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.icons_data_cache'
+)
+
+
+class TestFreezeThaw(TestCase):
+    def setUp(self):
+        self.test_data = {
+            'name': 'ATest-1',
+            'preferences': {'settings': {'icon': 'atest-1'}},
+            'syntax': [{'name': 'ATest-1', 'file_extensions': ['atest']}],
+        }
+
+    def test_freeze_read_only(self):
+        frozen = icons_data_cache.freeze(self.test_data)
+
+        self.assertIsInstance(frozen, dict)
+        self.assertIsInstance(frozen['syntax'], list)
+        self.assertEqual(frozen, self.test_data)
+
+        with self.assertRaises(TypeError):
+            frozen['name'] = 'ATest-2'
+        with self.assertRaises(TypeError):
+            frozen['preferences']['settings']['icon'] = 'atest-2'
+        with self.assertRaises(TypeError):
+            frozen['syntax'][0]['file_extensions'].append('atest2')
+
+    def test_thaw_editable_copy(self):
+        frozen = icons_data_cache.freeze(self.test_data)
+        thawed = icons_data_cache.thaw(frozen)
+
+        thawed['preferences']['settings']['icon'] = 'atest-2'
+        thawed['syntax'][0]['file_extensions'].append('atest2')
+
+        self.assertEqual(frozen['preferences']['settings']['icon'], 'atest-1')
+        self.assertEqual(frozen['syntax'][0]['file_extensions'], ['atest'])
+        self.assertNotIsInstance(thawed, icons_data_cache.FrozenDict)
+
+    def test_copy_and_pickle(self):
+        frozen = icons_data_cache.freeze(self.test_data)
+
+        self.assertEqual(copy.deepcopy(frozen), self.test_data)
+        self.assertEqual(pickle.loads(pickle.dumps(frozen)), self.test_data)
+
+        edited = dict(frozen, name='ATest-2')
+        self.assertEqual(edited['name'], 'ATest-2')
+        self.assertEqual(frozen['name'], 'ATest-1')
+
+
+class TestIconsDataCache(TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.test_dir, 'zukan_icons_data.pkl')
+        self.test_data = [{'name': 'ATest-1'}, {'name': 'ATest-2'}]
+
+        with open(self.test_file, 'wb') as f:
+            for d in self.test_data:
+                pickle.dump(d, f, protocol=3)
+
+        self.cache = icons_data_cache.IconsDataCache()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_read_hit_miss(self):
+        with patch.object(
+            icons_data_cache,
+            'read_pickle_data',
+            wraps=icons_data_cache.read_pickle_data,
+        ) as mock_read:
+            first = self.cache.read(self.test_file)
+            second = self.cache.read(self.test_file)
+
+        self.assertEqual(first, self.test_data)
+        self.assertIs(first, second)
+        mock_read.assert_called_once_with(self.test_file)
+        self.assertEqual(self.cache.stats(), {'hits': 1, 'misses': 1, 'files': 1})
+
+    def test_read_reload_file_changed(self):
+        self.cache.read(self.test_file)
+
+        with open(self.test_file, 'ab') as f:
+            pickle.dump({'name': 'ATest-3'}, f, protocol=3)
+
+        result = self.cache.read(self.test_file)
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_invalidate(self):
+        self.cache.read(self.test_file)
+        self.cache.invalidate(self.test_file)
+        self.cache.read(self.test_file)
+
+        self.assertEqual(self.cache.misses, 2)
+
+        self.cache.invalidate()
+        self.assertEqual(self.cache.stats()['files'], 0)
+
+    def test_read_file_not_found(self):
+        with self.assertRaises(FileNotFoundError):
+            self.cache.read(os.path.join(self.test_dir, 'not_found.pkl'))
+
+    def test_read_zukan_icons_data(self):
+        with patch.object(icons_data_cache.icons_data_cache, 'read') as mock_read:
+            icons_data_cache.read_zukan_icons_data(self.test_file)
+
+        mock_read.assert_called_once_with(self.test_file)
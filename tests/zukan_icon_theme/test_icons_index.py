@@ -0,0 +1,121 @@
+import importlib
+
+from unittest import TestCase
+
+icons_index = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.icons_index'
+)
+
+
+class TestZukanIconIndex(TestCase):
+    def setUp(self):
+        self.test_data = [
+            {
+                'name': 'ATest-1',
+                'preferences': {
+                    'scope': 'source.atest1',
+                    'settings': {'icon': 'atest-1'},
+                },
+                'syntax': [
+                    {
+                        'name': 'ATest-1',
+                        'scope': 'source.atest1',
+                        'file_extensions': ['atest1', 'at1'],
+                    },
+                    {
+                        'name': 'ATest-1 (Extra)',
+                        'scope': 'source.atest1.extra',
+                        'file_extensions': ['at1x'],
+                    },
+                ],
+                'tag': 'primary',
+            },
+            {
+                'name': 'ATest-2',
+                'preferences': {
+                    'scope': 'source.atest2',
+                    'settings': {'icon': 'atest-2-dark'},
+                },
+                'syntax': [
+                    {
+                        'name': 'ATest-2',
+                        'scope': 'source.atest2',
+                        'file_extensions': ['at1'],
+                    }
+                ],
+            },
+            {
+                'name': 'ATest-3',
+                'preferences': {'settings': {'icon': 'atest-3'}},
+            },
+        ]
+        self.index = icons_index.ZukanIconIndex(self.test_data)
+
+    def test_record_by_name(self):
+        self.assertIs(self.index.record_by_name('ATest-2'), self.test_data[1])
+        self.assertIsNone(self.index.record_by_name('ATest-4'))
+        self.assertTrue(self.index.has_name('ATest-3'))
+
+    def test_records_by_icon(self):
+        self.assertEqual(
+            self.index.records_by_icon('atest-2-dark'), [self.test_data[1]]
+        )
+        self.assertEqual(self.index.records_by_icon('atest-2'), [])
+
+    def test_records_by_tag(self):
+        self.assertEqual(self.index.records_by_tag('primary'), [self.test_data[0]])
+
+    def test_syntaxes_by_name(self):
+        result = self.index.syntaxes_by_name('ATest-1 (Extra)')
+
+        self.assertEqual(len(result), 1)
+        self.assertIs(result[0][0], self.test_data[0])
+        self.assertEqual(result[0][1]['scope'], 'source.atest1.extra')
+
+    def test_syntaxes_by_scope(self):
+        result = self.index.syntaxes_by_scope('source.atest2')
+
+        self.assertEqual([r['name'] for r, _ in result], ['ATest-2'])
+
+    def test_syntaxes_by_file_extension(self):
+        result = self.index.syntaxes_by_file_extension('at1')
+
+        self.assertEqual([s['name'] for _, s in result], ['ATest-1', 'ATest-2'])
+
+    def test_extend(self):
+        custom = [
+            {
+                'name': 'Custom-1',
+                'syntax': [
+                    {
+                        'name': 'ATest-1',
+                        'scope': 'source.custom1',
+                        'file_extensions': ['cst'],
+                    }
+                ],
+            }
+        ]
+        extended = self.index.extend(custom)
+
+        result = extended.syntaxes_by_name('ATest-1')
+
+        self.assertEqual([r['name'] for r, _ in result], ['ATest-1', 'Custom-1'])
+        self.assertEqual(len(extended.all_records()), 4)
+        self.assertFalse(self.index.has_name('Custom-1'))
+        self.assertTrue(extended.has_name('Custom-1'))
+
+
+class TestZukanIconsIndex(TestCase):
+    def test_zukan_icons_index_reused(self):
+        test_data = [{'name': 'ATest-1'}]
+
+        first = icons_index.zukan_icons_index(test_data)
+        second = icons_index.zukan_icons_index(test_data)
+
+        self.assertIs(first, second)
+
+    def test_zukan_icons_index_rebuilt(self):
+        first = icons_index.zukan_icons_index([{'name': 'ATest-1'}])
+        second = icons_index.zukan_icons_index([{'name': 'ATest-1'}])
+
+        self.assertIsNot(first, second)
@@ -31,6 +31,12 @@ class TestZukanPreference(TestCase):
         self.bgcolor_dark = 'dark'
         self.bgcolor_light = 'light'
 
+        # Output dirs listing is shared, tests mock it.
+        icons_preferences.output_state.invalidate()
+
+    def tearDown(self):
+        icons_preferences.output_state.invalidate()
+
     @patch.object(icons_preferences, 'get_change_icon_settings')
     def test_change_icon_setting(self, mock_get_settings):
         expected = {'Rust': 'rust-1', 'Go': 'go-1'}
@@ -90,7 +96,7 @@ class TestZukanPreference(TestCase):
         self.assertEqual(result, expected)
         mock_get_theme.assert_called_once()
 
-    @patch.object(icons_preferences, 'read_pickle_data')
+    @patch.object(icons_preferences, 'read_zukan_icons_data')
     def test_zukan_icons_data(self, mock_read_pickle):
         expected = [{'name': 'ATest-1'}, {'name': 'ATest-2'}]
         mock_read_pickle.return_value = expected
@@ -153,7 +159,9 @@ class TestZukanPreference(TestCase):
 
         mock_exists.return_value = False
 
-        with patch.object(self.zukan, 'create_icons_preferences') as mock_create:
+        with patch.object(
+            self.zukan, 'create_icons_preferences'
+        ) as mock_create, patch.object(self.zukan, 'build_session'):
             self.zukan.build_icons_preferences()
 
             mock_makedirs.assert_called_once_with(
@@ -162,15 +170,16 @@ class TestZukanPreference(TestCase):
             mock_create.assert_called_once()
             mock_copy_icons.assert_called_once()
 
-    def test_build_icons_preferences_deletes_existing_preferences(self):
+    def test_build_icons_preferences_deletes_stale_preferences(self):
+        mock_session = MagicMock()
+
         # fmt: off
         with patch('os.path.exists') as mock_exists, \
-             patch('os.makedirs') as mock_makedirs, \
-             patch('os.listdir') as mock_listdir, \
+             patch.object(self.zukan, 'build_session') as mock_build_session, \
              patch.object(self.zukan, 'delete_icons_preferences') as mock_delete, \
              patch.object(self.zukan, 'theme_name_setting') as mock_theme_name, \
              patch.object(self.zukan, 'sidebar_bgcolor') as mock_bgcolor, \
-             patch.object(self.zukan, 'clean_output_dir_setting') as mock_ckean_output_dir, \
+             patch.object(self.zukan, 'clean_output_dir_setting') as mock_clean_output_dir, \
              patch.object(
                 self.zukan, 'create_icons_preferences'
              ) as mock_create_icons_preferences, \
@@ -180,17 +189,19 @@ class TestZukanPreference(TestCase):
              # fmt: on
 
             mock_exists.return_value = True
-            mock_listdir.return_value = ["atest1.tmPreferences", "atest2.tmPreferences"]
+            mock_build_session.return_value = mock_session
             mock_theme_name.return_value = self.test_dark_theme
             mock_bgcolor.return_value = self.bgcolor_dark
-            mock_ckean_output_dir = True
+            mock_clean_output_dir.return_value = True
 
             self.zukan.build_icons_preferences()
 
-            mock_delete.assert_called_once()
+            mock_delete.assert_not_called()
             mock_create_icons_preferences.assert_called_once_with(
-                self.bgcolor_dark, self.test_dark_theme
+                self.bgcolor_dark, self.test_dark_theme, mock_session
             )
+            mock_session.delete_stale.assert_called_once()
+            mock_session.finish.assert_called_once()
             mock_copy_icons.assert_called_once_with(self.bgcolor_dark, self.test_dark_theme)
 
     def test_apply_change_icon(self):
@@ -204,7 +215,7 @@ class TestZukanPreference(TestCase):
 
         self.assertEqual(test_pref['preferences']['settings']['icon'], 'rust-1')
 
-    @patch('os.path.exists')
+    @patch.object(icons_preferences.png_catalog, 'exists')
     def test_apply_prefer_icon(self, mock_exists):
         test_pref = {
             'name': 'Ada',
@@ -219,7 +230,7 @@ class TestZukanPreference(TestCase):
 
         self.assertEqual(test_pref['preferences']['settings']['icon'], 'ada-light')
 
-    @patch('os.path.exists')
+    @patch.object(icons_preferences.png_catalog, 'exists')
     def test_apply_auto_prefer_icon(self, mock_exists):
         test_pref = {
             'name': 'Ada',
@@ -258,7 +269,7 @@ class TestZukanPreference(TestCase):
                 test_pref['preferences']['settings']['icon'], 'file_type_image-dark'
             )
 
-    @patch('os.path.exists')
+    @patch.object(icons_preferences.png_catalog, 'exists')
     @patch.object(icons_preferences, 'logger')
     def test_png_exists(self, mock_logger, mock_exists):
         mock_exists.return_value = False
@@ -345,7 +356,9 @@ class TestZukanPreference(TestCase):
 
         with patch.multiple(
             self.zukan,
-            get_list_icons_preferences=MagicMock(return_value=mock_icons),
+            get_icons_index=MagicMock(
+                return_value=icons_preferences.ZukanIconIndex(mock_icons)
+            ),
             theme_name_setting=MagicMock(return_value='Treble Adaptive.sublime-theme'),
             sidebar_bgcolor=MagicMock(return_value=self.bgcolor_dark),
             prefer_icon_setting=MagicMock(return_value=(True, {})),
@@ -640,11 +653,11 @@ class TestZukanPreference(TestCase):
         mock_logger.error.assert_called_once()
 
     @patch('os.path.exists')
-    @patch('glob.glob')
-    def test_list_created_icons_preferences(self, mock_glob, mock_exists):
+    @patch.object(icons_preferences.output_state, 'files')
+    def test_list_created_icons_preferences(self, mock_files, mock_exists):
         mock_exists.return_value = True
         expected_files = ['atest1.tmPreferences', 'atest2.tmPreferences']
-        mock_glob.return_value = [os.path.join('path', f) for f in expected_files]
+        mock_files.return_value = expected_files
 
         result = self.zukan.list_created_icons_preferences()
 
@@ -663,13 +676,13 @@ class TestZukanPreference(TestCase):
         mock_logger.error.assert_called()
 
     @patch('os.path.exists')
-    @patch('glob.glob')
+    @patch.object(icons_preferences.output_state, 'files')
     @patch.object(icons_preferences, 'logger')
     def test_list_created_icons_preferences_os_error(
-        self, mock_logger, mock_glob, mock_exists
+        self, mock_logger, mock_files, mock_exists
     ):
         mock_exists.return_value = True
-        mock_glob.side_effect = OSError
+        mock_files.side_effect = OSError
 
         result = self.zukan.list_created_icons_preferences()
 
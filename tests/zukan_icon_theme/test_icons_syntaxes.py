@@ -3,7 +3,7 @@ import importlib
 import os
 
 from unittest import TestCase
-from unittest.mock import call, MagicMock, mock_open, patch
+from unittest.mock import MagicMock, patch
 
 icons_syntaxes = importlib.import_module(
     'Zukan Icon Theme.src.zukan_icon_theme.lib.icons_syntaxes'
@@ -63,10 +63,14 @@ class TestZukanSyntax(TestCase):
 
         self.zukan = icons_syntaxes.ZukanSyntax()
 
+        # Output dirs listing is shared, tests mock it.
+        icons_syntaxes.output_state.invalidate()
+
     def tearDown(self):
         self.sublime_patcher.stop()
+        icons_syntaxes.output_state.invalidate()
 
-    @patch.object(icons_syntaxes, 'read_pickle_data')
+    @patch.object(icons_syntaxes, 'read_zukan_icons_data')
     def test_zukan_icons_data(self, mock_read_pickle):
         expected_data = ['icon1', 'icon2']
         mock_read_pickle.return_value = expected_data
@@ -114,64 +118,84 @@ class TestZukanSyntax(TestCase):
         self.assertEqual(result, expected_ignored)
         mock_get_settings.assert_called_once()
 
-    @patch('threading.Thread')
+    @patch.object(icons_syntaxes, 'build_jobs')
     @patch.object(icons_syntaxes, 'ThreadProgress')
-    def test_install_syntax(self, mock_thread_progress, mock_thread):
+    def test_install_syntax(self, mock_thread_progress, mock_build_jobs):
         file_name = 'ATest'
         syntax_name = 'Atest'
-        mock_thread_instance = MagicMock()
-        mock_thread.return_value = mock_thread_instance
 
         self.zukan.install_syntax(file_name, syntax_name)
 
-        mock_thread.assert_called_once_with(
-            target=self.zukan.build_icon_syntax, args=(file_name, syntax_name)
-        )
-        mock_thread_instance.start.assert_called_once()
+        job = mock_build_jobs.submit.call_args[0][0]
+        self.assertEqual(job.key, ('build_icon_syntax', file_name))
+        self.assertEqual(job.target, self.zukan.build_icon_syntax)
+        self.assertEqual(job.args, (file_name, syntax_name))
+        self.assertEqual(job.scope, icons_syntaxes.SCOPE_SYNTAXES)
+        self.assertFalse(job.full)
         mock_thread_progress.assert_called_once_with(
-            mock_thread_instance, 'Building zukan syntaxes', 'Build done'
+            mock_build_jobs.submit.return_value, 'Building zukan syntaxes', 'Build done'
         )
 
-    @patch('threading.Thread')
+    @patch.object(icons_syntaxes, 'build_jobs')
     @patch.object(icons_syntaxes, 'ThreadProgress')
-    def test_install_syntaxes(self, mock_thread_progress, mock_thread):
-        mock_thread_instance = MagicMock()
-        mock_thread.return_value = mock_thread_instance
-
+    def test_install_syntaxes(self, mock_thread_progress, mock_build_jobs):
         self.zukan.install_syntaxes()
 
-        mock_thread.assert_called_once_with(target=self.zukan.build_icons_syntaxes)
-        mock_thread_instance.start.assert_called_once()
+        job = mock_build_jobs.submit.call_args[0][0]
+        self.assertEqual(job.key, ('build_icons_syntaxes',))
+        self.assertEqual(job.target, self.zukan.build_icons_syntaxes)
+        self.assertTrue(job.full)
         mock_thread_progress.assert_called_once_with(
-            mock_thread_instance, 'Building zukan syntaxes', 'Build done'
+            mock_build_jobs.submit.return_value, 'Building zukan syntaxes', 'Build done'
         )
 
-    def test_build_icons_syntaxes_deletes_existing_syntaxes(self):
+    def test_build_icons_syntaxes_deletes_stale_syntaxes(self):
+        mock_session = MagicMock()
+
         # fmt: off
         with patch('os.path.exists') as mock_exists, \
-             patch('os.makedirs') as mock_makedirs, \
-             patch('os.listdir') as mock_listdir, \
+             patch.object(self.zukan, 'build_session') as mock_build_session, \
              patch.object(self.zukan, 'clean_output_dir_setting') as mock_clean_output_dir, \
              patch.object(self.zukan, 'delete_icons_syntaxes') as mock_delete, \
              patch.object(self.zukan, 'create_icons_syntaxes') as mock_create, \
-             patch.object(self.zukan, 'edit_contexts_scopes') as mock_edit_contexts, \
              patch.object(icons_syntaxes, 'copy_primary_icons') as mock_copy_icons:
         # fmt: on
 
             mock_exists.return_value = True
-            mock_listdir.return_value = [
-                'Atest-1.sublime-syntax',
-                'Atest-2.sublime-syntax',
-            ]
+            mock_build_session.return_value = mock_session
             mock_clean_output_dir.return_value = True
 
             self.zukan.build_icons_syntaxes()
 
-            mock_delete.assert_called_once()
-            mock_create.assert_called_once()
-            mock_edit_contexts.assert_called_once()
+            mock_delete.assert_not_called()
+            mock_create.assert_called_once_with(mock_session)
+            mock_session.delete_stale.assert_called_once()
+            mock_session.finish.assert_called_once()
             mock_copy_icons.assert_called_once()
 
+    def test_build_icons_syntaxes_keeps_stale_syntaxes(self):
+        mock_session = MagicMock()
+
+        with patch('os.path.exists', return_value=True), patch.object(
+            self.zukan, 'build_session', return_value=mock_session
+        ), patch.object(
+            self.zukan, 'clean_output_dir_setting', return_value=False
+        ), patch.object(self.zukan, 'create_icons_syntaxes'), patch.object(
+            icons_syntaxes, 'copy_primary_icons'
+        ):
+            self.zukan.build_icons_syntaxes()
+
+            mock_session.delete_stale.assert_not_called()
+            mock_session.finish.assert_called_once()
+
+    def test_build_session(self):
+        with patch.object(icons_syntaxes, 'build_manifest') as mock_manifest:
+            self.zukan.build_session()
+
+        mock_manifest.session.assert_called_once_with(
+            icons_syntaxes.ZUKAN_PKG_ICONS_SYNTAXES_PATH, '.sublime-syntax'
+        )
+
     def test_get_list_icons_syntaxes(self):
         zukan_icons = [{'syntax': 'Rust'}, {'other': 'value'}]
         custom_icons = [{'syntax': 'ATest-1'}]
@@ -184,6 +208,22 @@ class TestZukanSyntax(TestCase):
             self.assertEqual(result, zukan_icons + custom_icons)
             mock_generate.assert_called_once_with(zukan_icons)
 
+    def test_get_icons_index(self):
+        custom_icons = [
+            {'name': 'ATest-1', 'syntax': [{'name': 'ATest-1'}]},
+            {'name': 'ATest-2', 'preferences': {'settings': {'icon': 'atest-2'}}},
+        ]
+
+        with patch.object(icons_syntaxes, 'generate_custom_icon') as mock_generate:
+            mock_generate.return_value = custom_icons
+
+            result = self.zukan.get_icons_index(self.mock_zukan_icons_data)
+
+            self.assertEqual(len(result.syntaxes_by_name('ATest-3')), 1)
+            self.assertEqual(result.syntaxes_by_name('ATest-1')[0][0], custom_icons[0])
+            self.assertFalse(result.has_name('ATest-2'))
+            mock_generate.assert_called_once_with(self.mock_zukan_icons_data)
+
     def test_get_compare_scopes(self):
         zukan_icons = [
             {'scope': 'source.atest1'},
@@ -209,45 +249,43 @@ class TestZukanSyntax(TestCase):
             icons_syntaxes,
             'CONTEXTS_SCOPES',
             contexts_scopes,
-        ):
-            # Passing all False since it has an inconsistency order if pass True and
-            # False even sorting result. Test will pass sometimes and then fail.
-            #
-            # It can be some mock not being cleared. Or related to issue in method
-            # `visible_syntaxes_only`, where API responds with all syntaxes being False
-            # even icons syntaxes that are all marked hidden True.
-            self.sublime_mock.find_syntax_by_scope.side_effect = [False, False]
+        ), patch.object(icons_syntaxes, 'syntax_registry') as mock_registry:
+            mock_registry.scopes_available.return_value = {
+                'source.atest1': True,
+                'source.atest2': False,
+            }
 
             result = self.zukan.get_sublime_scope_set()
 
-            expected = {'source.atest1': False, 'source.atest2': False}
-
-            self.assertEqual(sorted(result.items()), sorted(expected.items()))
-            self.assertEqual(
-                self.sublime_mock.find_syntax_by_scope.call_count, len(contexts_scopes)
+            self.assertEqual(result, {'source.atest1': True, 'source.atest2': False})
+            mock_registry.scopes_available.assert_called_once_with(
+                {'source.atest1', 'source.atest2'}
             )
 
     @patch.object(icons_syntaxes, 'save_sublime_syntax')
-    @patch.object(icons_syntaxes, 'edit_file_extension')
+    @patch.object(icons_syntaxes, 'extension_ownership')
     @patch('os.path.join')
-    def test_create_icon_syntax(
-        self, mock_path_join, mock_edit_extension, mock_save_syntax
-    ):
+    def test_create_icon_syntax(self, mock_path_join, mock_ownership, mock_save_syntax):
         mock_path_join.return_value = self.test_syntax_path
-        mock_edit_extension.return_value = self.test_edit_extensions_data
+        mock_ownership.return_value.filter_file_extensions.return_value = (
+            self.test_edit_extensions_data
+        )
 
         self.zukan.zukan_icons_data = MagicMock(return_value=self.mock_zukan_icons_data)
         self.zukan.get_compare_scopes = MagicMock(return_value=set())
         self.zukan.change_icon_file_extension_setting = MagicMock(return_value=[])
         self.zukan.ignored_icon_setting = MagicMock(return_value=set())
-        self.zukan.get_list_icons_syntaxes = MagicMock(
-            return_value=self.mock_get_list_icons_syntaxes_data
+        self.zukan.get_sublime_scope_set = MagicMock(return_value={})
+        self.zukan.get_icons_index = MagicMock(
+            return_value=icons_syntaxes.ZukanIconIndex(
+                self.mock_get_list_icons_syntaxes_data
+            )
         )
 
         self.zukan.create_icon_syntax('ATest-3')
 
         mock_save_syntax.assert_called_with(
-            self.test_syntax_data, self.test_syntax_path
+            self.test_syntax_data, self.test_syntax_path, contexts_main=None
         )
 
     @patch.object(icons_syntaxes.logger, 'info')
@@ -266,16 +304,18 @@ class TestZukanSyntax(TestCase):
         self.zukan.get_compare_scopes = MagicMock(return_value=set())
         self.zukan.change_icon_file_extension_setting = MagicMock(return_value=[])
         self.zukan.ignored_icon_setting = MagicMock(return_value={'ignored_icon'})
-        self.zukan.get_list_icons_syntaxes = MagicMock(
-            return_value=[
-                {
-                    'name': 'Ignored Icon',
-                    'syntax': [
-                        {'name': 'Ignored Icon', 'scope': 'source.ignored_icon'}
-                    ],
-                    'preferences': {'settings': {'icon': 'ignored_icon'}},
-                }
-            ]
+        self.zukan.get_icons_index = MagicMock(
+            return_value=icons_syntaxes.ZukanIconIndex(
+                [
+                    {
+                        'name': 'Ignored Icon',
+                        'syntax': [
+                            {'name': 'Ignored Icon', 'scope': 'source.ignored_icon'}
+                        ],
+                        'preferences': {'settings': {'icon': 'ignored_icon'}},
+                    }
+                ]
+            )
         )
 
         self.zukan.create_icon_syntax('Ignored Icon')
@@ -293,8 +333,10 @@ class TestZukanSyntax(TestCase):
             self.zukan.get_compare_scopes = MagicMock(return_value=set())
             self.zukan.change_icon_file_extension_setting = MagicMock(return_value=[])
             self.zukan.ignored_icon_setting = MagicMock(return_value=[])
-            self.zukan.get_list_icons_syntaxes = MagicMock(
-                return_value=self.mock_get_list_icons_syntaxes_data
+            self.zukan.get_icons_index = MagicMock(
+                return_value=icons_syntaxes.ZukanIconIndex(
+                    self.mock_get_list_icons_syntaxes_data
+                )
             )
 
             with self.assertLogs(level='ERROR') as log:
@@ -317,8 +359,10 @@ class TestZukanSyntax(TestCase):
             self.zukan.get_compare_scopes = MagicMock(return_value=set())
             self.zukan.change_icon_file_extension_setting = MagicMock(return_value=[])
             self.zukan.ignored_icon_setting = MagicMock(return_value=[])
-            self.zukan.get_list_icons_syntaxes = MagicMock(
-                return_value=self.mock_get_list_icons_syntaxes_data
+            self.zukan.get_icons_index = MagicMock(
+                return_value=icons_syntaxes.ZukanIconIndex(
+                    self.mock_get_list_icons_syntaxes_data
+                )
             )
 
             with self.assertLogs(level='ERROR') as log:
@@ -330,25 +374,30 @@ class TestZukanSyntax(TestCase):
             )
 
     @patch.object(icons_syntaxes, 'save_sublime_syntax')
-    @patch.object(icons_syntaxes, 'edit_file_extension')
+    @patch.object(icons_syntaxes, 'extension_ownership')
     @patch('os.path.join')
     def test_create_icons_syntaxes(
-        self, mock_path_join, mock_edit_extension, mock_save_syntax
+        self, mock_path_join, mock_ownership, mock_save_syntax
     ):
         mock_path_join.return_value = self.test_syntax_path
-        mock_edit_extension.return_value = self.test_edit_extensions_data
+        mock_ownership.return_value.filter_file_extensions.return_value = (
+            self.test_edit_extensions_data
+        )
 
         self.zukan.zukan_icons_data = MagicMock(return_value=self.mock_zukan_icons_data)
         self.zukan.get_compare_scopes = MagicMock(return_value=set())
         self.zukan.change_icon_file_extension_setting = MagicMock(return_value=[])
         self.zukan.ignored_icon_setting = MagicMock(return_value=set())
+        self.zukan.get_sublime_scope_set = MagicMock(return_value={})
         self.zukan.get_list_icons_syntaxes = MagicMock(
             return_value=self.mock_get_list_icons_syntaxes_data
         )
 
         self.zukan.create_icons_syntaxes()
 
-        mock_save_syntax.assert_any_call(self.test_syntax_data, self.test_syntax_path)
+        mock_save_syntax.assert_any_call(
+            self.test_syntax_data, self.test_syntax_path, None, None
+        )
         assert mock_save_syntax.call_count > 0
 
         list_all_icons_syntaxes = self.zukan.get_list_icons_syntaxes()
@@ -501,180 +550,51 @@ class TestZukanSyntax(TestCase):
                     )
                     mock_remove.assert_called_once_with(self.test_syntax_file_name)
 
-    @patch('os.path.exists')
-    @patch(
-        'builtins.open',
-        new_callable=mock_open,
-        read_data=(
-            'contexts:\n  main:\n    - include: scope:source.atest\n      '
-            'apply_prototype: true\n'
-        ),
-    )
-    def test_edit_context_scope_scope_exists(self, mock_file, mock_exists):
-        mock_exists.return_value = True
-        self.zukan.get_sublime_scope_set = MagicMock(
-            return_value={'source.atest': True}
-        )
-        # Test old syntax ST3
+    def test_get_contexts_main_st3(self):
         self.zukan.sublime_version = 4000
 
-        mock_file_handle = mock_file()
-
-        self.zukan.edit_context_scope(self.test_syntax_file_name)
-
-        written_content = ''.join(
-            call.args[0] for call in mock_file_handle.write.call_args_list
-        )
-        self.assertIn('contexts:\n  main:', written_content)
-        self.assertIn('scope:source.atest', written_content)
-
-    @patch('os.path.exists')
-    @patch(
-        'builtins.open',
-        new_callable=mock_open,
-        read_data=(
-            'contexts:\n  main:\n    - include: scope:source.atest\n      '
-            'apply_prototype: true\n'
-        ),
-    )
-    def test_edit_context_scope_scope_not_exists(self, mock_file, mock_exists):
-        mock_exists.return_value = True
-        self.zukan.get_sublime_scope_set = MagicMock(
-            return_value={'source.atest': False}
-        )
-
-        mock_file_handle = mock_file()
-
-        self.zukan.edit_context_scope(self.test_syntax_file_name)
-
-        written_content = ''.join(
-            call.args[0] for call in mock_file_handle.write.call_args_list
-        )
-        self.assertEqual(written_content, 'contexts:\n  main: []\n')
-
-    @patch('os.path.exists')
-    @patch('builtins.open', new_callable=mock_open)
-    @patch.object(icons_syntaxes.logger, 'error')
-    def test_edit_context_scope_file_not_found(
-        self, mock_logger_error, mock_file, mock_exists
-    ):
-        mock_exists.return_value = True
-        expected_path = os.path.join(
-            icons_syntaxes.ZUKAN_PKG_ICONS_SYNTAXES_PATH, self.test_syntax_file_name
-        )
-
-        mock_file.side_effect = FileNotFoundError
-
-        self.zukan.edit_context_scope(self.test_syntax_file_name)
-
-        mock_logger_error.assert_called_with(
-            '[Errno %d] %s: %r', errno.ENOENT, os.strerror(errno.ENOENT), expected_path
-        )
+        with patch.object(icons_syntaxes, 'CONTEXTS_SCOPES', self.test_contexts_scopes):
+            result = self.zukan.get_contexts_main(
+                'ATest-1.sublime-syntax', {'source.atest1': True}
+            )
 
-    @patch('os.path.exists')
-    @patch('builtins.open', new_callable=mock_open)
-    @patch.object(icons_syntaxes.logger, 'error')
-    def test_edit_context_scope_os_error(
-        self, mock_logger_error, mock_file, mock_exists
-    ):
-        mock_exists.return_value = True
-        expected_path = os.path.join(
-            icons_syntaxes.ZUKAN_PKG_ICONS_SYNTAXES_PATH, self.test_syntax_file_name
+        self.assertEqual(
+            result,
+            'contexts:\n  main:\n    - include: scope:source.atest1#prototype\n'
+            '      include: scope:source.atest1\n',
         )
 
-        mock_file.side_effect = OSError
-
-        self.zukan.edit_context_scope(self.test_syntax_file_name)
-
-        mock_logger_error.assert_called_with(
-            '[Errno %d] %s: %r', errno.EACCES, os.strerror(errno.EACCES), expected_path
-        )
+    def test_get_contexts_main_installed(self):
+        self.zukan.sublime_version = 4180
 
-    @patch.object(icons_syntaxes, 'edit_contexts_main')
-    def test_edit_contexts_scopes(self, mock_edit_contexts):
-        self.zukan.list_created_icons_syntaxes = MagicMock(
-            return_value=[self.test_syntax_file_name]
-        )
-        self.zukan.get_sublime_scope_set = MagicMock(
-            return_value={'source.atest': True}
-        )
-        self.zukan.sublime_version = 4000
-        test_contexts = [{'scope': 'source.atest', 'startsWith': 'ATest'}]
-
-        with patch.object(
-            icons_syntaxes,
-            'CONTEXTS_SCOPES',
-            test_contexts,
-        ):
-            self.zukan.edit_contexts_scopes()
-
-        mock_edit_contexts.assert_called_once()
+        with patch.object(icons_syntaxes, 'CONTEXTS_SCOPES', self.test_contexts_scopes):
+            result = self.zukan.get_contexts_main(
+                'ATest-1.sublime-syntax', {'source.atest1': True}
+            )
 
-    def test_edit_contexts_scopes_not_installed(self):
-        test_installed_syntaxes = ['ATest-1.sublime-syntax', 'ATest-2.sublime-syntax']
-        self.zukan.list_created_icons_syntaxes = MagicMock(
-            return_value=test_installed_syntaxes
-        )
+        self.assertIsNone(result)
 
-        self.zukan.get_sublime_scope_set = MagicMock(
-            return_value={'source.atest1': None, 'source.atest2': None}
-        )
+    def test_get_contexts_main_not_installed(self):
+        self.zukan.sublime_version = 4180
 
-        with patch.object(
-            icons_syntaxes,
-            'CONTEXTS_SCOPES',
-            self.test_contexts_scopes,
-        ):
-            with patch.object(
-                icons_syntaxes,
-                'edit_contexts_main',
-            ) as mock_edit:
-                self.zukan.edit_contexts_scopes()
-
-                expected_calls = [
-                    call(
-                        os.path.join(
-                            icons_syntaxes.ZUKAN_PKG_ICONS_SYNTAXES_PATH,
-                            'ATest-1.sublime-syntax',
-                        ),
-                        None,
-                    ),
-                    call(
-                        os.path.join(
-                            icons_syntaxes.ZUKAN_PKG_ICONS_SYNTAXES_PATH,
-                            'ATest-2.sublime-syntax',
-                        ),
-                        None,
-                    ),
-                ]
-                mock_edit.assert_has_calls(expected_calls, any_order=True)
-                self.assertEqual(mock_edit.call_count, 2)
+        with patch.object(icons_syntaxes, 'CONTEXTS_SCOPES', self.test_contexts_scopes):
+            result = self.zukan.get_contexts_main(
+                'ATest-2.sublime-syntax', {'source.atest1': True, 'source.atest2': None}
+            )
 
-    def test_edit_contexts_scopes_empty_installed_list(self):
-        self.zukan.list_created_icons_syntaxes = MagicMock(return_value=[])
+        self.assertEqual(result, 'contexts:\n  main: []\n')
 
-        self.zukan.get_sublime_scope_set = MagicMock(
-            return_value={'source.atest1': None, 'source.atest2': None}
-        )
+    def test_get_contexts_main_not_in_contexts_scopes(self):
+        with patch.object(icons_syntaxes, 'CONTEXTS_SCOPES', self.test_contexts_scopes):
+            result = self.zukan.get_contexts_main('ATest-3.sublime-syntax', {})
 
-        with patch.object(
-            icons_syntaxes,
-            'CONTEXTS_SCOPES',
-            self.test_contexts_scopes,
-        ):
-            with patch.object(icons_syntaxes, 'edit_contexts_main') as mock_edit:
-                self.zukan.edit_contexts_scopes()
-
-                mock_edit.assert_not_called()
+        self.assertIsNone(result)
 
     @patch('os.path.exists')
-    @patch('glob.glob')
-    def test_list_created_icons_syntaxes(self, mock_glob, mock_exists):
+    @patch.object(icons_syntaxes.output_state, 'files')
+    def test_list_created_icons_syntaxes(self, mock_files, mock_exists):
         mock_exists.return_value = True
-        mock_glob.return_value = [
-            '/path/test/ATest-1.sublime-syntax',
-            '/path/test/ATest-2.sublime-syntax',
-        ]
+        mock_files.return_value = ['ATest-1.sublime-syntax', 'ATest-2.sublime-syntax']
 
         result = self.zukan.list_created_icons_syntaxes()
 
@@ -708,10 +628,10 @@ class TestZukanSyntax(TestCase):
                 icons_syntaxes.ZUKAN_PKG_ICONS_SYNTAXES_PATH
             )
 
-    def test_list_created_icons_syntaxes_os_error_glob(self):
+    def test_list_created_icons_syntaxes_os_error_listing(self):
         with patch('os.path.exists', return_value=True):
-            with patch('glob.glob') as mock_glob:
-                mock_glob.side_effect = OSError(
+            with patch.object(icons_syntaxes.output_state, 'files') as mock_files:
+                mock_files.side_effect = OSError(
                     errno.EACCES,
                     os.strerror(errno.EACCES),
                     icons_syntaxes.ZUKAN_PKG_ICONS_SYNTAXES_PATH,
@@ -725,9 +645,7 @@ class TestZukanSyntax(TestCase):
                     log.output[0],
                 )
                 self.assertIsNone(result)
-                mock_glob.assert_called_once_with(
-                    os.path.join(
-                        icons_syntaxes.ZUKAN_PKG_ICONS_SYNTAXES_PATH,
-                        '*' + icons_syntaxes.SUBLIME_SYNTAX_EXTENSION,
-                    )
+                mock_files.assert_called_once_with(
+                    icons_syntaxes.ZUKAN_PKG_ICONS_SYNTAXES_PATH,
+                    icons_syntaxes.SUBLIME_SYNTAX_EXTENSION,
                 )
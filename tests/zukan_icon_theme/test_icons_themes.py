@@ -1,6 +1,8 @@
 import errno
 import importlib
 import os
+import shutil
+import tempfile
 
 from unittest import TestCase
 from unittest.mock import call, MagicMock, mock_open, patch
@@ -25,8 +27,12 @@ class TestZukanTheme(TestCase):
 
         self.test_theme_path = 'Packages/Theme - Test/Test.sublime-theme'
 
+        # Output dirs listing is shared, tests mock it.
+        icons_themes.output_state.invalidate()
+
     def tearDown(self):
         self.zukan_theme = None
+        icons_themes.output_state.invalidate()
 
     @patch.object(icons_themes, 'get_theme_settings')
     def test_ignored_theme_setting_with_themes(self, mock_get_settings):
@@ -227,10 +233,49 @@ class TestZukanTheme(TestCase):
     @patch.object(icons_themes, 'search_resources_sublime_themes')
     def test_create_icons_themes(self, mock_search):
         mock_search.return_value = self.sample_themes
-        with patch.object(self.zukan_theme, 'create_icon_theme') as mock_create:
-            result = self.zukan_theme.create_icons_themes()
-            self.assertEqual(result, self.sample_themes)
-            self.assertEqual(mock_create.call_count, len(self.sample_themes))
+        with patch.object(
+            self.zukan_theme, 'icon_theme_content', return_value='{}'
+        ) as mock_content:
+            with patch.object(self.zukan_theme, '_write_icon_theme') as mock_write:
+                result = self.zukan_theme.create_icons_themes()
+                self.assertEqual(result, self.sample_themes)
+                self.assertEqual(mock_content.call_count, len(self.sample_themes))
+                self.assertEqual(mock_write.call_count, len(self.sample_themes))
+        mock_search.assert_called_once()
+
+    @patch.object(icons_themes, 'theme_with_opacity', return_value=True)
+    @patch.object(icons_themes, 'search_resources_sublime_themes')
+    def test_create_icons_themes_unchanged_not_written(self, mock_search, mock_opacity):
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        mock_search.return_value = [
+            'Packages/Theme - Treble/Treble Dark.sublime-theme',
+            'Packages/Theme - Treble/Treble Light.sublime-theme',
+            'Packages/Theme - Treble/Ignored.sublime-theme',
+        ]
+        with open(os.path.join(test_dir, 'Treble Dark.sublime-theme'), 'w') as f:
+            f.write(icons_themes.TEMPLATE_JSON)
+
+        with patch.object(icons_themes, 'ZUKAN_PKG_ICONS_PATH', test_dir):
+            with patch.object(
+                self.zukan_theme,
+                'ignored_theme_setting',
+                return_value=['Ignored.sublime-theme'],
+            ):
+                with patch.object(icons_themes.logger, 'info') as mock_info:
+                    self.zukan_theme.create_icons_themes()
+
+        self.assertEqual(
+            sorted(os.listdir(test_dir)),
+            ['Treble Dark.sublime-theme', 'Treble Light.sublime-theme'],
+        )
+        mock_info.assert_has_calls(
+            [
+                call('ignored theme %s', 'Ignored.sublime-theme'),
+                call('creating icon theme %s', 'Treble Light.sublime-theme'),
+            ]
+        )
+        self.assertEqual(mock_info.call_count, 2)
 
     @patch.object(icons_themes, 'search_resources_sublime_themes')
     def test_create_icons_themes_empty(self, mock_search):
@@ -332,20 +377,18 @@ class TestZukanTheme(TestCase):
         )
 
     @patch.object(icons_themes, 'search_resources_sublime_themes')
-    @patch('glob.glob')
+    @patch.object(icons_themes.output_state, 'files')
     @patch('os.path.exists')
     @patch('os.remove')
     def test_delete_unused_icon_theme(
-        self, mock_remove, mock_exists, mock_glob, mock_search
+        self, mock_remove, mock_exists, mock_files, mock_search
     ):
         installed_themes = ['path_icons/Treble Adaptive.sublime-theme']
         created_themes = ['Treble Adaptive.sublime-theme', 'unused.sublime-theme']
 
         mock_search.return_value = installed_themes
         mock_exists.return_value = True
-        mock_glob.return_value = [
-            os.path.join(self.icons_path, theme) for theme in created_themes
-        ]
+        mock_files.return_value = created_themes
 
         self.zukan_theme.delete_unused_icon_theme()
 
@@ -373,19 +416,19 @@ class TestZukanTheme(TestCase):
             mock_delete.assert_not_called()
 
     @patch('os.path.exists')
-    @patch('glob.glob')
-    def test_list_created_icons_themes(self, mock_glob, mock_exists):
+    @patch.object(icons_themes.output_state, 'files')
+    def test_list_created_icons_themes(self, mock_files, mock_exists):
         mock_exists.return_value = True
         expected_themes = ['theme1.sublime-theme', 'theme2.sublime-theme']
-        mock_glob.return_value = [
-            os.path.join(self.icons_path, theme) for theme in expected_themes
-        ]
+        mock_files.return_value = expected_themes
 
         result = self.zukan_theme.list_created_icons_themes()
 
         self.assertEqual(result, expected_themes)
         mock_exists.assert_called_once()
-        mock_glob.assert_called_once()
+        mock_files.assert_called_once_with(
+            icons_themes.ZUKAN_PKG_ICONS_PATH, icons_themes.SUBLIME_THEME_EXTENSION
+        )
 
     @patch('os.path.exists')
     def test_list_created_icons_themes_directory_not_found(self, mock_exists):
@@ -394,13 +437,13 @@ class TestZukanTheme(TestCase):
         self.assertIsNone(result)
 
     @patch('os.path.exists')
-    @patch('glob.glob')
+    @patch.object(icons_themes.output_state, 'files')
     @patch.object(icons_themes, 'logger')
     def test_list_created_icons_themes_os_error(
-        self, mock_logger, mock_glob, mock_exists
+        self, mock_logger, mock_files, mock_exists
     ):
         mock_exists.return_value = True
-        mock_glob.side_effect = OSError
+        mock_files.side_effect = OSError
 
         result = self.zukan_theme.list_created_icons_themes()
 
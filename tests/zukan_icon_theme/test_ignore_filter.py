@@ -0,0 +1,99 @@
+import importlib
+
+from unittest import TestCase
+
+ignore_filter = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.ignore_filter'
+)
+
+
+class TestIgnoreFilter(TestCase):
+    def setUp(self):
+        self.rust = {
+            'name': 'Rust',
+            'preferences': {'settings': {'icon': 'file_type_rust'}},
+        }
+        self.ada = {
+            'name': 'Ada',
+            'tag': 'programming',
+            'preferences': {'settings': {'icon': 'file_type_ada'}},
+        }
+        self.image = {
+            'name': 'Image',
+            'icons': ['file_type_image-1'],
+            'preferences': {'settings': {'icon': 'file_type_image'}},
+        }
+        self.syntax_only = {'name': 'Syntax Only', 'syntax': []}
+        self.records = [self.rust, self.ada, self.image, self.syntax_only]
+
+    def test_normalize_ignored(self):
+        self.assertEqual(
+            ignore_filter.normalize_ignored('file_type_rust.svg'), 'file_type_rust'
+        )
+        self.assertEqual(ignore_filter.normalize_ignored('Rust'), 'Rust')
+
+    def test_entries(self):
+        f = ignore_filter.IgnoreFilter(['Rust', 'file_type_ada.svg', None])
+        self.assertEqual(f.entries, frozenset({'Rust', 'file_type_ada'}))
+
+    def test_is_ignored(self):
+        for compiled in (False, True):
+            f = ignore_filter.IgnoreFilter(['Rust', 'programming'])
+            if compiled:
+                f.compile(self.records)
+
+            self.assertTrue(f.is_ignored(self.rust))
+            self.assertTrue(f.is_ignored(self.ada))
+            self.assertFalse(f.is_ignored(self.image))
+            self.assertFalse(f.is_ignored(self.syntax_only))
+
+    def test_is_ignored_icon_svg(self):
+        f = ignore_filter.IgnoreFilter(['file_type_rust.svg']).compile(self.records)
+        self.assertTrue(f.is_ignored(self.rust))
+        self.assertFalse(f.is_ignored(self.ada))
+
+    def test_is_ignored_syntax_only_icon(self):
+        f = ignore_filter.IgnoreFilter(['file_type_rust', 'Syntax Only'])
+        self.assertTrue(f.is_ignored(self.syntax_only))
+
+    def test_is_option_ignored(self):
+        for entry in ('file_type_image-1', 'file_type_image-1.svg'):
+            f = ignore_filter.IgnoreFilter([entry]).compile(self.records)
+            self.assertTrue(f.is_option_ignored(self.image))
+            self.assertFalse(f.is_ignored(self.image))
+            self.assertFalse(f.is_option_ignored(self.rust))
+
+    def test_compile_uses_record_ids(self):
+        f = ignore_filter.IgnoreFilter(['Rust']).compile(self.records)
+        # A copy is not compiled, it is checked against entries.
+        self.assertTrue(f.is_ignored(dict(self.rust)))
+        self.assertIn(id(self.rust), f._ignored)
+        self.assertNotIn(id(self.ada), f._ignored)
+
+    def test_empty(self):
+        f = ignore_filter.IgnoreFilter([]).compile(self.records)
+        self.assertFalse(f.is_ignored(self.rust))
+        self.assertFalse(f.is_option_ignored(self.image))
+        self.assertFalse(f.is_primary_ignored('Image', 'file_type_image-1'))
+
+    def test_is_primary_ignored(self):
+        self.assertTrue(
+            ignore_filter.IgnoreFilter(['primary']).is_primary_ignored(
+                'Source', 'file_type_source-dark'
+            )
+        )
+        self.assertTrue(
+            ignore_filter.IgnoreFilter(['Source']).is_primary_ignored(
+                'Source', 'file_type_source-dark'
+            )
+        )
+        self.assertTrue(
+            ignore_filter.IgnoreFilter(
+                ['file_type_source-dark.svg']
+            ).is_primary_ignored('Source', 'file_type_source-dark')
+        )
+        self.assertFalse(
+            ignore_filter.IgnoreFilter(['file_type_source-light']).is_primary_ignored(
+                'Source', 'file_type_source-dark'
+            )
+        )
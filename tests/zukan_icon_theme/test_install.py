@@ -35,16 +35,16 @@ class TestInstallEvent(TestCase):
         mock_version.return_value = ('0.4.8', None)
         self.assertEqual(self.install_event.pkg_version_setting(), '0.4.8')
 
+    @patch.object(install_event, 'build_icons_files')
     @patch.object(install_event, 'get_theme_settings')
-    def test_install_batch(self, mock_theme_settings):
+    def test_install_batch(self, mock_theme_settings, mock_build):
         # Test auto_install_theme is False
         mock_theme_settings.return_value = (None, False)
 
         self.install_event.install_batch()
 
         self.mock_theme.create_icons_themes.assert_called_once()
-        self.mock_syntax.build_icons_syntaxes.assert_called_once()
-        self.mock_preference.build_icons_preferences.assert_called_once()
+        mock_build.assert_called_once_with(self.mock_syntax, self.mock_preference)
 
         # Test auto_install_theme is True
         self.mock_theme.reset_mock()
@@ -53,17 +53,16 @@ class TestInstallEvent(TestCase):
         self.install_event.install_batch()
 
         self.mock_theme.create_icons_themes.assert_not_called()
-        self.mock_syntax.build_icons_syntaxes.assert_called()
-        self.mock_preference.build_icons_preferences.assert_called()
+        self.assertEqual(mock_build.call_count, 2)
 
-    def test_install_syntaxes_preferences(self):
+    @patch.object(install_event, 'build_icons_files')
+    def test_install_syntaxes_preferences(self, mock_build):
         self.install_event.install_syntaxes_preferences()
 
-        self.mock_syntax.build_icons_syntaxes.assert_called_once()
-        self.mock_preference.build_icons_preferences.assert_called_once()
+        mock_build.assert_called_once_with(self.mock_syntax, self.mock_preference)
 
     @patch.object(install_event, 'delete_unused_icons')
-    @patch.object(install_event.threading, 'Thread')
+    @patch.object(install_event, 'build_jobs')
     @patch('sublime.active_window')
     @patch('sublime.set_timeout')
     @patch('sublime.message_dialog')
@@ -72,11 +71,11 @@ class TestInstallEvent(TestCase):
         mock_dialog,
         mock_set_timeout,
         mock_active_window,
-        mock_thread,
+        mock_build_jobs,
         mock_delete_unused,
     ):
-        mock_thread_instance = MagicMock()
-        mock_thread.return_value = mock_thread_instance
+        mock_job = MagicMock()
+        mock_build_jobs.submit.return_value = mock_job
 
         mock_view = MagicMock()
         mock_window = MagicMock()
@@ -91,10 +90,12 @@ class TestInstallEvent(TestCase):
             self.install_event.install_upgrade_thread()
 
             self.mock_move_folder.move_folders.assert_called_once()
-            mock_thread.assert_called_once_with(
-                target=self.install_event.install_syntaxes_preferences
+            job = mock_build_jobs.submit.call_args[0][0]
+            self.assertEqual(job.key, ('install_syntaxes_preferences',))
+            self.assertEqual(
+                job.target, self.install_event.install_syntaxes_preferences
             )
-            mock_thread_instance.start.assert_called_once()
+            self.assertTrue(job.full)
             mock_delete_unused.assert_has_calls(
                 [
                     call(install_event.ZUKAN_PKG_ICONS_PATH),
@@ -102,18 +103,18 @@ class TestInstallEvent(TestCase):
                 ]
             )
 
-            mock_thread_instance.is_alive.return_value = False
+            mock_job.is_alive.return_value = False
             first_callback = mock_set_timeout.call_args_list[0][0][0]
             first_callback()
 
-    @patch.object(install_event.threading, 'Thread')
+    @patch.object(install_event, 'build_jobs')
     @patch('sublime.active_window')
     @patch('sublime.set_timeout')
     def test_rebuild_icon_files_thread(
-        self, mock_set_timeout, mock_active_window, mock_thread
+        self, mock_set_timeout, mock_active_window, mock_build_jobs
     ):
-        mock_thread_instance = MagicMock()
-        mock_thread.return_value = mock_thread_instance
+        mock_job = MagicMock()
+        mock_build_jobs.submit.return_value = mock_job
 
         mock_view = MagicMock()
         mock_window = MagicMock()
@@ -122,12 +123,11 @@ class TestInstallEvent(TestCase):
 
         self.install_event.rebuild_icon_files_thread()
 
-        mock_thread.assert_called_once_with(
-            target=self.install_event.install_syntaxes_preferences
-        )
-        mock_thread_instance.start.assert_called_once()
+        job = mock_build_jobs.submit.call_args[0][0]
+        self.assertEqual(job.key, ('install_syntaxes_preferences',))
+        self.assertEqual(job.scope, install_event.SCOPE_ICONS_FILES)
 
-        mock_thread_instance.is_alive.return_value = False
+        mock_job.is_alive.return_value = False
 
         first_callback = mock_set_timeout.call_args_list[0][0][0]
         first_callback()
@@ -137,20 +137,37 @@ class TestInstallEvent(TestCase):
 
         mock_view.erase_status.assert_called_with('_zukan')
 
-    @patch.object(install_event.threading, 'Thread')
+    @patch.object(install_event, 'build_jobs')
+    @patch.object(install_event, 'ThreadProgress')
+    def test_rebuild_changed_icons_thread(self, mock_thread_progress, mock_build_jobs):
+        settings_diff = MagicMock()
+
+        self.install_event.rebuild_changed_icons_thread(settings_diff)
+
+        job = mock_build_jobs.submit.call_args[0][0]
+        self.assertEqual(job.target, install_event.build_changed_icons_files)
+        self.assertEqual(
+            job.args, (self.mock_syntax, self.mock_preference, settings_diff)
+        )
+        self.assertFalse(job.full)
+        mock_thread_progress.assert_called_once_with(
+            mock_build_jobs.submit.return_value, 'Building zukan files', 'Build done'
+        )
+
+    @patch.object(install_event, 'build_jobs')
     @patch('sublime.active_window')
     @patch('sublime.set_timeout')
     @patch('sublime.message_dialog')
     def test_new_install(
-        self, mock_dialog, mock_set_timeout, mock_active_window, mock_thread
+        self, mock_dialog, mock_set_timeout, mock_active_window, mock_build_jobs
     ):
         mock_view = MagicMock()
         mock_window = MagicMock()
         mock_window.active_view.return_value = mock_view
         mock_active_window.return_value = mock_window
 
-        mock_thread_instance = MagicMock()
-        mock_thread.return_value = mock_thread_instance
+        mock_job = MagicMock()
+        mock_build_jobs.submit.return_value = mock_job
 
         with patch.object(
             self.install_event, 'zukan_restart_message_setting', return_value=True
@@ -158,29 +175,31 @@ class TestInstallEvent(TestCase):
             self.install_event, 'pkg_version_setting', return_value='0.4.8'
         ):
             self.install_event.new_install()
-            mock_thread.assert_called_once_with(target=self.install_event.install_batch)
-            mock_thread_instance.start.assert_called_once()
+            job = mock_build_jobs.submit.call_args[0][0]
+            self.assertEqual(job.target, self.install_event.install_batch)
+            self.assertEqual(job.scope, install_event.SCOPE_ALL)
+            mock_build_jobs.submit.assert_called_once()
 
-            mock_thread_instance.is_alive.return_value = False
+            mock_job.is_alive.return_value = False
             first_callback = mock_set_timeout.call_args_list[0][0][0]
             first_callback()
 
-        mock_thread.reset_mock()
-        mock_thread_instance.reset_mock()
+        mock_build_jobs.reset_mock()
         mock_set_timeout.reset_mock()
         mock_view.reset_mock()
         mock_dialog.reset_mock()
 
-        mock_thread_instance = MagicMock()
-        mock_thread.return_value = mock_thread_instance
+        mock_job = MagicMock()
+        mock_build_jobs.submit.return_value = mock_job
 
         with patch.object(
             self.install_event, 'zukan_restart_message_setting', return_value=False
         ):
             self.install_event.new_install()
-            mock_thread.assert_called_once_with(target=self.install_event.install_batch)
-            mock_thread_instance.start.assert_called_once()
+            job = mock_build_jobs.submit.call_args[0][0]
+            self.assertEqual(job.target, self.install_event.install_batch)
+            mock_build_jobs.submit.assert_called_once()
 
-            mock_thread_instance.is_alive.return_value = False
+            mock_job.is_alive.return_value = False
             first_callback = mock_set_timeout.call_args_list[0][0][0]
             first_callback()
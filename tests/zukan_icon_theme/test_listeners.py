@@ -54,9 +54,13 @@ class TestSchemeTheme(TestCase):
 
         self.scheme_theme = listeners.SchemeTheme()
 
+        # Output dirs listing is shared, tests mock it.
+        listeners.output_state.invalidate()
+
     def tearDown(self):
         for patcher in self.patches:
             patcher.stop()
+        listeners.output_state.invalidate()
 
     def test_scheme_theme_init(self):
         self.assertEqual(self.scheme_theme.auto_prefer_icon, True)
@@ -81,12 +85,11 @@ class TestSchemeTheme(TestCase):
         self.assertTrue(result.endswith('test_theme'))
 
     @patch('os.path.exists')
-    @patch('os.listdir')
-    def test_get_user_theme_delete_syntaxes(self, mock_listdir, mock_exists):
-        mock_listdir.return_value = [
-            f'test.{listeners.SUBLIME_SYNTAX_EXTENSION}',
-            'test.toml',
-        ]
+    @patch.object(listeners.output_state, 'has_files')
+    def test_get_user_theme_delete_syntaxes(self, mock_has_files, mock_exists):
+        mock_has_files.side_effect = lambda d, e: (
+            e == listeners.SUBLIME_SYNTAX_EXTENSION
+        )
         self.mock_theme_name.return_value = 'Ignored Theme.sublime-theme'
 
         self.scheme_theme.get_user_theme()
@@ -94,12 +97,9 @@ class TestSchemeTheme(TestCase):
         self.scheme_theme.zukan_syntax.delete_icons_syntaxes.assert_called_once()
 
     @patch('os.path.exists')
-    @patch('os.listdir')
-    def test_get_user_theme_delete_preferences(self, mock_listdir, mock_exists):
-        mock_listdir.return_value = [
-            f'test.{listeners.TMPREFERENCES_EXTENSION}',
-            'test.toml',
-        ]
+    @patch.object(listeners.output_state, 'has_files')
+    def test_get_user_theme_delete_preferences(self, mock_has_files, mock_exists):
+        mock_has_files.side_effect = lambda d, e: e == listeners.TMPREFERENCES_EXTENSION
         self.mock_theme_name.return_value = 'Ignored Theme.sublime-theme'
 
         self.scheme_theme.get_user_theme()
@@ -120,33 +120,48 @@ class TestSchemeTheme(TestCase):
             'Packages/Theme - New Theme/New Theme.sublime-theme'
         )
 
+    @patch.object(listeners, 'build_jobs')
     @patch('os.path.exists')
     @patch('os.listdir')
-    def test_get_user_theme_build_syntaxes(self, mock_listdir, mock_exists):
+    def test_get_user_theme_build_syntaxes(
+        self, mock_listdir, mock_exists, mock_build_jobs
+    ):
         mock_exists.return_value = True
         mock_listdir.return_value = ['test.other']
+        mock_build_jobs.submit.side_effect = lambda job: job
         self.scheme_theme.zukan_theme.list_created_icons_themes.return_value = [
             'test_theme'
         ]
 
         self.scheme_theme.get_user_theme()
 
+        job = mock_build_jobs.submit.call_args_list[0][0][0]
+        self.assertEqual(job.key, ('build_icons_syntaxes',))
+        self.assertTrue(job.full)
+        job.run()
         self.scheme_theme.zukan_syntax.build_icons_syntaxes.assert_called()
 
+    @patch.object(listeners, 'build_jobs')
     @patch('os.path.exists')
     @patch('os.listdir')
-    def test_get_user_theme_build_preferences(self, mock_listdir, mock_exists):
+    def test_get_user_theme_build_preferences(
+        self, mock_listdir, mock_exists, mock_build_jobs
+    ):
         mock_exists.return_value = True
         mock_listdir.return_value = [
             f'test.{listeners.SUBLIME_SYNTAX_EXTENSION}',
             'test.other',
         ]
+        mock_build_jobs.submit.side_effect = lambda job: job
         self.scheme_theme.zukan_theme.list_created_icons_themes.return_value = [
             'test_theme'
         ]
 
         self.scheme_theme.get_user_theme()
 
+        job = mock_build_jobs.submit.call_args_list[-1][0][0]
+        self.assertEqual(job.key, ('build_icons_preferences',))
+        job.run()
         self.scheme_theme.zukan_preference.build_icons_preferences.assert_called()
 
     @patch('os.path.exists')
@@ -218,9 +233,13 @@ class TestSchemeThemeListener(TestCase):
         self.listener = listeners.SchemeThemeListener(self.mock_view)
         self.listener.view = self.mock_view
 
+        listeners.activation_gate.invalidate()
+        listeners.output_state.invalidate()
+
     def tearDown(self):
         for patcher in self.patches:
             patcher.stop()
+        listeners.output_state.invalidate()
 
     @patch('os.path.exists')
     @patch('os.makedirs')
@@ -314,3 +333,92 @@ class TestSchemeThemeListener(TestCase):
             'Treble Adaptive.sublime-theme',  # current_theme
             '#FFFFFF',  # sidebar_bgcolor
         )
+
+    @patch('os.path.exists')
+    @patch('os.listdir')
+    def test_scheme_theme_listener_on_activated_async_unchanged(
+        self, mock_listdir, mock_exists
+    ):
+        mock_exists.return_value = True
+        mock_listdir.return_value = []
+
+        self.listener.on_activated_async()
+        self.listener.on_activated_async()
+
+        self.mock_sidebar_bgcolor.assert_called_once()
+        self.mock_save_ui.assert_called_once()
+        # Once per activation.
+        self.assertEqual(self.mock_system_theme.call_count, 2)
+
+    @patch('os.path.exists')
+    @patch('os.listdir')
+    def test_scheme_theme_listener_on_activated_async_same_saved_ui_settings(
+        self, mock_listdir, mock_exists
+    ):
+        mock_exists.return_value = True
+        mock_listdir.return_value = []
+        self.mock_read_pickle.return_value = [
+            {
+                'background': '#FFFFFF',
+                'color_scheme': 'D-O.sublime-color-scheme',
+                'dark_theme': 'Treble Dark.sublime-theme',
+                'light_theme': 'Treble Light.sublime-theme',
+                'sidebar_bgcolor': '#FFFFFF',
+                'system_theme': False,
+                'theme': 'Treble Adaptive.sublime-theme',
+            }
+        ]
+
+        self.listener.on_activated_async()
+
+        self.mock_save_ui.assert_not_called()
+
+    @patch('os.path.exists')
+    @patch('os.listdir')
+    def test_scheme_theme_listener_on_activated_async_debounced(
+        self, mock_listdir, mock_exists
+    ):
+        mock_exists.return_value = True
+        mock_listdir.return_value = []
+
+        self.listener.on_activated_async()
+
+        self.mock_view.style.return_value = {'background': '#000000'}
+        with patch.object(listeners, 'sublime') as mock_sublime:
+            # Burst, only last delayed update runs.
+            self.listener.on_activated_async()
+            self.listener.on_activated_async()
+
+            self.assertEqual(mock_sublime.set_timeout_async.call_count, 2)
+            self.mock_sidebar_bgcolor.assert_called_once()
+
+            callbacks = [c[0][0] for c in mock_sublime.set_timeout_async.call_args_list]
+            for callback in callbacks:
+                callback()
+
+        self.assertEqual(self.mock_sidebar_bgcolor.call_count, 2)
+        self.assertEqual(self.mock_save_ui.call_args[0][0], '#000000')
+
+
+class TestActivationGate(TestCase):
+    def test_activation_gate(self):
+        gate = listeners.ActivationGate(debounce_ms=1000)
+        ui = ('#FFFFFF', 'Fuji.sublime-color-scheme', None, None, False, 'auto')
+
+        self.assertFalse(gate.is_current(ui))
+        self.assertEqual(gate.delay(), 0)
+
+        gate.start()
+        gate.done(ui)
+
+        self.assertTrue(gate.is_current(ui))
+        self.assertGreater(gate.delay(), 0)
+
+        token = gate.schedule()
+        self.assertTrue(gate.is_latest(token))
+        gate.schedule()
+        self.assertFalse(gate.is_latest(token))
+
+        gate.invalidate()
+        self.assertFalse(gate.is_current(ui))
+        self.assertEqual(gate.delay(), 0)
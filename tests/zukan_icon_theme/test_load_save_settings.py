@@ -162,10 +162,8 @@ class TestGetThemeSettings(TestCase):
         self, mock_is_valid_list, mock_get_settings
     ):
         mock_get_settings.return_value = 'some_theme'
-        mock_get_settings.side_effect = (
-            lambda file, option: ['theme1', 'theme2']
-            if option == 'ignored_theme'
-            else 'some_theme'
+        mock_get_settings.side_effect = lambda file, option: (
+            ['theme1', 'theme2'] if option == 'ignored_theme' else 'some_theme'
         )
         mock_is_valid_list.return_value = True
 
@@ -177,10 +175,8 @@ class TestGetThemeSettings(TestCase):
     def test_get_theme_settings_with_invalid_ignored_theme(
         self, mock_is_valid_list, mock_get_settings
     ):
-        mock_get_settings.side_effect = (
-            lambda file, option: ['theme1', 'theme2']
-            if option == 'ignored_theme'
-            else 'some_theme'
+        mock_get_settings.side_effect = lambda file, option: (
+            ['theme1', 'theme2'] if option == 'ignored_theme' else 'some_theme'
         )
         mock_is_valid_list.return_value = False
 
@@ -192,8 +188,8 @@ class TestGetThemeSettings(TestCase):
     def test_get_theme_settings_with_empty_ignored_theme(
         self, mock_is_valid_list, mock_get_settings
     ):
-        mock_get_settings.side_effect = (
-            lambda file, option: [] if option == 'ignored_theme' else 'some_theme'
+        mock_get_settings.side_effect = lambda file, option: (
+            [] if option == 'ignored_theme' else 'some_theme'
         )
         mock_is_valid_list.return_value = False
 
@@ -279,10 +275,8 @@ class TestGetChangeIconSettings(TestCase):
     def test_get_change_icon_settings_with_valid_dict(
         self, mock_is_valid_dict, mock_get_settings
     ):
-        mock_get_settings.side_effect = (
-            lambda file, option: {'Icon 1': 'icon1', 'Icon 2': 'icon2'}
-            if option == 'change_icon'
-            else 'png'
+        mock_get_settings.side_effect = lambda file, option: (
+            {'Icon 1': 'icon1', 'Icon 2': 'icon2'} if option == 'change_icon' else 'png'
         )
         mock_is_valid_dict.return_value = True
 
@@ -294,10 +288,8 @@ class TestGetChangeIconSettings(TestCase):
     def test_get_change_icon_settings_with_invalid_dict(
         self, mock_is_valid_dict, mock_get_settings
     ):
-        mock_get_settings.side_effect = (
-            lambda file, option: {'Icon 1': 'icon1', 'Icon 2': 'icon2'}
-            if option == 'change_icon'
-            else 'png'
+        mock_get_settings.side_effect = lambda file, option: (
+            {'Icon 1': 'icon1', 'Icon 2': 'icon2'} if option == 'change_icon' else 'png'
         )
         mock_is_valid_dict.return_value = False
 
@@ -309,8 +301,8 @@ class TestGetChangeIconSettings(TestCase):
     def test_get_change_icon_settings_with_empty_dict(
         self, mock_is_valid_dict, mock_get_settings
     ):
-        mock_get_settings.side_effect = (
-            lambda file, option: {} if option == 'change_icon' else 'svg'
+        mock_get_settings.side_effect = lambda file, option: (
+            {} if option == 'change_icon' else 'svg'
         )
         mock_is_valid_dict.return_value = False
 
@@ -322,8 +314,8 @@ class TestGetChangeIconSettings(TestCase):
     def test_get_change_icon_settings_with_none(
         self, mock_is_valid_dict, mock_get_settings
     ):
-        mock_get_settings.side_effect = (
-            lambda file, option: None if option == 'change_icon' else 'svg'
+        mock_get_settings.side_effect = lambda file, option: (
+            None if option == 'change_icon' else 'svg'
         )
         mock_is_valid_dict.return_value = False
 
@@ -337,10 +329,8 @@ class TestGetPreferIconSettings(TestCase):
     def test_prefer_icon_empty_dict_invalid(
         self, mock_is_valid_dict, mock_get_settings
     ):
-        mock_get_settings.side_effect = (
-            lambda settings, key: None
-            if key == 'prefer_icon'
-            else {'auto_prefer_icon': True}
+        mock_get_settings.side_effect = lambda settings, key: (
+            None if key == 'prefer_icon' else {'auto_prefer_icon': True}
         )
         mock_is_valid_dict.return_value = False
 
@@ -355,8 +345,8 @@ class TestGetIgnoredIconSettings(TestCase):
     def test_ignored_icon_empty_list_invalid(
         self, mock_is_valid_list, mock_get_settings
     ):
-        mock_get_settings.side_effect = (
-            lambda settings, key: None if key == 'ignored_icon' else []
+        mock_get_settings.side_effect = lambda settings, key: (
+            None if key == 'ignored_icon' else []
         )
         mock_is_valid_list.return_value = False
 
@@ -648,6 +638,94 @@ class TestIsZukanListenerEnabled(TestCase):
         )
 
 
+class TestGetBuildWorkers(TestCase):
+    @patch.object(load_save_settings, 'get_settings')
+    def test_get_build_workers(self, mock_get_settings):
+        mock_get_settings.return_value = 8
+
+        result = load_save_settings.get_build_workers()
+
+        self.assertEqual(result, 8)
+        mock_get_settings.assert_called_once_with(
+            load_save_settings.ZUKAN_SETTINGS, 'build_workers'
+        )
+
+    @patch.object(load_save_settings, 'get_settings')
+    def test_get_build_workers_invalid(self, mock_get_settings):
+        for value in (None, 0, -1, '2'):
+            mock_get_settings.return_value = value
+
+            self.assertEqual(load_save_settings.get_build_workers(), 4)
+
+
+class TestIsStagedBuild(TestCase):
+    @patch.object(load_save_settings, 'get_settings')
+    def test_is_staged_build(self, mock_get_settings):
+        mock_get_settings.return_value = True
+
+        result = load_save_settings.is_staged_build()
+
+        self.assertTrue(result)
+        mock_get_settings.assert_called_once_with(
+            load_save_settings.ZUKAN_SETTINGS, 'staged_build'
+        )
+
+    @patch.object(load_save_settings, 'get_settings')
+    def test_is_staged_build_not_set(self, mock_get_settings):
+        mock_get_settings.return_value = None
+
+        self.assertFalse(load_save_settings.is_staged_build())
+
+
+class TestIsLinkPrimaryIcons(TestCase):
+    @patch.object(load_save_settings, 'get_settings')
+    def test_is_link_primary_icons(self, mock_get_settings):
+        mock_get_settings.return_value = True
+
+        self.assertTrue(load_save_settings.is_link_primary_icons())
+        mock_get_settings.assert_called_once_with(
+            load_save_settings.ZUKAN_SETTINGS, 'link_primary_icons'
+        )
+
+    @patch.object(load_save_settings, 'get_settings')
+    def test_is_link_primary_icons_not_set(self, mock_get_settings):
+        mock_get_settings.return_value = None
+
+        self.assertFalse(load_save_settings.is_link_primary_icons())
+
+
+class TestSystemThemeSettings(TestCase):
+    @patch.object(load_save_settings, 'get_settings')
+    def test_get_system_theme_ttl(self, mock_get_settings):
+        mock_get_settings.return_value = 30
+
+        result = load_save_settings.get_system_theme_ttl()
+
+        self.assertEqual(result, 30)
+        mock_get_settings.assert_called_once_with(
+            load_save_settings.ZUKAN_SETTINGS, 'system_theme_ttl'
+        )
+
+    @patch.object(load_save_settings, 'get_settings')
+    def test_get_system_theme_ttl_invalid(self, mock_get_settings):
+        for value in (None, -1, '2', True):
+            mock_get_settings.return_value = value
+
+            self.assertEqual(
+                load_save_settings.get_system_theme_ttl(),
+                load_save_settings.SYSTEM_THEME_TTL,
+            )
+
+    @patch.object(load_save_settings, 'get_settings')
+    def test_is_system_theme_watch(self, mock_get_settings):
+        mock_get_settings.return_value = True
+
+        self.assertTrue(load_save_settings.is_system_theme_watch())
+        mock_get_settings.assert_called_once_with(
+            load_save_settings.ZUKAN_SETTINGS, 'system_theme_watch'
+        )
+
+
 class TestIsZukanRestartMessage(TestCase):
     @patch.object(load_save_settings, 'get_settings')
     def test_is_zukan_restart_message(self, mock_get_settings):
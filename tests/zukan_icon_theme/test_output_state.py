@@ -0,0 +1,93 @@
+import importlib
+import os
+import shutil
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+output_state = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.output_state'
+)
+
+
+class TestZukanOutputState(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.state = output_state.ZukanOutputState()
+
+        for file_name in ('a.sublime-syntax', 'b.sublime-syntax', 'a.png'):
+            with open(os.path.join(self.temp_dir, file_name), 'w') as f:
+                f.write('')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_files(self):
+        self.assertEqual(
+            self.state.files(self.temp_dir, '.sublime-syntax'),
+            ['a.sublime-syntax', 'b.sublime-syntax'],
+        )
+        self.assertEqual(self.state.count(self.temp_dir, '.png'), 1)
+        self.assertFalse(self.state.has_files(self.temp_dir, '.tmPreferences'))
+        self.assertTrue(self.state.contains(self.temp_dir, 'a.png'))
+        self.assertFalse(self.state.contains(self.temp_dir, 'c.png'))
+
+    def test_directory_not_found(self):
+        directory = os.path.join(self.temp_dir, 'missing')
+
+        self.assertEqual(self.state.files(directory, '.sublime-syntax'), [])
+        self.assertFalse(self.state.has_files(directory, '.sublime-syntax'))
+
+    def test_listed_once(self):
+        with patch.object(
+            output_state.os, 'listdir', wraps=output_state.os.listdir
+        ) as mock_listdir:
+            for _ in range(5):
+                self.state.has_files(self.temp_dir, '.sublime-syntax')
+                self.state.contains(self.temp_dir, 'a.png')
+
+            mock_listdir.assert_called_once()
+
+    def test_directory_changed(self):
+        self.assertEqual(self.state.count(self.temp_dir, '.png'), 1)
+
+        file_path = os.path.join(self.temp_dir, 'b.png')
+        with open(file_path, 'w') as f:
+            f.write('')
+        # Directory modified time changes, even on coarse clocks.
+        st = os.stat(self.temp_dir)
+        os.utime(self.temp_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        self.assertEqual(self.state.count(self.temp_dir, '.png'), 2)
+
+    def test_added_removed(self):
+        self.state.files(self.temp_dir, '.sublime-syntax')
+
+        with patch.object(
+            output_state.os, 'listdir', wraps=output_state.os.listdir
+        ) as mock_listdir:
+            file_path = os.path.join(self.temp_dir, 'c.sublime-syntax')
+            with open(file_path, 'w') as f:
+                f.write('')
+            self.state.added(file_path)
+
+            os.remove(os.path.join(self.temp_dir, 'a.sublime-syntax'))
+            self.state.removed(os.path.join(self.temp_dir, 'a.sublime-syntax'))
+
+            self.assertEqual(
+                self.state.files(self.temp_dir, '.sublime-syntax'),
+                ['b.sublime-syntax', 'c.sublime-syntax'],
+            )
+            mock_listdir.assert_not_called()
+
+    def test_invalidate(self):
+        self.state.files(self.temp_dir, '.png')
+        self.state.invalidate(self.temp_dir)
+
+        with patch.object(
+            output_state.os, 'listdir', wraps=output_state.os.listdir
+        ) as mock_listdir:
+            self.state.files(self.temp_dir, '.png')
+
+            mock_listdir.assert_called_once_with(self.temp_dir)
@@ -0,0 +1,92 @@
+import importlib
+import os
+import shutil
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+png_catalog = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.png_catalog'
+)
+
+
+class TestPngCatalog(TestCase):
+    def setUp(self):
+        self.icons_path = tempfile.mkdtemp()
+        self.primary_path = tempfile.mkdtemp()
+
+        for file_name in (
+            'file_type_rust-dark.png',
+            'file_type_rust-dark@2x.png',
+            'file_type_rust-dark@3x.png',
+            'file_type_rust-light.png',
+            'file_type_ada@2x.png',
+            'file_type_ada.svg',
+        ):
+            with open(os.path.join(self.icons_path, file_name), 'w') as f:
+                f.write('')
+        with open(
+            os.path.join(self.primary_path, 'file_type_image-dark.png'), 'w'
+        ) as f:
+            f.write('')
+
+        self.catalog = png_catalog.PngCatalog((self.icons_path, self.primary_path))
+
+    def tearDown(self):
+        shutil.rmtree(self.icons_path)
+        shutil.rmtree(self.primary_path)
+
+    def test_split_png_name(self):
+        list_png = [
+            ('file_type_rust-dark@2x.png', ('file_type_rust-dark', '@2x')),
+            ('file_type_rust-dark@3x.png', ('file_type_rust-dark', '@3x')),
+            ('file_type_rust-dark.png', ('file_type_rust-dark', '')),
+            ('file_type_rust.svg', None),
+        ]
+        for file_name, expected in list_png:
+            with self.subTest(file_name):
+                self.assertEqual(png_catalog.split_png_name(file_name), expected)
+
+    def test_exists(self):
+        self.assertTrue(self.catalog.exists('file_type_rust-dark'))
+        self.assertTrue(self.catalog.exists('file_type_image-dark'))
+        self.assertFalse(
+            self.catalog.exists('file_type_image-dark', (self.icons_path,))
+        )
+        # Only @2x size.
+        self.assertFalse(self.catalog.exists('file_type_ada'))
+        self.assertFalse(self.catalog.exists('file_type_missing'))
+
+    def test_suffixes(self):
+        self.assertEqual(
+            self.catalog.suffixes('file_type_rust-dark'), {'', '@2x', '@3x'}
+        )
+        self.assertEqual(self.catalog.suffixes('file_type_ada'), {'@2x'})
+
+    def test_variant(self):
+        self.assertEqual(
+            self.catalog.variant('file_type_rust-dark', 'light'),
+            'file_type_rust-light',
+        )
+        self.assertIsNone(self.catalog.variant('file_type_image-dark', 'light'))
+        self.assertIsNone(self.catalog.variant('file_type_ada', 'light'))
+
+    def test_listed_once(self):
+        with patch.object(
+            png_catalog.os, 'listdir', wraps=png_catalog.os.listdir
+        ) as mock_listdir:
+            for _ in range(10):
+                self.catalog.exists('file_type_missing')
+
+            self.assertEqual(mock_listdir.call_count, 2)
+
+    def test_directory_changed(self):
+        self.assertFalse(self.catalog.exists('file_type_go'))
+
+        with open(os.path.join(self.icons_path, 'file_type_go.png'), 'w') as f:
+            f.write('')
+        st = os.stat(self.icons_path)
+        os.utime(self.icons_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        self.assertTrue(self.catalog.exists('file_type_go'))
@@ -3,6 +3,9 @@ import importlib
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
+icons_index = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.icons_index'
+)
 preferences = importlib.import_module(
     'Zukan Icon Theme.src.zukan_icon_theme.core.preferences'
 )
@@ -79,8 +82,8 @@ class TestPreferences(TestCase):
 
     @patch.object(preferences.sublime, 'error_message')
     def test_install_icon_preference_icon_ignored(self, mock_error):
-        self.preferences.get_list_icons_preferences = Mock(
-            return_value=self.mock_preferences_list
+        self.preferences.get_icons_index = Mock(
+            return_value=icons_index.ZukanIconIndex(self.mock_preferences_list)
         )
         self.preferences.ignored_icon_setting = Mock(return_value=['ATest-1'])
 
@@ -90,15 +93,46 @@ class TestPreferences(TestCase):
 
     @patch.object(preferences.sublime, 'error_message')
     def test_install_icon_preference(self, mock_error):
-        self.preferences.get_list_icons_preferences = Mock(
-            return_value=self.mock_preferences_list
+        self.preferences.get_icons_index = Mock(
+            return_value=icons_index.ZukanIconIndex(self.mock_preferences_list)
+        )
+        self.preferences.ignored_icon_setting = Mock(return_value=[])
+        self.preferences.build_icon_preference = Mock()
+
+        self.preferences.install_icon_preference('atest1.tmPreferences')
+
+        self.preferences.build_icon_preference.assert_called_once_with('atest1-dark')
+        mock_error.assert_not_called()
+
+    @patch.object(preferences.sublime, 'error_message')
+    def test_install_icon_preference_built_once(self, mock_error):
+        self.mock_preferences_list.extend(
+            [
+                {
+                    'name': 'ATest-1 Light',
+                    'preferences': {
+                        'scope': 'scope3',
+                        'settings': {'icon': 'atest1-light'},
+                    },
+                },
+                {
+                    'name': 'ATest-1 Alt',
+                    'preferences': {
+                        'scope': 'scope4',
+                        'settings': {'icon': 'atest1-dark'},
+                    },
+                },
+            ]
+        )
+        self.preferences.get_icons_index = Mock(
+            return_value=icons_index.ZukanIconIndex(self.mock_preferences_list)
         )
         self.preferences.ignored_icon_setting = Mock(return_value=[])
         self.preferences.build_icon_preference = Mock()
 
         self.preferences.install_icon_preference('atest1.tmPreferences')
 
-        self.preferences.build_icon_preference.assert_called_once()
+        self.preferences.build_icon_preference.assert_called_once_with('atest1-dark')
         mock_error.assert_not_called()
 
     def test_install_all_icons_preferences(self):
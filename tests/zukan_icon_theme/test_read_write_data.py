@@ -134,84 +134,3 @@ class TestDumpPickleData(TestCase):
         mock_logger.error.assert_called_once_with(
             '[Errno %d] %s: %r', errno.EACCES, os.strerror(errno.EACCES), file_path
         )
-
-
-class TestEdtiContextsMain(TestCase):
-    def setUp(self):
-        self.test_syntax_file = 'ATest.sublime-syntax'
-
-    @patch('builtins.open', new_callable=mock_open)
-    @patch.object(read_write_data.logger, 'error')
-    def test_edit_contexts_main_file_not_found(self, mock_error, mock_open):
-        mock_open.side_effect = FileNotFoundError
-
-        with self.assertRaises(FileNotFoundError):
-            read_write_data.edit_contexts_main(self.test_syntax_file)
-
-        mock_error.assert_called_with(
-            '[Errno %d] %s: %r',
-            errno.ENOENT,
-            os.strerror(errno.ENOENT),
-            self.test_syntax_file,
-        )
-
-    @patch('builtins.open', new_callable=mock_open)
-    @patch.object(read_write_data.logger, 'error')
-    def test_edit_contexts_main_os_error(self, mock_error, mock_open):
-        mock_open.side_effect = OSError
-
-        with self.assertRaises(OSError):
-            read_write_data.edit_contexts_main(self.test_syntax_file)
-
-        mock_error.assert_called_with(
-            '[Errno %d] %s: %r',
-            errno.EACCES,
-            os.strerror(errno.EACCES),
-            self.test_syntax_file,
-        )
-
-    @patch(
-        'builtins.open',
-        new_callable=mock_open,
-        read_data=(
-            'contexts:\n  main:\n    - include: some_other_include\n'
-            '      apply_prototype: some_value\n'
-        ),
-    )
-    @patch.object(read_write_data.logger, 'debug')
-    def test_edit_contexts_main_with_scope(self, mock_debug, mock_open):
-        file_path = 'ATest.yaml'
-        scope = 'source.atest'
-        read_write_data.edit_contexts_main(file_path, scope)
-
-        mock_open.assert_any_call(file_path, 'r')
-        mock_open.assert_any_call(file_path, 'w')
-
-        expected_content = (
-            'contexts:\n  main:\n    - include: scope:source.atest#prototype\n'
-            '      include: scope:source.atest\n'
-        )
-        mock_open().write.assert_called_with(expected_content)
-
-        mock_debug.assert_called_with('edited file %r contaxts main.', file_path)
-
-    @patch(
-        'builtins.open',
-        new_callable=mock_open,
-        read_data=(
-            'contexts:\n  main:\n    - include: some_other_include\n      '
-            'apply_prototype: some_value\n'
-        ),
-    )
-    @patch.object(read_write_data.logger, 'debug')
-    def test_edit_contexts_main_without_scope(self, mock_debug, mock_open):
-        file_path = 'ATest.yaml'
-        read_write_data.edit_contexts_main(file_path)
-
-        mock_open.assert_any_call(file_path, 'r')
-        mock_open.assert_any_call(file_path, 'w')
-
-        expected_content = 'contexts:\n  main: []\n'
-        mock_open().write.assert_called_with(expected_content)
-
-        mock_debug.assert_called_with('edited file %r contaxts main.', file_path)
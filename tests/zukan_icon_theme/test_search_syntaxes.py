@@ -12,6 +12,9 @@ zukan_paths = importlib.import_module(
 
 
 class TestZukanSyntaxFunctions(TestCase):
+    def setUp(self):
+        search_syntaxes.syntax_registry.invalidate()
+
     @patch.object(search_syntaxes.sublime, 'list_syntaxes')
     def test_visible_syntaxes_only(self, mock_list_syntaxes):
         mock_syntax1 = MagicMock(
@@ -157,3 +160,69 @@ class TestZukanSyntaxFunctions(TestCase):
         self.assertEqual(
             result, [{'scope': 'source.atest1'}, {'scope': 'embedding.atest3'}]
         )
+
+
+class TestSyntaxRegistry(TestCase):
+    def setUp(self):
+        self.registry = search_syntaxes.SyntaxRegistry()
+        self.syntaxes = [
+            MagicMock(
+                hidden=False,
+                path='Packages/ATest-1/ATest-1.sublime-syntax',
+                scope='source.atest1',
+            ),
+            MagicMock(
+                hidden=True,
+                path='Packages/ATest-2/ATest-2.sublime-syntax',
+                scope='source.atest2',
+            ),
+        ]
+
+    @patch.object(search_syntaxes.sublime, 'list_syntaxes')
+    def test_scopes_available(self, mock_list_syntaxes):
+        mock_list_syntaxes.return_value = self.syntaxes
+
+        result = self.registry.scopes_available(
+            {'source.atest1', 'source.atest2', 'source.atest3'}
+        )
+
+        self.assertEqual(
+            result,
+            {'source.atest1': True, 'source.atest2': True, 'source.atest3': False},
+        )
+
+    @patch.object(search_syntaxes.sublime, 'list_syntaxes')
+    def test_visible_scopes(self, mock_list_syntaxes):
+        mock_list_syntaxes.return_value = self.syntaxes
+
+        self.assertEqual(self.registry.visible_scopes(), {'source.atest1'})
+
+    @patch.object(search_syntaxes, 'visible_syntaxes_only')
+    @patch.object(search_syntaxes.sublime, 'list_syntaxes')
+    def test_cached_while_syntaxes_unchanged(
+        self, mock_list_syntaxes, mock_visible_syntaxes
+    ):
+        mock_list_syntaxes.return_value = self.syntaxes
+        mock_visible_syntaxes.return_value = set()
+
+        self.registry.visible_scopes()
+        self.registry.scopes_available({'source.atest1'})
+
+        mock_visible_syntaxes.assert_called_once()
+
+    @patch.object(search_syntaxes, 'visible_syntaxes_only')
+    @patch.object(search_syntaxes.sublime, 'list_syntaxes')
+    def test_refresh_package_enabled(self, mock_list_syntaxes, mock_visible_syntaxes):
+        mock_list_syntaxes.return_value = self.syntaxes[:1]
+        mock_visible_syntaxes.return_value = set()
+
+        self.assertEqual(
+            self.registry.scopes_available({'source.atest2'}), {'source.atest2': False}
+        )
+
+        mock_list_syntaxes.return_value = self.syntaxes
+
+        self.assertEqual(
+            self.registry.scopes_available({'source.atest2'}), {'source.atest2': True}
+        )
+        self.assertEqual(mock_visible_syntaxes.call_count, 2)
@@ -57,8 +57,158 @@ class TestSearchResourcesSublimeThemes(TestCase):
         search_resources_sublime_themes_mock.assert_called_once()
 
 
+class TestThemeGraph(TestCase):
+    def setUp(self):
+        self.theme_graph = search_themes.ThemeGraph()
+        self.contents = {
+            'Packages/Theme - Treble/Treble Dark.sublime-theme': {
+                'extends': 'Treble.hidden-theme'
+            },
+            'Packages/Theme - Treble/Treble.hidden-theme': {
+                'extends': 'Base.hidden-theme'
+            },
+            'Packages/Theme - Treble/Base.hidden-theme': {'rules': []},
+        }
+        self.resources = {
+            'Treble.hidden-theme': [
+                'Packages/Zukan Icon Theme/icons/Treble.hidden-theme',
+                'Packages/Theme - Treble/Treble.hidden-theme',
+            ],
+            'Base.hidden-theme': ['Packages/Theme - Treble/Base.hidden-theme'],
+        }
+        self.patcher1 = patch.object(
+            search_themes.sublime,
+            'find_resources',
+            side_effect=lambda p: self.resources.get(p, []),
+        )
+        self.patcher2 = patch.object(
+            search_themes.sublime, 'load_resource', side_effect=lambda p: p
+        )
+        self.patcher3 = patch.object(
+            search_themes.sublime,
+            'decode_value',
+            side_effect=lambda p: self.contents[p],
+        )
+        self.mock_find_resources = self.patcher1.start()
+        self.mock_load_resource = self.patcher2.start()
+        self.patcher3.start()
+
+    def tearDown(self):
+        self.patcher1.stop()
+        self.patcher2.stop()
+        self.patcher3.stop()
+
+    def test_ancestors(self):
+        theme_content = self.theme_graph.content(
+            'Packages/Theme - Treble/Treble Dark.sublime-theme'
+        )
+
+        self.assertEqual(
+            self.theme_graph.ancestors(theme_content['extends']),
+            [
+                'Packages/Theme - Treble/Treble.hidden-theme',
+                'Packages/Theme - Treble/Base.hidden-theme',
+            ],
+        )
+
+    def test_theme_parsed_once(self):
+        for _ in range(3):
+            self.theme_graph.ancestors('Treble.hidden-theme')
+            self.theme_graph.content('Packages/Theme - Treble/Treble.hidden-theme')
+
+        self.assertEqual(self.mock_load_resource.call_count, 2)
+        self.assertEqual(self.mock_find_resources.call_count, 2)
+
+        self.theme_graph.invalidate()
+        self.theme_graph.ancestors('Treble.hidden-theme')
+
+        self.assertEqual(self.mock_load_resource.call_count, 4)
+
+    def test_parents(self):
+        self.assertEqual(
+            self.theme_graph.parents(
+                'Packages/Theme - Treble/Treble Dark.sublime-theme'
+            ),
+            [
+                [
+                    'Treble.hidden-theme',
+                    ['Packages/Theme - Treble/Treble.hidden-theme'],
+                ],
+                ['Base.hidden-theme', ['Packages/Theme - Treble/Base.hidden-theme']],
+            ],
+        )
+
+    def test_parents_extending_each_other(self):
+        self.contents['Packages/Theme - Treble/Base.hidden-theme'] = {
+            'extends': 'Treble.hidden-theme'
+        }
+
+        self.assertEqual(
+            len(
+                self.theme_graph.parents(
+                    'Packages/Theme - Treble/Treble Dark.sublime-theme'
+                )
+            ),
+            2,
+        )
+
+    def test_hidden_themes(self):
+        self.assertEqual(
+            self.theme_graph.hidden_themes('Treble.hidden-theme'),
+            ['Packages/Theme - Treble/Treble.hidden-theme'],
+        )
+        self.mock_load_resource.assert_not_called()
+
+    def test_color_mod_evaluate_all(self):
+        theme_content = {'variables': {'a': '#000000', 'b': 'color(var(a) a(0.5))'}}
+
+        with patch.object(
+            search_themes.ColorMod, 'evaluate_all', autospec=True
+        ) as mock_evaluate_all:
+            evaluator = self.theme_graph.color_mod(theme_content)
+            self.assertIs(self.theme_graph.color_mod(theme_content), evaluator)
+
+        mock_evaluate_all.assert_called_once_with(evaluator)
+
+    def test_operation(self):
+        with self.theme_graph.operation():
+            with self.theme_graph.operation():
+                self.theme_graph.ancestors('Treble.hidden-theme')
+            self.theme_graph.ancestors('Treble.hidden-theme')
+
+            self.assertEqual(self.mock_load_resource.call_count, 2)
+
+        # Cache emptied when last operation ends.
+        with self.theme_graph.operation():
+            self.theme_graph.ancestors('Treble.hidden-theme')
+
+        self.assertEqual(self.mock_load_resource.call_count, 4)
+
+    def test_operation_starts_empty(self):
+        self.theme_graph.ancestors('Treble.hidden-theme')
+
+        with self.theme_graph.operation():
+            self.theme_graph.ancestors('Treble.hidden-theme')
+
+        self.assertEqual(self.mock_load_resource.call_count, 4)
+
+    def test_ancestors_cycle(self):
+        self.contents['Packages/Theme - Treble/Base.hidden-theme'] = {
+            'extends': 'Treble.hidden-theme'
+        }
+
+        self.assertEqual(
+            self.theme_graph.ancestors('Treble.hidden-theme'),
+            [
+                'Packages/Theme - Treble/Treble.hidden-theme',
+                'Packages/Theme - Treble/Base.hidden-theme',
+            ],
+        )
+
+
 class TestPackageThemeExists(TestCase):
     def setUp(self):
+        search_themes.theme_graph.invalidate()
         self.mock_theme_paths = [
             'Packages/User/Treble Dark.sublime-theme',
             'Packages/Zukan Icon Theme/Theme/Treble Dark.sublime-theme',
@@ -124,6 +274,7 @@ class TestPackageThemeExists(TestCase):
 
 class TestThemeOpacity(TestCase):
     def setUp(self):
+        search_themes.theme_graph.invalidate()
         self.theme_content_with_opacity = {
             'rules': [
                 {
@@ -327,6 +478,7 @@ class TestThemeOpacity(TestCase):
 
 class TestFindSidebarBackground(TestCase):
     def setUp(self):
+        search_themes.theme_graph.invalidate()
         self.theme_content = {
             'rules': [
                 {
@@ -441,6 +593,83 @@ class TestFindSidebarBackground(TestCase):
         )
         self.assertEqual(target_list, ['light'])
 
+    def test_find_variables_trace(self):
+        target_list = []
+        trace = []
+        search_themes.find_variables(
+            'var(black)',
+            {'variables': {'black': '#000000'}},
+            target_list,
+            'Packages/Theme - Treble/Treble Dark.sublime-theme',
+            trace,
+        )
+        self.assertEqual(target_list, ['dark'])
+        self.assertEqual(trace, ['var(black)', '#000000'])
+
+    def test_find_variables_memoized(self):
+        theme_content = {
+            'variables': {'sidebar_bg': 'var(dark_bg)', 'dark_bg': '#000000'}
+        }
+
+        with patch.object(
+            search_themes, 'classify', wraps=search_themes.classify
+        ) as mock_classify:
+            for _ in range(2):
+                target_list = []
+                trace = []
+                search_themes.find_variables(
+                    'var(sidebar_bg)',
+                    theme_content,
+                    target_list,
+                    'Packages/Theme - Treble/Treble Dark.sublime-theme',
+                    trace,
+                )
+                self.assertEqual(target_list, ['dark'])
+                self.assertEqual(trace, ['var(sidebar_bg)', 'var(dark_bg)', '#000000'])
+
+            self.assertEqual(mock_classify.call_count, 3)
+
+    def test_find_variables_color_mod(self):
+        theme_content = {
+            'variables': {
+                'sidebar_bg': 'color(var(dark_bg) blend(#fff 20%))',
+                'dark_bg': '#000000',
+            }
+        }
+        target_list = []
+        trace = []
+        search_themes.find_variables(
+            'var(sidebar_bg)',
+            theme_content,
+            target_list,
+            'Packages/Theme - Treble/Treble Dark.sublime-theme',
+            trace,
+        )
+        # Base color is dark, blended with 80% white it is light.
+        self.assertEqual(target_list, ['light'])
+        self.assertEqual(
+            trace, ['var(sidebar_bg)', 'color(var(dark_bg) blend(#fff 20%))']
+        )
+
+    def test_find_variables_color_mod_background(self):
+        theme_content = {
+            'variables': {'sidebar_bg': 'color(var(--background) l(+ 80%))'}
+        }
+        target_list = []
+        trace = []
+        with patch.object(search_themes, 'scheme_background') as mock_background:
+            mock_background.return_value = '#000000'
+            search_themes.theme_graph.invalidate()
+            search_themes.find_variables(
+                'var(sidebar_bg)',
+                theme_content,
+                target_list,
+                'Packages/Theme - Treble/Treble Adaptive.sublime-theme',
+                trace,
+            )
+        self.assertEqual(target_list, ['light'])
+        self.assertIn('var(--background)', trace)
+
     def test_find_variables_derived_background(self):
         target_list = []
         with patch('os.path.exists') as mock_exists:
@@ -574,6 +803,16 @@ class TestFindSidebarBackground(TestCase):
 
 
 class TestGetSidebarBgColor(TestCase):
+    def setUp(self):
+        search_themes.theme_graph.invalidate()
+        self.patcher = patch.object(
+            search_themes, 'is_cached_theme_info', return_value=False
+        )
+        self.mock_cached = self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
     @patch.object(search_themes.sublime, 'find_resources')
     @patch.object(search_themes, 'find_sidebar_background')
     def test_get_sidebar_bgcolor(
@@ -588,7 +827,7 @@ class TestGetSidebarBgColor(TestCase):
         result = search_themes.get_sidebar_bgcolor(mock_theme_name)
 
         mock_find_resources.assert_called_with(mock_theme_name)
-        mock_find_sidebar_background.assert_called_with('Packages/Theme Treble')
+        mock_find_sidebar_background.assert_called_with('Packages/Theme Treble', [])
         self.assertEqual(result, 'dark')
 
     @patch('sublime.find_resources')
@@ -603,7 +842,7 @@ class TestGetSidebarBgColor(TestCase):
             self.assertEqual(result, 'dark')
             mock_find_resources.assert_called_once_with('Treble Dark.sublime-theme')
             mock_find_bg.assert_called_once_with(
-                'Packages/User/Treble Dark.sublime-theme'
+                'Packages/User/Treble Dark.sublime-theme', []
             )
 
     @patch('sublime.find_resources')
@@ -621,9 +860,85 @@ class TestGetSidebarBgColor(TestCase):
             self.assertEqual(result, 'light')
             mock_find_resources.assert_called_once_with('Treble Dark.sublime-theme')
             mock_find_bg.assert_called_once_with(
-                'Packages/Theme - Treble/Treble Dark.sublime-theme'
+                'Packages/Theme - Treble/Treble Dark.sublime-theme', []
             )
 
+    @patch.object(search_themes.sublime, 'load_resource')
+    @patch.object(search_themes, 'find_sidebar_background')
+    @patch.object(search_themes, 'get_cached_sidebar_bgcolor', return_value='dark')
+    @patch.object(search_themes, 'scheme_background', return_value='#FFFFFF')
+    @patch('sublime.find_resources')
+    def test_get_sidebar_bgcolor_cached(
+        self,
+        mock_find_resources,
+        mock_background,
+        mock_get_cached,
+        mock_find_bg,
+        mock_load_resource,
+    ):
+        mock_find_resources.return_value = [
+            'Packages/Theme - Treble/Treble Dark.sublime-theme'
+        ]
+        self.mock_cached.return_value = True
+
+        result = search_themes.get_sidebar_bgcolor('Treble Dark.sublime-theme')
+
+        self.assertEqual(result, 'dark')
+        mock_get_cached.assert_called_once_with(
+            search_themes.filepath(
+                '../../../../../Packages/Theme - Treble/Treble Dark.sublime-theme'
+            ),
+            '#FFFFFF',
+            search_themes.theme_graph.hidden_themes,
+        )
+        mock_find_bg.assert_not_called()
+        # Theme and its parents not parsed.
+        mock_load_resource.assert_not_called()
+
+    @patch.object(
+        search_themes.theme_graph,
+        'parents',
+        return_value=[
+            ['Treble.hidden-theme', ['Packages/Theme - Treble/Treble.hidden-theme']]
+        ],
+    )
+    @patch.object(search_themes, 'save_sidebar_bgcolor')
+    @patch.object(search_themes, 'get_cached_sidebar_bgcolor', return_value=None)
+    @patch.object(search_themes, 'scheme_background', return_value='#FFFFFF')
+    @patch('sublime.find_resources')
+    def test_get_sidebar_bgcolor_saves_trace(
+        self,
+        mock_find_resources,
+        mock_background,
+        mock_get_cached,
+        mock_save,
+        mock_parents,
+    ):
+        mock_find_resources.return_value = [
+            'Packages/Theme - Treble/Treble Adaptive.sublime-theme'
+        ]
+        self.mock_cached.return_value = True
+
+        def find_bg(theme_st_path, trace):
+            trace.extend(['var(sidebar_bg)', 'var(--background)'])
+            return ['light']
+
+        with patch.object(
+            search_themes, 'find_sidebar_background', side_effect=find_bg
+        ):
+            result = search_themes.get_sidebar_bgcolor('Treble Adaptive.sublime-theme')
+
+        self.assertEqual(result, 'light')
+        mock_save.assert_called_once_with(
+            search_themes.filepath(
+                '../../../../../Packages/Theme - Treble/Treble Adaptive.sublime-theme'
+            ),
+            'light',
+            ['var(sidebar_bg)', 'var(--background)'],
+            '#FFFFFF',
+            [['Treble.hidden-theme', ['Packages/Theme - Treble/Treble.hidden-theme']]],
+        )
+
     @patch('sublime.find_resources')
     def test_get_sidebar_bgcolor_no_theme_found(self, mock_find_resources):
         mock_find_resources.return_value = []
@@ -0,0 +1,110 @@
+import importlib
+
+from unittest import TestCase
+
+settings_diff = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.settings_diff'
+)
+
+CUSTOM_ICON = {
+    'name': 'Custom',
+    'scope': 'source.custom',
+    'icon': 'custom',
+    'syntax_name': 'Custom',
+    'file_extensions': ['custom'],
+}
+
+
+class TestSettingsDiff(TestCase):
+    def test_ignored_icon(self):
+        diff = settings_diff.SettingsDiff(
+            {'ignored_icon': ['Rust', 'file_type_ada.svg']},
+            {'ignored_icon': ['file_type_ada', 'Go']},
+        )
+        self.assertEqual(diff.ignored_added, {'Go'})
+        self.assertEqual(diff.ignored_removed, {'Rust'})
+        self.assertTrue(diff.has_changes())
+
+    def test_change_icon(self):
+        diff = settings_diff.SettingsDiff(
+            {'change_icon': {'Rust': 'file_type_rust-1', 'Go': 'file_type_go-1'}},
+            {'change_icon': {'Rust': 'file_type_rust-2', 'Go': 'file_type_go-1'}},
+        )
+        self.assertEqual(diff.change_icon_keys, {'Rust'})
+
+        diff = settings_diff.SettingsDiff({}, {'change_icon': {'Go': 'file_type_go'}})
+        self.assertEqual(diff.change_icon_keys, {'Go'})
+
+    def test_create_custom_icon(self):
+        edited = dict(CUSTOM_ICON, icon='custom-1')
+        diff = settings_diff.SettingsDiff(
+            {'create_custom_icon': [CUSTOM_ICON]}, {'create_custom_icon': [edited]}
+        )
+        self.assertEqual(diff.custom_icon_added, [edited])
+        self.assertEqual(diff.custom_icon_removed, [CUSTOM_ICON])
+        self.assertEqual(diff.names, {'Custom'})
+
+        removed = diff.removed_custom_icons()
+        self.assertEqual(len(removed), 1)
+        self.assertEqual(removed[0]['preferences']['settings']['icon'], 'custom')
+        self.assertEqual(removed[0]['syntax'][0]['name'], 'Custom')
+
+    def test_removed_custom_icons_invalid(self):
+        diff = settings_diff.SettingsDiff(
+            {'create_custom_icon': ['Custom', {'name': 'No scope'}]},
+            {'create_custom_icon': []},
+        )
+        self.assertEqual(diff.removed_custom_icons(), [])
+
+    def test_no_changes(self):
+        settings = {
+            'ignored_icon': ['Rust'],
+            'change_icon': {'Go': 'file_type_go-1'},
+            'create_custom_icon': [CUSTOM_ICON],
+        }
+        diff = settings_diff.SettingsDiff(settings, dict(settings))
+        self.assertFalse(diff.has_changes())
+        self.assertFalse(diff.is_icon_changed({'name': 'Rust'}))
+
+    def test_is_icon_changed(self):
+        diff = settings_diff.SettingsDiff(
+            {'ignored_icon': []},
+            {'ignored_icon': ['file_type_rust.svg', 'programming', 'file_type_go-1']},
+        )
+        rust = {
+            'name': 'Rust',
+            'preferences': {'settings': {'icon': 'file_type_rust'}},
+        }
+        ada = {
+            'name': 'Ada',
+            'tag': 'programming',
+            'preferences': {'settings': {'icon': 'file_type_ada'}},
+        }
+        go = {
+            'name': 'Go',
+            'icons': ['file_type_go-1'],
+            'preferences': {'settings': {'icon': 'file_type_go'}},
+        }
+        syntax_only = {'name': 'Syntax', 'syntax': []}
+
+        self.assertTrue(diff.is_icon_changed(rust))
+        self.assertTrue(diff.is_icon_changed(ada))
+        self.assertTrue(diff.is_icon_changed(go))
+        self.assertFalse(diff.is_icon_changed(syntax_only))
+
+    def test_affects_primary(self):
+        self.assertTrue(
+            settings_diff.SettingsDiff(
+                {'ignored_icon': []}, {'ignored_icon': ['primary']}
+            ).affects_primary()
+        )
+        self.assertTrue(
+            settings_diff.SettingsDiff(
+                {}, {'change_icon': {'Source': 'file_type_source-1-dark'}}
+            ).affects_primary()
+        )
+        self.assertFalse(
+            settings_diff.SettingsDiff(
+                {'ignored_icon': []}, {'ignored_icon': ['Rust']}
+            ).affects_primary()
+        )
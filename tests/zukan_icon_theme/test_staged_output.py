@@ -0,0 +1,117 @@
+import importlib
+import os
+import shutil
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+staged_output = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.staged_output'
+)
+
+
+class TestStagedOutput(TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.test_dir, 'icons_syntaxes')
+        os.makedirs(self.output_dir)
+        self.staging_root = os.path.join(self.test_dir, 'Zukan Icon Theme Build')
+        self.staged = staged_output.StagedOutput(self.output_dir, self.staging_root)
+
+        self.kept_file = os.path.join(self.output_dir, 'ATest-1.sublime-syntax')
+        self.changed_file = os.path.join(self.output_dir, 'ATest-2.sublime-syntax')
+        for f in (self.kept_file, self.changed_file):
+            with open(f, 'w') as fh:
+                fh.write('atest')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def read(self, file_path: str) -> str:
+        with open(file_path, 'r') as f:
+            return f.read()
+
+    def test_staged_path(self):
+        self.assertEqual(
+            self.staged.staged_path(self.kept_file),
+            os.path.join(
+                self.staging_root,
+                'staging',
+                'icons_syntaxes',
+                'ATest-1.sublime-syntax',
+            ),
+        )
+
+    def test_prepare(self):
+        self.staged.prepare({self.changed_file})
+
+        self.assertEqual(os.listdir(self.staged.staging), ['ATest-1.sublime-syntax'])
+        self.assertEqual(
+            os.stat(self.staged.staged_path(self.kept_file)).st_mtime_ns,
+            os.stat(self.kept_file).st_mtime_ns,
+        )
+
+    def test_prepare_hardlinks_kept_files(self):
+        self.staged.prepare({self.changed_file})
+
+        self.assertTrue(
+            os.path.samefile(self.staged.staged_path(self.kept_file), self.kept_file)
+        )
+
+    @patch.object(staged_output.os, 'link', side_effect=OSError)
+    def test_prepare_copy_without_hardlinks(self, mock_link):
+        self.staged.prepare({self.changed_file})
+
+        staged_file = self.staged.staged_path(self.kept_file)
+        self.assertFalse(os.path.samefile(staged_file, self.kept_file))
+        self.assertEqual(self.read(staged_file), 'atest')
+
+    def test_unshare_file(self):
+        self.staged.prepare({self.changed_file})
+        self.assertTrue(self.staged.swap())
+
+        staged_output.unshare_file(self.kept_file)
+        with open(self.kept_file, 'w') as f:
+            f.write('atest changed')
+
+        # Previous build file not changed.
+        self.assertEqual(
+            self.read(os.path.join(self.staged.previous, 'ATest-1.sublime-syntax')),
+            'atest',
+        )
+
+    def test_unshare_file_not_shared(self):
+        staged_output.unshare_file(self.kept_file)
+        staged_output.unshare_file(os.path.join(self.output_dir, 'missing'))
+
+        self.assertTrue(os.path.exists(self.kept_file))
+
+    def test_swap_and_rollback(self):
+        self.staged.prepare({self.changed_file})
+        with open(self.staged.staged_path(self.changed_file), 'w') as f:
+            f.write('atest changed')
+
+        self.assertTrue(self.staged.swap())
+        self.assertEqual(self.read(self.changed_file), 'atest changed')
+        self.assertEqual(self.read(self.kept_file), 'atest')
+        self.assertFalse(os.path.exists(self.staged.staging))
+        self.assertEqual(
+            self.read(os.path.join(self.staged.previous, 'ATest-2.sublime-syntax')),
+            'atest',
+        )
+
+        self.assertTrue(self.staged.rollback())
+        self.assertEqual(self.read(self.changed_file), 'atest')
+        self.assertFalse(os.path.exists(self.staged.previous))
+
+    def test_swap_failed(self):
+        self.staged.prepare(set())
+
+        with patch.object(staged_output.os, 'rename', side_effect=OSError):
+            self.assertFalse(self.staged.swap())
+
+        self.assertEqual(self.read(self.changed_file), 'atest')
+
+    def test_rollback_no_previous(self):
+        self.assertFalse(self.staged.rollback())
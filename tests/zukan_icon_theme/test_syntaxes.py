@@ -3,6 +3,9 @@ import importlib
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
+icons_index = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.icons_index'
+)
 syntaxes = importlib.import_module(
     'Zukan Icon Theme.src.zukan_icon_theme.core.syntaxes'
 )
@@ -24,7 +27,7 @@ class TestSyntaxes(TestCase):
             }
         ]
 
-    @patch.object(syntaxes, 'read_pickle_data')
+    @patch.object(syntaxes, 'read_zukan_icons_data')
     def test_zukan_icons_data(self, mock_read_pickle):
         mock_read_pickle.return_value = self.mock_zukan_data
         result = self.syntaxes.zukan_icons_data()
@@ -57,11 +60,9 @@ class TestSyntaxes(TestCase):
 
         self.syntaxes.list_created_icons_syntaxes = Mock(return_value=set())
 
-        with patch.object(
-            syntaxes,
-            'edit_file_extension',
-            return_value=['atest'],
-        ):
+        with patch.object(syntaxes, 'extension_ownership') as mock_ownership:
+            mock_ownership.return_value.filter_file_extensions.return_value = ['atest']
+
             result = self.syntaxes.get_not_installed_syntaxes()
             expected = ['ATest.sublime-syntax']
             self.assertEqual(sorted(result), sorted(expected))
@@ -69,24 +70,26 @@ class TestSyntaxes(TestCase):
     @patch('os.path.splitext')
     @patch.object(syntaxes.sublime, 'error_message')
     @patch.object(syntaxes.Syntaxes, 'zukan_icons_data')
-    @patch.object(syntaxes.Syntaxes, 'get_list_icons_syntaxes')
+    @patch.object(syntaxes.Syntaxes, 'get_icons_index')
     @patch.object(syntaxes.Syntaxes, 'ignored_icon_setting')
     @patch.object(syntaxes.Syntaxes, 'install_syntax')
     def test_install_icon_syntax(
         self,
         mock_install_syntax,
         mock_ignored_icon_setting,
-        mock_get_list_icons_syntaxes,
+        mock_get_icons_index,
         mock_zukan_icons_data,
         mock_error_message,
         mock_splitext,
     ):
         mock_splitext.return_value = ('ATest', '.sublime-syntax')
         mock_zukan_icons_data.return_value = 'test_data'
-        mock_get_list_icons_syntaxes.return_value = [
-            {'name': 'ATest', 'syntax': [{'name': 'ATest'}]},
-            {'name': 'ATest-2', 'syntax': [{'name': 'ATest-2'}]},
-        ]
+        mock_get_icons_index.return_value = icons_index.ZukanIconIndex(
+            [
+                {'name': 'ATest', 'syntax': [{'name': 'ATest'}]},
+                {'name': 'ATest-2', 'syntax': [{'name': 'ATest-2'}]},
+            ]
+        )
         mock_ignored_icon_setting.return_value = []
 
         self.syntaxes.install_icon_syntax('ATest.sublime-syntax')
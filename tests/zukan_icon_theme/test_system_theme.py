@@ -1,6 +1,12 @@
 import importlib
 import json
+import os
 import platform
+import shutil
+import stat
+import tempfile
+import time
+import unittest
 
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
@@ -11,7 +17,25 @@ system_theme = importlib.import_module(
 )
 
 
+# Fake busctl, logs each process spawned. 'monitor' prints a color-scheme
+# SettingChanged signal, dark, and waits.
+FAKE_BUSCTL = """#!/bin/sh
+echo "$*" >> "$(dirname "$0")/calls.log"
+for arg in "$@"; do
+    if [ "$arg" = "monitor" ]; then
+        echo '{"type":"signal","member":"SettingChanged","payload":{"type":"ssv",\
+"data":["org.freedesktop.appearance","color-scheme",{"type":"u","data":1}]}}'
+        exec sleep 30
+    fi
+done
+echo '{"type":"(v)","data":[{"type":"v","data":2}]}'
+"""
+
+
 class TestSystemTheme(TestCase):
+    def setUp(self):
+        system_theme.system_appearance.invalidate()
+
     @patch.object(system_theme.subprocess, 'check_output')
     def test_linux_theme_dark(self, mock_check_output):
         mock_check_output.return_value = json.dumps({'data': [{'data': 1}]})
@@ -113,3 +137,102 @@ class TestSystemTheme(TestCase):
 
             result = system_theme.system_theme()
             self.assertTrue(result)
+
+
+@unittest.skipUnless(platform.system() == 'Linux', 'busctl is Linux only')
+class TestSystemAppearance(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.busctl = os.path.join(self.temp_dir, 'busctl')
+        self.calls_log = os.path.join(self.temp_dir, 'calls.log')
+
+        with open(self.busctl, 'w') as f:
+            f.write(FAKE_BUSCTL)
+        os.chmod(self.busctl, os.stat(self.busctl).st_mode | stat.S_IEXEC)
+
+        self.appearance = system_theme.SystemAppearance(ttl=60, busctl=self.busctl)
+
+    def tearDown(self):
+        self.appearance.stop_watch()
+        shutil.rmtree(self.temp_dir)
+
+    def calls(self) -> list:
+        if not os.path.exists(self.calls_log):
+            return []
+        with open(self.calls_log) as f:
+            return f.read().splitlines()
+
+    def test_is_dark_cached(self):
+        for _ in range(5):
+            self.assertFalse(self.appearance.is_dark())
+
+        self.assertEqual(len(self.calls()), 1)
+
+    def test_is_dark_expired(self):
+        self.appearance.ttl = 0
+
+        for _ in range(3):
+            self.assertFalse(self.appearance.is_dark())
+
+        self.assertEqual(len(self.calls()), 3)
+
+    def test_watch(self):
+        with patch.object(system_theme.platform, 'system', return_value='Linux'):
+            self.appearance.configure(0, True)
+
+        self.assertTrue(self.appearance.is_watching())
+
+        # Signal pushed by monitor, dark.
+        for _ in range(50):
+            if self.appearance._dark is not None:
+                break
+            time.sleep(0.05)
+
+        for _ in range(5):
+            self.assertTrue(self.appearance.is_dark())
+
+        calls = self.calls()
+        self.assertEqual(len(calls), 1)
+        self.assertIn('monitor', calls[0])
+
+        self.appearance.stop_watch()
+        self.assertFalse(self.appearance.is_watching())
+
+    def test_read_watcher_malformed_messages(self):
+        watcher = MagicMock()
+        watcher.poll.return_value = None
+        watcher.stdout = [
+            'not json\n',
+            '[1, 2]\n',
+            '{"payload": {"data": ["org.freedesktop.appearance", "color-scheme"]}}\n',
+            '{"payload": {"data": ["org.freedesktop.appearance", "color-scheme", 1]}}\n',
+            '{"payload": {"data": ["org.freedesktop.appearance", "color-scheme",'
+            ' {"type": "u", "data": 1}]}}\n',
+        ]
+        self.appearance._watcher = watcher
+
+        self.appearance._read_watcher(watcher)
+
+        self.assertTrue(self.appearance._dark)
+        # Watcher ended, stopped and results expire with ttl again.
+        self.assertFalse(self.appearance.is_watching())
+        watcher.terminate.assert_called_once()
+        self.assertEqual(self.appearance._expires, 0.0)
+
+    def test_read_watcher_error(self):
+        watcher = MagicMock()
+        watcher.poll.return_value = None
+        watcher.stdout.__iter__.side_effect = OSError
+        self.appearance._watcher = watcher
+
+        with patch.object(system_theme.logger, 'exception'):
+            self.appearance._read_watcher(watcher)
+
+        self.assertIsNone(self.appearance._watcher)
+        watcher.terminate.assert_called_once()
+
+    def test_configure_no_watch(self):
+        self.appearance.configure(60, False)
+
+        self.assertFalse(self.appearance.is_watching())
+        self.assertEqual(self.appearance.ttl, 60)
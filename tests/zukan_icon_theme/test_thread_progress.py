@@ -10,6 +10,12 @@ from unittest.mock import patch, Mock
 constants_pickle = importlib.import_module(
     'Zukan Icon Theme.tests.zukan_icon_theme.mocks.constants_pickle'
 )
+build_jobs = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.build_jobs'
+)
+build_progress = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.build_progress'
+)
 thread_progress = importlib.import_module(
     'Zukan Icon Theme.src.zukan_icon_theme.helpers.thread_progress'
 )
@@ -167,6 +173,73 @@ class TestThreadProgress(TestCase):
         progress.last_view = self.mock_view
         self.progress_cleanup_2(mock_set_timeout)
 
+    @patch('sublime.set_timeout')
+    @patch('sublime.active_window')
+    def test_thread_progress_build_job(self, mock_active_window, mock_set_timeout):
+        job = build_jobs.BuildJob(('build_icons_syntaxes',), Mock())
+        job.scheduler = Mock()
+        job.scheduler.depth.return_value = 2
+
+        progress = thread_progress.ThreadProgress(
+            job, self.message, self.success_message
+        )
+        progress.window = self.mock_window
+
+        progress.run(0)
+        self.mock_view.set_status.assert_called_with(
+            '_zukan', f'{self.message} (2 queued)  ⦿  ⦾  ⦾ '
+        )
+
+        job.run()
+        job.duration = 1.25
+        progress.run(0)
+        self.mock_view.set_status.assert_called_with(
+            '_zukan', f'{self.success_message} in 1.2s'
+        )
+
+    @patch.object(build_jobs, 'build_progress')
+    @patch('sublime.set_timeout')
+    @patch('sublime.active_window')
+    def test_thread_progress_build_job_status(
+        self, mock_active_window, mock_set_timeout, mock_build_progress
+    ):
+        mock_build_progress.status.return_value = 'syntaxes 120/480, 923 files/s, 0.1s'
+        job = build_jobs.BuildJob(('build_icons_syntaxes',), Mock())
+        job.scheduler = Mock()
+        job.scheduler.depth.return_value = 0
+        job.scheduler.running.return_value = job
+
+        progress = thread_progress.ThreadProgress(
+            job, self.message, self.success_message
+        )
+        progress.window = self.mock_window
+
+        progress.run(0)
+        self.mock_view.set_status.assert_called_with(
+            '_zukan',
+            f'{self.message}: syntaxes 120/480, 923 files/s, 0.1s  ⦿  ⦾  ⦾ ',
+        )
+
+    @patch('sublime.set_timeout')
+    @patch('sublime.active_window')
+    def test_thread_progress_absorbed_build_job(
+        self, mock_active_window, mock_set_timeout
+    ):
+        job = build_jobs.BuildJob(('install_syntaxes_preferences',), Mock())
+        job.absorbed_by = build_jobs.BuildJob(('install_batch',), Mock(), full=True)
+        job.absorbed_by._absorbed.append(job)
+
+        job.absorbed_by.run()
+
+        progress = thread_progress.ThreadProgress(
+            job, self.message, self.success_message
+        )
+        progress.window = self.mock_window
+        progress.run(0)
+
+        self.assertTrue(job.result)
+        self.assertIn(self.success_message, self.mock_view.set_status.call_args[0][1])
+
     # This test downgrade performance and raise func call in `build_icons_themes` profile results
     # And it is not necessary since it does not solve the uncovered missing lines.
     # Leaving for now for references.
@@ -0,0 +1,91 @@
+import errno
+import importlib
+import os
+import shutil
+import tempfile
+import threading
+
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+build_progress = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.build_progress'
+)
+write_files = importlib.import_module(
+    'Zukan Icon Theme.src.zukan_icon_theme.helpers.write_files'
+)
+
+
+class TestWriteFiles(TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.files = [
+            (
+                os.path.join(self.test_dir, 'ATest-{n}.sublime-syntax'.format(n=n)),
+                str(n),
+            )
+            for n in range(10)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def assert_files_written(self):
+        for file_path, content in self.files:
+            with open(file_path, 'r') as f:
+                self.assertEqual(f.read(), content)
+
+    def test_write_files_serial(self):
+        errors = write_files.write_files(self.files, workers=1)
+
+        self.assertEqual(errors, {})
+        self.assert_files_written()
+
+    def test_write_files_workers(self):
+        errors = write_files.write_files(self.files, workers=4)
+
+        self.assertEqual(errors, {})
+        self.assert_files_written()
+
+    def test_write_files_session(self):
+        written = []
+        lock = threading.Lock()
+
+        def session_write(file_path, content):
+            with lock:
+                written.append((file_path, content))
+
+        # MagicMock call count is not thread safe.
+        mock_session = MagicMock()
+        mock_session.write.side_effect = session_write
+
+        write_files.write_files(self.files, mock_session, workers=4)
+
+        self.assertEqual(sorted(written), sorted(self.files))
+
+    def test_write_files_progress(self):
+        progress = build_progress.BuildProgress()
+
+        with progress.phase('syntaxes', len(self.files)) as phase:
+            write_files.write_files(self.files, workers=4, progress=phase)
+
+        self.assertEqual(phase.done, len(self.files))
+        self.assertEqual(phase.total, len(self.files))
+
+    @patch.object(write_files.logger, 'error')
+    def test_write_files_errors(self, mock_error):
+        missing_file = os.path.join(self.test_dir, 'missing', 'ATest.sublime-syntax')
+        self.files.append((missing_file, 'atest'))
+
+        errors = write_files.write_files(self.files, workers=4)
+
+        self.assertEqual(list(errors), [missing_file])
+        self.assertIsInstance(errors[missing_file], FileNotFoundError)
+        mock_error.assert_called_once_with(
+            '[Errno %d] %s: %r', errno.ENOENT, os.strerror(errno.ENOENT), missing_file
+        )
+        self.assert_files_written_except(missing_file)
+
+    def assert_files_written_except(self, file_path: str):
+        self.files = [f for f in self.files if f[0] != file_path]
+        self.assert_files_written()
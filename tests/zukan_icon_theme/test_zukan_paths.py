@@ -32,6 +32,10 @@ params_list = [
         zukan_paths.ZUKAN_PKG_ICONS_SYNTAXES_PATH,
         os.path.join(ST_PACKAGES_PATH, PACKAGE_NAME, 'icons_syntaxes'),
     ),
+    (
+        zukan_paths.ZUKAN_BUILD_STAGING_PATH,
+        os.path.join(os.path.dirname(ST_PACKAGES_PATH), PACKAGE_NAME + ' Build'),
+    ),
     (
         zukan_paths.ZUKAN_PKG_PATH,
         os.path.join(ST_PACKAGES_PATH, PACKAGE_NAME),
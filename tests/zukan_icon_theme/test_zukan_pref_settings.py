@@ -141,6 +141,7 @@ class TestZukanIconFiles(TestCase):
             self.zukan.rebuild_functions,
             {
                 'rebuild_icon_files_thread': False,
+                'rebuild_changed_icons': False,
                 'build_icons_preferences': False,
                 'install_syntaxes': False,
             },
@@ -170,6 +171,19 @@ class TestZukanIconFiles(TestCase):
 
         self.assertTrue(any(self.zukan.rebuild_functions.values()))
 
+    def test_rebuild_icons_files_ignored_icon_changed(self):
+        self.zukan.ignored_icon = ['Ignored-1', 'Ignored-3']
+        self.zukan.change_icon = {'Atest': 'atest'}
+        self.zukan.execute_rebuilds = Mock()
+
+        self.zukan.rebuild_icons_files(self.event_bus)
+
+        self.assertTrue(self.zukan.rebuild_functions['rebuild_changed_icons'])
+        self.assertFalse(self.zukan.rebuild_functions['rebuild_icon_files_thread'])
+        self.assertEqual(self.zukan.settings_diff.ignored_added, {'Ignored-3'})
+        self.assertEqual(self.zukan.settings_diff.ignored_removed, {'Ignored-2'})
+        self.assertEqual(self.zukan.settings_diff.change_icon_keys, frozenset())
+
     def test_execute_rebuilds(self):
         self.zukan.rebuild_functions['build_icons_preferences'] = True
         self.zukan.rebuild_functions['install_syntaxes'] = True
@@ -187,6 +201,47 @@ class TestZukanIconFiles(TestCase):
         self.assertFalse(self.zukan.rebuild_functions['build_icons_preferences'])
         self.assertFalse(self.zukan.rebuild_functions['install_syntaxes'])
 
+    def test_execute_rebuilds_changed_icons(self):
+        self.zukan.rebuild_functions['rebuild_changed_icons'] = True
+        self.zukan.settings_diff = zukan_pref_settings.SettingsDiff(
+            {'ignored_icon': []}, {'ignored_icon': ['ATest']}
+        )
+
+        self.zukan.execute_rebuilds()
+
+        self.install_event.rebuild_changed_icons_thread.assert_called_once_with(
+            self.zukan.settings_diff
+        )
+        self.install_event.rebuild_icon_files_thread.assert_not_called()
+        self.clean_comments.clean_comments.assert_called_once()
+        self.assertFalse(self.zukan.rebuild_functions['rebuild_changed_icons'])
+
+    def test_execute_rebuilds_changed_icons_no_changes(self):
+        self.zukan.rebuild_functions['rebuild_changed_icons'] = True
+        self.zukan.settings_diff = zukan_pref_settings.SettingsDiff(
+            {'ignored_icon': ['ATest']}, {'ignored_icon': ['ATest.svg']}
+        )
+
+        self.zukan.execute_rebuilds()
+
+        self.install_event.rebuild_changed_icons_thread.assert_not_called()
+        self.assertFalse(self.zukan.rebuild_functions['rebuild_changed_icons'])
+
+    def test_execute_rebuilds_changed_icons_and_preferences(self):
+        self.zukan.rebuild_functions['rebuild_changed_icons'] = True
+        self.zukan.rebuild_functions['build_icons_preferences'] = True
+        self.zukan.settings_diff = zukan_pref_settings.SettingsDiff(
+            {'ignored_icon': []}, {'ignored_icon': ['ATest']}
+        )
+
+        self.zukan.execute_rebuilds()
+
+        self.install_event.rebuild_changed_icons_thread.assert_not_called()
+        self.zukan_preference.build_icons_preferences.assert_not_called()
+        self.install_event.rebuild_icon_files_thread.assert_called_once()
+        self.assertFalse(self.zukan.rebuild_functions['rebuild_changed_icons'])
+        self.assertFalse(self.zukan.rebuild_functions['rebuild_icon_files_thread'])
+
     def test_execute_rebuilds_icon_files_thread(self):
         self.zukan.rebuild_functions['rebuild_icon_files_thread'] = True
 